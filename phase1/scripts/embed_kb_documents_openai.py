@@ -10,9 +10,14 @@ import time
 import urllib.error
 import urllib.request
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from ingest_metrics import RunMetrics  # noqa: E402
+
 
 OPENAI_EMBEDDINGS_URL = "https://api.openai.com/v1/embeddings"
 
+METRICS = RunMetrics("embed_kb_documents")
+
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Embed kb_document rows using OpenAI embeddings and upsert into kb_embedding.")
@@ -25,6 +30,9 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--max-docs", type=int, default=0, help="If >0, stop after embedding this many documents.")
     p.add_argument("--sleep-seconds", type=float, default=0.0, help="Optional sleep between batches.")
     p.add_argument("--dry-run", action="store_true", help="Only show how many docs would be embedded.")
+    p.add_argument("--repo-full-name", default="", help="If set, only embed kb_document rows for this owner/name.")
+    p.add_argument("--metrics-out", default="", help="If set, write run metrics (requests, latency, retries, tokens) as JSON here.")
+    p.add_argument("--metrics-prom", default="", help="If set, also write run metrics as a Prometheus textfile here.")
     return p.parse_args()
 
 
@@ -57,7 +65,16 @@ def psql_exec_file(psql: str, *, user: str, port: int, db: str, path: str) -> No
         raise RuntimeError(f"psql failed.\nFILE: {path}\nSTDOUT:\n{proc.stdout}\nSTDERR:\n{proc.stderr}")
 
 
-def fetch_pending_docs(psql: str, *, user: str, port: int, db: str, model: str, limit: int) -> list[dict]:
+def pending_docs_filter(*, repo_full_name: str = "") -> str:
+    where = "(e.kb_id IS NULL OR e.source_hash <> d.source_hash)"
+    if repo_full_name:
+        where += " AND d.repo_full_name = " + sql_quote(repo_full_name)
+    return where
+
+
+def fetch_pending_docs(
+    psql: str, *, user: str, port: int, db: str, model: str, limit: int, repo_full_name: str = ""
+) -> list[dict]:
     # Return as JSON lines-ish via row_to_json for stability.
     sql = (
         "WITH pending AS ("
@@ -66,7 +83,7 @@ def fetch_pending_docs(psql: str, *, user: str, port: int, db: str, model: str,
         "  LEFT JOIN kb_embedding e ON e.kb_id = d.kb_id AND e.model = "
         + sql_quote(model)
         + " "
-        "  WHERE e.kb_id IS NULL OR e.source_hash <> d.source_hash "
+        "  WHERE " + pending_docs_filter(repo_full_name=repo_full_name) + " "
         "  ORDER BY d.kb_id "
         f"  LIMIT {int(limit)}"
         ") "
@@ -114,9 +131,20 @@ def openai_embed_batch(*, api_key: str, model: str, inputs: list[str], dimension
     attempt = 0
     while True:
         attempt += 1
+        t0 = time.time()
         try:
             with urllib.request.urlopen(req, timeout=60) as resp:
-                payload = json.loads(resp.read().decode("utf-8"))
+                raw = resp.read()
+                status = resp.status
+            METRICS.observe_request(
+                "embeddings", status=status, latency_s=time.time() - t0, bytes_sent=len(data), bytes_received=len(raw)
+            )
+            payload = json.loads(raw.decode("utf-8"))
+            usage = payload.get("usage") or {}
+            if isinstance(usage.get("prompt_tokens"), int):
+                METRICS.incr("embedding_prompt_tokens", usage["prompt_tokens"])
+            if isinstance(usage.get("total_tokens"), int):
+                METRICS.incr("embedding_total_tokens", usage["total_tokens"])
             items = payload.get("data") or []
             if not isinstance(items, list) or len(items) != len(inputs):
                 raise RuntimeError(f"Unexpected embeddings response shape (items={type(items)} len={len(items) if isinstance(items, list) else 'n/a'}).")
@@ -134,14 +162,19 @@ def openai_embed_batch(*, api_key: str, model: str, inputs: list[str], dimension
                 body_text = e.read().decode("utf-8", errors="replace")
             except Exception:
                 pass
+            METRICS.observe_request(
+                "embeddings", status=status, latency_s=time.time() - t0, bytes_sent=len(data), bytes_received=len(body_text)
+            )
             if status in (429, 500, 502, 503, 504) and attempt <= 8:
                 sleep_s = min(2 ** (attempt - 1), 60) + random.random()
-                time.sleep(sleep_s)
+                METRICS.count_retry("embeddings", "rate_limit_429" if status == 429 else "http_5xx")
+                METRICS.sleep("embeddings", "rate_limit" if status == 429 else "backoff", sleep_s)
                 continue
             raise RuntimeError(f"OpenAI HTTP {status}: {body_text[:500]}") from e
         except Exception as e:
             if attempt <= 5:
-                time.sleep(min(2 ** (attempt - 1), 30) + random.random())
+                METRICS.count_retry("embeddings", "exception")
+                METRICS.sleep("embeddings", "backoff", min(2 ** (attempt - 1), 30) + random.random())
                 continue
             raise
 
@@ -211,7 +244,7 @@ def main() -> int:
                     "LEFT JOIN kb_embedding e ON e.kb_id = d.kb_id AND e.model = "
                     + sql_quote(args.model)
                     + " "
-                    "WHERE e.kb_id IS NULL OR e.source_hash <> d.source_hash;"
+                    "WHERE " + pending_docs_filter(repo_full_name=args.repo_full_name) + ";"
                 ),
             ).strip()
             or "0"
@@ -226,29 +259,44 @@ def main() -> int:
 
     total_embedded = 0
     while True:
-        rows = fetch_pending_docs(psql, user=args.db_user, port=args.port, db=args.db_name, model=args.model, limit=args.batch_size)
+        limit = args.batch_size
+        if args.max_docs and args.max_docs > 0:
+            limit = min(limit, args.max_docs - total_embedded)
+        with METRICS.stage_timer("fetch_pending"):
+            rows = fetch_pending_docs(
+                psql,
+                user=args.db_user,
+                port=args.port,
+                db=args.db_name,
+                model=args.model,
+                limit=limit,
+                repo_full_name=args.repo_full_name,
+            )
         if not rows:
             break
 
         texts = [str(r.get("text") or "") for r in rows]
-        embeddings = openai_embed_batch(api_key=api_key, model=args.model, inputs=texts, dimensions=args.dimensions)
+        with METRICS.stage_timer("embeddings"):
+            embeddings = openai_embed_batch(api_key=api_key, model=args.model, inputs=texts, dimensions=args.dimensions)
 
         # Basic dimension guard (schema is vector(3072) by default).
         if embeddings and (len(embeddings[0]) != int(args.dimensions)):
             raise RuntimeError(f"Embedding dims mismatch: expected {args.dimensions}, got {len(embeddings[0])}")
 
-        upsert_embeddings(
-            psql,
-            user=args.db_user,
-            port=args.port,
-            db=args.db_name,
-            model=args.model,
-            dims=int(args.dimensions),
-            rows=rows,
-            embeddings=embeddings,
-        )
+        with METRICS.stage_timer("upsert"):
+            upsert_embeddings(
+                psql,
+                user=args.db_user,
+                port=args.port,
+                db=args.db_name,
+                model=args.model,
+                dims=int(args.dimensions),
+                rows=rows,
+                embeddings=embeddings,
+            )
 
         total_embedded += len(rows)
+        METRICS.incr("documents_embedded", len(rows))
         print(f"Embedded {len(rows)} docs (total={total_embedded})")
 
         if args.max_docs and total_embedded >= args.max_docs:
@@ -256,6 +304,10 @@ def main() -> int:
         if args.sleep_seconds and args.sleep_seconds > 0:
             time.sleep(args.sleep_seconds)
 
+    if args.metrics_out:
+        METRICS.write_json(args.metrics_out)
+    if args.metrics_prom:
+        METRICS.write_prometheus(args.metrics_prom, labels={"model": args.model})
     print(f"Done. Embedded {total_embedded} document(s) into kb_embedding for model={args.model}.")
     return 0
 
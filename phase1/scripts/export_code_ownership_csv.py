@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+import argparse
+import csv
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from export_repo_user_activity_csv import (  # noqa: E402
+    actor_key,
+    build_work_item_url,
+    derive_number,
+    derive_repo_full_name,
+    parse_time,
+    time_to_iso,
+)
+from raw_store import iter_raw_records  # noqa: E402
+
+REST_PR_FILES_URL = re.compile(r"/repos/([A-Za-z0-9_.-]+)/([A-Za-z0-9_.-]+)/pulls/(\d+)/files")
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        description="Export repo_code_ownership.csv (who authored/reviewed which file paths) from raw_http JSON records."
+    )
+    p.add_argument("--raw-http-dir", required=True, help="Path to raw_http directory (contains tag/ subdirs with *.json).")
+    p.add_argument("--out-dir", default="out", help="Output directory for CSV files (default: out).")
+    p.add_argument("--no-headers", action="store_true", help="Do not write CSV header rows.")
+    return p.parse_args()
+
+
+class PullRequestFacts:
+    def __init__(self) -> None:
+        self.paths: set[str] = set()
+        self.author: str | None = None
+        self.authored_at: str | None = None
+        self.reviews: dict[str, str] = {}  # reviewer -> latest submittedAt
+
+
+def rest_pr_files_key(record: dict) -> tuple[str, int] | None:
+    url = (record.get("request") or {}).get("url")
+    if not isinstance(url, str):
+        return None
+    m = REST_PR_FILES_URL.search(url)
+    if not m:
+        return None
+    return f"{m.group(1)}/{m.group(2)}", int(m.group(3))
+
+
+def collect_pull_requests(records) -> dict[tuple[str, int], PullRequestFacts]:
+    """Group files (GraphQL files pages + REST pulls/{n}/files), author and reviews by PR."""
+    prs: dict[tuple[str, int], PullRequestFacts] = {}
+
+    def facts(key: tuple[str, int]) -> PullRequestFacts:
+        if key not in prs:
+            prs[key] = PullRequestFacts()
+        return prs[key]
+
+    for record in records:
+        tag = (record.get("meta") or {}).get("tag") or ""
+        if not isinstance(tag, str):
+            continue
+        resp = (record.get("response") or {}).get("json")
+
+        if tag.startswith("rest_pr_files_pr"):
+            key = rest_pr_files_key(record)
+            if key is None or not isinstance(resp, list):
+                continue
+            for f in resp:
+                if isinstance(f, dict) and isinstance(f.get("filename"), str) and f["filename"]:
+                    facts(key).paths.add(f["filename"])
+            continue
+
+        if not isinstance(resp, dict):
+            continue
+        repo = derive_repo_full_name(record)
+        number = derive_number(record)
+        if not repo or number is None:
+            continue
+        data = resp.get("data") or {}
+        if not isinstance(data, dict):
+            continue
+        repository = data.get("repository") or {}
+        if not isinstance(repository, dict):
+            continue
+
+        if tag.startswith("graphql_files_pr"):
+            nodes = ((repository.get("pullRequest") or {}).get("files") or {}).get("nodes") or []
+            for node in nodes if isinstance(nodes, list) else []:
+                if isinstance(node, dict) and isinstance(node.get("path"), str) and node["path"]:
+                    facts((repo, number)).paths.add(node["path"])
+
+        elif tag.startswith("graphql_core_item"):
+            item = repository.get("issueOrPullRequest") or {}
+            if not isinstance(item, dict) or item.get("__typename") != "PullRequest":
+                continue
+            author = actor_key(item.get("author") or {})
+            # A merged change is owned from the merge onward; otherwise from when it was opened.
+            when = parse_time(item.get("mergedAt")) or parse_time(item.get("createdAt"))
+            if author and when is not None:
+                pr = facts((repo, number))
+                pr.author = author
+                pr.authored_at = time_to_iso(when)
+
+        elif tag.startswith("graphql_reviews_pr"):
+            reviews = ((repository.get("pullRequest") or {}).get("reviews") or {}).get("nodes") or []
+            for r in reviews if isinstance(reviews, list) else []:
+                if not isinstance(r, dict):
+                    continue
+                reviewer = actor_key(r.get("author") or {})
+                when = parse_time(r.get("submittedAt"))
+                if not reviewer or when is None:
+                    continue
+                pr = facts((repo, number))
+                iso = time_to_iso(when)
+                if iso > pr.reviews.get(reviewer, ""):
+                    pr.reviews[reviewer] = iso
+
+    return prs
+
+
+def ownership_rows(prs: dict[tuple[str, int], PullRequestFacts]) -> list[tuple]:
+    """(repo_full_name, user_id, role, path, occurred_at, reference), one per PR x person x file."""
+    rows: list[tuple] = []
+    for (repo, number), pr in prs.items():
+        if not pr.paths:
+            continue
+        reference = build_work_item_url(repo, "PullRequest", number)
+        people: list[tuple[str, str, str]] = []
+        if pr.author and pr.authored_at:
+            people.append((pr.author, "author", pr.authored_at))
+        for reviewer, when in pr.reviews.items():
+            if reviewer != pr.author:
+                people.append((reviewer, "reviewer", when))
+        for user_id, role, when in people:
+            for path in pr.paths:
+                rows.append((repo, user_id, role, path, when, reference))
+    rows.sort(key=lambda r: (r[0], r[3], r[1], r[2], r[4]))
+    return rows
+
+
+def main() -> int:
+    args = parse_args()
+    raw_http_dir = args.raw_http_dir
+    if not os.path.isdir(raw_http_dir):
+        print(f"raw_http dir not found: {raw_http_dir}", file=sys.stderr)
+        return 2
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    prs = collect_pull_requests(iter_raw_records(raw_http_dir, ok_only=True))
+    rows = ownership_rows(prs)
+
+    out_csv = os.path.join(args.out_dir, "repo_code_ownership.csv")
+    with open(out_csv, "w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        if not args.no_headers:
+            w.writerow(["repo_full_name", "user_id", "role", "path", "occurred_at", "reference"])
+        w.writerows(rows)
+
+    print(f"Wrote {len(rows)} repo_code_ownership rows ({sum(1 for p in prs.values() if p.paths)} PRs): {out_csv}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,12 +2,14 @@
 import argparse
 import csv
 import datetime as dt
-import json
 import os
 import re
 import sys
 import urllib.parse
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from raw_store import iter_raw_records  # noqa: E402
+
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Export repo_user / repo_user_activity CSVs from raw_http JSON records.")
@@ -42,19 +44,6 @@ def time_to_iso(value: dt.datetime) -> str:
     return value.astimezone(dt.timezone.utc).isoformat().replace("+00:00", "Z")
 
 
-def iter_json_files(raw_http_dir: str):
-    for root, _dirs, files in os.walk(raw_http_dir):
-        for name in files:
-            if not name.endswith(".json"):
-                continue
-            yield os.path.join(root, name)
-
-
-def load_json(path: str) -> dict:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
 def derive_repo_full_name(record: dict) -> str | None:
     # Prefer GraphQL variables.
     body = (record.get("request") or {}).get("body")
@@ -344,11 +333,7 @@ def main() -> int:
     activities_set: set[tuple] = set()
     role_obs: list[tuple] = []
 
-    for path in iter_json_files(raw_http_dir):
-        try:
-            record = load_json(path)
-        except Exception:
-            continue
+    for record in iter_raw_records(raw_http_dir):
         acts, roles = extract_rows_from_record(record)
         for a in acts:
             activities_set.add(a)
@@ -9,6 +9,9 @@ import re
 import sys
 import urllib.parse
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from raw_store import iter_raw_records  # noqa: E402
+
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Export relational-friendly work-item views from raw_http JSON records.")
@@ -24,19 +27,6 @@ def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
-def iter_json_files(raw_http_dir: str):
-    for root, _dirs, files in os.walk(raw_http_dir):
-        for name in files:
-            if not name.endswith(".json"):
-                continue
-            yield os.path.join(root, name)
-
-
-def load_json(path: str) -> dict:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
 def parse_time(value: str | None) -> dt.datetime | None:
     if not value or not isinstance(value, str):
         return None
@@ -406,11 +396,7 @@ def main() -> int:
     comments: list[dict] = []
     reviews: list[dict] = []
 
-    for path in iter_json_files(raw_http_dir):
-        try:
-            record = load_json(path)
-        except Exception:
-            continue
+    for record in iter_raw_records(raw_http_dir):
         wi_rows, ev_rows, c_rows, r_rows = extract_rows_from_record(
             record, max_body_chars=max_body_chars, max_item_body_chars=max_item_body_chars
         )
@@ -13,10 +13,29 @@ import sys
 import time
 import urllib.parse
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from ingest_metrics import RunMetrics  # noqa: E402
+from raw_store import RawStore  # noqa: E402
+
 
 GITHUB_API = "https://api.github.com"
 GITHUB_GRAPHQL = "https://api.github.com/graphql"
 
+# "files" keeps one pretty-printed JSON per attempt; "packed" appends to raw_http/raw_store.sqlite.
+RAW_STORE_MODE = "files"
+_raw_stores: dict[str, RawStore] = {}
+
+METRICS = RunMetrics("github_raw_ingest")
+
+_STAGE_TAG_RE = re.compile(
+    r"^(discovery_pr|discovery_issue|graphql_core|graphql_comments|graphql_timeline|graphql_reviews|graphql_files|rest_pr_files)"
+)
+
+
+def stage_for_tag(tag: str) -> str:
+    m = _STAGE_TAG_RE.match(tag or "")
+    return m.group(1) if m else "other"
+
 
 def utc_now_compact() -> str:
     return dt.datetime.utcnow().replace(microsecond=0).isoformat().replace(":", "").replace("-", "") + "Z"
@@ -47,6 +66,19 @@ def safe_write_text(path: str, text: str) -> None:
     os.replace(tmp, path)
 
 
+def write_raw_record(out_dir: str, record: dict) -> None:
+    meta = record.get("meta") or {}
+    if RAW_STORE_MODE == "packed":
+        raw_http_dir = os.path.join(out_dir, "raw_http")
+        store = _raw_stores.get(raw_http_dir)
+        if store is None:
+            store = _raw_stores[raw_http_dir] = RawStore(raw_http_dir)
+        store.put(record)
+        return
+    out_path = os.path.join(out_dir, "raw_http", meta["tag"], f"{meta['request_fingerprint']}_a{meta['attempt']}.json")
+    safe_write_json(out_path, record)
+
+
 def redact_headers(headers: dict) -> dict:
     redacted = {}
     for k, v in headers.items():
@@ -92,6 +124,7 @@ def http_request_json(
         )
     )[:16]
 
+    stage = stage_for_tag(tag)
     attempt = 0
     last_error = None
     while attempt <= max_retries:
@@ -129,7 +162,9 @@ def http_request_json(
                 cmd.extend(["--data-binary", json.dumps(body_obj)])
             cmd.extend(["-w", "%{http_code}"])
 
+            t0 = time.time()
             proc = subprocess.run(cmd, check=False, capture_output=True, text=True)
+            latency_s = time.time() - t0
             if auth_header_file is not None:
                 try:
                     os.unlink(auth_header_file.name)
@@ -137,7 +172,8 @@ def http_request_json(
                     pass
             if proc.returncode != 0:
                 last_error = RuntimeError(f"curl failed (code={proc.returncode}): {proc.stderr.strip()}")
-                time.sleep(min(2**attempt, 60) + random.random())
+                METRICS.count_retry(stage, "curl_error")
+                METRICS.sleep(stage, "backoff", min(2**attempt, 60) + random.random())
                 continue
 
             status_text = (proc.stdout or "").strip()
@@ -153,6 +189,17 @@ def http_request_json(
                 os.unlink(body_path)
             except OSError:
                 pass
+            METRICS.observe_request(
+                stage,
+                status=status,
+                latency_s=latency_s,
+                bytes_sent=len(body_bytes or b""),
+                bytes_received=len(body_text.encode("utf-8")),
+            )
+            remaining = resp_headers.get("X-RateLimit-Remaining") or resp_headers.get("x-ratelimit-remaining")
+            resource = resp_headers.get("X-RateLimit-Resource") or resp_headers.get("x-ratelimit-resource") or "core"
+            if remaining and str(remaining).isdigit():
+                METRICS.set_gauge(f"ratelimit_remaining_{resource}", int(remaining))
             try:
                 data = json.loads(body_text)
             except json.JSONDecodeError:
@@ -178,19 +225,21 @@ def http_request_json(
                     "attempt": attempt,
                 },
             }
-            out_path = os.path.join(out_dir, "raw_http", tag, f"{request_fingerprint}_a{attempt}.json")
-            safe_write_json(out_path, record)
+            write_raw_record(out_dir, record)
 
             # Retry on rate-limit / transient.
             if status in (429, 500, 502, 503, 504):
                 sleep_s = compute_retry_sleep(resp_headers, attempt)
-                time.sleep(sleep_s)
+                cause = "rate_limit_429" if status == 429 else "http_5xx"
+                METRICS.count_retry(stage, cause)
+                METRICS.sleep(stage, "rate_limit" if status == 429 else "backoff", sleep_s)
                 continue
 
             # Secondary rate limit often returns 403 with message.
             if status == 403 and is_secondary_rate_limit(data):
                 sleep_s = compute_retry_sleep(resp_headers, attempt, default_s=60)
-                time.sleep(sleep_s)
+                METRICS.count_retry(stage, "secondary_rate_limit")
+                METRICS.sleep(stage, "rate_limit", sleep_s)
                 continue
 
             if status >= 400:
@@ -201,7 +250,8 @@ def http_request_json(
             return record
         except Exception as e:
             last_error = e
-            time.sleep(min(2**attempt, 60) + random.random())
+            METRICS.count_retry(stage, "exception")
+            METRICS.sleep(stage, "backoff", min(2**attempt, 60) + random.random())
 
     raise RuntimeError(f"Request failed after {max_retries} retries: {url}") from last_error
 
@@ -294,6 +344,7 @@ def rest_search_issues(*, token: str, q: str, per_page: int, out_dir: str, tag_p
 
 GET_CORE = """
 query GetIssueOrPRCore($owner: String!, $name: String!, $number: Int!) {
+  rateLimit { cost remaining resetAt }
   repository(owner: $owner, name: $name) {
     issueOrPullRequest(number: $number) {
       __typename
@@ -324,6 +375,7 @@ query GetIssueOrPRCore($owner: String!, $name: String!, $number: Int!) {
         milestone { title description dueOn state number }
         assignees(first: 100) { nodes { login id databaseId url avatarUrl __typename } }
         comments { totalCount }
+        timelineItems { totalCount }
       }
       ... on PullRequest {
         id
@@ -373,6 +425,7 @@ query GetIssueOrPRCore($owner: String!, $name: String!, $number: Int!) {
         comments { totalCount }
         reviews { totalCount }
         files { totalCount }
+        timelineItems { totalCount }
       }
     }
   }
@@ -382,6 +435,7 @@ query GetIssueOrPRCore($owner: String!, $name: String!, $number: Int!) {
 
 GET_COMMENTS_PAGE = """
 query GetItemCommentsPage($owner: String!, $name: String!, $number: Int!, $after: String) {
+  rateLimit { cost remaining resetAt }
   repository(owner: $owner, name: $name) {
     issueOrPullRequest(number: $number) {
       __typename
@@ -441,6 +495,7 @@ query GetItemCommentsPage($owner: String!, $name: String!, $number: Int!, $after
 
 GET_TIMELINE_PAGE = """
 query GetItemTimelinePage($owner: String!, $name: String!, $number: Int!, $after: String) {
+  rateLimit { cost remaining resetAt }
   repository(owner: $owner, name: $name) {
     issueOrPullRequest(number: $number) {
       __typename
@@ -828,6 +883,7 @@ query GetItemTimelinePage($owner: String!, $name: String!, $number: Int!, $after
 
 GET_PR_REVIEWS_PAGE = """
 query GetPRReviewsPage($owner: String!, $name: String!, $number: Int!, $after: String) {
+  rateLimit { cost remaining resetAt }
   repository(owner: $owner, name: $name) {
     pullRequest(number: $number) {
       reviews(first: 100, after: $after) {
@@ -858,6 +914,7 @@ query GetPRReviewsPage($owner: String!, $name: String!, $number: Int!, $after: S
 
 GET_PR_FILES_PAGE = """
 query GetPRFilesPage($owner: String!, $name: String!, $number: Int!, $after: String) {
+  rateLimit { cost remaining resetAt }
   repository(owner: $owner, name: $name) {
     pullRequest(number: $number) {
       files(first: 100, after: $after) {
@@ -888,6 +945,12 @@ def graphql_call(*, token: str, query: str, variables: dict, out_dir: str, tag:
         tag=tag,
     )
     payload = rec.get("response", {}).get("json")
+    rate_limit = ((payload or {}).get("data") or {}).get("rateLimit") if isinstance(payload, dict) else None
+    if isinstance(rate_limit, dict):
+        if isinstance(rate_limit.get("cost"), int):
+            METRICS.incr("graphql_cost", rate_limit["cost"])
+        if isinstance(rate_limit.get("remaining"), int):
+            METRICS.set_gauge("graphql_ratelimit_remaining", rate_limit["remaining"])
     if isinstance(payload, dict) and payload.get("errors"):
         errors = payload.get("errors") or []
         first = errors[0] if isinstance(errors, list) and errors else {}
@@ -933,6 +996,101 @@ def extract_page_info(data: dict) -> tuple[bool, str] | None:
     return (has_next, end_cursor)
 
 
+def item_fingerprint(core_json: dict) -> dict | None:
+    """updatedAt + per-connection totalCount from a core query; None if the item was not returned."""
+    node = ((core_json or {}).get("data") or {}).get("repository", {}) or {}
+    node = node.get("issueOrPullRequest") or {}
+    if not node.get("updatedAt"):
+        return None
+    counts = {}
+    for conn in ("comments", "timelineItems", "reviews", "files"):
+        if isinstance(node.get(conn), dict):
+            counts[conn] = node[conn].get("totalCount")
+    return {"updated_at": node["updatedAt"], "counts": counts}
+
+
+def item_tag_prefixes(n: int) -> list[str]:
+    # Trailing "_p"/"_page" keeps item 1 from matching item 12.
+    return [
+        f"graphql_comments_item{n}_p",
+        f"graphql_timeline_item{n}_p",
+        f"graphql_reviews_pr{n}_p",
+        f"graphql_files_pr{n}_p",
+        f"rest_pr_files_pr{n}_page",
+    ]
+
+
+def load_item_index(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    items = data.get("items") if isinstance(data, dict) else None
+    return items if isinstance(items, dict) else {}
+
+
+def save_item_index(path: str, updates: dict) -> None:
+    if not updates:
+        return
+    # Re-read before writing: other windows of the same repo may be hydrating concurrently.
+    items = load_item_index(path)
+    items.update(updates)
+    safe_write_json(path, {"items": items, "updated_at": dt.datetime.utcnow().isoformat() + "Z"})
+
+
+def copy_item_records(src_raw_http: str, out_dir: str, n: int) -> int:
+    """Copy (or hard-link) item n's connection pages from an earlier run into out_dir. Returns records copied."""
+    dst_raw_http = os.path.join(out_dir, "raw_http")
+    prefixes = item_tag_prefixes(n)
+    # Same run folder (e.g. a retried window): the pages are already in place, only count them.
+    same_run = os.path.abspath(src_raw_http) == os.path.abspath(dst_raw_http)
+    copied = 0
+
+    if os.path.isdir(src_raw_http):
+        for tag in sorted(os.listdir(src_raw_http)):
+            src_tag_dir = os.path.join(src_raw_http, tag)
+            if not os.path.isdir(src_tag_dir) or not any(tag.startswith(p) for p in prefixes):
+                continue
+            for name in sorted(os.listdir(src_tag_dir)):
+                if not name.endswith(".json"):
+                    continue
+                src = os.path.join(src_tag_dir, name)
+                if same_run:
+                    copied += 1
+                    continue
+                if RAW_STORE_MODE == "packed":
+                    with open(src, "r", encoding="utf-8") as f:
+                        write_raw_record(out_dir, json.load(f))
+                else:
+                    dst = os.path.join(dst_raw_http, tag, name)
+                    ensure_dir(os.path.dirname(dst))
+                    if not os.path.exists(dst):
+                        try:
+                            os.link(src, dst)
+                        except OSError:
+                            shutil.copy2(src, dst)
+                copied += 1
+
+    if os.path.isfile(os.path.join(src_raw_http, "raw_store.sqlite")):
+        src_store = RawStore(src_raw_http)
+        try:
+            for prefix in prefixes:
+                for record in src_store.iter_records(tag_prefix=prefix):
+                    if not same_run:
+                        write_raw_record(out_dir, record)
+                    copied += 1
+        finally:
+            src_store.close()
+    return copied
+
+
+def write_run_metrics(out_dir: str, args: argparse.Namespace) -> None:
+    METRICS.write_json(os.path.join(out_dir, "metrics.json"))
+    if args.metrics_prom:
+        METRICS.write_prometheus(args.metrics_prom, labels={"repo": f"{args.owner}/{args.repo}"})
+
+
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Query GitHub (closedAt window) and write raw responses locally.")
     p.add_argument("--owner", default="openai")
@@ -943,6 +1101,32 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--per-page", type=int, default=100)
     p.add_argument("--max-items", type=int, default=0, help="If >0, limit number of items hydrated (for smoke runs).")
     p.add_argument("--no-hydrate", action="store_true", help="Only run discovery and save raw search responses.")
+    p.add_argument(
+        "--item-index",
+        default=None,
+        help="Per-repo hydration index (number -> updatedAt/totalCounts/run). Default: <parent of --out>/hydration_index.json",
+    )
+    p.add_argument(
+        "--no-skip-unchanged",
+        action="store_true",
+        help="Always paginate every connection, even for items unchanged since an indexed earlier run.",
+    )
+    p.add_argument(
+        "--metrics-prom",
+        default="",
+        help="Also write run metrics as a Prometheus textfile to this path (metrics.json is always written to --out).",
+    )
+    p.add_argument(
+        "--raw-store",
+        choices=["files", "packed"],
+        default="files",
+        help="files: one JSON per attempt (default); packed: compressed, body-deduplicated raw_http/raw_store.sqlite.",
+    )
+    p.add_argument(
+        "--reuse-discovery",
+        action="store_true",
+        help="Hydrate from an existing {out}/discovered_index.json instead of re-running discovery (requires --out).",
+    )
     return p.parse_args()
 
 
@@ -957,6 +1141,9 @@ def main() -> int:
         )
         return 2
 
+    global RAW_STORE_MODE
+    RAW_STORE_MODE = args.raw_store
+
     owner = args.owner
     repo = args.repo
     start = args.start
@@ -967,6 +1154,18 @@ def main() -> int:
     else:
         out_dir = os.path.join("raw", f"{owner}-{repo}", f"closedAt_{start}_{end}_{utc_now_compact()}")
 
+    if args.reuse_discovery:
+        if not args.out:
+            print("--reuse-discovery requires --out pointing at an earlier discovery run.", file=sys.stderr)
+            return 2
+        if args.no_hydrate:
+            print("--reuse-discovery and --no-hydrate are mutually exclusive.", file=sys.stderr)
+            return 2
+        discovered_path = os.path.join(out_dir, "discovered_index.json")
+        if not os.path.isfile(discovered_path):
+            print(f"discovered_index.json not found: {discovered_path}", file=sys.stderr)
+            return 2
+
     ensure_dir(out_dir)
     safe_write_json(
         os.path.join(out_dir, "run.json"),
@@ -975,33 +1174,46 @@ def main() -> int:
             "window": {"closedAt_start": start, "closedAt_end": end},
             "started_at": dt.datetime.utcnow().isoformat() + "Z",
             "notes": "Raw-only ingestion. No normalization or downstream processing performed.",
+            "raw_store": args.raw_store,
         },
     )
 
-    q_pr = f"repo:{owner}/{repo} is:pr state:closed closed:{start}..{end}"
-    q_issue = f"repo:{owner}/{repo} is:issue state:closed closed:{start}..{end}"
+    t_discovery = time.time()
+    if args.reuse_discovery:
+        with open(os.path.join(out_dir, "discovered_index.json"), "r", encoding="utf-8") as f:
+            discovered = json.load(f)
+        pr_items = (discovered.get("discovery") or {}).get("prs") or []
+        issue_items = (discovered.get("discovery") or {}).get("issues") or []
+    else:
+        q_pr = f"repo:{owner}/{repo} is:pr state:closed closed:{start}..{end}"
+        q_issue = f"repo:{owner}/{repo} is:issue state:closed closed:{start}..{end}"
 
-    pr_items = rest_search_issues(
-        token=token, q=q_pr, per_page=args.per_page, out_dir=out_dir, tag_prefix="discovery_pr"
-    )
-    issue_items = rest_search_issues(
-        token=token, q=q_issue, per_page=args.per_page, out_dir=out_dir, tag_prefix="discovery_issue"
-    )
+        pr_items = rest_search_issues(
+            token=token, q=q_pr, per_page=args.per_page, out_dir=out_dir, tag_prefix="discovery_pr"
+        )
+        issue_items = rest_search_issues(
+            token=token, q=q_issue, per_page=args.per_page, out_dir=out_dir, tag_prefix="discovery_issue"
+        )
 
-    # Save the discovered item list (still raw-ish; just a convenience index).
-    discovered = {
-        "repo": f"{owner}/{repo}",
-        "window": {"closedAt_start": start, "closedAt_end": end},
-        "discovery": {
-            "pr_count": len(pr_items),
-            "issue_count": len(issue_items),
-            "prs": [{"number": it.get("number"), "url": it.get("html_url")} for it in pr_items],
-            "issues": [{"number": it.get("number"), "url": it.get("html_url")} for it in issue_items],
-        },
-    }
-    safe_write_json(os.path.join(out_dir, "discovered_index.json"), discovered)
+        # Save the discovered item list (still raw-ish; just a convenience index).
+        discovered = {
+            "repo": f"{owner}/{repo}",
+            "window": {"closedAt_start": start, "closedAt_end": end},
+            "discovery": {
+                "pr_count": len(pr_items),
+                "issue_count": len(issue_items),
+                "prs": [{"number": it.get("number"), "url": it.get("html_url")} for it in pr_items],
+                "issues": [{"number": it.get("number"), "url": it.get("html_url")} for it in issue_items],
+            },
+        }
+        safe_write_json(os.path.join(out_dir, "discovered_index.json"), discovered)
+
+    METRICS.add_wall("discovery", time.time() - t_discovery)
+    METRICS.incr("discovered_prs", len(pr_items))
+    METRICS.incr("discovered_issues", len(issue_items))
 
     if args.no_hydrate:
+        write_run_metrics(out_dir, args)
         return 0
 
     numbers = [it.get("number") for it in pr_items + issue_items if isinstance(it.get("number"), int)]
@@ -1010,8 +1222,19 @@ def main() -> int:
     if args.max_items and args.max_items > 0:
         numbers = numbers[: args.max_items]
 
+    item_index_path = args.item_index or os.path.join(os.path.dirname(os.path.abspath(out_dir)), "hydration_index.json")
+    item_index = load_item_index(item_index_path)
+    index_updates: dict = {}
+    skipped_unchanged = 0
+    raw_http_abs = os.path.abspath(os.path.join(out_dir, "raw_http"))
+
+    t_hydrate = time.time()
     variables_base = {"owner": owner, "name": repo}
-    for n in numbers:
+    for i, n in enumerate(numbers):
+        if index_updates and i % 25 == 0:
+            save_item_index(item_index_path, index_updates)
+            index_updates = {}
+
         tag = f"graphql_core_item{n}"
         rec = graphql_call(token=token, query=GET_CORE, variables={**variables_base, "number": n}, out_dir=out_dir, tag=tag)
         data = rec["response"]["json"]
@@ -1022,6 +1245,20 @@ def main() -> int:
             .get("__typename")
         )
 
+        fingerprint = item_fingerprint(data)
+        prev = item_index.get(str(n)) or {}
+        if (
+            fingerprint is not None
+            and not args.no_skip_unchanged
+            and prev.get("updated_at") == fingerprint["updated_at"]
+            and prev.get("counts") == fingerprint["counts"]
+            and prev.get("raw_http_dir")
+            and copy_item_records(prev["raw_http_dir"], out_dir, n) > 0
+        ):
+            skipped_unchanged += 1
+            index_updates[str(n)] = {**fingerprint, "raw_http_dir": raw_http_abs}
+            continue
+
         def get_comments_page(after_cursor):
             t = f"graphql_comments_item{n}_p{sha256_hex(after_cursor or 'start')[:8]}"
             return graphql_call(
@@ -1093,9 +1330,21 @@ def main() -> int:
                 if page > 1000:
                     break
 
+        if fingerprint is not None:
+            index_updates[str(n)] = {**fingerprint, "raw_http_dir": raw_http_abs}
+
+    save_item_index(item_index_path, index_updates)
+    METRICS.add_wall("hydration", time.time() - t_hydrate)
+    METRICS.incr("items_hydrated", len(numbers) - skipped_unchanged)
+    METRICS.incr("items_skipped_unchanged", skipped_unchanged)
+    write_run_metrics(out_dir, args)
     safe_write_json(
         os.path.join(out_dir, "run_finished.json"),
-        {"finished_at": dt.datetime.utcnow().isoformat() + "Z", "hydrated_item_count": len(numbers)},
+        {
+            "finished_at": dt.datetime.utcnow().isoformat() + "Z",
+            "hydrated_item_count": len(numbers),
+            "skipped_unchanged_count": skipped_unchanged,
+        },
     )
     return 0
 
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+import contextlib
+import datetime as dt
+import json
+import os
+import threading
+import time
+
+
+# Upper bounds (seconds) for request latency buckets; the last bucket is +Inf.
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0]
+
+
+def _new_stage() -> dict:
+    return {
+        "requests": 0,
+        "responses_by_status": {},
+        "bytes_sent": 0,
+        "bytes_received": 0,
+        "latency_seconds_sum": 0.0,
+        "latency_buckets": [0] * (len(LATENCY_BUCKETS) + 1),
+        "retries_by_cause": {},
+        "sleep_seconds_by_cause": {},
+        "wall_seconds": 0.0,
+    }
+
+
+class RunMetrics:
+    """In-process counters for one script run, written as metrics.json and optionally a Prometheus textfile."""
+
+    def __init__(self, job: str) -> None:
+        self.job = job
+        self.started_at = dt.datetime.utcnow().isoformat() + "Z"
+        self._t0 = time.time()
+        self._lock = threading.Lock()
+        self.stages: dict[str, dict] = {}
+        self.counters: dict[str, float] = {}
+        self.gauges: dict[str, float] = {}
+
+    def _stage(self, stage: str) -> dict:
+        st = self.stages.get(stage)
+        if st is None:
+            st = self.stages[stage] = _new_stage()
+        return st
+
+    def observe_request(self, stage: str, *, status: int, latency_s: float, bytes_sent: int = 0, bytes_received: int = 0) -> None:
+        with self._lock:
+            st = self._stage(stage)
+            st["requests"] += 1
+            key = str(int(status))
+            st["responses_by_status"][key] = st["responses_by_status"].get(key, 0) + 1
+            st["bytes_sent"] += int(bytes_sent)
+            st["bytes_received"] += int(bytes_received)
+            st["latency_seconds_sum"] += float(latency_s)
+            i = 0
+            while i < len(LATENCY_BUCKETS) and latency_s > LATENCY_BUCKETS[i]:
+                i += 1
+            st["latency_buckets"][i] += 1
+
+    def count_retry(self, stage: str, cause: str) -> None:
+        with self._lock:
+            st = self._stage(stage)
+            st["retries_by_cause"][cause] = st["retries_by_cause"].get(cause, 0) + 1
+
+    def add_sleep(self, stage: str, cause: str, seconds: float) -> None:
+        with self._lock:
+            st = self._stage(stage)
+            st["sleep_seconds_by_cause"][cause] = st["sleep_seconds_by_cause"].get(cause, 0.0) + float(seconds)
+
+    def sleep(self, stage: str, cause: str, seconds: float) -> None:
+        self.add_sleep(stage, cause, seconds)
+        time.sleep(seconds)
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self.gauges[name] = value
+
+    def add_wall(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._stage(stage)["wall_seconds"] += float(seconds)
+
+    @contextlib.contextmanager
+    def stage_timer(self, stage: str):
+        t0 = time.time()
+        try:
+            yield
+        finally:
+            self.add_wall(stage, time.time() - t0)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "job": self.job,
+                "started_at": self.started_at,
+                "finished_at": dt.datetime.utcnow().isoformat() + "Z",
+                "wall_seconds": round(time.time() - self._t0, 3),
+                "latency_bucket_bounds": LATENCY_BUCKETS,
+                "stages": json.loads(json.dumps(self.stages)),
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+            }
+
+    def write_json(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp, path)
+
+    def write_prometheus(self, path: str, *, labels: dict | None = None) -> None:
+        # node_exporter textfile collector format; written atomically so a scrape never sees half a file.
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(render_prometheus(self.to_dict(), labels=labels))
+        os.replace(tmp, path)
+
+
+def _labels(base: dict, **extra) -> str:
+    merged = {**base, **extra}
+    if not merged:
+        return ""
+    parts = []
+    for k in sorted(merged):
+        v = str(merged[k]).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{k}="{v}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def render_prometheus(snapshot: dict, *, labels: dict | None = None) -> str:
+    prefix = "prism_ingest"
+    base = {"job_name": snapshot.get("job") or "", **(labels or {})}
+    lines: list[str] = []
+
+    def metric(name: str, kind: str, help_text: str) -> None:
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+    stages = snapshot.get("stages") or {}
+    metric("requests_total", "counter", "HTTP responses received, by stage and status.")
+    for stage, st in sorted(stages.items()):
+        for status, n in sorted(st["responses_by_status"].items()):
+            lines.append(f"{prefix}_requests_total{_labels(base, stage=stage, status=status)} {n}")
+    metric("bytes_total", "counter", "Request/response body bytes, by stage and direction.")
+    for stage, st in sorted(stages.items()):
+        lines.append(f"{prefix}_bytes_total{_labels(base, stage=stage, direction='sent')} {st['bytes_sent']}")
+        lines.append(f"{prefix}_bytes_total{_labels(base, stage=stage, direction='received')} {st['bytes_received']}")
+    metric("request_latency_seconds", "histogram", "HTTP request latency, by stage.")
+    bounds = snapshot.get("latency_bucket_bounds") or LATENCY_BUCKETS
+    for stage, st in sorted(stages.items()):
+        cumulative = 0
+        for bound, n in zip(list(bounds) + ["+Inf"], st["latency_buckets"]):
+            cumulative += n
+            lines.append(f"{prefix}_request_latency_seconds_bucket{_labels(base, stage=stage, le=bound)} {cumulative}")
+        lines.append(f"{prefix}_request_latency_seconds_sum{_labels(base, stage=stage)} {st['latency_seconds_sum']:.6f}")
+        lines.append(f"{prefix}_request_latency_seconds_count{_labels(base, stage=stage)} {st['requests']}")
+    metric("retries_total", "counter", "Retried requests, by stage and cause.")
+    for stage, st in sorted(stages.items()):
+        for cause, n in sorted(st["retries_by_cause"].items()):
+            lines.append(f"{prefix}_retries_total{_labels(base, stage=stage, cause=cause)} {n}")
+    metric("sleep_seconds_total", "counter", "Time spent sleeping before retries, by stage and cause.")
+    for stage, st in sorted(stages.items()):
+        for cause, s in sorted(st["sleep_seconds_by_cause"].items()):
+            lines.append(f"{prefix}_sleep_seconds_total{_labels(base, stage=stage, cause=cause)} {s:.3f}")
+    metric("stage_wall_seconds", "gauge", "Wall-clock time spent inside each stage.")
+    for stage, st in sorted(stages.items()):
+        lines.append(f"{prefix}_stage_wall_seconds{_labels(base, stage=stage)} {st['wall_seconds']:.3f}")
+    for name, value in sorted((snapshot.get("counters") or {}).items()):
+        metric(f"{name}_total", "counter", f"Run counter {name}.")
+        lines.append(f"{prefix}_{name}_total{_labels(base)} {value}")
+    for name, value in sorted((snapshot.get("gauges") or {}).items()):
+        metric(name, "gauge", f"Last observed {name}.")
+        lines.append(f"{prefix}_{name}{_labels(base)} {value}")
+    metric("run_wall_seconds", "gauge", "Wall-clock duration of the run.")
+    lines.append(f"{prefix}_run_wall_seconds{_labels(base)} {snapshot.get('wall_seconds', 0)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,650 @@
+#!/usr/bin/env python3
+import argparse
+import datetime as dt
+import os
+import random
+import re
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+
+STAGES = ["discover", "hydrate", "export", "kb", "embed"]
+
+# Stages that share a worker pool also share its concurrency budget. Discovery and hydration both
+# talk to GitHub, so they draw from one pool to keep all repos under a single rate-limit budget.
+STAGE_POOL = {
+    "discover": "github",
+    "hydrate": "github",
+    "export": "export",
+    "kb": "kb",
+    "embed": "embed",
+}
+
+EMBED_BUDGET_KEY = "embed_budget_remaining"
+# Budget currently held by running embed jobs; it flows back to EMBED_BUDGET_KEY minus what they used.
+EMBED_RESERVED_KEY = "embed_budget_reserved"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  repo TEXT NOT NULL,
+  window_start TEXT NOT NULL,
+  window_end TEXT NOT NULL,
+  stage TEXT NOT NULL,
+  status TEXT NOT NULL DEFAULT 'pending',
+  attempts INTEGER NOT NULL DEFAULT 0,
+  next_run_at REAL NOT NULL DEFAULT 0,
+  run_dir TEXT NOT NULL,
+  last_error TEXT NOT NULL DEFAULT '',
+  updated_at REAL NOT NULL DEFAULT 0,
+  UNIQUE (repo, window_start, window_end, stage)
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, stage, next_run_at);
+CREATE TABLE IF NOT EXISTS meta (
+  key TEXT PRIMARY KEY,
+  value TEXT NOT NULL
+);
+"""
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        description="Run discovery → hydration → export → KB build → embedding for many repos over a SQLite work queue."
+    )
+    p.add_argument("--repos", default="", help="Comma-separated owner/name list.")
+    p.add_argument("--repos-file", default="", help="File with one owner/name per line (# comments allowed).")
+    p.add_argument("--start", default="", help="YYYY-MM-DD (first closedAt window start, UTC)")
+    p.add_argument("--end", default="", help="YYYY-MM-DD (last closedAt window end, UTC, inclusive)")
+    p.add_argument("--window-days", type=int, default=14, help="Split [start, end] into windows of this many days.")
+    p.add_argument("--queue", default=os.path.join("raw", "ingest_queue.sqlite"), help="SQLite work queue path.")
+    p.add_argument("--raw-root", default="raw", help="Root for per-repo run folders (default: raw).")
+    p.add_argument("--raw-store", choices=["files", "packed"], default="files", help="raw_http backend for ingestion.")
+    p.add_argument("--last-stage", choices=STAGES, default="embed", help="Stop the chain after this stage.")
+    p.add_argument("--github-workers", type=int, default=2, help="Concurrent discovery/hydration jobs (shared GitHub budget).")
+    p.add_argument("--export-workers", type=int, default=2)
+    p.add_argument("--kb-workers", type=int, default=1)
+    p.add_argument("--embed-workers", type=int, default=1, help="Concurrent embedding jobs (shared OpenAI budget).")
+    p.add_argument("--max-attempts", type=int, default=5, help="Give up on a job after this many failed attempts.")
+    p.add_argument("--backoff-seconds", type=float, default=30.0, help="Base retry delay (doubles per attempt).")
+    p.add_argument("--max-backoff-seconds", type=float, default=900.0)
+    p.add_argument("--poll-seconds", type=float, default=2.0, help="Idle worker sleep while waiting for retries.")
+    p.add_argument("--db-name", default="prism_phase1")
+    p.add_argument("--db-user", default=os.environ.get("USER", "postgres"))
+    p.add_argument("--port", type=int, default=5432)
+    p.add_argument("--embed-model", default="text-embedding-3-large")
+    p.add_argument("--embed-dimensions", type=int, default=3072)
+    p.add_argument(
+        "--embed-max-docs",
+        type=int,
+        default=-1,
+        help="Total documents all embedding jobs may embed (persisted in the queue). -1 keeps the current budget; 0 means unlimited.",
+    )
+    p.add_argument("--enqueue-only", action="store_true", help="Only add jobs to the queue; do not run workers.")
+    p.add_argument("--status", action="store_true", help="Print per-repo progress from the queue and exit.")
+    return p.parse_args()
+
+
+def parse_date(text: str) -> dt.date:
+    return dt.datetime.strptime(text, "%Y-%m-%d").date()
+
+
+def split_windows(start: str, end: str, window_days: int) -> list[tuple[str, str]]:
+    # closedAt search ranges are inclusive on both ends, so windows must not overlap.
+    d0 = parse_date(start)
+    d1 = parse_date(end)
+    if d1 < d0:
+        raise ValueError(f"end before start: {start}..{end}")
+    step = max(1, int(window_days))
+    out: list[tuple[str, str]] = []
+    cur = d0
+    while cur <= d1:
+        w_end = min(cur + dt.timedelta(days=step - 1), d1)
+        out.append((cur.isoformat(), w_end.isoformat()))
+        cur = w_end + dt.timedelta(days=1)
+    return out
+
+
+def load_repos(repos: str, repos_file: str) -> list[str]:
+    names: list[str] = []
+    for part in (repos or "").split(","):
+        if part.strip():
+            names.append(part.strip())
+    if repos_file:
+        with open(repos_file, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if line:
+                    names.append(line)
+    out: list[str] = []
+    for name in names:
+        if name.count("/") != 1 or not all(name.split("/")):
+            raise ValueError(f"Expected owner/name, got: {name!r}")
+        if name not in out:
+            out.append(name)
+    return out
+
+
+def run_dir_for(raw_root: str, repo: str, window_start: str, window_end: str) -> str:
+    # Deterministic (no timestamp) so a retried stage resumes the same folder.
+    owner, name = repo.split("/", 1)
+    return os.path.join(raw_root, f"{owner}-{name}", f"closedAt_{window_start}_{window_end}")
+
+
+def backoff_seconds(attempt: int, *, base: float, cap: float) -> float:
+    if base <= 0:
+        return 0.0
+    return min(base * (2 ** max(0, attempt - 1)), cap) + random.random()
+
+
+class WorkQueue:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads; keep one per worker.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, repo: str, window_start: str, window_end: str, *, stage: str, run_dir: str) -> bool:
+        cur = self._conn().execute(
+            "INSERT OR IGNORE INTO jobs(repo, window_start, window_end, stage, run_dir, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (repo, window_start, window_end, stage, run_dir, time.time()),
+        )
+        return cur.rowcount > 0
+
+    def reset_running(self) -> int:
+        # Jobs left 'running' by a killed orchestrator are safe to re-run: stages are idempotent per run_dir.
+        cur = self._conn().execute(
+            "UPDATE jobs SET status = 'pending', next_run_at = 0, updated_at = ? WHERE status = 'running'",
+            (time.time(),),
+        )
+        # Their budget reservations died with them; what they embedded is unknown, so it is not refunded.
+        self._conn().execute("DELETE FROM meta WHERE key = ?", (EMBED_RESERVED_KEY,))
+        return cur.rowcount
+
+    def claim(self, stages: list[str], *, now: float | None = None) -> dict | None:
+        now = time.time() if now is None else now
+        conn = self._conn()
+        marks = ",".join("?" for _ in stages)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                f"SELECT * FROM jobs WHERE status = 'pending' AND stage IN ({marks}) AND next_run_at <= ? "
+                "ORDER BY next_run_at, id LIMIT 1",
+                (*stages, now),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (now, row["id"]),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        job = dict(row)
+        job["attempts"] += 1
+        return job
+
+    def complete(self, job: dict, *, next_stage: str | None, status: str = "done", note: str = "") -> None:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "UPDATE jobs SET status = ?, last_error = ?, updated_at = ? WHERE id = ?",
+                (status, note, time.time(), job["id"]),
+            )
+            if next_stage:
+                conn.execute(
+                    "INSERT OR IGNORE INTO jobs(repo, window_start, window_end, stage, run_dir, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (job["repo"], job["window_start"], job["window_end"], next_stage, job["run_dir"], time.time()),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def defer(self, job: dict, *, delay_s: float, note: str = "", now: float | None = None) -> None:
+        """Put a claimed job back without counting the attempt (it could not start yet)."""
+        now = time.time() if now is None else now
+        self._conn().execute(
+            "UPDATE jobs SET status = 'pending', attempts = attempts - 1, next_run_at = ?, last_error = ?, updated_at = ? "
+            "WHERE id = ?",
+            (now + delay_s, note, now, job["id"]),
+        )
+
+    def fail(self, job: dict, error: str, *, max_attempts: int, delay_s: float, now: float | None = None) -> str:
+        now = time.time() if now is None else now
+        status = "failed" if job["attempts"] >= max_attempts else "pending"
+        self._conn().execute(
+            "UPDATE jobs SET status = ?, next_run_at = ?, last_error = ?, updated_at = ? WHERE id = ?",
+            (status, now + delay_s, error[-2000:], now, job["id"]),
+        )
+        return status
+
+    def has_open_jobs(self, stages: list[str] | None = None) -> bool:
+        sql = "SELECT 1 FROM jobs WHERE status IN ('pending', 'running')"
+        params: tuple = ()
+        if stages is not None:
+            sql += " AND stage IN (" + ",".join("?" for _ in stages) + ")"
+            params = tuple(stages)
+        return self._conn().execute(sql + " LIMIT 1", params).fetchone() is not None
+
+    def set_meta(self, key: str, value: str) -> None:
+        self._conn().execute(
+            "INSERT INTO meta(key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    def delete_meta(self, key: str) -> None:
+        self._conn().execute("DELETE FROM meta WHERE key = ?", (key,))
+
+    def get_meta(self, key: str, default: str = "") -> str:
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return str(row["value"]) if row is not None else default
+
+    def reserve_embed_budget(self) -> int | None:
+        """Atomically take the whole remaining embedding budget; None means unlimited.
+
+        The amount is recorded as reserved until `refund_embed_budget` releases it, so
+        a job that gets 0 can tell "exhausted" from "held by a running job".
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = ?", (EMBED_BUDGET_KEY,)).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            remaining = max(0, int(row["value"]))
+            conn.execute("UPDATE meta SET value = '0' WHERE key = ?", (EMBED_BUDGET_KEY,))
+            if remaining:
+                conn.execute(
+                    "INSERT INTO meta(key, value) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = CAST(CAST(value AS INTEGER) + excluded.value AS TEXT)",
+                    (EMBED_RESERVED_KEY, str(remaining)),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return remaining
+
+    def refund_embed_budget(self, amount: int, *, reserved: int = 0) -> None:
+        """Return `amount` unused documents to the budget and release a `reserved` reservation."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if amount > 0:
+                conn.execute(
+                    "UPDATE meta SET value = CAST(CAST(value AS INTEGER) + ? AS TEXT) WHERE key = ?",
+                    (int(amount), EMBED_BUDGET_KEY),
+                )
+            if reserved > 0:
+                conn.execute(
+                    "UPDATE meta SET value = CAST(MAX(0, CAST(value AS INTEGER) - ?) AS TEXT) WHERE key = ?",
+                    (int(reserved), EMBED_RESERVED_KEY),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def embed_budget_state(self) -> tuple[int, int]:
+        """(remaining, reserved by running jobs), read together."""
+        rows = self._conn().execute(
+            "SELECT key, value FROM meta WHERE key IN (?, ?)", (EMBED_BUDGET_KEY, EMBED_RESERVED_KEY)
+        ).fetchall()
+        values = {r["key"]: max(0, int(r["value"])) for r in rows}
+        return values.get(EMBED_BUDGET_KEY, 0), values.get(EMBED_RESERVED_KEY, 0)
+
+    def progress(self) -> dict[str, dict]:
+        out: dict[str, dict] = {}
+        rows = self._conn().execute(
+            "SELECT repo, window_start, window_end, stage, status, attempts, last_error FROM jobs ORDER BY repo, window_start, id"
+        ).fetchall()
+        for r in rows:
+            rp = out.setdefault(r["repo"], {"windows": {}, "counts": {}})
+            rp["counts"][r["status"]] = rp["counts"].get(r["status"], 0) + 1
+            key = f"{r['window_start']}..{r['window_end']}"
+            # Later stages overwrite earlier ones, so each window reports its furthest stage.
+            rp["windows"][key] = {"stage": r["stage"], "status": r["status"], "attempts": r["attempts"], "last_error": r["last_error"]}
+        return out
+
+
+def next_stage_after(stage: str, last_stage: str) -> str | None:
+    i = STAGES.index(stage)
+    if i >= STAGES.index(last_stage):
+        return None
+    return STAGES[i + 1]
+
+
+def find_psql() -> str:
+    # Prefer PATH.
+    p = shutil.which("psql")
+    if p:
+        return p
+    # Prefer Homebrew postgresql@17.
+    candidate = "/opt/homebrew/opt/postgresql@17/bin/psql"
+    if os.path.isfile(candidate):
+        return candidate
+    raise RuntimeError("psql not found. Ensure Postgres is installed and psql is on PATH.")
+
+
+VIEW_TABLES = [
+    (
+        "repo_work_item",
+        "repo_work_item.csv",
+        "repo_full_name,number,type,url,title,body_excerpt,state,created_at,closed_at,author_login,author_association,labels_json,milestone_title,is_merged,merged_at,merged_by,comment_count,review_count,changed_files,additions,deletions",
+        ["repo_full_name", "number", "type"],
+    ),
+    (
+        "repo_work_item_event",
+        "repo_work_item_event.csv",
+        "repo_full_name,number,type,event_id,event_type,occurred_at,actor_login,subject_type,subject,reference",
+        ["repo_full_name", "number", "type", "event_id"],
+    ),
+    (
+        "repo_comment",
+        "repo_comment.csv",
+        "repo_full_name,number,type,comment_id,url,created_at,author_login,author_association,body_excerpt",
+        ["repo_full_name", "number", "type", "comment_id"],
+    ),
+    (
+        "repo_pr_review",
+        "repo_pr_review.csv",
+        "repo_full_name,pr_number,review_id,review_state,submitted_at,author_login,body_excerpt,reference",
+        ["repo_full_name", "pr_number", "review_id"],
+    ),
+]
+
+
+def build_view_load_script(views_dir: str) -> str:
+    # Unlike pg_kb_bootstrap_local.py (which truncates), many repos/windows share the tables here,
+    # so each window replaces only its own rows by primary key.
+    lines = ["\\set ON_ERROR_STOP 1", "BEGIN;"]
+    for table, filename, columns, pk in VIEW_TABLES:
+        stage = f"stage_{table}"
+        path = os.path.abspath(os.path.join(views_dir, filename)).replace("'", "''")
+        match = " AND ".join(f"t.{c} = s.{c}" for c in pk)
+        lines.append(f"CREATE TEMP TABLE {stage} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP;")
+        lines.append(f"\\copy {stage}({columns}) FROM '{path}' CSV HEADER")
+        lines.append(f"DELETE FROM {table} t USING {stage} s WHERE {match};")
+        lines.append(f"INSERT INTO {table}({columns}) SELECT {columns} FROM {stage};")
+    lines.append("COMMIT;")
+    return "\n".join(lines) + "\n"
+
+
+def parse_embedded_count(stdout: str) -> int:
+    m = re.search(r"Done\. Embedded (\d+) document", stdout or "")
+    return int(m.group(1)) if m else 0
+
+
+def default_runner(cmd: list[str], *, cwd: str) -> subprocess.CompletedProcess:
+    return subprocess.run(cmd, cwd=cwd, check=False, capture_output=True, text=True)
+
+
+class StageError(RuntimeError):
+    pass
+
+
+class Orchestrator:
+    def __init__(self, queue: WorkQueue, args: argparse.Namespace, *, repo_root: str, runner=default_runner) -> None:
+        self.queue = queue
+        self.args = args
+        self.repo_root = repo_root
+        self.runner = runner
+        self._print_lock = threading.Lock()
+
+    def log(self, msg: str) -> None:
+        with self._print_lock:
+            print(msg, flush=True)
+
+    def _run(self, cmd: list[str]) -> subprocess.CompletedProcess:
+        proc = self.runner(cmd, cwd=self.repo_root)
+        if proc.returncode != 0:
+            tail = ((proc.stderr or "") or (proc.stdout or ""))[-1500:]
+            raise StageError(f"Command failed ({proc.returncode}): {' '.join(cmd[:3])} ...\n{tail}")
+        return proc
+
+    def _script(self, name: str) -> str:
+        return os.path.join(self.repo_root, "scripts", name)
+
+    def _psql_base(self) -> list[str]:
+        return [find_psql(), "-v", "ON_ERROR_STOP=1", "-U", self.args.db_user, "-p", str(self.args.port), "-d", self.args.db_name]
+
+    def run_stage(self, job: dict) -> tuple[str, str]:
+        """Run one stage; returns (status, note) where status is 'done', 'skipped' or 'deferred'."""
+        stage = job["stage"]
+        owner, name = job["repo"].split("/", 1)
+        run_dir = job["run_dir"]
+        if not os.path.isabs(run_dir):
+            run_dir = os.path.join(self.repo_root, run_dir)
+        ingest = [
+            sys.executable,
+            self._script("github_raw_ingest_closedat.py"),
+            "--owner",
+            owner,
+            "--repo",
+            name,
+            "--start",
+            job["window_start"],
+            "--end",
+            job["window_end"],
+            "--out",
+            run_dir,
+            "--raw-store",
+            self.args.raw_store,
+        ]
+        views_dir = os.path.join(run_dir, "out_views")
+
+        if stage == "discover":
+            self._run(ingest + ["--no-hydrate"])
+            return "done", ""
+        if stage == "hydrate":
+            self._run(ingest + ["--reuse-discovery"])
+            return "done", ""
+        if stage == "export":
+            self._run(
+                [
+                    sys.executable,
+                    self._script("export_repo_work_item_views.py"),
+                    "--raw-http-dir",
+                    os.path.join(run_dir, "raw_http"),
+                    "--out-dir",
+                    views_dir,
+                ]
+            )
+            return "done", ""
+        if stage == "kb":
+            self._run(self._psql_base() + ["-f", os.path.join(self.repo_root, "sql", "001_schema.sql")])
+            with tempfile.NamedTemporaryFile(mode="w", encoding="utf-8", delete=False, suffix=".psql") as f:
+                path = f.name
+                f.write(build_view_load_script(views_dir))
+            try:
+                self._run(self._psql_base() + ["-f", path])
+            finally:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            self._run(self._psql_base() + ["-f", os.path.join(self.repo_root, "sql", "003_build_kb_documents.sql")])
+            return "done", ""
+        if stage == "embed":
+            reserved = self.queue.reserve_embed_budget()
+            if reserved == 0:
+                remaining, held = self.queue.embed_budget_state()
+                if remaining or held:
+                    # Another embed job holds the budget and may hand some of it back; try again later.
+                    return "deferred", "waiting for embedding budget"
+                return "skipped", "embedding budget exhausted"
+            cmd = [
+                sys.executable,
+                self._script("embed_kb_documents_openai.py"),
+                "--db-name",
+                self.args.db_name,
+                "--db-user",
+                self.args.db_user,
+                "--port",
+                str(self.args.port),
+                "--model",
+                self.args.embed_model,
+                "--dimensions",
+                str(self.args.embed_dimensions),
+                "--repo-full-name",
+                job["repo"],
+                "--metrics-out",
+                os.path.join(run_dir, "embed_metrics.json"),
+            ]
+            if reserved is not None:
+                cmd += ["--max-docs", str(reserved)]
+            used = 0
+            try:
+                proc = self._run(cmd)
+                used = parse_embedded_count(proc.stdout)
+            finally:
+                if reserved is not None:
+                    self.queue.refund_embed_budget(reserved - used, reserved=reserved)
+            return "done", f"embedded={used}"
+        raise StageError(f"Unknown stage: {stage}")
+
+    def process(self, job: dict) -> None:
+        label = f"[{job['repo']} {job['window_start']}..{job['window_end']} {job['stage']}#{job['attempts']}]"
+        t0 = time.time()
+        try:
+            status, note = self.run_stage(job)
+        except Exception as e:
+            delay = backoff_seconds(job["attempts"], base=self.args.backoff_seconds, cap=self.args.max_backoff_seconds)
+            outcome = self.queue.fail(job, str(e), max_attempts=self.args.max_attempts, delay_s=delay)
+            if outcome == "failed":
+                self.log(f"{label} failed permanently: {str(e).splitlines()[0]}")
+            else:
+                self.log(f"{label} error, retry in {delay:.0f}s: {str(e).splitlines()[0]}")
+            return
+        if status == "deferred":
+            self.queue.defer(job, delay_s=max(0.01, self.args.poll_seconds), note=note)
+            return
+        next_stage = next_stage_after(job["stage"], self.args.last_stage) if status == "done" else None
+        self.queue.complete(job, next_stage=next_stage, status=status, note=note)
+        self.log(f"{label} {status} in {time.time() - t0:.1f}s" + (f" ({note})" if note else ""))
+
+    def enabled_stages(self) -> list[str]:
+        return STAGES[: STAGES.index(self.args.last_stage) + 1]
+
+    def worker(self, stages: list[str]) -> None:
+        while True:
+            job = self.queue.claim(stages)
+            if job is not None:
+                self.process(job)
+                continue
+            # Upstream pools may still produce work for this pool, so only exit once nothing is open anywhere.
+            if not self.queue.has_open_jobs(self.enabled_stages()):
+                return
+            time.sleep(max(0.01, self.args.poll_seconds))
+
+    def run(self) -> None:
+        pools: dict[str, list[str]] = {}
+        for stage in self.enabled_stages():
+            pools.setdefault(STAGE_POOL[stage], []).append(stage)
+        sizes = {
+            "github": self.args.github_workers,
+            "export": self.args.export_workers,
+            "kb": self.args.kb_workers,
+            "embed": self.args.embed_workers,
+        }
+        threads: list[threading.Thread] = []
+        for pool, stages in pools.items():
+            for i in range(max(1, int(sizes.get(pool) or 1))):
+                t = threading.Thread(target=self.worker, args=(stages,), name=f"{pool}-{i}", daemon=True)
+                t.start()
+                threads.append(t)
+        for t in threads:
+            t.join()
+
+
+def print_status(queue: WorkQueue) -> None:
+    progress = queue.progress()
+    if not progress:
+        print("Queue is empty.")
+        return
+    for repo, info in progress.items():
+        counts = " ".join(f"{k}={v}" for k, v in sorted(info["counts"].items()))
+        print(f"{repo}: {counts}")
+        for window, w in info["windows"].items():
+            line = f"  {window}: {w['stage']} {w['status']} (attempts={w['attempts']})"
+            if w["status"] in ("failed", "pending") and w["last_error"]:
+                line += f" last_error={w['last_error'].splitlines()[0][:120]}"
+            print(line)
+    budget = queue.get_meta(EMBED_BUDGET_KEY, "")
+    print(f"embedding budget remaining: {budget if budget else 'unlimited'}")
+
+
+def main() -> int:
+    args = parse_args()
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    queue_path = args.queue if os.path.isabs(args.queue) else os.path.join(repo_root, args.queue)
+    queue = WorkQueue(queue_path)
+
+    if args.status:
+        print_status(queue)
+        return 0
+
+    try:
+        repos = load_repos(args.repos, args.repos_file)
+    except (OSError, ValueError) as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    if repos:
+        if not args.start or not args.end:
+            print("--start and --end are required when enqueuing repos.", file=sys.stderr)
+            return 2
+        try:
+            windows = split_windows(args.start, args.end, args.window_days)
+        except ValueError as e:
+            print(str(e), file=sys.stderr)
+            return 2
+        added = 0
+        for repo in repos:
+            for w_start, w_end in windows:
+                run_dir = run_dir_for(args.raw_root, repo, w_start, w_end)
+                added += int(queue.enqueue(repo, w_start, w_end, stage=STAGES[0], run_dir=run_dir))
+        print(f"Enqueued {added} new window(s) across {len(repos)} repo(s).")
+
+    if args.embed_max_docs >= 0:
+        if args.embed_max_docs == 0:
+            queue.delete_meta(EMBED_BUDGET_KEY)
+        else:
+            queue.set_meta(EMBED_BUDGET_KEY, str(args.embed_max_docs))
+
+    if args.enqueue_only:
+        return 0
+
+    reset = queue.reset_running()
+    if reset:
+        print(f"Re-queued {reset} job(s) left running by an earlier run.")
+
+    Orchestrator(queue, args, repo_root=repo_root).run()
+    print_status(queue)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import zlib
+
+
+# Packed raw_http storage: one SQLite file per raw_http dir acting as packfile + index.
+# Response bodies are zlib-compressed and stored once per content hash; each attempt keeps
+# only a small compressed envelope (request, status, headers, meta) pointing at its body.
+STORE_FILENAME = "raw_store.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+  sha256 TEXT PRIMARY KEY,
+  raw_size INTEGER NOT NULL,
+  data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  tag TEXT NOT NULL,
+  name TEXT NOT NULL,
+  status INTEGER NOT NULL,
+  envelope BLOB NOT NULL,
+  body_sha256 TEXT NOT NULL REFERENCES blobs(sha256),
+  UNIQUE (tag, name)
+);
+CREATE INDEX IF NOT EXISTS idx_records_tag ON records (tag);
+"""
+
+
+def store_path(raw_http_dir: str) -> str:
+    return os.path.join(raw_http_dir, STORE_FILENAME)
+
+
+def record_name(record: dict) -> str:
+    meta = record.get("meta") or {}
+    return f"{meta.get('request_fingerprint') or ''}_a{int(meta.get('attempt') or 0)}"
+
+
+def canonical_json(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+# GraphQL `rateLimit { cost remaining resetAt }` differs on every call, so it lives in the
+# envelope instead of the body; otherwise no two GraphQL pages would ever share a blob.
+RATE_LIMIT_KEY = "graphql_rate_limit"
+
+
+def split_rate_limit(body):
+    """(body without data.rateLimit, the rateLimit object or None)."""
+    data = body.get("data") if isinstance(body, dict) else None
+    if not isinstance(data, dict) or "rateLimit" not in data:
+        return body, None
+    data = dict(data)
+    rate_limit = data.pop("rateLimit")
+    return {**body, "data": data}, rate_limit
+
+
+def join_rate_limit(body, rate_limit):
+    if rate_limit is None or not isinstance(body, dict):
+        return body
+    return {**body, "data": {**(body.get("data") or {}), "rateLimit": rate_limit}}
+
+
+class RawStore:
+    def __init__(self, raw_http_dir: str, *, level: int = 6) -> None:
+        os.makedirs(raw_http_dir, exist_ok=True)
+        self.raw_http_dir = raw_http_dir
+        self.level = level
+        self.conn = sqlite3.connect(store_path(raw_http_dir))
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "RawStore":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+    def put(self, record: dict) -> bool:
+        """Store one raw record; returns True if its response body was not stored before."""
+        resp = dict(record.get("response") or {})
+        body_obj, rate_limit = split_rate_limit(resp.pop("json", None))
+        if rate_limit is not None:
+            resp[RATE_LIMIT_KEY] = rate_limit
+        body = canonical_json(body_obj)
+        body_sha = hashlib.sha256(body).hexdigest()
+        envelope = dict(record)
+        envelope["response"] = resp
+        tag = str((record.get("meta") or {}).get("tag") or "")
+
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT OR IGNORE INTO blobs(sha256, raw_size, data) VALUES (?, ?, ?)",
+                (body_sha, len(body), zlib.compress(body, self.level)),
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO records(tag, name, status, envelope, body_sha256) VALUES (?, ?, ?, ?, ?)",
+                (
+                    tag,
+                    record_name(record),
+                    int(resp.get("status") or 0),
+                    zlib.compress(canonical_json(envelope), self.level),
+                    body_sha,
+                ),
+            )
+        return cur.rowcount > 0
+
+    def has(self, tag: str, name: str) -> bool:
+        row = self.conn.execute("SELECT 1 FROM records WHERE tag = ? AND name = ?", (tag, name)).fetchone()
+        return row is not None
+
+    def iter_records(self, *, ok_only: bool = False, tag_prefix: str = ""):
+        sql = "SELECT r.envelope, r.body_sha256, b.data FROM records r JOIN blobs b ON b.sha256 = r.body_sha256"
+        where = []
+        params: list = []
+        if ok_only:
+            where.append("r.status BETWEEN 200 AND 299")
+        if tag_prefix:
+            where.append("substr(r.tag, 1, ?) = ?")
+            params.extend([len(tag_prefix), tag_prefix])
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY r.id"
+        # Retries of one request usually share a body; skip re-decoding consecutive duplicates.
+        last_sha = None
+        body = None
+        for envelope_z, body_sha, data_z in self.conn.execute(sql, params):
+            record = json.loads(zlib.decompress(envelope_z))
+            if body_sha != last_sha:
+                body = json.loads(zlib.decompress(data_z))
+                last_sha = body_sha
+            resp = record.setdefault("response", {})
+            resp["json"] = join_rate_limit(body, resp.pop(RATE_LIMIT_KEY, None))
+            yield record
+
+    def stats(self) -> dict:
+        records, = self.conn.execute("SELECT count(*) FROM records").fetchone()
+        blobs, raw_size, packed_size = self.conn.execute(
+            "SELECT count(*), coalesce(sum(raw_size), 0), coalesce(sum(length(data)), 0) FROM blobs"
+        ).fetchone()
+        return {"records": records, "unique_bodies": blobs, "body_bytes_raw": raw_size, "body_bytes_packed": packed_size}
+
+
+def iter_json_files(raw_http_dir: str):
+    # Sorted walk so legacy files and the packed store (filled in this order) iterate identically.
+    for root, dirs, files in os.walk(raw_http_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if not name.endswith(".json"):
+                continue
+            yield os.path.join(root, name)
+
+
+def load_json(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def iter_raw_records(raw_http_dir: str, *, ok_only: bool = False):
+    """Yield raw records from legacy per-attempt *.json files and from the packed store, if present.
+
+    A record present in both places (packed without --delete-json) is yielded once.
+    """
+    seen: set[tuple[str, str]] = set()
+    for path in iter_json_files(raw_http_dir):
+        try:
+            record = load_json(path)
+        except Exception:
+            continue
+        seen.add((str((record.get("meta") or {}).get("tag") or ""), record_name(record)))
+        if ok_only and not (200 <= int((record.get("response") or {}).get("status") or 0) < 300):
+            continue
+        yield record
+    if os.path.isfile(store_path(raw_http_dir)):
+        with RawStore(raw_http_dir) as store:
+            for record in store.iter_records(ok_only=ok_only):
+                if seen and (str((record.get("meta") or {}).get("tag") or ""), record_name(record)) in seen:
+                    continue
+                yield record
+
+
+def pack_raw_http(raw_http_dir: str, *, delete_json: bool = False) -> dict:
+    """Move legacy per-attempt *.json files into the packed store."""
+    packed = 0
+    skipped = 0
+    with RawStore(raw_http_dir) as store:
+        for path in iter_json_files(raw_http_dir):
+            try:
+                record = load_json(path)
+            except Exception:
+                skipped += 1
+                continue
+            if not isinstance(record.get("meta"), dict):
+                skipped += 1
+                continue
+            store.put(record)
+            packed += 1
+            if delete_json:
+                os.unlink(path)
+        if delete_json:
+            # Remove the now-empty per-tag directories.
+            for root, dirs, files in os.walk(raw_http_dir, topdown=False):
+                if root != raw_http_dir and not dirs and not files:
+                    try:
+                        os.rmdir(root)
+                    except OSError:
+                        pass
+        stats = store.stats()
+    stats.update({"packed_files": packed, "skipped_files": skipped})
+    return stats
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Pack raw_http/**.json into a deduplicated, compressed raw store.")
+    p.add_argument("--raw-http-dir", required=True, help="Path to raw_http directory (contains tag/ subdirs with *.json).")
+    p.add_argument("--delete-json", action="store_true", help="Delete the *.json files once packed.")
+    p.add_argument("--stats", action="store_true", help="Only print stats for an existing store.")
+    return p.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if not os.path.isdir(args.raw_http_dir):
+        print(f"raw_http dir not found: {args.raw_http_dir}", file=sys.stderr)
+        return 2
+    if args.stats:
+        with RawStore(args.raw_http_dir) as store:
+            stats = store.stats()
+    else:
+        stats = pack_raw_http(args.raw_http_dir, delete_json=args.delete_json)
+    print(json.dumps(stats, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,63 @@
+import unittest
+
+
+from scripts.export_code_ownership_csv import collect_pull_requests, ownership_rows
+
+REPO_VARS = {"owner": "openai", "name": "openai-agents-python", "number": 7}
+
+
+def graphql_record(tag: str, data: dict) -> dict:
+    return {
+        "meta": {"tag": tag},
+        "request": {"url": "https://api.github.com/graphql", "body": {"variables": dict(REPO_VARS)}},
+        "response": {"status": 200, "json": {"data": {"repository": data}}},
+    }
+
+
+class TestExportCodeOwnershipCsv(unittest.TestCase):
+    def test_rows_join_files_author_and_reviewers(self) -> None:
+        records = [
+            graphql_record(
+                "graphql_core_item7",
+                {
+                    "issueOrPullRequest": {
+                        "__typename": "PullRequest",
+                        "author": {"login": "alice"},
+                        "createdAt": "2026-01-01T00:00:00Z",
+                        "mergedAt": "2026-01-03T00:00:00Z",
+                    }
+                },
+            ),
+            graphql_record("graphql_files_pr7_p1", {"pullRequest": {"files": {"nodes": [{"path": "src/agents/run.py"}]}}}),
+            {
+                "meta": {"tag": "rest_pr_files_pr7_page1"},
+                "request": {"url": "https://api.github.com/repos/openai/openai-agents-python/pulls/7/files?page=1"},
+                "response": {"status": 200, "json": [{"filename": "src/agents/run.py"}, {"filename": "tests/test_run.py"}]},
+            },
+            graphql_record(
+                "graphql_reviews_pr7_p1",
+                {
+                    "pullRequest": {
+                        "reviews": {
+                            "nodes": [
+                                {"author": {"login": "bob"}, "submittedAt": "2026-01-02T00:00:00Z"},
+                                {"author": {"login": "bob"}, "submittedAt": "2026-01-02T12:00:00Z"},
+                                {"author": {"login": "alice"}, "submittedAt": "2026-01-02T13:00:00Z"},
+                            ]
+                        }
+                    }
+                },
+            ),
+        ]
+        rows = ownership_rows(collect_pull_requests(records))
+        url = "https://github.com/openai/openai-agents-python/pull/7"
+        repo = "openai/openai-agents-python"
+        self.assertEqual(
+            rows,
+            [
+                (repo, "@alice", "author", "src/agents/run.py", "2026-01-03T00:00:00Z", url),
+                (repo, "@bob", "reviewer", "src/agents/run.py", "2026-01-02T12:00:00Z", url),
+                (repo, "@alice", "author", "tests/test_run.py", "2026-01-03T00:00:00Z", url),
+                (repo, "@bob", "reviewer", "tests/test_run.py", "2026-01-02T12:00:00Z", url),
+            ],
+        )
@@ -0,0 +1,84 @@
+import json
+import os
+import tempfile
+import unittest
+
+
+import scripts.github_raw_ingest_closedat as ingest
+from scripts.raw_store import iter_raw_records
+
+
+def write_record(raw_http_dir: str, tag: str, fp: str) -> None:
+    d = os.path.join(raw_http_dir, tag)
+    os.makedirs(d, exist_ok=True)
+    record = {
+        "request": {},
+        "response": {"status": 200, "headers": {}, "json": {"data": {"tag": tag}}},
+        "meta": {"tag": tag, "request_fingerprint": fp, "attempt": 1},
+    }
+    with open(os.path.join(d, f"{fp}_a1.json"), "w", encoding="utf-8") as f:
+        json.dump(record, f)
+
+
+class TestHydrationIndex(unittest.TestCase):
+    def tearDown(self) -> None:
+        ingest.RAW_STORE_MODE = "files"
+        ingest._raw_stores.clear()
+
+    def test_fingerprint_uses_updated_at_and_counts(self) -> None:
+        core = {
+            "data": {
+                "repository": {
+                    "issueOrPullRequest": {
+                        "__typename": "PullRequest",
+                        "updatedAt": "2026-01-10T00:00:00Z",
+                        "comments": {"totalCount": 3},
+                        "reviews": {"totalCount": 1},
+                        "files": {"totalCount": 2},
+                        "timelineItems": {"totalCount": 9},
+                    }
+                }
+            }
+        }
+        fp = ingest.item_fingerprint(core)
+        self.assertEqual(fp["updated_at"], "2026-01-10T00:00:00Z")
+        self.assertEqual(fp["counts"], {"comments": 3, "timelineItems": 9, "reviews": 1, "files": 2})
+        self.assertIsNone(ingest.item_fingerprint({"data": {"repository": {"issueOrPullRequest": None}}}))
+
+    def test_copy_item_records_only_copies_that_item(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, "old", "raw_http")
+            write_record(src, "graphql_comments_item1_pabcd1234", "aaaa")
+            write_record(src, "rest_pr_files_pr1_page1", "bbbb")
+            write_record(src, "graphql_comments_item12_pabcd1234", "cccc")
+            write_record(src, "graphql_core_item1", "dddd")
+
+            out_dir = os.path.join(tmp, "new")
+            self.assertEqual(ingest.copy_item_records(src, out_dir, 1), 2)
+            self.assertEqual(
+                sorted(os.listdir(os.path.join(out_dir, "raw_http"))),
+                ["graphql_comments_item1_pabcd1234", "rest_pr_files_pr1_page1"],
+            )
+            self.assertEqual(ingest.copy_item_records(src, out_dir, 7), 0)
+
+            ingest.RAW_STORE_MODE = "packed"
+            packed_out = os.path.join(tmp, "packed")
+            self.assertEqual(ingest.copy_item_records(src, packed_out, 12), 1)
+            ingest._raw_stores.clear()
+            tags = [r["meta"]["tag"] for r in iter_raw_records(os.path.join(packed_out, "raw_http"))]
+            self.assertEqual(tags, ["graphql_comments_item12_pabcd1234"])
+
+            # And back out of a packed store into files.
+            ingest.RAW_STORE_MODE = "files"
+            self.assertEqual(ingest.copy_item_records(os.path.join(packed_out, "raw_http"), os.path.join(tmp, "again"), 12), 1)
+
+    def test_save_item_index_merges_with_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "hydration_index.json")
+            ingest.save_item_index(path, {"1": {"updated_at": "a"}})
+            ingest.save_item_index(path, {"2": {"updated_at": "b"}})
+            self.assertEqual(sorted(ingest.load_item_index(path)), ["1", "2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
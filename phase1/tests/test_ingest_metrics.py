@@ -0,0 +1,51 @@
+import json
+import os
+import tempfile
+import unittest
+
+
+from scripts.github_raw_ingest_closedat import stage_for_tag
+from scripts.ingest_metrics import RunMetrics, render_prometheus
+
+
+class TestIngestMetrics(unittest.TestCase):
+    def test_stage_for_tag(self) -> None:
+        self.assertEqual(stage_for_tag("discovery_pr_page3"), "discovery_pr")
+        self.assertEqual(stage_for_tag("graphql_comments_item12_pabcd1234"), "graphql_comments")
+        self.assertEqual(stage_for_tag("rest_pr_files_pr7_page1"), "rest_pr_files")
+        self.assertEqual(stage_for_tag("something_else"), "other")
+
+    def test_snapshot_and_prometheus(self) -> None:
+        m = RunMetrics("github_raw_ingest")
+        m.observe_request("graphql_core", status=200, latency_s=0.3, bytes_sent=100, bytes_received=2000)
+        m.observe_request("graphql_core", status=502, latency_s=12.0, bytes_sent=100, bytes_received=10)
+        m.count_retry("graphql_core", "http_5xx")
+        m.add_sleep("graphql_core", "backoff", 1.5)
+        m.incr("graphql_cost", 1)
+        m.incr("graphql_cost", 1)
+        m.set_gauge("graphql_ratelimit_remaining", 4998)
+
+        snap = m.to_dict()
+        st = snap["stages"]["graphql_core"]
+        self.assertEqual(st["requests"], 2)
+        self.assertEqual(st["responses_by_status"], {"200": 1, "502": 1})
+        self.assertEqual(st["bytes_received"], 2010)
+        self.assertEqual(sum(st["latency_buckets"]), 2)
+        self.assertEqual(st["latency_buckets"][3], 1)  # 0.25 < 0.3 <= 0.5
+        self.assertEqual(snap["counters"]["graphql_cost"], 2)
+
+        text = render_prometheus(snap, labels={"repo": "openai/openai-agents-python"})
+        self.assertIn('prism_ingest_retries_total{cause="http_5xx",job_name="github_raw_ingest",repo="openai/openai-agents-python",stage="graphql_core"} 1', text)
+        self.assertIn('le="+Inf",repo="openai/openai-agents-python",stage="graphql_core"} 2', text)
+        self.assertIn('le="0.5",repo="openai/openai-agents-python",stage="graphql_core"} 1', text)
+        self.assertIn("prism_ingest_graphql_cost_total", text)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.json")
+            m.write_json(path)
+            with open(path, "r", encoding="utf-8") as f:
+                self.assertEqual(json.load(f)["stages"]["graphql_core"]["retries_by_cause"], {"http_5xx": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
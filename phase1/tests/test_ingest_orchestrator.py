@@ -0,0 +1,172 @@
+import argparse
+import os
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+
+
+from scripts.ingest_orchestrator import (
+    STAGES,
+    Orchestrator,
+    WorkQueue,
+    build_view_load_script,
+    next_stage_after,
+    parse_embedded_count,
+    run_dir_for,
+    split_windows,
+)
+
+
+def make_args(**overrides) -> argparse.Namespace:
+    base = dict(
+        last_stage="export",
+        raw_store="files",
+        github_workers=2,
+        export_workers=1,
+        kb_workers=1,
+        embed_workers=1,
+        max_attempts=2,
+        backoff_seconds=0.0,
+        max_backoff_seconds=0.0,
+        poll_seconds=0.01,
+        db_name="prism_phase1",
+        db_user="postgres",
+        port=5432,
+        embed_model="text-embedding-3-large",
+        embed_dimensions=3072,
+    )
+    base.update(overrides)
+    return argparse.Namespace(**base)
+
+
+class TestIngestOrchestrator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.queue = WorkQueue(os.path.join(self.tmp.name, "queue.sqlite"))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def enqueue(self, repo: str, start: str, end: str) -> None:
+        self.queue.enqueue(repo, start, end, stage=STAGES[0], run_dir=run_dir_for(self.tmp.name, repo, start, end))
+
+    def test_split_windows_is_inclusive_and_non_overlapping(self) -> None:
+        self.assertEqual(
+            split_windows("2026-01-01", "2026-01-20", 7),
+            [("2026-01-01", "2026-01-07"), ("2026-01-08", "2026-01-14"), ("2026-01-15", "2026-01-20")],
+        )
+        self.assertEqual(split_windows("2026-01-05", "2026-01-05", 14), [("2026-01-05", "2026-01-05")])
+        with self.assertRaises(ValueError):
+            split_windows("2026-01-05", "2026-01-01", 7)
+
+    def test_enqueue_is_idempotent(self) -> None:
+        self.assertTrue(self.queue.enqueue("a/b", "2026-01-01", "2026-01-07", stage="discover", run_dir="x"))
+        self.assertFalse(self.queue.enqueue("a/b", "2026-01-01", "2026-01-07", stage="discover", run_dir="x"))
+
+    def test_claim_respects_stage_and_backoff(self) -> None:
+        self.enqueue("a/b", "2026-01-01", "2026-01-07")
+        self.assertIsNone(self.queue.claim(["export"]))
+        job = self.queue.claim(["discover"], now=100.0)
+        self.assertIsNotNone(job)
+        self.assertEqual(job["attempts"], 1)
+        self.assertIsNone(self.queue.claim(["discover"], now=100.0))
+
+        status = self.queue.fail(job, "boom", max_attempts=3, delay_s=50.0, now=100.0)
+        self.assertEqual(status, "pending")
+        self.assertIsNone(self.queue.claim(["discover"], now=120.0))
+        job = self.queue.claim(["discover"], now=151.0)
+        self.assertEqual(job["attempts"], 2)
+
+        job = dict(job, attempts=3)
+        self.assertEqual(self.queue.fail(job, "boom", max_attempts=3, delay_s=0.0), "failed")
+        self.assertFalse(self.queue.has_open_jobs())
+
+    def test_stages_chain_per_repo_window(self) -> None:
+        self.assertEqual(next_stage_after("discover", "embed"), "hydrate")
+        self.assertIsNone(next_stage_after("export", "export"))
+
+        calls = []
+        lock = threading.Lock()
+
+        def runner(cmd, *, cwd):
+            with lock:
+                calls.append(cmd)
+            return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+
+        for repo in ("a/one", "b/two"):
+            for start, end in split_windows("2026-01-01", "2026-01-14", 7):
+                self.enqueue(repo, start, end)
+
+        Orchestrator(self.queue, make_args(), repo_root=self.tmp.name, runner=runner).run()
+
+        progress = self.queue.progress()
+        self.assertEqual(set(progress), {"a/one", "b/two"})
+        for info in progress.values():
+            self.assertEqual(info["counts"], {"done": 6})
+            for w in info["windows"].values():
+                self.assertEqual((w["stage"], w["status"]), ("export", "done"))
+
+        hydrate_calls = [c for c in calls if "--reuse-discovery" in c]
+        self.assertEqual(len(hydrate_calls), 4)
+        self.assertEqual(len([c for c in calls if "--no-hydrate" in c]), 4)
+
+    def test_failed_stage_retries_then_gives_up(self) -> None:
+        self.enqueue("a/b", "2026-01-01", "2026-01-07")
+
+        def runner(cmd, *, cwd):
+            if "--reuse-discovery" in cmd:
+                return subprocess.CompletedProcess(cmd, 1, stdout="", stderr="HTTP 502")
+            return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+
+        Orchestrator(self.queue, make_args(), repo_root=self.tmp.name, runner=runner).run()
+        w = self.queue.progress()["a/b"]["windows"]["2026-01-01..2026-01-07"]
+        self.assertEqual((w["stage"], w["status"], w["attempts"]), ("hydrate", "failed", 2))
+        self.assertIn("HTTP 502", w["last_error"])
+
+    def test_embed_budget_is_shared(self) -> None:
+        self.assertEqual(parse_embedded_count("Embedded 3 docs (total=3)\nDone. Embedded 3 document(s) into kb_embedding"), 3)
+        self.assertIsNone(self.queue.reserve_embed_budget())
+        self.queue.set_meta("embed_budget_remaining", "10")
+        self.assertEqual(self.queue.reserve_embed_budget(), 10)
+        self.assertEqual(self.queue.reserve_embed_budget(), 0)
+        self.assertEqual(self.queue.embed_budget_state(), (0, 10))
+        self.queue.refund_embed_budget(4, reserved=10)
+        self.assertEqual(self.queue.get_meta("embed_budget_remaining"), "4")
+        self.assertEqual(self.queue.embed_budget_state(), (4, 0))
+
+    def test_concurrent_embed_jobs_wait_for_held_budget(self) -> None:
+        self.queue.set_meta("embed_budget_remaining", "10")
+        for repo in ("a/one", "b/two"):
+            self.queue.enqueue(repo, "2026-01-01", "2026-01-07", stage="embed", run_dir=run_dir_for(self.tmp.name, repo, "2026-01-01", "2026-01-07"))
+        started = threading.Event()
+        limits = []
+
+        def runner(cmd, *, cwd):
+            limit = int(cmd[cmd.index("--max-docs") + 1])
+            limits.append(limit)
+            if not started.is_set():
+                started.set()
+                time.sleep(0.3)  # hold the whole budget while the second worker claims its job
+            embedded = min(limit, 3)
+            return subprocess.CompletedProcess(cmd, 0, stdout=f"Done. Embedded {embedded} document(s) into kb_embedding", stderr="")
+
+        Orchestrator(self.queue, make_args(last_stage="embed", embed_workers=2), repo_root=self.tmp.name, runner=runner).run()
+
+        for repo in ("a/one", "b/two"):
+            w = self.queue.progress()[repo]["windows"]["2026-01-01..2026-01-07"]
+            self.assertEqual((w["stage"], w["status"], w["attempts"]), ("embed", "done", 1))
+            self.assertEqual(w["last_error"], "embedded=3")
+        self.assertEqual(limits, [10, 7])
+        self.assertEqual(self.queue.embed_budget_state(), (4, 0))
+
+    def test_view_load_script_replaces_rows_by_primary_key(self) -> None:
+        script = build_view_load_script("/tmp/views")
+        self.assertNotIn("TRUNCATE", script)
+        self.assertIn("DELETE FROM repo_pr_review t USING stage_repo_pr_review s", script)
+        self.assertIn("\\copy stage_repo_work_item(", script)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+import unittest
+
+
+from scripts.raw_store import RawStore, iter_raw_records, pack_raw_http
+
+
+def make_record(tag: str, fp: str, attempt: int, status: int, body) -> dict:
+    return {
+        "started_at": "2026-01-01T00:00:00Z",
+        "finished_at": "2026-01-01T00:00:01Z",
+        "request": {"method": "POST", "url": "https://api.github.com/graphql", "headers": {}, "body": {"q": fp}},
+        "response": {"status": status, "headers": {"x-ratelimit-remaining": "4999"}, "json": body},
+        "meta": {"tag": tag, "request_fingerprint": fp, "attempt": attempt},
+    }
+
+
+def write_legacy(raw_http_dir: str, record: dict) -> None:
+    meta = record["meta"]
+    d = os.path.join(raw_http_dir, meta["tag"])
+    os.makedirs(d, exist_ok=True)
+    with open(os.path.join(d, f"{meta['request_fingerprint']}_a{meta['attempt']}.json"), "w", encoding="utf-8") as f:
+        json.dump(record, f, indent=2, sort_keys=True)
+
+
+class TestRawStore(unittest.TestCase):
+    def test_put_deduplicates_identical_bodies(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with RawStore(tmp) as store:
+                self.assertTrue(store.put(make_record("graphql_core_item1", "aaaa", 1, 502, {"message": "Bad Gateway"})))
+                self.assertFalse(store.put(make_record("graphql_core_item2", "bbbb", 1, 502, {"message": "Bad Gateway"})))
+                self.assertTrue(store.put(make_record("graphql_core_item1", "aaaa", 2, 200, {"data": {"n": 1}})))
+                stats = store.stats()
+                self.assertEqual((stats["records"], stats["unique_bodies"]), (3, 2))
+                ok = list(store.iter_records(ok_only=True))
+                self.assertEqual([r["response"]["json"] for r in ok], [{"data": {"n": 1}}])
+                self.assertEqual([r["meta"]["tag"] for r in store.iter_records(tag_prefix="graphql_core_item2")], ["graphql_core_item2"])
+
+    def test_graphql_rate_limit_does_not_defeat_dedup(self) -> None:
+        page = {"repository": {"issue": {"number": 7, "title": "Same page"}}}
+        with tempfile.TemporaryDirectory() as tmp:
+            with RawStore(tmp) as store:
+                first = {"data": {**page, "rateLimit": {"cost": 1, "remaining": 4990, "resetAt": "2026-01-01T01:00:00Z"}}}
+                second = {"data": {**page, "rateLimit": {"cost": 1, "remaining": 4989, "resetAt": "2026-01-01T01:00:00Z"}}}
+                self.assertTrue(store.put(make_record("graphql_core_item7", "aaaa", 1, 200, first)))
+                self.assertFalse(store.put(make_record("graphql_core_item7", "bbbb", 1, 200, second)))
+                self.assertEqual(store.stats()["unique_bodies"], 1)
+                # Each record still reads back with its own rateLimit.
+                self.assertEqual([r["response"]["json"] for r in store.iter_records()], [first, second])
+
+    def test_pack_round_trips_legacy_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            records = [
+                make_record("discovery_pr_page1", "1111", 1, 200, {"items": [{"number": 1}]}),
+                make_record("graphql_core_item1", "2222", 1, 200, {"data": {"repository": {}}}),
+            ]
+            for r in records:
+                write_legacy(tmp, r)
+            before = list(iter_raw_records(tmp))
+
+            stats = pack_raw_http(tmp)
+            self.assertEqual(stats["packed_files"], 2)
+            # Packed without deleting: each record is still yielded once.
+            self.assertEqual(list(iter_raw_records(tmp)), before)
+
+            pack_raw_http(tmp, delete_json=True)
+            self.assertEqual(sorted(os.listdir(tmp)), ["raw_store.sqlite"])
+            self.assertEqual(list(iter_raw_records(tmp)), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
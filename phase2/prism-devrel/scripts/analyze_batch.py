@@ -0,0 +1,106 @@
+"""Triage a file of issues and write one NDJSON line per issue as results arrive.
+
+Input is a JSON array or JSONL of issues, either GitHub API issue objects or
+`{"number", "title", "body", "labels"}` dicts.
+
+    python scripts/analyze_batch.py --input issues.jsonl --out triage.ndjson --concurrency 16
+    python scripts/analyze_batch.py --input issues.jsonl --mode batch   # OpenAI Batch API
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from tests.helpers.dotenv import load_dotenv  # noqa: E402
+
+load_dotenv(
+    PROJECT_ROOT.parent.parent / ".env",
+    PROJECT_ROOT.parent / ".env",
+    PROJECT_ROOT / ".env",
+)
+
+from devrel.agents.triage_batch import analyze_issues_stream  # noqa: E402
+from devrel.agents.types import Issue  # noqa: E402
+from devrel.llm.batch import OpenAIBatchRunner  # noqa: E402
+from devrel.llm.client import AsyncLlmClient  # noqa: E402
+
+
+def issue_from_json(payload: dict[str, Any]) -> Issue:
+    labels = []
+    for label in payload.get("labels", []) or []:
+        name = label.get("name", "") if isinstance(label, dict) else str(label)
+        if name:
+            labels.append(name)
+    return Issue(
+        number=int(payload["number"]),
+        title=str(payload.get("title", "")),
+        body=str(payload.get("body", "") or ""),
+        labels=tuple(labels),
+    )
+
+
+def load_issues(path: Path) -> list[Issue]:
+    text = path.read_text(encoding="utf-8")
+    if text.lstrip().startswith("["):
+        items = json.loads(text)
+    else:
+        items = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return [issue_from_json(item) for item in items]
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Batch-triage issues and stream NDJSON results.")
+    p.add_argument("--input", required=True, type=Path, help="JSON array or JSONL of issues.")
+    p.add_argument("--out", type=Path, default=None, help="NDJSON output path (default: stdout).")
+    p.add_argument("--mode", choices=("concurrent", "batch"), default="concurrent")
+    p.add_argument("--concurrency", type=int, default=8, help="Max in-flight LLM calls (concurrent mode and retries).")
+    p.add_argument("--max-retries", type=int, default=2)
+    p.add_argument("--poll-seconds", type=float, default=30.0, help="Batch status poll interval (batch mode).")
+    p.add_argument("--heuristic", action="store_true", help="Use the rule-based analyzer instead of the LLM.")
+    return p.parse_args()
+
+
+async def run(args: argparse.Namespace) -> int:
+    issues = load_issues(args.input)
+    llm = None if args.heuristic else AsyncLlmClient()
+    runner = OpenAIBatchRunner(llm, poll_interval_s=args.poll_seconds) if llm and args.mode == "batch" else None
+    out = args.out.open("w", encoding="utf-8") if args.out else sys.stdout
+    counts = {"ok": 0, "error": 0}
+    try:
+        async for line in analyze_issues_stream(
+            issues,
+            llm=llm,
+            mode=args.mode,
+            concurrency=args.concurrency,
+            max_retries=args.max_retries,
+            batch_runner=runner,
+        ):
+            counts[line["status"]] = counts.get(line["status"], 0) + 1
+            out.write(json.dumps(line, ensure_ascii=False) + "\n")
+            out.flush()
+    finally:
+        if args.out:
+            out.close()
+        if llm is not None:
+            await llm.close()
+    print(f"Done. ok={counts['ok']} error={counts['error']} total={len(issues)}", file=sys.stderr)
+    return 0 if counts["error"] == 0 else 1
+
+
+def main() -> int:
+    return asyncio.run(run(parse_args()))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,112 @@
+"""Benchmark heuristic assignment: per-issue `recommend_assignee` vs `ContributorMatrix`.
+
+Generates a synthetic team and issue batch (default 10k contributors x 1k issues),
+checks that both paths return identical assignments on a sample, and prints
+timings as JSON.
+
+    python scripts/bench_assignment_matrix.py --contributors 10000 --issues 1000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from devrel.agents.assignment import recommend_assignee  # noqa: E402
+from devrel.agents.assignment_matrix import ContributorMatrix  # noqa: E402
+from devrel.agents.types import (  # noqa: E402
+    Contributor,
+    IssueAnalysisOutput,
+    IssueType,
+    Priority,
+    ResponseStrategy,
+)
+
+
+def synthetic_team(n: int, areas: list[str], rng: random.Random) -> list[Contributor]:
+    return [
+        Contributor(
+            login=f"user{i}",
+            areas=tuple(rng.sample(areas, rng.randint(0, 4))),
+            recent_activity_score=round(rng.random() * 3, 2),
+            merged_prs=rng.randint(0, 30),
+            reviews=rng.randint(0, 40),
+        )
+        for i in range(n)
+    ]
+
+
+def synthetic_analyses(n: int, areas: list[str], rng: random.Random) -> list[IssueAnalysisOutput]:
+    return [
+        IssueAnalysisOutput(
+            issue_type=IssueType.BUG,
+            priority=Priority.MEDIUM,
+            required_skills=tuple(rng.sample(areas, rng.randint(0, 3))),
+            keywords=(),
+            summary=f"issue {i}",
+            needs_more_info=False,
+            suggested_action=ResponseStrategy.DIRECT_ANSWER,
+        )
+        for i in range(n)
+    ]
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Benchmark vectorized contributor scoring.")
+    p.add_argument("--contributors", type=int, default=10_000)
+    p.add_argument("--issues", type=int, default=1_000)
+    p.add_argument("--areas", type=int, default=200, help="Distinct areas across the team.")
+    p.add_argument("--baseline-issues", type=int, default=50, help="Issues timed (and compared) on the per-issue path.")
+    p.add_argument("--seed", type=int, default=0)
+    return p.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    rng = random.Random(args.seed)
+    areas = [f"area{i}" for i in range(args.areas)]
+    team = synthetic_team(args.contributors, areas, rng)
+    analyses = synthetic_analyses(args.issues, areas, rng)
+
+    started = time.perf_counter()
+    matrix = ContributorMatrix(team)
+    build_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    vectorized = matrix.recommend_batch(analyses)
+    batch_s = time.perf_counter() - started
+
+    sample = analyses[: args.baseline_issues]
+    started = time.perf_counter()
+    baseline = [recommend_assignee(a, team) for a in sample]
+    baseline_s = time.perf_counter() - started
+    mismatches = sum(1 for a, b in zip(baseline, vectorized) if a != b)
+
+    per_issue_baseline_ms = baseline_s / max(len(sample), 1) * 1000.0
+    report = {
+        "contributors": args.contributors,
+        "issues": args.issues,
+        "matrix_build_ms": round(build_s * 1000.0, 1),
+        "batch_ms": round(batch_s * 1000.0, 1),
+        "per_issue_ms": {
+            "matrix": round(batch_s / max(args.issues, 1) * 1000.0, 4),
+            "recommend_assignee": round(per_issue_baseline_ms, 4),
+        },
+        "speedup": round(per_issue_baseline_ms / (batch_s / max(args.issues, 1) * 1000.0), 1) if batch_s else None,
+        "compared": len(sample),
+        "mismatches": mismatches,
+    }
+    print(json.dumps(report, indent=2))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+"""Cluster the knowledge base's issue embeddings into doc-gap candidates.
+
+Reads `title_body` issue embeddings from phase1's `kb_embedding` (POSTGRES_*
+env vars), clusters them (`devrel.agents.doc_clusters`) and prints the top
+clusters by recency-weighted size. With `--llm`, each of those clusters is
+summarised into a `DocGapOutput` from its representatives only.
+
+    python scripts/cluster_doc_gaps.py --repo openai/openai-agents-python --top 10
+    python scripts/cluster_doc_gaps.py --repo openai/openai-agents-python --top 5 --llm --out gaps.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from tests.helpers.dotenv import load_dotenv  # noqa: E402
+
+load_dotenv(
+    PROJECT_ROOT.parent.parent / ".env",
+    PROJECT_ROOT.parent / ".env",
+    PROJECT_ROOT / ".env",
+)
+
+from devrel.agents.doc_clusters import (  # noqa: E402
+    DEFAULT_DIMS,
+    DEFAULT_HALF_LIFE_DAYS,
+    DEFAULT_MIN_CLUSTER_SIZE,
+    DocGapCluster,
+    cluster_doc_gaps,
+    load_issue_vectors,
+    summarize_cluster_llm,
+)
+
+
+def cluster_json(cluster: DocGapCluster) -> dict[str, Any]:
+    return {
+        "cluster_id": cluster.cluster_id,
+        "size": cluster.size,
+        "weight": cluster.weight,
+        "cohesion": cluster.cohesion,
+        "top_terms": list(cluster.top_terms),
+        "latest": cluster.latest.isoformat() if cluster.latest else None,
+        "representatives": [{"number": i.number, "title": i.title} for i in cluster.representatives],
+        "issue_numbers": list(cluster.issue_numbers),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Cluster issue embeddings into ranked doc-gap candidates.")
+    p.add_argument("--repo", default=None, help="Only issues of this owner/name.")
+    p.add_argument("--model", default="text-embedding-3-large", help="kb_embedding model.")
+    p.add_argument("--item-type", default="issue", help="kb_document item_type to cluster.")
+    p.add_argument("--dims", type=int, default=DEFAULT_DIMS, help="Leading embedding dimensions kept (0 = all).")
+    p.add_argument("--k", type=int, default=0, help="Cluster count (default: sqrt(n/2), at most 200).")
+    p.add_argument("--half-life-days", type=float, default=DEFAULT_HALF_LIFE_DAYS)
+    p.add_argument("--min-size", type=int, default=DEFAULT_MIN_CLUSTER_SIZE)
+    p.add_argument("--limit", type=int, default=0, help="Only the first N issues.")
+    p.add_argument("--top", type=int, default=10, help="Clusters to report.")
+    p.add_argument("--llm", action="store_true", help="Summarise the top clusters with the LLM (billed).")
+    p.add_argument("--out", type=Path, default=None, help="Write the report here instead of stdout.")
+    return p.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    started = time.perf_counter()
+    items, vectors = load_issue_vectors(
+        repo=args.repo, model=args.model, item_type=args.item_type, dims=args.dims or None, limit=args.limit
+    )
+    loaded = time.perf_counter()
+    clusters = cluster_doc_gaps(
+        items,
+        vectors,
+        k=args.k or None,
+        dims=args.dims or None,
+        half_life_days=args.half_life_days,
+        min_size=args.min_size,
+    )
+    clustered = time.perf_counter()
+
+    top = clusters[: args.top]
+    report: dict[str, Any] = {
+        "issues": len(items),
+        "clusters": len(clusters),
+        "load_s": round(loaded - started, 2),
+        "cluster_s": round(clustered - loaded, 2),
+        "top": [cluster_json(c) for c in top],
+    }
+    if args.llm:
+        from devrel.llm.client import LlmClient
+
+        llm = LlmClient()
+        for row, cluster in zip(report["top"], top):
+            gap = summarize_cluster_llm(llm, cluster)
+            row["doc_gap"] = {**asdict(gap), "priority": gap.priority.value}
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out is not None:
+        args.out.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
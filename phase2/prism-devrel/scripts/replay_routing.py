@@ -0,0 +1,151 @@
+"""Replay issues through the fixed model mapping and the router, and compare them.
+
+Each issue is triaged and answered (`draft_response_llm`) twice: once with
+`model_for(task)` and once through `RoutedLlmClient`. The report shows, per arm,
+calls, total/avg latency and estimated cost from the clients' telemetry, plus
+how often the routed triage agrees with the fixed one. When an input issue has
+`expected: {"issue_type": ..., "priority": ...}`, both arms are also scored
+against those labels.
+
+    python scripts/replay_routing.py --input issues.jsonl --out replay.ndjson
+    LLM_ROUTER_SLO_MS=4000 python scripts/replay_routing.py --input issues.jsonl
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from tests.helpers.dotenv import load_dotenv  # noqa: E402
+
+load_dotenv(
+    PROJECT_ROOT.parent.parent / ".env",
+    PROJECT_ROOT.parent / ".env",
+    PROJECT_ROOT / ".env",
+)
+
+from analyze_batch import issue_from_json  # noqa: E402
+
+from devrel.agents.assignment import analyze_issue_llm  # noqa: E402
+from devrel.agents.response import draft_response_llm  # noqa: E402
+from devrel.agents.types import Issue, IssueAnalysisOutput  # noqa: E402
+from devrel.llm.client import LlmClient  # noqa: E402
+from devrel.llm.router import ModelRouter, RoutedLlmClient  # noqa: E402
+
+
+def load_cases(path: Path) -> list[tuple[Issue, dict[str, Any]]]:
+    text = path.read_text(encoding="utf-8")
+    if text.lstrip().startswith("["):
+        items = json.loads(text)
+    else:
+        items = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return [(issue_from_json(item), dict(item.get("expected") or {})) for item in items]
+
+
+def run_arm(llm: Any, issue: Issue) -> tuple[IssueAnalysisOutput | None, float | None, str]:
+    try:
+        analysis = analyze_issue_llm(llm, issue)
+        response = draft_response_llm(llm, issue=issue, analysis=analysis)
+    except Exception as e:
+        return None, None, f"{type(e).__name__}: {e}"
+    return analysis, response.confidence, ""
+
+
+def arm_totals(llm: Any) -> dict[str, Any]:
+    # Aggregate metrics, not `telemetry.recent`: that ring buffer keeps only the last 500 calls.
+    return llm.telemetry.metrics.totals()
+
+
+def label_accuracy(rows: list[dict[str, Any]], arm: str) -> float | None:
+    scored = [r for r in rows if r["expected"] and r[arm]["issue_type"] is not None]
+    if not scored:
+        return None
+    hits = sum(
+        all(r[arm].get(k) == v for k, v in r["expected"].items() if k in ("issue_type", "priority")) for r in scored
+    )
+    return round(hits / len(scored), 4)
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Compare routed vs fixed model mapping on recorded issues.")
+    p.add_argument("--input", required=True, type=Path, help="JSON array or JSONL of issues (optional `expected`).")
+    p.add_argument("--out", type=Path, default=None, help="Per-issue NDJSON output path.")
+    p.add_argument("--limit", type=int, default=0, help="Replay only the first N issues.")
+    return p.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    cases = load_cases(args.input)
+    if args.limit:
+        cases = cases[: args.limit]
+
+    # Separate clients (and no response cache) so each arm pays for its own calls.
+    fixed = LlmClient()
+    routed = RoutedLlmClient(LlmClient(), ModelRouter.from_env(history=1_000_000))
+
+    rows: list[dict[str, Any]] = []
+    out = args.out.open("w", encoding="utf-8") if args.out else None
+    try:
+        for issue, expected in cases:
+            row: dict[str, Any] = {"number": issue.number, "expected": expected}
+            seen = len(routed.router.decisions)
+            for name, llm in (("fixed", fixed), ("routed", routed)):
+                started = time.perf_counter()
+                analysis, confidence, error = run_arm(llm, issue)
+                row[name] = {
+                    "issue_type": analysis.issue_type.value if analysis else None,
+                    "priority": analysis.priority.value if analysis else None,
+                    "response_confidence": confidence,
+                    "latency_ms": round((time.perf_counter() - started) * 1000.0, 1),
+                    "error": error,
+                }
+            row["routes"] = [
+                {"task": d.task, "model": d.model, "reason": d.reason, "outcome": d.outcome}
+                for d in list(routed.router.decisions)[seen:]
+            ]
+            rows.append(row)
+            if out is not None:
+                out.write(json.dumps(row, ensure_ascii=False) + "\n")
+    finally:
+        if out is not None:
+            out.close()
+
+    comparable = [r for r in rows if r["fixed"]["issue_type"] and r["routed"]["issue_type"]]
+    agreement = (
+        sum(
+            r["fixed"]["issue_type"] == r["routed"]["issue_type"] and r["fixed"]["priority"] == r["routed"]["priority"]
+            for r in comparable
+        )
+        / len(comparable)
+        if comparable
+        else None
+    )
+    decisions = list(routed.router.decisions)
+    report = {
+        "issues": len(rows),
+        "fixed": {**arm_totals(fixed), "label_accuracy": label_accuracy(rows, "fixed")},
+        "routed": {
+            **arm_totals(routed),
+            "label_accuracy": label_accuracy(rows, "routed"),
+            "escalations": sum(1 for d in decisions if d.reason.startswith("escalate")),
+            "slo_downgrades": sum(1 for d in decisions if d.reason == "slo"),
+        },
+        "triage_agreement": round(agreement, 4) if agreement is not None else None,
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
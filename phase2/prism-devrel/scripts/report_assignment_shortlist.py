@@ -0,0 +1,118 @@
+"""Measure how often the LLM's assignee falls outside the heuristic top-K shortlist.
+
+Each issue is assigned by the LLM with the whole team in the prompt
+(`top_k=0`). The pick is then located in the heuristic ranking: a pick at rank
+>= K is one that a `DEVREL_ASSIGNMENT_TOP_K=K` shortlist would have excluded.
+The report gives that miss rate per K along with the roster size in tokens for
+the full team and for each K.
+
+    python scripts/report_assignment_shortlist.py --issues issues.jsonl --raw-data-repo openai/openai-agents-python
+    python scripts/report_assignment_shortlist.py --issues issues.jsonl --contributors team.json --k 5 10 20
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from tests.helpers.dotenv import load_dotenv  # noqa: E402
+
+load_dotenv(
+    PROJECT_ROOT.parent.parent / ".env",
+    PROJECT_ROOT.parent / ".env",
+    PROJECT_ROOT / ".env",
+)
+
+from analyze_batch import load_issues  # noqa: E402
+
+from devrel.agents.assignment import (  # noqa: E402
+    analyze_issue,
+    contributor_roster,
+    recommend_assignee_llm,
+    shortlist_contributors,
+)
+from devrel.agents.types import Contributor  # noqa: E402
+from devrel.llm.client import LlmClient  # noqa: E402
+from devrel.search.context_builder import count_tokens  # noqa: E402
+from tests.helpers.github_fixtures import contributor_from_profile_json  # noqa: E402
+from tests.helpers.raw_data_loader import get_active_contributors  # noqa: E402
+
+
+def load_team(args: argparse.Namespace) -> list[Contributor]:
+    if args.contributors is not None:
+        return [contributor_from_profile_json(c) for c in json.loads(args.contributors.read_text(encoding="utf-8"))]
+    return get_active_contributors(args.raw_data_repo, min_activity=args.min_activity)
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Report LLM assignment picks outside the heuristic top-K.")
+    p.add_argument("--issues", required=True, type=Path, help="JSON array or JSONL of issues.")
+    team = p.add_mutually_exclusive_group(required=True)
+    team.add_argument("--contributors", type=Path, help="JSON array of contributor profiles.")
+    team.add_argument("--raw-data-repo", help="Use raw_data contributors of this repo.")
+    p.add_argument("--min-activity", type=int, default=3, help="With --raw-data-repo: minimum merged_prs + reviews.")
+    p.add_argument("--k", type=int, nargs="+", default=[5, 10, 20], help="Shortlist sizes to evaluate.")
+    p.add_argument("--limit", type=int, default=0, help="Only the first N issues.")
+    p.add_argument("--out", type=Path, default=None, help="Per-issue NDJSON output path.")
+    return p.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    issues = load_issues(args.issues)
+    if args.limit:
+        issues = issues[: args.limit]
+    team = load_team(args)
+    llm = LlmClient()
+
+    rows: list[dict[str, Any]] = []
+    out = args.out.open("w", encoding="utf-8") if args.out else None
+    try:
+        for issue in issues:
+            analysis = analyze_issue(issue)
+            ranking = [c.login for c in shortlist_contributors(analysis, team, len(team))]
+            row: dict[str, Any] = {"number": issue.number, "team": len(team)}
+            try:
+                pick = recommend_assignee_llm(
+                    llm, issue=issue, issue_analysis=analysis, contributors=team, top_k=0
+                ).recommended_assignee
+                row["pick"] = pick
+                row["rank"] = ranking.index(pick) if pick in ranking else None
+            except Exception as e:
+                row["error"] = f"{type(e).__name__}: {e}"
+            rows.append(row)
+            if out is not None:
+                out.write(json.dumps(row, ensure_ascii=False) + "\n")
+    finally:
+        if out is not None:
+            out.close()
+
+    scored = [r for r in rows if "rank" in r]
+    sample = analyze_issue(issues[0]) if issues else None
+    report: dict[str, Any] = {
+        "issues": len(rows),
+        "errors": sum(1 for r in rows if "error" in r),
+        "team": len(team),
+        "roster_tokens": {"all": count_tokens(contributor_roster(team))},
+        "outside_top_k": {},
+    }
+    for k in sorted(set(args.k)):
+        misses = sum(1 for r in scored if r["rank"] is None or r["rank"] >= k)
+        report["outside_top_k"][str(k)] = round(misses / len(scored), 4) if scored else None
+        if sample is not None:
+            report["roster_tokens"][str(k)] = count_tokens(contributor_roster(shortlist_contributors(sample, team, k)))
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,83 @@
+"""Evaluate promotion for every contributor and materialise the results for the UI.
+
+Features come from the exported `repo_user_activity.csv` (cached as an
+`ActivityStore` file at `ACTIVITY_STORE_PATH` when set). Only contributors whose
+stage changed are sent to the LLM (`--llm`, at most `--llm-limit` per run;
+changes beyond the limit or with a failed call stay pending for the next run).
+Results land in the SQLite store that `GET /api/promotions` serves
+(`PROMOTION_DB_PATH`).
+
+    python scripts/run_promotion_batch.py --activity raw_data/repo_user_activity.csv --repo openai/openai-agents-python
+    python scripts/run_promotion_batch.py --activity raw_data/repo_user_activity.csv --repo openai/openai-agents-python --llm
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from tests.helpers.dotenv import load_dotenv  # noqa: E402
+
+load_dotenv(
+    PROJECT_ROOT.parent.parent / ".env",
+    PROJECT_ROOT.parent / ".env",
+    PROJECT_ROOT / ".env",
+)
+
+from devrel import CACHE_DIR  # noqa: E402
+from devrel.agents.contributor_index import is_bot_account  # noqa: E402
+from devrel.agents.promotion_batch import (  # noqa: E402
+    DEFAULT_LLM_LIMIT,
+    PromotionStore,
+    contributors_from_csv,
+    run_promotion_batch,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Batch promotion evaluation into the promotion store.")
+    p.add_argument("--activity", type=Path, required=True, help="repo_user_activity.csv path.")
+    p.add_argument("--repo", default=None, help="Only activity in this owner/name.")
+    p.add_argument(
+        "--db",
+        default=os.getenv("PROMOTION_DB_PATH", str(CACHE_DIR / "promotions.sqlite")),
+        help="Promotion store SQLite file (default: $PROMOTION_DB_PATH or prism-devrel/.cache/promotions.sqlite).",
+    )
+    p.add_argument("--llm", action="store_true", help="Ask the LLM for narratives of stage changes (billed).")
+    p.add_argument("--llm-limit", type=int, default=DEFAULT_LLM_LIMIT, help="Max LLM calls per run.")
+    return p.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    contributors = contributors_from_csv(
+        args.activity, repo=args.repo, exclude=is_bot_account, cache_path=os.getenv("ACTIVITY_STORE_PATH") or None
+    )
+
+    llm = None
+    if args.llm:
+        from devrel.llm.client import LlmClient
+
+        llm = LlmClient()
+
+    store = PromotionStore(args.db)
+    try:
+        stats = run_promotion_batch(contributors, store, llm=llm, llm_limit=args.llm_limit)
+    finally:
+        store.close()
+    print(json.dumps(asdict(stats), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
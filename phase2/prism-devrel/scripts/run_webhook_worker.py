@@ -0,0 +1,114 @@
+"""Consume the webhook job queue in a separate process.
+
+`POST /webhooks/github` enqueues into the SQLite queue at `WEBHOOK_QUEUE_PATH`.
+Run the API with `WEBHOOK_WORKERS=0` and start as many of these as throughput
+needs; workers share the queue file and never run the same job twice at once.
+
+    python scripts/run_webhook_worker.py --workers 8 --llm
+    python scripts/run_webhook_worker.py --once          # drain ready jobs and exit
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from tests.helpers.dotenv import load_dotenv  # noqa: E402
+
+load_dotenv(
+    PROJECT_ROOT.parent.parent / ".env",
+    PROJECT_ROOT.parent / ".env",
+    PROJECT_ROOT / ".env",
+)
+
+from devrel.agents.contributor_index import ContributorIndex, is_bot_account  # noqa: E402
+from devrel.agents.webhooks import (  # noqa: E402
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_WEBHOOK_QUEUE_PATH,
+    DEFAULT_WORKERS,
+    WebhookQueue,
+    WebhookWorkerPool,
+    triage_handler,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Run the agent pipeline for queued GitHub webhook jobs.")
+    p.add_argument(
+        "--db",
+        default=os.getenv("WEBHOOK_QUEUE_PATH", DEFAULT_WEBHOOK_QUEUE_PATH),
+        help="Queue SQLite file (default: $WEBHOOK_QUEUE_PATH or prism-devrel/.cache/webhook_jobs.sqlite).",
+    )
+    p.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent jobs in this process.")
+    p.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS, help="Attempts before dead-lettering.")
+    p.add_argument("--job-timeout", type=float, default=120.0, help="Seconds per job attempt.")
+    p.add_argument("--llm", action="store_true", help="Triage and draft responses with the LLM (billed).")
+    p.add_argument("--rag", action="store_true", help="Retrieve KB context (POSTGRES_* env vars).")
+    p.add_argument("--once", action="store_true", help="Process the ready jobs, then exit.")
+    return p.parse_args()
+
+
+async def run(args: argparse.Namespace) -> int:
+    llm = rag = None
+    if args.llm:
+        from devrel.llm.cache import build_llm_cache_from_env
+        from devrel.llm.client import AsyncLlmClient
+
+        llm = AsyncLlmClient(cache=build_llm_cache_from_env())
+    if args.rag:
+        from devrel.search.rag_client import AsyncRAGClient
+
+        rag = AsyncRAGClient()
+        await rag.open()
+    index = None
+    if os.getenv("CONTRIBUTOR_ACTIVITY_PATH"):
+        index = ContributorIndex.from_activity_csv(
+            os.environ["CONTRIBUTOR_ACTIVITY_PATH"],
+            repo=os.getenv("CONTRIBUTOR_REPO") or None,
+            exclude=is_bot_account,
+        )
+
+    queue = WebhookQueue(args.db)
+    pool = WebhookWorkerPool(
+        queue,
+        triage_handler(llm=llm, rag=rag, contributor_index=index),
+        workers=args.workers,
+        max_attempts=args.max_attempts,
+        job_timeout_s=args.job_timeout,
+    )
+    try:
+        if args.once:
+            await pool.drain()
+        else:
+            pool.start()
+            await asyncio.Event().wait()  # until interrupted
+    finally:
+        await pool.stop()
+        print(json.dumps(queue.counts()))
+        queue.close()
+        if rag is not None:
+            await rag.close()
+        if llm is not None:
+            await llm.close()
+    return 0
+
+
+def main() -> int:
+    try:
+        return asyncio.run(run(parse_args()))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,151 @@
+"""Train the offline triage classifier and print an accuracy/latency report.
+
+Training targets come from one of:
+
+- `--input`: JSON array or JSONL of issues. Uses `expected: {"issue_type", "priority",
+  "suggested_action"}` when present, else the targets implied by the issue's labels.
+- `--input` + `--triage`: distil LLM triage output (`scripts/analyze_batch.py` NDJSON,
+  joined on `number`) into the classifier.
+- `--from-db`: labelled issues in `repo_work_item` (POSTGRES_* env vars).
+
+    python scripts/train_triage_classifier.py --input issues.jsonl --triage triage.ndjson --out triage.json.gz
+    python scripts/train_triage_classifier.py --from-db --repo openai/openai-agents-python --out triage.json.gz
+
+Serve the model with `TRIAGE_CLASSIFIER_PATH=triage.json.gz`.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from tests.helpers.dotenv import load_dotenv  # noqa: E402
+
+load_dotenv(
+    PROJECT_ROOT.parent.parent / ".env",
+    PROJECT_ROOT.parent / ".env",
+    PROJECT_ROOT / ".env",
+)
+
+from analyze_batch import issue_from_json  # noqa: E402
+
+from devrel.agents.triage_classifier import (  # noqa: E402
+    DEFAULT_THRESHOLD,
+    HEADS,
+    TriageClassifier,
+    TriageExample,
+    evaluate,
+    example_from_labels,
+)
+from devrel.agents.types import Issue  # noqa: E402
+
+
+def _read_json_items(path: Path) -> list[dict[str, Any]]:
+    text = path.read_text(encoding="utf-8")
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def examples_from_file(path: Path, triage: Path | None) -> list[TriageExample]:
+    analyses: dict[int, dict[str, Any]] = {}
+    if triage is not None:
+        for line in _read_json_items(triage):
+            if line.get("status") == "ok" and line.get("analysis"):
+                analyses[int(line["number"])] = line["analysis"]
+
+    examples: list[TriageExample] = []
+    for item in _read_json_items(path):
+        issue = issue_from_json(item)
+        source = analyses.get(issue.number) if triage is not None else item.get("expected")
+        if source:
+            examples.append(TriageExample(issue, {k: str(source[k]) for k in HEADS if source.get(k)}))
+        elif triage is None:
+            examples.append(example_from_labels(issue))
+    return examples
+
+
+def examples_from_db(repo: str | None) -> list[TriageExample]:
+    import psycopg
+
+    from devrel.llm.cache import postgres_conninfo_from_env
+
+    sql = "SELECT number, title, COALESCE(body_excerpt, ''), labels_json FROM repo_work_item WHERE type = 'issue'"
+    params: tuple[Any, ...] = ()
+    if repo:
+        sql += " AND repo_full_name = %s"
+        params = (repo,)
+    with psycopg.connect(postgres_conninfo_from_env()) as conn:
+        rows = conn.execute(sql, params).fetchall()
+
+    examples: list[TriageExample] = []
+    for number, title, body, labels in rows:
+        if isinstance(labels, str):
+            labels = json.loads(labels)
+        names = tuple(str(label.get("name", "")) if isinstance(label, dict) else str(label) for label in labels or [])
+        examples.append(example_from_labels(Issue(number=int(number), title=title, body=body, labels=names)))
+    return examples
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Train the TF-IDF triage classifier.")
+    p.add_argument("--input", type=Path, default=None, help="JSON array or JSONL of issues.")
+    p.add_argument("--triage", type=Path, default=None, help="analyze_batch.py NDJSON output to use as targets.")
+    p.add_argument("--from-db", action="store_true", help="Load labelled issues from repo_work_item.")
+    p.add_argument("--repo", default=None, help="Restrict --from-db to one repo_full_name.")
+    p.add_argument("--out", type=Path, default=None, help="Model path (.json or .json.gz).")
+    p.add_argument("--test-fraction", type=float, default=0.2, help="Held-out share for the report.")
+    p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Confidence needed to skip the LLM.")
+    p.add_argument("--min-df", type=int, default=2)
+    p.add_argument("--epochs", type=int, default=12)
+    p.add_argument("--seed", type=int, default=13)
+    return p.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.from_db:
+        examples = examples_from_db(args.repo)
+    elif args.input is not None:
+        examples = examples_from_file(args.input, args.triage)
+    else:
+        print("error: pass --input or --from-db", file=sys.stderr)
+        return 2
+    examples = [e for e in examples if e.targets]
+    if not examples:
+        print("error: no labelled issues found", file=sys.stderr)
+        return 1
+
+    random.Random(args.seed).shuffle(examples)
+    n_test = int(len(examples) * args.test_fraction)
+    test, train = examples[:n_test], examples[n_test:]
+
+    classifier = TriageClassifier.train(train, min_df=args.min_df, epochs=args.epochs, seed=args.seed)
+    report: dict[str, Any] = {
+        "train_examples": len(train),
+        "heads": {name: head.classes for name, head in classifier.heads.items()},
+        "features": len(classifier.idf),
+    }
+    if test:
+        report["test"] = evaluate(classifier, test, threshold=args.threshold)
+    if args.out is not None:
+        # Refit on everything for the shipped model; the report above is from the held-out split.
+        final = TriageClassifier.train(examples, min_df=args.min_df, epochs=args.epochs, seed=args.seed) if test else classifier
+        final.save(args.out)
+        report["model_path"] = str(args.out)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
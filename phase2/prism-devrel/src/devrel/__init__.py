@@ -1,2 +1,5 @@
 """PRISM DevRel Agent (Phase 2 scaffold)."""
+from pathlib import Path
 
+# Default home of the local SQLite files (git-ignored), anchored to the project rather than the CWD.
+CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache"
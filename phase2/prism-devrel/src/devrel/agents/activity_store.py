@@ -0,0 +1,380 @@
+"""Columnar activity store indexed by (repo, user, occurred_at).
+
+Building contributors from `repo_user_activity` used to mean parsing every row
+and then scanning all activities once per user. `ActivityStore` keeps the rows
+sorted by (repo, user, occurred_at) in fixed-width columns:
+
+- `ts`: occurred_at as epoch seconds (float64), ascending within each
+  (repo, user) group, so a time window is two `bisect` calls;
+- `prefix.<action>`: running counts per action (length rows + 1), so the number
+  of actions of a kind in any row range is one subtraction;
+- `group_*`: the (repo, user) of each group and the row where it starts.
+
+A windowed count is therefore an index range scan, and a `Contributor` costs
+O(actions × repos of that user), independent of how many rows the store holds.
+
+The columns are written to a single file (a JSON header followed by 8-byte
+aligned native-endian arrays) and read back through `mmap`, so opening a large
+store is free and the pages are shared between processes. `from_csv` rebuilds
+the file only when the source CSV's size or mtime changed.
+
+`contributor_from_activity` is the one mapping from activity to `Contributor`
+features; the store, `ContributorIndex` and the raw_data loader all go through it.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from .types import Contributor
+
+MAGIC = b"PRISMACT"
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct("<8sII")  # magic, version, header length
+_ALIGN = 8
+
+ACTION_AREAS: dict[str, str] = {
+    "reviewed": "code-review",
+    "pr_opened": "development",
+    "issue_opened": "issue-reporting",
+    "commented": "community",
+}
+RECENT_DAYS = 30
+
+
+def contributor_from_activity(
+    login: str,
+    *,
+    counts: Mapping[str, int],
+    first: float,
+    latest: float,
+    recent: int,
+    areas: Iterable[str] = (),
+) -> Contributor:
+    """`Contributor` features from per-action `counts`, the first/latest activity (epoch seconds)
+    and the number of activities within `RECENT_DAYS` of the latest; `areas` adds to those the actions imply.
+    """
+    implied = {ACTION_AREAS[a] for a, c in counts.items() if c and a in ACTION_AREAS}
+    return Contributor(
+        login=login,
+        areas=tuple(sorted(implied.union(areas))),
+        recent_activity_score=round(recent / 10.0, 2),
+        merged_prs=counts.get("pr_opened", 0),
+        reviews=counts.get("reviewed", 0),
+        first_contribution_date=datetime.fromtimestamp(first, timezone.utc).strftime("%Y-%m-%d"),
+        last_contribution_date=datetime.fromtimestamp(latest, timezone.utc).strftime("%Y-%m-%d"),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class ActivityRecord:
+    repo: str
+    login: str
+    action: str
+    reference: str
+    occurred_at: datetime
+
+
+def activity_record_from_row(row: dict[str, str]) -> ActivityRecord:
+    """A `repo_user_activity.csv` row."""
+    return ActivityRecord(
+        repo=row.get("repo_full_name", ""),
+        login=row["user_id"],
+        action=row["action"],
+        reference=row.get("reference", ""),
+        occurred_at=datetime.fromisoformat(row["occurred_at"].replace("Z", "+00:00")),
+    )
+
+
+def _pad(n: int) -> int:
+    return -n % _ALIGN
+
+
+def _encode(records: Iterable[ActivityRecord], source: dict[str, Any] | None = None) -> bytes:
+    rows = sorted(
+        ((r.repo, r.login, r.occurred_at.timestamp(), r.action, r.reference) for r in records),
+        key=lambda row: (row[0], row[1], row[2]),
+    )
+    repos = sorted({row[0] for row in rows})
+    users = sorted({row[1] for row in rows})
+    actions = sorted({row[3] for row in rows})
+    repo_ids = {name: i for i, name in enumerate(repos)}
+    user_ids = {name: i for i, name in enumerate(users)}
+    action_ids = {name: i for i, name in enumerate(actions)}
+
+    n = len(rows)
+    ts = array("d", (row[2] for row in rows))
+    action_col = array("B", (action_ids[row[3]] for row in rows))
+    prefix = {a: array("I", [0]) * (n + 1) for a in actions}
+    refs = bytearray()
+    ref_end = array("Q")
+    group_repo, group_user, group_start = array("I"), array("I"), array("Q")
+    previous: tuple[str, str] | None = None
+    for i, (repo, login, _, action, reference) in enumerate(rows):
+        if (repo, login) != previous:
+            previous = (repo, login)
+            group_repo.append(repo_ids[repo])
+            group_user.append(user_ids[login])
+            group_start.append(i)
+        for a, column in prefix.items():
+            column[i + 1] = column[i] + (a == action)
+        refs += reference.encode("utf-8")
+        ref_end.append(len(refs))
+    group_start.append(n)
+
+    columns: dict[str, array | bytes] = {
+        "ts": ts,
+        "action": action_col,
+        "ref_end": ref_end,
+        "refs": bytes(refs),
+        "group_repo": group_repo,
+        "group_user": group_user,
+        "group_start": group_start,
+        **{f"prefix.{a}": column for a, column in prefix.items()},
+    }
+    blobs = [c.tobytes() if isinstance(c, array) else c for c in columns.values()]
+
+    def layout(data_start: int) -> dict[str, list[Any]]:
+        placed: dict[str, list[Any]] = {}
+        offset = data_start
+        for (name, column), blob in zip(columns.items(), blobs):
+            code = column.typecode if isinstance(column, array) else "B"
+            placed[name] = [code, offset, len(blob)]
+            offset += len(blob) + _pad(len(blob))
+        return placed
+
+    header: dict[str, Any] = {
+        "byteorder": sys.byteorder,
+        "rows": n,
+        "repos": repos,
+        "users": users,
+        "actions": actions,
+        "source": source or {},
+        "columns": layout(0),
+    }
+    # Column offsets depend on the header length, which depends on the offsets; settle it.
+    while True:
+        raw = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        start = _PREAMBLE.size + len(raw) + _pad(_PREAMBLE.size + len(raw))
+        placed = layout(start)
+        if placed == header["columns"]:
+            break
+        header["columns"] = placed
+
+    out = bytearray(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(raw)))
+    out += raw
+    out += b"\0" * _pad(len(out))
+    for blob in blobs:
+        out += blob
+        out += b"\0" * _pad(len(blob))
+    return bytes(out)
+
+
+def _source_stamp(path: Path) -> dict[str, Any]:
+    stat = path.stat()
+    return {"path": str(path.resolve()), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _read_header(buffer: Any) -> dict[str, Any]:
+    magic, version, header_len = _PREAMBLE.unpack_from(buffer, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"not an activity store (format {FORMAT_VERSION})")
+    header = json.loads(bytes(buffer[_PREAMBLE.size : _PREAMBLE.size + header_len]))
+    if header["byteorder"] != sys.byteorder:
+        raise ValueError("activity store was written with a different byte order")
+    return header
+
+
+class ActivityStore:
+    def __init__(self, buffer: bytes | mmap.mmap, *, path: Path | None = None) -> None:
+        self._buffer = buffer
+        self.path = path
+        self._lock = threading.Lock()
+        header = _read_header(buffer)
+        self.source: dict[str, Any] = header["source"]
+        self._repos: list[str] = header["repos"]
+        self._users: list[str] = header["users"]
+        self._actions: list[str] = header["actions"]
+        self._views: list[memoryview] = []
+        base = memoryview(buffer)
+        self._views.append(base)
+        cols: dict[str, memoryview] = {}
+        for name, (code, offset, length) in header["columns"].items():
+            raw = base[offset : offset + length]
+            cols[name] = raw.cast(code)
+            self._views += [raw, cols[name]]
+        self._ts = cols["ts"]
+        self._action = cols["action"]
+        self._ref_end = cols["ref_end"]
+        self._refs = cols["refs"]
+        self._group_start = cols["group_start"]
+        self._prefix = {a: cols[f"prefix.{a}"] for a in self._actions}
+
+        self._repo_ids = {name: i for i, name in enumerate(self._repos)}
+        # Groups are sorted by repo, then user; index them by login for O(1) lookups.
+        self._group_names = [(r, self._users[u]) for r, u in zip(cols["group_repo"], cols["group_user"])]
+        self._user_groups: dict[str, list[tuple[int, int]]] = {}
+        for g, (repo_id, login) in enumerate(self._group_names):
+            self._user_groups.setdefault(login, []).append((repo_id, g))
+
+    @classmethod
+    def build(cls, records: Iterable[ActivityRecord]) -> ActivityStore:
+        """In-memory store over `records` (any order)."""
+        return cls(_encode(records))
+
+    @classmethod
+    def write(cls, path: str | Path, records: Iterable[ActivityRecord], *, source: dict[str, Any] | None = None) -> ActivityStore:
+        """Write `records` to `path` (atomically) and open it."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(_encode(records, source))
+        os.replace(tmp, path)
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path: str | Path) -> ActivityStore:
+        """Memory-map a store written by `write`."""
+        path = Path(path)
+        with path.open("rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer, path=path)
+
+    @classmethod
+    def from_csv(cls, csv_path: str | Path, *, cache_path: str | Path | None = None) -> ActivityStore:
+        """Store over `repo_user_activity.csv`; with `cache_path`, reused until the CSV changes."""
+        csv_path = Path(csv_path)
+        stamp = _source_stamp(csv_path)
+        if cache_path is not None and Path(cache_path).exists():
+            try:
+                store = cls.open(cache_path)
+            except (ValueError, struct.error):
+                pass  # unreadable or older format: rebuild below
+            else:
+                if store.source == stamp:
+                    return store
+                store.close()
+        with csv_path.open("r", encoding="utf-8", newline="") as f:
+            records = [activity_record_from_row(row) for row in csv.DictReader(f)]
+        if cache_path is None:
+            return cls(_encode(records, stamp))
+        return cls.write(cache_path, records, source=stamp)
+
+    def close(self) -> None:
+        with self._lock:
+            for view in reversed(self._views):
+                view.release()
+            self._views = []
+            if isinstance(self._buffer, mmap.mmap):
+                self._buffer.close()
+
+    def __len__(self) -> int:
+        return len(self._ts)
+
+    def repos(self) -> list[str]:
+        return list(self._repos)
+
+    def logins(self, repo: str | None = None) -> list[str]:
+        """Logins with activity (in `repo`), sorted."""
+        if repo is None:
+            return sorted(self._user_groups)
+        repo_id = self._repo_ids.get(repo)
+        return sorted(login for login, groups in self._user_groups.items() if any(r == repo_id for r, _ in groups))
+
+    def _groups(self, login: str, repo: str | None) -> list[int]:
+        groups = self._user_groups.get(login, ())
+        if repo is None:
+            return [g for _, g in groups]
+        repo_id = self._repo_ids.get(repo)
+        return [g for r, g in groups if r == repo_id]
+
+    def _window(self, g: int, since: float | None, until: float | None) -> tuple[int, int]:
+        start, end = self._group_start[g], self._group_start[g + 1]
+        lo = start if since is None else bisect_left(self._ts, since, start, end)
+        hi = end if until is None else bisect_left(self._ts, until, lo, end)
+        return lo, hi
+
+    def count(
+        self,
+        login: str,
+        *,
+        repo: str | None = None,
+        action: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> int:
+        """Activities of `login` with `since <= occurred_at < until` (both optional)."""
+        if action is not None and action not in self._prefix:
+            return 0
+        lo_ts = since.timestamp() if since is not None else None
+        hi_ts = until.timestamp() if until is not None else None
+        total = 0
+        for g in self._groups(login, repo):
+            lo, hi = self._window(g, lo_ts, hi_ts)
+            if action is None:
+                total += hi - lo
+            else:
+                column = self._prefix[action]
+                total += column[hi] - column[lo]
+        return total
+
+    def contributor(self, login: str, *, repo: str | None = None, recent_days: int = RECENT_DAYS) -> Contributor | None:
+        """`Contributor` features for `login` (in `repo`), or None without activity."""
+        groups = self._groups(login, repo)
+        if not groups:
+            return None
+        bounds = [(self._group_start[g], self._group_start[g + 1]) for g in groups]
+        first = min(self._ts[start] for start, _ in bounds)
+        latest = max(self._ts[end - 1] for _, end in bounds)
+        cutoff = latest - recent_days * 86400
+        recent = sum(end - bisect_left(self._ts, cutoff, start, end) for start, end in bounds)
+        counts = {a: sum(column[end] - column[start] for start, end in bounds) for a, column in self._prefix.items()}
+        return contributor_from_activity(login, counts=counts, first=first, latest=latest, recent=recent)
+
+    def contributors(
+        self,
+        *,
+        repo: str | None = None,
+        logins: Sequence[str] | None = None,
+        exclude: Callable[[str], bool] | None = None,
+    ) -> list[Contributor]:
+        """Contributors for `logins` (default: everyone active in `repo`), skipping those without activity."""
+        out: list[Contributor] = []
+        for login in self.logins(repo) if logins is None else logins:
+            if exclude is not None and exclude(login):
+                continue
+            contributor = self.contributor(login, repo=repo)
+            if contributor is not None:
+                out.append(contributor)
+        return out
+
+    def records(self, *, repo: str | None = None, login: str | None = None) -> Iterator[ActivityRecord]:
+        """Rows ordered by (repo, user, occurred_at)."""
+        if login is not None:
+            groups = self._groups(login, repo)
+        else:
+            repo_id = self._repo_ids.get(repo) if repo is not None else None
+            groups = [g for g, (r, _) in enumerate(self._group_names) if repo is None or r == repo_id]
+        for g in groups:
+            repo_id, user = self._group_names[g]
+            for i in range(self._group_start[g], self._group_start[g + 1]):
+                ref_start = self._ref_end[i - 1] if i else 0
+                yield ActivityRecord(
+                    repo=self._repos[repo_id],
+                    login=user,
+                    action=self._actions[self._action[i]],
+                    reference=bytes(self._refs[ref_start : self._ref_end[i]]).decode("utf-8"),
+                    occurred_at=datetime.fromtimestamp(self._ts[i], timezone.utc),
+                )
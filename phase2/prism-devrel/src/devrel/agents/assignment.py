@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import heapq
 import json
+import os
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 
-from devrel.llm.client import JsonSchema, LlmClient
+from devrel.llm.client import AsyncLlmClient, JsonSchema, LlmClient
 from devrel.llm.model_selector import LlmTask
 
 from .types import (
@@ -62,7 +66,8 @@ def analyze_issue(issue: Issue) -> IssueAnalysisOutput:
     )
 
 
-def analyze_issue_llm(llm: LlmClient, issue: Issue) -> IssueAnalysisOutput:
+def issue_analysis_request(issue: Issue) -> tuple[JsonSchema, str, str]:
+    """(schema, system, user) of the triage prompt, shared by the sync, async and batch analyzers."""
     schema = JsonSchema(
         name="issue_analysis_output",
         schema={
@@ -100,10 +105,21 @@ def analyze_issue_llm(llm: LlmClient, issue: Issue) -> IssueAnalysisOutput:
         f"Body: {issue.body}\n"
         f"Labels: {list(issue.labels)}\n"
     )
+    return schema, system, user
+
+
+def analyze_issue_llm(llm: LlmClient, issue: Issue) -> IssueAnalysisOutput:
+    schema, system, user = issue_analysis_request(issue)
     data = llm.generate_json(task=LlmTask.ISSUE_TRIAGE, system=system, user=user, json_schema=schema)
     return issue_analysis_from_dict(data)
 
 
+async def analyze_issue_llm_async(llm: AsyncLlmClient, issue: Issue) -> IssueAnalysisOutput:
+    schema, system, user = issue_analysis_request(issue)
+    data = await llm.generate_json(task=LlmTask.ISSUE_TRIAGE, system=system, user=user, json_schema=schema)
+    return issue_analysis_from_dict(data)
+
+
 def analyze_issue_with_tavily(
     llm: LlmClient,
     issue: Issue,
@@ -120,16 +136,19 @@ def analyze_issue_with_tavily(
     """
     from devrel.search.tavily_client import TavilyClient
 
-    # 1. Basic issue analysis
-    base_analysis = analyze_issue_llm(llm, issue)
-
-    # 2. Search for external insights
     tavily = TavilyClient(api_key=tavily_api_key)
-    insight = tavily.search_issue_context(
-        issue_title=issue.title,
-        issue_body=issue.body,
-        repo_name=repo_name,
-    )
+
+    # 1. Basic issue analysis, with the (independent) external search running alongside
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        search = pool.submit(
+            tavily.search_issue_context,
+            issue_title=issue.title,
+            issue_body=issue.body,
+            repo_name=repo_name,
+        )
+        base_analysis = analyze_issue_llm(llm, issue)
+        # 2. External insights
+        insight = search.result()
 
     # 3. Convert to ExternalInsight objects
     external_insights = []
@@ -156,8 +175,24 @@ def recommend_assignee(
     contributors: list[Contributor],
     *,
     limit: int = 3,
+    ownership: Mapping[str, float] | None = None,
 ) -> AssignmentOutput:
-    if not contributors or limit <= 0:
+    """`ownership` (login -> 0..1, see `ownership.ownership_scores`) boosts owners of the code the issue mentions."""
+    required = frozenset(issue_analysis.required_skills)
+    scored = [(c, _score_contributor(required, c, ownership)) for c in contributors]
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return assignment_from_ranking(issue_analysis, scored, limit=limit, ownership=ownership)
+
+
+def assignment_from_ranking(
+    issue_analysis: IssueAnalysisOutput,
+    ranked: Sequence[tuple[Contributor, float]],
+    *,
+    limit: int = 3,
+    ownership: Mapping[str, float] | None = None,
+) -> AssignmentOutput:
+    """Build the assignment from `(contributor, score)` pairs, best first (at least the top `max(limit, 2)`)."""
+    if not ranked or limit <= 0:
         return AssignmentOutput(
             recommended_assignee="",
             confidence=0.0,
@@ -166,17 +201,15 @@ def recommend_assignee(
             alternative_assignees=(),
         )
 
-    ranked = sorted(contributors, key=lambda c: _score_contributor(issue_analysis, c), reverse=True)
-    top = ranked[0]
-    top_score = _score_contributor(issue_analysis, top)
-    second_score = _score_contributor(issue_analysis, ranked[1]) if len(ranked) > 1 else 0.0
+    top, top_score = ranked[0]
+    second_score = ranked[1][1] if len(ranked) > 1 else 0.0
 
     confidence = 0.5
     if top_score > 0:
         confidence = min(1.0, 0.5 + (top_score - second_score) / max(top_score, 1.0))
 
-    reasons = _build_reasons(issue_analysis, top)
-    alternatives = tuple(c.login for c in ranked[1:max(limit, 1)])
+    reasons = _build_reasons(issue_analysis, top, ownership)
+    alternatives = tuple(c.login for c, _ in ranked[1:max(limit, 1)])
 
     context = (
         f"Issue type: {issue_analysis.issue_type.value}\n"
@@ -194,6 +227,36 @@ def recommend_assignee(
     )
 
 
+DEFAULT_ASSIGNMENT_TOP_K = 10
+
+
+def assignment_top_k() -> int:
+    """Candidates sent to the LLM (`DEVREL_ASSIGNMENT_TOP_K`, default 10; 0 sends the whole team)."""
+    return int(os.getenv("DEVREL_ASSIGNMENT_TOP_K", DEFAULT_ASSIGNMENT_TOP_K))
+
+
+def shortlist_contributors(
+    issue_analysis: IssueAnalysisOutput,
+    contributors: Sequence[Contributor],
+    k: int,
+    *,
+    ownership: Mapping[str, float] | None = None,
+) -> list[Contributor]:
+    """The `k` best contributors by the heuristic score, in `recommend_assignee` order (all when k <= 0)."""
+    required = frozenset(issue_analysis.required_skills)
+    if k <= 0 or len(contributors) <= k:
+        # Still ranked: callers (e.g. the shortlist report) read positions off this list.
+        scored = [(c, _score_contributor(required, c, ownership)) for c in contributors]
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return [c for c, _ in scored]
+    best = heapq.nlargest(
+        k,
+        enumerate(contributors),
+        key=lambda item: (_score_contributor(required, item[1], ownership), -item[0]),
+    )
+    return [c for _, c in best]
+
+
 def recommend_assignee_llm(
     llm: LlmClient,
     *,
@@ -201,7 +264,17 @@ def recommend_assignee_llm(
     issue_analysis: IssueAnalysisOutput,
     contributors: list[Contributor],
     limit: int = 3,
+    top_k: int | None = None,
+    ownership: Mapping[str, float] | None = None,
 ) -> AssignmentOutput:
+    """Retrieve-then-rerank: the heuristic shortlists `top_k` candidates (default `assignment_top_k()`), the LLM picks.
+
+    A pick outside the shortlist falls back to `recommend_assignee` over the whole team.
+    """
+    team = contributors
+    contributors = shortlist_contributors(
+        issue_analysis, team, assignment_top_k() if top_k is None else top_k, ownership=ownership
+    )
     schema = JsonSchema(
         name="assignment_output",
         schema={
@@ -252,28 +325,42 @@ def recommend_assignee_llm(
             "needs_more_info": issue_analysis.needs_more_info,
             "suggested_action": issue_analysis.suggested_action.value,
         },
-        "contributors": [
-            {
-                "login": c.login,
-                "areas": list(c.areas),
-                "recent_activity_score": c.recent_activity_score,
-                "merged_prs": c.merged_prs,
-                "reviews": c.reviews,
-            }
-            for c in contributors
-        ],
         "limit": limit,
     }
     user = f"Input:\n{json.dumps(payload, ensure_ascii=False)}"
-    data = llm.generate_json(task=LlmTask.ASSIGNMENT, system=system, user=user, json_schema=schema)
+    data = llm.generate_json(
+        task=LlmTask.ASSIGNMENT,
+        system=system,
+        user=user,
+        json_schema=schema,
+        context=[contributor_roster(contributors)],
+    )
     out = assignment_output_from_dict(data)
 
     allowed = {c.login for c in contributors}
     if out.recommended_assignee and out.recommended_assignee not in allowed:
-        return recommend_assignee(issue_analysis, contributors, limit=limit)
+        return recommend_assignee(issue_analysis, team, limit=limit, ownership=ownership)
     return out
 
 
+def contributor_roster(contributors: list[Contributor]) -> str:
+    """Candidate list as a prompt block that is byte-identical for the same team, whatever the input order.
+
+    It is sent ahead of the issue so consecutive assignment calls share a cacheable prompt prefix.
+    """
+    roster = [
+        {
+            "login": c.login,
+            "areas": sorted(c.areas),
+            "recent_activity_score": c.recent_activity_score,
+            "merged_prs": c.merged_prs,
+            "reviews": c.reviews,
+        }
+        for c in sorted(contributors, key=lambda c: c.login)
+    ]
+    return f"Candidate contributors:\n{json.dumps(roster, ensure_ascii=False, sort_keys=True)}"
+
+
 def _infer_priority(issue_type: IssueType, text: str) -> Priority:
     if any(token in text for token in ("critical", "security", "data loss", "breach")):
         return Priority.CRITICAL
@@ -305,22 +392,45 @@ def _infer_required_skills(issue_type: IssueType, keywords: list[str]) -> list[s
     return skills
 
 
-def _score_contributor(issue_analysis: IssueAnalysisOutput, contributor: Contributor) -> float:
+def base_contributor_score(contributor: Contributor) -> float:
+    """Part of the assignment score that does not depend on the issue."""
     score = min(contributor.recent_activity_score, 2.0)
-
-    required = set(issue_analysis.required_skills)
-    areas = set(contributor.areas)
-    if required and areas:
-        overlap = len(required & areas)
-        score += overlap * 2.0
-
     score += min(contributor.merged_prs, 10) * 0.05
     score += min(contributor.reviews, 20) * 0.02
     return float(score)
 
 
-def _build_reasons(issue_analysis: IssueAnalysisOutput, contributor: Contributor) -> list[AssignmentReason]:
+SKILL_MATCH_WEIGHT = 2.0
+OWNERSHIP_WEIGHT = 2.0
+
+
+def _score_contributor(
+    required: frozenset[str],
+    contributor: Contributor,
+    ownership: Mapping[str, float] | None = None,
+) -> float:
+    overlap = len(required.intersection(contributor.areas)) if required else 0
+    score = base_contributor_score(contributor) + overlap * SKILL_MATCH_WEIGHT
+    if ownership:
+        score += ownership.get(contributor.login, 0.0) * OWNERSHIP_WEIGHT
+    return score
+
+
+def _build_reasons(
+    issue_analysis: IssueAnalysisOutput,
+    contributor: Contributor,
+    ownership: Mapping[str, float] | None = None,
+) -> list[AssignmentReason]:
     reasons: list[AssignmentReason] = []
+    owned = (ownership or {}).get(contributor.login, 0.0)
+    if owned > 0:
+        reasons.append(
+            AssignmentReason(
+                factor="code_ownership",
+                explanation="Authored or reviewed recent changes to the code this issue mentions",
+                score=min(1.0, owned),
+            )
+        )
     overlap = sorted(set(issue_analysis.required_skills) & set(contributor.areas))
     if overlap:
         reasons.append(
@@ -0,0 +1,99 @@
+"""Vectorized heuristic assignment for batches of issues (requires numpy).
+
+`ContributorMatrix` holds the team as arrays: the issue-independent base score
+(`base_contributor_score`) and a contributors x areas multi-hot matrix. Scoring
+a batch of issues is one matrix product (area overlap) plus the base score,
+and the top `k` per issue comes from a partial sort (`np.partition`). Scores
+use the same float64 operations as `recommend_assignee` and ties keep the
+input order, so rankings match it exactly.
+
+    matrix = ContributorMatrix(contributors)
+    outputs = matrix.recommend_batch([analyze_issue(i) for i in issues])
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+from .assignment import SKILL_MATCH_WEIGHT, assignment_from_ranking
+from .types import AssignmentOutput, Contributor, IssueAnalysisOutput
+
+# Issues scored per matrix product; bounds the (contributors x chunk) score buffer.
+DEFAULT_CHUNK = 256
+
+
+class ContributorMatrix:
+    def __init__(self, contributors: Sequence[Contributor]) -> None:
+        self.contributors = list(contributors)
+        self.areas: dict[str, int] = {}
+        for contributor in self.contributors:
+            for area in contributor.areas:
+                self.areas.setdefault(area, len(self.areas))
+
+        n = len(self.contributors)
+        activity = np.array([c.recent_activity_score for c in self.contributors], dtype=np.float64)
+        merged = np.array([c.merged_prs for c in self.contributors], dtype=np.float64)
+        reviews = np.array([c.reviews for c in self.contributors], dtype=np.float64)
+        # Same operation order as base_contributor_score, so every float is identical.
+        self.base = np.minimum(activity, 2.0) + np.minimum(merged, 10) * 0.05 + np.minimum(reviews, 20) * 0.02
+
+        self.area_matrix = np.zeros((n, max(len(self.areas), 1)), dtype=np.float32)
+        for row, contributor in enumerate(self.contributors):
+            for area in contributor.areas:
+                self.area_matrix[row, self.areas[area]] = 1.0
+
+    def __len__(self) -> int:
+        return len(self.contributors)
+
+    def _skill_matrix(self, skills: Sequence[Iterable[str]]) -> np.ndarray:
+        out = np.zeros((self.area_matrix.shape[1], len(skills)), dtype=np.float32)
+        for col, required in enumerate(skills):
+            for skill in set(required):
+                idx = self.areas.get(skill)
+                if idx is not None:
+                    out[idx, col] = 1.0
+        return out
+
+    def scores(self, skills: Sequence[Iterable[str]]) -> np.ndarray:
+        """(contributors x issues) scores for the given `required_skills` lists."""
+        overlap = (self.area_matrix @ self._skill_matrix(skills)).astype(np.float64)
+        return self.base[:, None] + overlap * SKILL_MATCH_WEIGHT
+
+    def rank_batch(
+        self,
+        skills: Sequence[Iterable[str]],
+        k: int,
+        *,
+        chunk: int = DEFAULT_CHUNK,
+    ) -> list[list[tuple[int, float]]]:
+        """Per issue, the top `k` `(contributor_index, score)` pairs, best first."""
+        n = len(self.contributors)
+        k = min(k, n)
+        if k <= 0:
+            return [[] for _ in skills]
+        ranked: list[list[tuple[int, float]]] = []
+        for start in range(0, len(skills), chunk):
+            block = self.scores(skills[start : start + chunk])
+            # k-th largest score per issue; everything at or above it is a candidate.
+            kth = np.partition(block, n - k, axis=0)[n - k]
+            for col in range(block.shape[1]):
+                column = block[:, col]
+                candidates = np.flatnonzero(column >= kth[col])
+                # Descending score, then ascending index (the stable-sort tie order).
+                order = np.lexsort((candidates, -column[candidates]))[:k]
+                ranked.append([(int(i), float(column[i])) for i in candidates[order]])
+        return ranked
+
+    def recommend_batch(
+        self,
+        analyses: Sequence[IssueAnalysisOutput],
+        *,
+        limit: int = 3,
+        chunk: int = DEFAULT_CHUNK,
+    ) -> list[AssignmentOutput]:
+        ranked = self.rank_batch([a.required_skills for a in analyses], max(limit, 2), chunk=chunk)
+        return [
+            assignment_from_ranking(analysis, [(self.contributors[i], score) for i, score in top], limit=limit)
+            for analysis, top in zip(analyses, ranked)
+        ]
@@ -0,0 +1,284 @@
+"""In-memory contributor index for heuristic assignment at org scale.
+
+`recommend_assignee` scores every contributor on every call. `ContributorIndex`
+keeps the issue-independent part of the score (`base_contributor_score`)
+precomputed, an inverted index from area to contributors, and the contributors
+ordered by base score. A ranking then only touches contributors that share an
+area with `required_skills`, plus the first `k` entries of the base order, and
+selects the top `k` with a heap. Scores and tie order match `recommend_assignee`.
+
+The index is built once from contributors or from activity events
+(`repo_user_activity.csv` rows) and refreshed incrementally: `apply` recomputes
+only the contributors that appear in the new events, and `refresh` reads just the
+rows appended to the activity CSV since the previous read.
+"""
+from __future__ import annotations
+
+import csv
+import heapq
+import io
+import logging
+import os
+import threading
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from .activity_store import RECENT_DAYS, contributor_from_activity
+from .assignment import OWNERSHIP_WEIGHT, SKILL_MATCH_WEIGHT, assignment_from_ranking, base_contributor_score
+from .types import AssignmentOutput, Contributor, IssueAnalysisOutput
+
+logger = logging.getLogger("devrel.agents.contributor_index")
+
+# 봇 및 CI/CD 계정 패턴
+BOT_PATTERNS = (
+    "[bot]",
+    "github-actions",
+    "dependabot",
+    "renovate",
+    "copilot",
+    "chatgpt-codex-connector",
+    "codecov",
+    "stale",
+    "mergify",
+    "semantic-release",
+)
+
+
+def is_bot_account(login: str) -> bool:
+    """Check if the login is a bot or CI/CD account."""
+    login_lower = login.lower()
+    return any(pattern in login_lower for pattern in BOT_PATTERNS)
+
+
+@dataclass(frozen=True, slots=True)
+class ActivityEvent:
+    login: str
+    action: str
+    occurred_at: datetime
+    repo: str = ""
+
+
+def activity_event_from_row(row: dict[str, str]) -> ActivityEvent:
+    return ActivityEvent(
+        login=row["user_id"],
+        action=row["action"],
+        occurred_at=datetime.fromisoformat(row["occurred_at"].replace("Z", "+00:00")),
+        repo=row.get("repo_full_name", ""),
+    )
+
+
+@dataclass(slots=True)
+class _Activity:
+    """Per-contributor counters behind a `Contributor` built from events (see `contributor_from_activity`)."""
+
+    timestamps: list[float] = field(default_factory=list)
+    counts: dict[str, int] = field(default_factory=dict)
+    areas: set[str] = field(default_factory=set)  # seeded from an upserted contributor
+
+    def add(self, event: ActivityEvent) -> None:
+        self.timestamps.append(event.occurred_at.timestamp())
+        self.counts[event.action] = self.counts.get(event.action, 0) + 1
+
+    def contributor(self, login: str) -> Contributor:
+        latest = max(self.timestamps)
+        cutoff = latest - RECENT_DAYS * 86400
+        return contributor_from_activity(
+            login,
+            counts=self.counts,
+            first=min(self.timestamps),
+            latest=latest,
+            recent=sum(1 for t in self.timestamps if t >= cutoff),
+            areas=self.areas,
+        )
+
+
+class ContributorIndex:
+    def __init__(self, contributors: Iterable[Contributor] = ()) -> None:
+        self._lock = threading.RLock()
+        self._reset()
+        self._source: Path | None = None
+        self._repo: str | None = None
+        self._exclude: Callable[[str], bool] | None = None
+        for contributor in contributors:
+            self._upsert(contributor)
+
+    @classmethod
+    def from_activity_csv(
+        cls,
+        path: str | Path,
+        *,
+        repo: str | None = None,
+        exclude: Callable[[str], bool] | None = None,
+    ) -> ContributorIndex:
+        """Index built from a `repo_user_activity.csv`; `refresh()` later picks up appended rows."""
+        index = cls()
+        index._source = Path(path)
+        index._repo = repo
+        index._exclude = exclude
+        index.refresh()
+        return index
+
+    def __len__(self) -> int:
+        return len(self._contributors)
+
+    def __contains__(self, login: object) -> bool:
+        return login in self._contributors
+
+    def get(self, login: str) -> Contributor | None:
+        return self._contributors.get(login)
+
+    def contributors(self) -> list[Contributor]:
+        return list(self._contributors.values())
+
+    def upsert(self, contributor: Contributor) -> None:
+        with self._lock:
+            self._upsert(contributor)
+
+    def remove(self, login: str) -> None:
+        with self._lock:
+            old = self._contributors.pop(login, None)
+            if old is None:
+                return
+            for area in set(old.areas):
+                self._postings.get(area, set()).discard(login)
+            self._base.pop(login, None)
+            self._activity.pop(login, None)
+            self._by_base = None
+
+    def apply(self, events: Iterable[ActivityEvent]) -> int:
+        """Fold new activity into the index; returns the number of contributors updated."""
+        with self._lock:
+            touched: set[str] = set()
+            for event in events:
+                if self._repo and event.repo and event.repo != self._repo:
+                    continue
+                if self._exclude is not None and self._exclude(event.login):
+                    continue
+                activity = self._activity.get(event.login)
+                if activity is None:
+                    activity = self._activity[event.login] = self._seed_activity(event.login)
+                activity.add(event)
+                touched.add(event.login)
+            for login in touched:
+                self._upsert(self._activity[login].contributor(login))
+            return len(touched)
+
+    def refresh(self) -> int:
+        """Apply the rows appended to the source CSV since the last read (0 if unchanged).
+
+        A missing source (mid-rotation, or an unmounted volume) counts as unchanged:
+        the index keeps serving what it already has.
+        """
+        if self._source is None:
+            return 0
+        with self._lock:
+            try:
+                size = os.path.getsize(self._source)
+            except FileNotFoundError:
+                logger.warning("activity CSV %s is missing; keeping the current contributor index", self._source)
+                return 0
+            if size < self._offset:  # truncated or replaced: rebuild from scratch
+                self._reset()
+            if size == self._offset:
+                return 0
+            try:
+                with self._source.open("rb") as f:
+                    f.seek(self._offset)
+                    chunk = f.read()
+            except FileNotFoundError:
+                logger.warning("activity CSV %s is missing; keeping the current contributor index", self._source)
+                return 0
+            # Only consume complete lines; a row still being written is picked up next time.
+            end = chunk.rfind(b"\n") + 1
+            if end == 0:
+                return 0
+            self._offset += end
+            text = chunk[:end].decode("utf-8")
+            if self._header is None:
+                header, _, text = text.partition("\n")
+                self._header = next(csv.reader([header]))
+            rows = csv.DictReader(io.StringIO(text), fieldnames=self._header)
+            return self.apply(activity_event_from_row(row) for row in rows)
+
+    def rank(
+        self,
+        required_skills: Iterable[str],
+        k: int,
+        *,
+        ownership: Mapping[str, float] | None = None,
+    ) -> list[tuple[Contributor, float]]:
+        """Top `k` `(contributor, score)` pairs, ordered like `recommend_assignee`."""
+        if k <= 0:
+            return []
+        with self._lock:
+            overlap: dict[str, int] = {}
+            for skill in set(required_skills):
+                for login in self._postings.get(skill, ()):
+                    overlap[login] = overlap.get(login, 0) + 1
+            for login, owned in (ownership or {}).items():
+                if owned and login in self._contributors:
+                    overlap.setdefault(login, 0)
+            if self._by_base is None:
+                self._by_base = sorted(self._base, key=lambda login: (-self._base[login], self._seq[login]))
+
+            candidates: list[tuple[float, str]] = []
+            for login, n in overlap.items():
+                score = self._base[login] + n * SKILL_MATCH_WEIGHT
+                if ownership:
+                    score += ownership.get(login, 0.0) * OWNERSHIP_WEIGHT
+                candidates.append((score, login))
+            unmatched = 0
+            for login in self._by_base:
+                if unmatched >= k:
+                    break
+                if login not in overlap:
+                    candidates.append((self._base[login], login))
+                    unmatched += 1
+            best = heapq.nlargest(k, candidates, key=lambda item: (item[0], -self._seq[item[1]]))
+            return [(self._contributors[login], score) for score, login in best]
+
+    def recommend(
+        self,
+        issue_analysis: IssueAnalysisOutput,
+        *,
+        limit: int = 3,
+        ownership: Mapping[str, float] | None = None,
+    ) -> AssignmentOutput:
+        ranked = self.rank(issue_analysis.required_skills, max(limit, 2), ownership=ownership)
+        return assignment_from_ranking(issue_analysis, ranked, limit=limit, ownership=ownership)
+
+    def _reset(self) -> None:
+        self._contributors: dict[str, Contributor] = {}
+        self._base: dict[str, float] = {}
+        self._seq: dict[str, int] = {}  # insertion order, the tie-breaker of a stable sort
+        self._postings: dict[str, set[str]] = {}
+        self._by_base: list[str] | None = None
+        self._activity: dict[str, _Activity] = {}
+        self._offset = 0
+        self._header: list[str] | None = None
+
+    def _seed_activity(self, login: str) -> _Activity:
+        # A contributor first added via `upsert` keeps its counts when activity starts arriving.
+        existing = self._contributors.get(login)
+        if existing is None:
+            return _Activity()
+        return _Activity(
+            counts={"pr_opened": existing.merged_prs, "reviewed": existing.reviews}, areas=set(existing.areas)
+        )
+
+    def _upsert(self, contributor: Contributor) -> None:
+        login = contributor.login
+        old = self._contributors.get(login)
+        if old is not None:
+            for area in set(old.areas) - set(contributor.areas):
+                self._postings[area].discard(login)
+        for area in contributor.areas:
+            self._postings.setdefault(area, set()).add(login)
+        self._contributors[login] = contributor
+        self._seq.setdefault(login, len(self._seq))
+        base = base_contributor_score(contributor)
+        if self._base.get(login) != base:
+            self._base[login] = base
+            self._by_base = None
@@ -0,0 +1,315 @@
+"""Corpus-scale doc-gap detection by clustering issue embeddings (requires numpy).
+
+`detect_doc_gaps` only knows three hard-coded topics and `detect_doc_gaps_llm`
+puts every issue into one prompt. Here the issue embeddings phase1 already
+stores (`kb_embedding` rows of the `title_body` section in `kb_document`) are
+clustered with spherical mini-batch k-means. Clusters are ranked by
+recency-weighted size (each issue counts `0.5 ** (age_days / half_life_days)`),
+and the LLM sees one cluster at a time: its size, distinctive title terms and
+the few issues closest to the centroid, never the whole corpus.
+
+text-embedding-3 vectors are Matryoshka-trained, so they are cut to their
+leading `dims` components (default 256) and re-normalised before clustering.
+This keeps 50k issues to seconds of CPU time for clustering.
+
+    items, vectors = load_issue_vectors(repo="openai/openai-agents-python")
+    clusters = cluster_doc_gaps(items, vectors)
+    gaps = summarize_clusters_llm(llm, clusters[:10])
+"""
+from __future__ import annotations
+
+import json
+import math
+import re
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass, replace
+from datetime import datetime
+
+import numpy as np
+
+from devrel.llm.client import LlmClient
+from devrel.llm.model_selector import LlmTask
+
+from .docs import DOC_GAP_SCHEMA, DocGapCandidate
+from .types import DocGapOutput, Issue, doc_gap_output_from_dict
+
+DEFAULT_DIMS = 256
+DEFAULT_HALF_LIFE_DAYS = 90.0
+DEFAULT_MIN_CLUSTER_SIZE = 3
+DEFAULT_REPRESENTATIVES = 5
+MAX_CLUSTERS = 200
+
+_WORD = re.compile(r"[a-z][a-z0-9_]+(?:[.\-][a-z0-9_]+)*")
+_STOPWORDS = frozenset(
+    "the and for with when not from this that are was but can how does use using into after "
+    "issue bug error feature request support add make should would get set have has".split()
+)
+_KB_TITLE = re.compile(r"^Title: (.*)$", re.MULTILINE)
+_KB_BODY = re.compile(r"\n\nBody: (.*?)(?:\n\nLabels: .*)?\Z", re.DOTALL)
+_KB_LABELS = re.compile(r"\n\nLabels: (.*)\Z")
+
+
+@dataclass(frozen=True, slots=True)
+class ClusterItem:
+    issue: Issue
+    occurred_at: datetime | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class DocGapCluster:
+    cluster_id: int
+    size: int
+    weight: float  # recency-weighted size
+    cohesion: float  # mean cosine similarity of members to the centroid
+    top_terms: tuple[str, ...]
+    issue_numbers: tuple[int, ...]  # closest to the centroid first
+    representatives: tuple[Issue, ...]
+    latest: datetime | None
+
+    def to_candidate(self) -> DocGapCandidate:
+        return DocGapCandidate(
+            topic=" ".join(self.top_terms[:3]),
+            evidence_issue_numbers=tuple(sorted(self.issue_numbers)),
+            rationale=f"{self.size} similar issues (recency-weighted {self.weight:.1f}) form one cluster.",
+        )
+
+
+def issue_from_kb_text(number: int, text: str) -> Issue:
+    """Rebuild an `Issue` from a `title_body` kb_document text (`Issue #N / Title: / Body: / Labels:`)."""
+    title = _KB_TITLE.search(text)
+    body = _KB_BODY.search(text)
+    labels = _KB_LABELS.search(text)
+    return Issue(
+        number=number,
+        title=title.group(1).strip() if title else "",
+        body=body.group(1).strip() if body else "",
+        labels=tuple(x.strip() for x in labels.group(1).split(",")) if labels else (),
+    )
+
+
+def prepare_vectors(vectors: np.ndarray, dims: int | None = DEFAULT_DIMS) -> np.ndarray:
+    """Leading `dims` components (all when `None`), L2-normalised, as float32."""
+    x = np.asarray(vectors, dtype=np.float32)
+    if dims and x.shape[1] > dims:
+        x = x[:, :dims]
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+
+def default_cluster_count(n: int) -> int:
+    return max(2, min(MAX_CLUSTERS, round(math.sqrt(n / 2))))
+
+
+def _kmeans_plus_plus(x: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    centers = [x[rng.integers(len(x))]]
+    # Squared cosine distance of unit vectors: 2 - 2 * similarity.
+    dist = np.maximum(2.0 - 2.0 * (x @ centers[0]), 0.0)
+    for _ in range(1, k):
+        total = float(dist.sum())
+        idx = int(rng.choice(len(x), p=dist / total)) if total > 0 else int(rng.integers(len(x)))
+        centers.append(x[idx])
+        dist = np.minimum(dist, np.maximum(2.0 - 2.0 * (x @ x[idx]), 0.0))
+    return np.array(centers, dtype=np.float32)
+
+
+def assign(x: np.ndarray, centroids: np.ndarray, *, chunk: int = 8192) -> tuple[np.ndarray, np.ndarray]:
+    """(nearest centroid, cosine similarity to it) for every row of unit-norm `x`."""
+    labels = np.empty(len(x), dtype=np.int64)
+    sims = np.empty(len(x), dtype=np.float32)
+    for start in range(0, len(x), chunk):
+        block = x[start : start + chunk] @ centroids.T
+        labels[start : start + chunk] = block.argmax(axis=1)
+        sims[start : start + chunk] = block.max(axis=1)
+    return labels, sims
+
+
+def minibatch_kmeans(
+    x: np.ndarray,
+    k: int,
+    *,
+    batch_size: int = 2048,
+    iterations: int = 100,
+    seed: int = 0,
+) -> np.ndarray:
+    """Spherical mini-batch k-means (Sculley, 2010) over unit-norm rows; returns unit-norm centroids."""
+    rng = np.random.default_rng(seed)
+    k = min(k, len(x))
+    init_sample = x[rng.choice(len(x), size=min(len(x), max(20 * k, batch_size)), replace=False)]
+    centroids = _kmeans_plus_plus(init_sample, k, rng)
+    counts = np.zeros(k, dtype=np.float64)
+    for _ in range(iterations):
+        batch = x[rng.choice(len(x), size=min(batch_size, len(x)), replace=False)]
+        labels = (batch @ centroids.T).argmax(axis=1)
+        onehot = np.zeros((k, len(batch)), dtype=np.float32)
+        onehot[labels, np.arange(len(batch))] = 1.0
+        batch_counts = onehot.sum(axis=1)
+        sums = onehot @ batch
+        counts += batch_counts
+        # Per-centre learning rate 1/count, applied to the whole batch at once.
+        touched = batch_counts > 0
+        rate = (batch_counts[touched] / counts[touched])[:, None].astype(np.float32)
+        means = sums[touched] / batch_counts[touched][:, None]
+        centroids[touched] = (1.0 - rate) * centroids[touched] + rate * means
+        centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+    return centroids
+
+
+def _tokens(text: str) -> set[str]:
+    return {t for t in _WORD.findall(text.lower()) if t not in _STOPWORDS}
+
+
+def _top_terms(member_titles: list[set[str]], df: Counter[str], n_docs: int, limit: int = 5) -> tuple[str, ...]:
+    tf: Counter[str] = Counter()
+    for tokens in member_titles:
+        tf.update(tokens)
+    scored = [
+        (count * math.log(n_docs / df[term]), term)
+        for term, count in tf.items()
+        if count >= 2 or len(member_titles) < 4
+    ]
+    scored.sort(key=lambda st: (-st[0], st[1]))
+    return tuple(term for _, term in scored[:limit])
+
+
+def cluster_doc_gaps(
+    items: Sequence[ClusterItem],
+    vectors: np.ndarray,
+    *,
+    k: int | None = None,
+    dims: int | None = DEFAULT_DIMS,
+    half_life_days: float = DEFAULT_HALF_LIFE_DAYS,
+    min_size: int = DEFAULT_MIN_CLUSTER_SIZE,
+    representatives: int = DEFAULT_REPRESENTATIVES,
+    now: datetime | None = None,
+    seed: int = 0,
+) -> list[DocGapCluster]:
+    """Cluster issues by embedding; clusters of at least `min_size`, highest recency-weighted size first."""
+    if len(items) != len(vectors):
+        raise ValueError(f"{len(items)} items but {len(vectors)} vectors")
+    if not items:
+        return []
+    x = prepare_vectors(vectors, dims)
+    centroids = minibatch_kmeans(x, k or default_cluster_count(len(x)), seed=seed)
+    labels, sims = assign(x, centroids)
+
+    stamps = [item.occurred_at for item in items]
+    known = [s for s in stamps if s is not None]
+    now = now or (max(known) if known else None)
+    recency = np.array(
+        [
+            0.5 ** (max(0.0, (now - s).total_seconds() / 86400) / half_life_days) if now and s else 1.0
+            for s in stamps
+        ],
+        dtype=np.float64,
+    )
+
+    titles = [_tokens(item.issue.title) for item in items]
+    df: Counter[str] = Counter()
+    for tokens in titles:
+        df.update(tokens)
+
+    clusters: list[DocGapCluster] = []
+    order = np.argsort(labels, kind="stable")
+    bounds = np.flatnonzero(np.diff(labels[order])) + 1
+    for members in np.split(order, bounds):
+        if len(members) < min_size:
+            continue
+        members = members[np.argsort(-sims[members], kind="stable")]
+        member_stamps = [stamps[i] for i in members if stamps[i] is not None]
+        clusters.append(
+            DocGapCluster(
+                cluster_id=int(labels[members[0]]),
+                size=len(members),
+                weight=round(float(recency[members].sum()), 4),
+                cohesion=round(float(sims[members].mean()), 4),
+                top_terms=_top_terms([titles[i] for i in members], df, len(items)),
+                issue_numbers=tuple(items[i].issue.number for i in members),
+                representatives=tuple(items[i].issue for i in members[:representatives]),
+                latest=max(member_stamps) if member_stamps else None,
+            )
+        )
+    clusters.sort(key=lambda c: (-c.weight, -c.size, c.cluster_id))
+    return clusters
+
+
+def _cluster_request(cluster: DocGapCluster, *, body_chars: int = 600) -> tuple[str, str]:
+    system = (
+        "You are a DevRel agent that detects documentation gaps from clusters of similar GitHub issues.\n"
+        "You see one cluster: its size, distinctive terms and the issues closest to its centre.\n"
+        "Return only JSON. Only cite issue numbers that are provided."
+    )
+    payload = {
+        "cluster": {
+            "size": cluster.size,
+            "recency_weighted_size": cluster.weight,
+            "top_terms": list(cluster.top_terms),
+            "latest": cluster.latest.isoformat() if cluster.latest else None,
+        },
+        "representative_issues": [
+            {"number": i.number, "title": i.title, "body": i.body[:body_chars], "labels": list(i.labels)}
+            for i in cluster.representatives
+        ],
+    }
+    return system, f"Issue cluster:\n{json.dumps(payload, ensure_ascii=False)}"
+
+
+def summarize_cluster_llm(llm: LlmClient, cluster: DocGapCluster) -> DocGapOutput:
+    """Doc-gap verdict for one cluster; `affected_issues` covers every member, not just the representatives."""
+    system, user = _cluster_request(cluster)
+    data = llm.generate_json(task=LlmTask.DOCS, system=system, user=user, json_schema=DOC_GAP_SCHEMA)
+    return replace(doc_gap_output_from_dict(data), affected_issues=tuple(sorted(cluster.issue_numbers)))
+
+
+def summarize_clusters_llm(llm: LlmClient, clusters: Sequence[DocGapCluster]) -> list[DocGapOutput]:
+    return [summarize_cluster_llm(llm, cluster) for cluster in clusters]
+
+
+# kb_document.created_at is when the row was ingested, so an issue's own dates come from repo_work_item.
+_ISSUE_VECTORS_SQL = """
+    SELECT d.item_number, d.text, COALESCE(d.closed_at, w.created_at), e.embedding::text
+    FROM kb_embedding e
+    JOIN kb_document d ON d.kb_id = e.kb_id
+    LEFT JOIN repo_work_item w
+      ON w.repo_full_name = d.repo_full_name AND w.number = d.item_number AND w.type = d.item_type
+    WHERE e.model = %s AND d.item_type = %s AND d.section = 'title_body'
+"""
+
+
+def load_issue_vectors(
+    conninfo: str | None = None,
+    *,
+    repo: str | None = None,
+    model: str = "text-embedding-3-large",
+    item_type: str = "issue",
+    dims: int | None = DEFAULT_DIMS,
+    limit: int = 0,
+) -> tuple[list[ClusterItem], np.ndarray]:
+    """Issues and their (truncated, unit-norm) embeddings from the phase1 knowledge base."""
+    import psycopg
+
+    from devrel.llm.cache import postgres_conninfo_from_env
+
+    sql = _ISSUE_VECTORS_SQL
+    params: list[object] = [model, item_type]
+    if repo:
+        sql += " AND d.repo_full_name = %s"
+        params.append(repo)
+    sql += " ORDER BY d.item_number"
+    if limit:
+        sql += " LIMIT %s"
+        params.append(limit)
+
+    items: list[ClusterItem] = []
+    rows: list[np.ndarray] = []
+    with psycopg.connect(conninfo or postgres_conninfo_from_env()) as conn:
+        with conn.cursor(name="doc_gap_vectors") as cur:
+            cur.itersize = 2000
+            cur.execute(sql, params)
+            for number, text, occurred_at, embedding in cur:
+                items.append(ClusterItem(issue_from_kb_text(int(number), text or ""), occurred_at))
+                vec = np.array(embedding.strip("[]").split(","), dtype=np.float32)
+                rows.append(vec[:dims] if dims else vec)
+    if not rows:
+        return [], np.zeros((0, dims or 0), dtype=np.float32)
+    return items, prepare_vectors(np.vstack(rows), dims)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
 from devrel.llm.client import JsonSchema, LlmClient
@@ -96,31 +97,32 @@ def summarize_doc_gap(candidate: DocGapCandidate) -> str:
     return f"Topic={candidate.topic}, evidence={numbers}, rationale={candidate.rationale}"
 
 
-def detect_doc_gaps_llm(llm: LlmClient, issues: list[Issue]) -> DocGapOutput:
-    schema = JsonSchema(
-        name="doc_gap_output",
-        schema={
-            "type": "object",
-            "additionalProperties": False,
-            "properties": {
-                "has_gap": {"type": "boolean"},
-                "gap_topic": {"type": "string"},
-                "affected_issues": {"type": "array", "items": {"type": "integer"}},
-                "suggested_doc_path": {"type": "string"},
-                "suggested_outline": {"type": "array", "items": {"type": "string"}},
-                "priority": {"type": "string", "enum": [p.value for p in Priority]},
-            },
-            "required": [
-                "has_gap",
-                "gap_topic",
-                "affected_issues",
-                "suggested_doc_path",
-                "suggested_outline",
-                "priority",
-            ],
+DOC_GAP_SCHEMA = JsonSchema(
+    name="doc_gap_output",
+    schema={
+        "type": "object",
+        "additionalProperties": False,
+        "properties": {
+            "has_gap": {"type": "boolean"},
+            "gap_topic": {"type": "string"},
+            "affected_issues": {"type": "array", "items": {"type": "integer"}},
+            "suggested_doc_path": {"type": "string"},
+            "suggested_outline": {"type": "array", "items": {"type": "string"}},
+            "priority": {"type": "string", "enum": [p.value for p in Priority]},
         },
-    )
+        "required": [
+            "has_gap",
+            "gap_topic",
+            "affected_issues",
+            "suggested_doc_path",
+            "suggested_outline",
+            "priority",
+        ],
+    },
+)
+
 
+def detect_doc_gaps_llm(llm: LlmClient, issues: list[Issue]) -> DocGapOutput:
     system = (
         "You are a DevRel agent that detects documentation gaps from GitHub issues.\n"
         "Return only JSON. Do not hallucinate issue numbers not provided."
@@ -129,7 +131,7 @@ def detect_doc_gaps_llm(llm: LlmClient, issues: list[Issue]) -> DocGapOutput:
         {"number": i.number, "title": i.title, "body": i.body, "labels": list(i.labels)} for i in issues
     ]
     user = f"Issues:\n{json.dumps(payload, ensure_ascii=False)}"
-    data = llm.generate_json(task=LlmTask.DOCS, system=system, user=user, json_schema=schema)
+    data = llm.generate_json(task=LlmTask.DOCS, system=system, user=user, json_schema=DOC_GAP_SCHEMA)
     return doc_gap_output_from_dict(data)
 
 
@@ -155,17 +157,20 @@ def detect_doc_gaps_with_tavily(
     # 2. Search for similar repos and best practices
     tavily = TavilyClient(api_key=tavily_api_key)
 
-    # Search for similar repos with good documentation
-    similar_insight = tavily.search_similar_repos(
-        repo_name=repo_name,
-        topic=f"{base_gap.gap_topic} documentation",
-    )
-
-    # Search for documentation best practices
-    best_practices_insight = tavily.search_docs_best_practices(
-        topic=base_gap.gap_topic,
-        repo_type="python agent framework",
-    )
+    # Search for similar repos with good documentation and for best practices, concurrently
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        similar = pool.submit(
+            tavily.search_similar_repos,
+            repo_name=repo_name,
+            topic=f"{base_gap.gap_topic} documentation",
+        )
+        best_practices = pool.submit(
+            tavily.search_docs_best_practices,
+            topic=base_gap.gap_topic,
+            repo_type="python agent framework",
+        )
+        similar_insight = similar.result()
+        best_practices_insight = best_practices.result()
 
     # 3. Extract external doc references
     external_refs = []
@@ -210,7 +215,7 @@ def detect_doc_gaps_with_github(
         reference_repos: List of reference repos to compare (auto-detected if None)
         github_token: GitHub token (or set GITHUB_TOKEN env var)
     """
-    from devrel.search.github_client import GitHubClient
+    from devrel.search.github_client import GitHubClient, compare_structures
 
     # 1. Basic doc gap analysis
     base_gap = detect_doc_gaps_llm(llm, issues)
@@ -225,8 +230,10 @@ def detect_doc_gaps_with_github(
             language="python",
         )
 
-    # 4. Get target repo docs structure
-    target_docs_raw = github.get_docs_structure(target_repo)
+    # 4. Get target and reference repos docs structures in one concurrent crawl
+    reference_repos = list(reference_repos[:3])  # Limit to 3 reference repos
+    structures = github.get_docs_structures([target_repo, *reference_repos])
+    target_docs_raw = structures.get(target_repo)
     target_docs = None
     if target_docs_raw:
         target_docs = RepoDocsInfo(
@@ -240,13 +247,13 @@ def detect_doc_gaps_with_github(
             total_files=target_docs_raw.total_files,
         )
 
-    # 5. Get reference repos docs structures and compare
+    # 5. Compare with reference repos docs structures
     ref_docs_list = []
     all_missing_topics = set()
     all_reference_examples = []
 
-    for ref_repo in reference_repos[:3]:  # Limit to 3 reference repos
-        comparison = github.compare_docs(target_repo, ref_repo)
+    for ref_repo in reference_repos:
+        comparison = compare_structures(target_repo, ref_repo, target_docs_raw, structures.get(ref_repo))
 
         if comparison.reference_docs:
             ref_info = RepoDocsInfo(
@@ -301,7 +308,7 @@ def detect_doc_gaps_with_github(
     # 9. Build comparison result
     docs_comparison = DocsComparisonResult(
         target_repo=target_repo,
-        reference_repos=tuple(reference_repos[:3]),
+        reference_repos=tuple(reference_repos),
         target_docs=target_docs,
         reference_docs=tuple(ref_docs_list),
         missing_topics=tuple(sorted(all_missing_topics)),
@@ -356,12 +363,27 @@ def detect_doc_gaps_full(
         github_token: GitHub token (or set GITHUB_TOKEN env var)
         tavily_api_key: Tavily API key (or set TAVILY_API_KEY env var)
     """
-    from devrel.search.github_client import GitHubClient
+    from devrel.search.github_client import GitHubClient, compare_structures
     from devrel.search.tavily_client import TavilyClient
 
     # 1. Basic doc gap analysis via LLM
     base_gap = detect_doc_gaps_llm(llm, issues)
 
+    # The Tavily searches only depend on the gap topic; they run while GitHub is crawled.
+    tavily = TavilyClient(api_key=tavily_api_key)
+    pool = ThreadPoolExecutor(max_workers=2)
+    similar = pool.submit(
+        tavily.search_similar_repos,
+        repo_name=target_repo,
+        topic=f"{base_gap.gap_topic} documentation",
+    )
+    best_practices = pool.submit(
+        tavily.search_docs_best_practices,
+        topic=base_gap.gap_topic,
+        repo_type="python agent framework",
+    )
+    pool.shutdown(wait=False)
+
     # ========== GitHub API ==========
     github = GitHubClient(token=github_token)
 
@@ -375,8 +397,10 @@ def detect_doc_gaps_full(
         if not reference_repos:
             reference_repos = ["redis/redis-py", "psf/requests", "pallets/flask"]
 
-    # Get target repo docs structure
-    target_docs_raw = github.get_docs_structure(target_repo)
+    # Get target and reference repos docs structures in one concurrent crawl
+    reference_repos = list(reference_repos[:3])
+    structures = github.get_docs_structures([target_repo, *reference_repos])
+    target_docs_raw = structures.get(target_repo)
     target_docs = None
     if target_docs_raw:
         target_docs = RepoDocsInfo(
@@ -395,8 +419,8 @@ def detect_doc_gaps_full(
     all_missing_topics = set()
     all_reference_examples = []
 
-    for ref_repo in reference_repos[:3]:
-        comparison = github.compare_docs(target_repo, ref_repo)
+    for ref_repo in reference_repos:
+        comparison = compare_structures(target_repo, ref_repo, target_docs_raw, structures.get(ref_repo))
         if comparison.reference_docs:
             ref_info = RepoDocsInfo(
                 repo=comparison.reference_docs.repo,
@@ -431,7 +455,7 @@ def detect_doc_gaps_full(
 
     docs_comparison = DocsComparisonResult(
         target_repo=target_repo,
-        reference_repos=tuple(reference_repos[:3]),
+        reference_repos=tuple(reference_repos),
         target_docs=target_docs,
         reference_docs=tuple(ref_docs_list),
         missing_topics=tuple(sorted(all_missing_topics)),
@@ -441,18 +465,8 @@ def detect_doc_gaps_full(
     )
 
     # ========== Tavily API ==========
-    tavily = TavilyClient(api_key=tavily_api_key)
-
-    # Search for similar repos and best practices
-    similar_insight = tavily.search_similar_repos(
-        repo_name=target_repo,
-        topic=f"{base_gap.gap_topic} documentation",
-    )
-
-    best_practices_insight = tavily.search_docs_best_practices(
-        topic=base_gap.gap_topic,
-        repo_type="python agent framework",
-    )
+    similar_insight = similar.result()
+    best_practices_insight = best_practices.result()
 
     # Extract external doc references from Tavily
     tavily_refs = []
@@ -0,0 +1,240 @@
+"""Code-ownership signal for assignment, from PR file history.
+
+`OwnershipTrie` is a path trie (one node per path segment) whose nodes carry
+per-contributor weights: every PR that touched `src/agents/run.py` adds the
+author's (and reviewers') weight to `src`, `src/agents` and `src/agents/run.py`,
+decayed by age with a half-life. Looking up a path walks one node per segment,
+so it is O(path depth) regardless of repository size. Partial mentions
+(`run.py`, `agents/tracing/`, `agents.tracing.spans`) go through a suffix index
+built with the trie, so resolving them is also O(depth); a suffix shared by
+several paths is ambiguous and resolves to nothing.
+
+The trie is built from `repo_code_ownership.csv` (phase1
+`scripts/export_code_ownership_csv.py`) and stored as compact JSON.
+`ownership_scores(trie, issue)` turns the paths and modules an issue mentions
+into per-login scores for `recommend_assignee(..., ownership=...)`.
+"""
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+import re
+from collections.abc import Iterable, Mapping
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .types import Issue
+
+ROLE_WEIGHTS: dict[str, float] = {"author": 1.0, "reviewer": 0.5}
+DEFAULT_HALF_LIFE_DAYS = 180.0
+MIN_WEIGHT = 1e-3  # smaller weights are dropped when saving
+
+# "src/agents/run.py", "agents/tracing/", "run.py", "agents.tracing.processors"
+_PATH_MENTION = re.compile(r"(?<![\w/.-])((?:[\w.-]+/)+[\w.-]*|[\w-]+\.(?:py|pyi|md|ts|tsx|js|toml|yaml|yml|json)\b)")
+_MODULE_MENTION = re.compile(r"\b([a-z_][a-z0-9_]*(?:\.[a-z_][a-z0-9_]*){1,})\b")
+
+
+class _Node:
+    __slots__ = ("children", "owners")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.owners: dict[str, float] = {}
+
+
+def _segments(path: str) -> list[str]:
+    return [s for s in path.strip().strip("/").split("/") if s and s != "."]
+
+
+def _login(user_id: str) -> str:
+    return user_id.lstrip("@")
+
+
+class OwnershipTrie:
+    def __init__(self) -> None:
+        self.root = _Node()
+        self._suffixes: dict[str, str | None] | None = None
+
+    def add(self, path: str, login: str, weight: float) -> None:
+        node = self.root
+        for segment in _segments(path):
+            node = node.children.setdefault(segment, _Node())
+            node.owners[login] = node.owners.get(login, 0.0) + weight
+        self._suffixes = None
+
+    def _suffix_index(self) -> dict[str, str | None]:
+        """Every proper suffix of every node path (and of `.py` files without the suffix) -> that path.
+
+        A suffix reached from two different paths maps to None (ambiguous).
+        """
+        if self._suffixes is not None:
+            return self._suffixes
+        index: dict[str, str | None] = {}
+
+        def put(key: str, path: str) -> None:
+            if key in index and index[key] != path:
+                index[key] = None
+            else:
+                index[key] = path
+
+        stack: list[tuple[list[str], _Node]] = [([], self.root)]
+        while stack:
+            prefix, node = stack.pop()
+            for segment, child in node.children.items():
+                segments = [*prefix, segment]
+                path = "/".join(segments)
+                for i in range(1, len(segments)):  # full paths are resolved from the root
+                    suffix = "/".join(segments[i:])
+                    put(suffix, path)
+                    if suffix.endswith(".py"):
+                        put(suffix[:-3], path)  # dotted module mentions name the file without it
+                stack.append((segments, child))
+        self._suffixes = index
+        return index
+
+    def lookup(self, path: str) -> dict[str, float]:
+        """Owners of the deepest node on `path` (the most specific prefix with history)."""
+        node = self.root
+        found: dict[str, float] = {}
+        for segment in _segments(path):
+            # Dotted module mentions (`agents.tracing.spans`) name the file without its suffix.
+            child = node.children.get(segment) or node.children.get(f"{segment}.py")
+            if child is None:
+                break
+            node = child
+            found = node.owners
+        return dict(found)
+
+    def resolve(self, mention: str) -> str | None:
+        """Repository path for a mention such as `agents/run.py` or `run.py`; None when unknown or ambiguous.
+
+        The longest leading part of the mention that is a known path suffix is
+        expanded to its full path; the rest is kept, so a file with no history
+        still resolves into its directory (`lookup` then uses the deepest prefix).
+        """
+        segments = _segments(mention)
+        if not segments:
+            return None
+        if segments[0] in self.root.children:
+            return "/".join(segments)
+        index = self._suffix_index()
+        for i in range(len(segments), 0, -1):
+            key = "/".join(segments[:i])
+            if key in index:
+                path = index[key]
+                return None if path is None else "/".join([path, *segments[i:]])
+        return None
+
+    def owners_for(self, paths: Iterable[str]) -> dict[str, float]:
+        """Summed owner weights over the resolved `paths`, normalised so the top owner has 1.0."""
+        totals: dict[str, float] = {}
+        for mention in paths:
+            path = self.resolve(mention)
+            if path is None:
+                continue
+            for login, weight in self.lookup(path).items():
+                totals[login] = totals.get(login, 0.0) + weight
+        top = max(totals.values(), default=0.0)
+        return {login: w / top for login, w in totals.items()} if top > 0 else {}
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Mapping[str, str]],
+        *,
+        repo: str | None = None,
+        half_life_days: float = DEFAULT_HALF_LIFE_DAYS,
+        now: datetime | None = None,
+    ) -> OwnershipTrie:
+        """Build from `repo_code_ownership.csv` rows; weights decay from `now` (default: newest row)."""
+        events: list[tuple[str, str, float, datetime]] = []
+        for row in rows:
+            if repo and row["repo_full_name"] != repo:
+                continue
+            role_weight = ROLE_WEIGHTS.get(row["role"])
+            if role_weight is None:
+                continue
+            occurred_at = datetime.fromisoformat(row["occurred_at"].replace("Z", "+00:00"))
+            events.append((row["path"], _login(row["user_id"]), role_weight, occurred_at))
+
+        trie = cls()
+        if not events:
+            return trie
+        now = now or max(e[3] for e in events)
+        for path, login, role_weight, occurred_at in events:
+            age_days = max(0.0, (now - occurred_at).total_seconds() / 86400)
+            trie.add(path, login, role_weight * 0.5 ** (age_days / half_life_days))
+        trie._suffix_index()
+        return trie
+
+    @classmethod
+    def from_csv(cls, path: str | Path, **kwargs: Any) -> OwnershipTrie:
+        with Path(path).open("r", encoding="utf-8") as f:
+            return cls.from_rows(csv.DictReader(f), **kwargs)
+
+    def to_dict(self) -> dict[str, Any]:
+        # {"o": {login: weight}, "c": {segment: node}}; logins are interned in a table.
+        logins: dict[str, int] = {}
+
+        def encode(node: _Node) -> dict[str, Any]:
+            out: dict[str, Any] = {}
+            owners = {
+                logins.setdefault(login, len(logins)): round(w, 4) for login, w in node.owners.items() if w >= MIN_WEIGHT
+            }
+            if owners:
+                out["o"] = owners
+            if node.children:
+                out["c"] = {segment: encode(child) for segment, child in sorted(node.children.items())}
+            return out
+
+        tree = encode(self.root)
+        return {"version": 1, "logins": list(logins), "tree": tree}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> OwnershipTrie:
+        if data.get("version") != 1:
+            raise ValueError(f"Unsupported ownership index version: {data.get('version')}")
+        logins = list(data["logins"])
+
+        def decode(raw: Mapping[str, Any]) -> _Node:
+            node = _Node()
+            node.owners = {logins[int(i)]: float(w) for i, w in (raw.get("o") or {}).items()}
+            node.children = {segment: decode(child) for segment, child in (raw.get("c") or {}).items()}
+            return node
+
+        trie = cls()
+        trie.root = decode(data["tree"])
+        trie._suffix_index()
+        return trie
+
+    def save(self, path: str | Path) -> None:
+        raw = json.dumps(self.to_dict(), separators=(",", ":")).encode("utf-8")
+        Path(path).write_bytes(gzip.compress(raw) if str(path).endswith(".gz") else raw)
+
+    @classmethod
+    def load(cls, path: str | Path) -> OwnershipTrie:
+        raw = Path(path).read_bytes()
+        if str(path).endswith(".gz"):
+            raw = gzip.decompress(raw)
+        return cls.from_dict(json.loads(raw))
+
+
+def mentioned_paths(text: str) -> list[str]:
+    """File paths, file names and dotted module names mentioned in issue text."""
+    found: list[str] = []
+    for m in _PATH_MENTION.finditer(text):
+        found.append(m.group(1).rstrip("."))
+    for m in _MODULE_MENTION.finditer(text):
+        module = m.group(1)
+        if not re.search(r"\.(py|md|com|org|io|txt)$", module):
+            found.append(module.replace(".", "/"))
+    return list(dict.fromkeys(p for p in found if p))
+
+
+def ownership_scores(trie: OwnershipTrie | None, issue: Issue) -> dict[str, float]:
+    """Per-login ownership (0..1) of the code the issue mentions; empty when nothing resolves."""
+    if trie is None:
+        return {}
+    return trie.owners_for(mentioned_paths(f"{issue.title}\n{issue.body}"))
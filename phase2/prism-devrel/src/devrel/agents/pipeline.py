@@ -0,0 +1,241 @@
+"""Run the issue agents as a small DAG so independent steps overlap.
+
+    triage ──┬── assignment
+             ├── doc_gap
+    rag ─────┴── response          promotion (independent)
+
+Retrieval starts from the issue title while triage is still running, and the
+fan-out after triage runs concurrently, so the pipeline takes roughly as long as
+its critical path (triage/rag -> response) instead of the sum of all steps.
+Each node has its own timeout; a failed or timed-out node only takes down the
+nodes that require it, and everything else is still returned.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from devrel.llm.model_selector import LlmTask
+from devrel.search.context_builder import build_references
+
+from .assignment import analyze_issue, analyze_issue_llm_async, recommend_assignee
+from .docs import DocGapCandidate, detect_doc_gaps, to_doc_gap_output
+from .ownership import ownership_scores
+from .promotion import evaluate_promotion
+from .response import draft_response, draft_response_llm_async, rag_search_query
+from .types import Contributor, Issue, IssueType
+
+if TYPE_CHECKING:
+    from devrel.llm.client import AsyncLlmClient
+
+    from .contributor_index import ContributorIndex
+    from .ownership import OwnershipTrie
+    from devrel.search.rag_client import AsyncRAGClient
+
+
+NodeFn = Callable[[Mapping[str, Any]], Awaitable[Any]]
+
+DEFAULT_NODE_TIMEOUTS: dict[str, float] = {
+    "triage": 30.0,
+    "rag": 10.0,
+    "assignment": 10.0,
+    "doc_gap": 10.0,
+    "promotion": 10.0,
+    "response": 45.0,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class PipelineNode:
+    """One step of the DAG.
+
+    `fn` receives the values of its successful upstream nodes keyed by name.
+    A node is skipped when any of `requires` did not succeed; nodes listed in
+    `after` are waited for but may fail without skipping this node.
+    """
+
+    name: str
+    fn: NodeFn
+    requires: tuple[str, ...] = ()
+    after: tuple[str, ...] = ()
+    timeout_s: float | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class NodeResult:
+    name: str
+    status: str  # ok | error | timeout | skipped
+    value: Any = None
+    error: str = ""
+    started_ms: float = 0.0
+    duration_ms: float = 0.0
+
+
+def _topological_order(nodes: Sequence[PipelineNode]) -> list[PipelineNode]:
+    by_name: dict[str, PipelineNode] = {}
+    for node in nodes:
+        if node.name in by_name:
+            raise ValueError(f"Duplicate pipeline node: {node.name}")
+        by_name[node.name] = node
+    for node in nodes:
+        unknown = [d for d in (*node.requires, *node.after) if d not in by_name]
+        if unknown:
+            raise ValueError(f"Node {node.name} depends on unknown nodes: {unknown}")
+
+    order: list[PipelineNode] = []
+    state: dict[str, int] = {}  # 1 = visiting, 2 = done
+
+    def visit(node: PipelineNode) -> None:
+        mark = state.get(node.name)
+        if mark == 2:
+            return
+        if mark == 1:
+            raise ValueError(f"Pipeline has a cycle through {node.name}")
+        state[node.name] = 1
+        for dep in (*node.requires, *node.after):
+            visit(by_name[dep])
+        state[node.name] = 2
+        order.append(node)
+
+    for node in nodes:
+        visit(node)
+    return order
+
+
+async def run_dag(nodes: Sequence[PipelineNode]) -> dict[str, NodeResult]:
+    """Run every node as soon as its dependencies settle; returns one result per node, in input order."""
+    order = _topological_order(nodes)
+    t0 = time.perf_counter()
+    tasks: dict[str, asyncio.Task[NodeResult]] = {}
+
+    def elapsed_ms(since: float) -> float:
+        return round((time.perf_counter() - since) * 1000.0, 1)
+
+    async def run_node(node: PipelineNode) -> NodeResult:
+        deps = (*node.requires, *node.after)
+        if deps:
+            await asyncio.wait([tasks[d] for d in deps])
+        upstream = {d: tasks[d].result() for d in deps}
+        failed = [d for d in node.requires if upstream[d].status != "ok"]
+        if failed:
+            return NodeResult(name=node.name, status="skipped", error=f"upstream not ok: {', '.join(failed)}")
+
+        inputs = {d: r.value for d, r in upstream.items() if r.status == "ok"}
+        started = time.perf_counter()
+        started_ms = round((started - t0) * 1000.0, 1)
+        try:
+            value = await asyncio.wait_for(node.fn(inputs), timeout=node.timeout_s)
+        except asyncio.TimeoutError:
+            return NodeResult(
+                name=node.name,
+                status="timeout",
+                error=f"timed out after {node.timeout_s}s",
+                started_ms=started_ms,
+                duration_ms=elapsed_ms(started),
+            )
+        except Exception as e:
+            return NodeResult(
+                name=node.name,
+                status="error",
+                error=f"{type(e).__name__}: {e}",
+                started_ms=started_ms,
+                duration_ms=elapsed_ms(started),
+            )
+        return NodeResult(
+            name=node.name,
+            status="ok",
+            value=value,
+            started_ms=started_ms,
+            duration_ms=elapsed_ms(started),
+        )
+
+    for node in order:
+        tasks[node.name] = asyncio.create_task(run_node(node))
+    await asyncio.gather(*tasks.values())
+    return {node.name: tasks[node.name].result() for node in nodes}
+
+
+def build_issue_pipeline(
+    issue: Issue,
+    *,
+    llm: AsyncLlmClient | None = None,
+    rag: AsyncRAGClient | None = None,
+    contributors: Sequence[Contributor] = (),
+    contributor_index: ContributorIndex | None = None,
+    ownership: OwnershipTrie | None = None,
+    search_limit: int = 5,
+    timeouts: Mapping[str, float] | None = None,
+) -> list[PipelineNode]:
+    """Build the agent DAG for one issue.
+
+    Triage and the response draft use the LLM when `llm` is given; assignment,
+    doc-gap and promotion use the heuristic agents. The `rag` node is only added
+    when a RAG client is available, assignment only when contributors or a
+    `contributor_index` are provided (the index is used when no contributors
+    are passed), and promotion only when contributors are provided. With an
+    `ownership` trie, assignment also favours owners of the code the issue mentions.
+    """
+    limits = {**DEFAULT_NODE_TIMEOUTS, **(timeouts or {})}
+    team = list(contributors)
+
+    async def triage(_: Mapping[str, Any]) -> Any:
+        if llm is not None:
+            return await analyze_issue_llm_async(llm, issue)
+        return analyze_issue(issue)
+
+    async def retrieve(_: Mapping[str, Any]) -> Any:
+        # Only the title is known before triage finishes; keywords are not worth the wait.
+        assert rag is not None
+        return await rag.search_hybrid(issue.title, limit=search_limit)
+
+    async def assignment(inputs: Mapping[str, Any]) -> Any:
+        owners = ownership_scores(ownership, issue)
+        if not team and contributor_index is not None:
+            return contributor_index.recommend(inputs["triage"], ownership=owners)
+        return recommend_assignee(inputs["triage"], team, ownership=owners)
+
+    async def doc_gap(inputs: Mapping[str, Any]) -> Any:
+        candidates = detect_doc_gaps([issue])
+        if not candidates and inputs["triage"].issue_type == IssueType.DOCUMENTATION:
+            candidates = [
+                DocGapCandidate(
+                    topic="documentation",
+                    evidence_issue_numbers=(issue.number,),
+                    rationale="Triage classified the issue as a documentation request.",
+                )
+            ]
+        return to_doc_gap_output(candidates[0]) if candidates else None
+
+    async def promotion(_: Mapping[str, Any]) -> Any:
+        return {c.login: evaluate_promotion(c) for c in team}
+
+    async def response(inputs: Mapping[str, Any]) -> Any:
+        analysis = inputs["triage"]
+        if llm is None:
+            return draft_response(issue, analysis)
+        references = None
+        if "rag" in inputs:
+            references = build_references(rag_search_query(issue, analysis), inputs["rag"], task=LlmTask.RESPONSE)
+        return await draft_response_llm_async(llm, issue=issue, analysis=analysis, references=references)
+
+    nodes = [PipelineNode("triage", triage, timeout_s=limits["triage"])]
+    if rag is not None:
+        nodes.append(PipelineNode("rag", retrieve, timeout_s=limits["rag"]))
+    if team or contributor_index is not None:
+        nodes.append(PipelineNode("assignment", assignment, requires=("triage",), timeout_s=limits["assignment"]))
+    if team:
+        nodes.append(PipelineNode("promotion", promotion, timeout_s=limits["promotion"]))
+    nodes.append(PipelineNode("doc_gap", doc_gap, requires=("triage",), timeout_s=limits["doc_gap"]))
+    nodes.append(
+        PipelineNode(
+            "response",
+            response,
+            requires=("triage",),
+            after=("rag",) if rag is not None else (),
+            timeout_s=limits["response"],
+        )
+    )
+    return nodes
@@ -12,7 +12,11 @@ from .types import promotion_output_from_dict
 def evaluate_promotion(contributor: Contributor) -> PromotionOutput:
     current_stage = _infer_stage(contributor)
     suggested_stage = _suggest_next_stage(current_stage, contributor)
+    return promotion_output(contributor, current_stage, suggested_stage)
 
+
+def promotion_output(contributor: Contributor, current_stage: str, suggested_stage: str) -> PromotionOutput:
+    """Heuristic evidence and recommendation for stages that were already inferred."""
     evidence: list[PromotionEvidence] = []
     evidence.append(
         PromotionEvidence(
@@ -0,0 +1,378 @@
+"""Promotion evaluation as a batch job over precomputed contributor features.
+
+`evaluate_promotion` / `evaluate_promotion_llm` look at one `Contributor` per
+call. `run_promotion_batch` evaluates the whole team at once:
+
+1. Features for every contributor come from the exported `repo_user_activity.csv`
+   through an `ActivityStore` (`contributors_from_csv`), the same derivation the
+   contributor index and the raw_data loader use.
+2. Stages are inferred column-wise from the `merged_prs` column
+   (`infer_stages`, `suggest_next_stages`), using the same thresholds as
+   `_infer_stage` / `_suggest_next_stage`.
+3. Only contributors whose stage changed go to the LLM for narrative evidence.
+   A record remembers the stage its LLM narrative was written for
+   (`narrated_stage`); while that differs from the current stage the narrative
+   is pending, so a change that missed the `llm_limit` cap or whose call failed
+   is picked up by a later run. Everyone else keeps the heuristic output, or the
+   narrative from an earlier run while their stage is unchanged.
+4. The results are materialised into a SQLite table (`PromotionStore`) that
+   `GET /api/promotions` reads without evaluating anything.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from bisect import bisect_right
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from devrel.llm.client import LlmClient
+
+from .activity_store import ActivityStore
+from .promotion import evaluate_promotion_llm, promotion_output
+from .types import Contributor, PromotionEvidence, PromotionOutput
+
+DEFAULT_LLM_LIMIT = 50  # LLM narratives per run; further stage changes stay pending for the next run
+
+STAGES = ("NEW", "FIRST_TIMER", "REGULAR", "CORE", "MAINTAINER")
+# Minimum merged PRs for each stage in STAGES; the thresholds `_infer_stage` uses.
+STAGE_MIN_MERGED_PRS = (0, 1, 2, 10, 30)
+_NEXT_STAGE = {
+    stage: (STAGES[i + 1], STAGE_MIN_MERGED_PRS[i + 1]) for i, stage in enumerate(STAGES[:-1])
+}
+
+
+def infer_stages(merged_prs: Sequence[int]) -> list[str]:
+    """`_infer_stage` for a whole `merged_prs` column."""
+    return [STAGES[max(0, bisect_right(STAGE_MIN_MERGED_PRS, m) - 1)] for m in merged_prs]
+
+
+def suggest_next_stages(stages: Sequence[str], merged_prs: Sequence[int]) -> list[str]:
+    """`_suggest_next_stage` for whole `stages` / `merged_prs` columns."""
+    suggested: list[str] = []
+    for stage, merged in zip(stages, merged_prs):
+        nxt = _NEXT_STAGE.get(stage)
+        suggested.append(nxt[0] if nxt is not None and merged >= nxt[1] else stage)
+    return suggested
+
+
+def contributors_from_csv(
+    path: str | Path,
+    *,
+    repo: str | None = None,
+    exclude: Callable[[str], bool] | None = None,
+    cache_path: str | Path | None = None,
+) -> list[Contributor]:
+    """Every contributor's features from `repo_user_activity.csv` (`cache_path`: see `ActivityStore.from_csv`)."""
+    store = ActivityStore.from_csv(path, cache_path=cache_path)
+    try:
+        return store.contributors(repo=repo, exclude=exclude)
+    finally:
+        store.close()
+
+
+def _stage_key(output: PromotionOutput) -> str:
+    return f"{output.current_stage}->{output.suggested_stage}"
+
+
+@dataclass(frozen=True, slots=True)
+class PromotionRecord:
+    login: str
+    output: PromotionOutput
+    merged_prs: int
+    reviews: int
+    recent_activity_score: float
+    areas: tuple[str, ...]
+    narrative: str  # "heuristic" or "llm"
+    stage_changed_at: str | None
+    updated_at: str
+    narrated_stage: str | None = None  # `_stage_key` the LLM narrative was written for
+
+    @property
+    def narrative_pending(self) -> bool:
+        """The stage changed and no LLM narrative covers the current stage yet."""
+        return self.stage_changed_at is not None and self.narrated_stage != _stage_key(self.output)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "login": self.login,
+            **asdict(self.output),
+            "merged_prs": self.merged_prs,
+            "reviews": self.reviews,
+            "recent_activity_score": self.recent_activity_score,
+            "areas": list(self.areas),
+            "narrative": self.narrative,
+            "stage_changed_at": self.stage_changed_at,
+            "updated_at": self.updated_at,
+            "narrative_pending": self.narrative_pending,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class PromotionRunStats:
+    run_at: str
+    contributors: int
+    stage_changes: int
+    llm_calls: int
+    llm_errors: int
+    elapsed_s: float
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS promotion_status (
+  login text PRIMARY KEY,
+  current_stage text NOT NULL,
+  suggested_stage text NOT NULL,
+  is_candidate integer NOT NULL,
+  confidence real NOT NULL,
+  evidence text NOT NULL,
+  recommendation text NOT NULL,
+  merged_prs integer NOT NULL,
+  reviews integer NOT NULL,
+  recent_activity_score real NOT NULL,
+  areas text NOT NULL,
+  narrative text NOT NULL,
+  stage_changed_at text,
+  updated_at text NOT NULL,
+  narrated_stage text
+);
+CREATE INDEX IF NOT EXISTS idx_promotion_status_rank
+  ON promotion_status (is_candidate DESC, confidence DESC, merged_prs DESC);
+CREATE INDEX IF NOT EXISTS idx_promotion_status_stage ON promotion_status (current_stage);
+CREATE TABLE IF NOT EXISTS promotion_run (
+  run_at text PRIMARY KEY,
+  contributors integer NOT NULL,
+  stage_changes integer NOT NULL,
+  llm_calls integer NOT NULL,
+  llm_errors integer NOT NULL,
+  elapsed_s real NOT NULL
+);
+"""
+
+_COLUMNS = (
+    "login, current_stage, suggested_stage, is_candidate, confidence, evidence, recommendation, "
+    "merged_prs, reviews, recent_activity_score, areas, narrative, stage_changed_at, updated_at, narrated_stage"
+)
+
+
+def _record_from_row(row: Sequence[Any]) -> PromotionRecord:
+    return PromotionRecord(
+        login=row[0],
+        output=PromotionOutput(
+            is_candidate=bool(row[3]),
+            current_stage=row[1],
+            suggested_stage=row[2],
+            confidence=float(row[4]),
+            evidence=tuple(PromotionEvidence(**e) for e in json.loads(row[5])),
+            recommendation=row[6],
+        ),
+        merged_prs=int(row[7]),
+        reviews=int(row[8]),
+        recent_activity_score=float(row[9]),
+        areas=tuple(json.loads(row[10])),
+        narrative=row[11],
+        stage_changed_at=row[12],
+        updated_at=row[13],
+        narrated_stage=row[14],
+    )
+
+
+class PromotionStore:
+    """Materialised promotion results, one row per contributor, plus a log of runs."""
+
+    def __init__(self, path: str) -> None:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SQLITE_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(promotion_status)")}
+        if "narrated_stage" not in columns:  # stores written before narratives could be pending
+            self._conn.execute("ALTER TABLE promotion_status ADD COLUMN narrated_stage text")
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def records(self) -> dict[str, PromotionRecord]:
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {_COLUMNS} FROM promotion_status").fetchall()
+        return {row[0]: _record_from_row(row) for row in rows}
+
+    def get(self, login: str) -> PromotionRecord | None:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_COLUMNS} FROM promotion_status WHERE login = ?", (login,)).fetchone()
+        return _record_from_row(row) if row else None
+
+    def query(
+        self,
+        *,
+        candidates_only: bool = False,
+        stage: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> tuple[int, list[PromotionRecord]]:
+        """(total matching, one page ordered candidates first, then by confidence and merged PRs)."""
+        where: list[str] = []
+        params: list[Any] = []
+        if candidates_only:
+            where.append("is_candidate = 1")
+        if stage:
+            where.append("current_stage = ?")
+            params.append(stage)
+        clause = f" WHERE {' AND '.join(where)}" if where else ""
+        with self._lock:
+            (total,) = self._conn.execute(f"SELECT count(*) FROM promotion_status{clause}", params).fetchone()
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM promotion_status{clause} "
+                "ORDER BY is_candidate DESC, confidence DESC, merged_prs DESC, login LIMIT ? OFFSET ?",
+                [*params, limit, offset],
+            ).fetchall()
+        return int(total), [_record_from_row(row) for row in rows]
+
+    def last_run(self) -> PromotionRunStats | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT run_at, contributors, stage_changes, llm_calls, llm_errors, elapsed_s "
+                "FROM promotion_run ORDER BY run_at DESC LIMIT 1"
+            ).fetchone()
+        return PromotionRunStats(*row) if row else None
+
+    def write(self, records: Sequence[PromotionRecord], stats: PromotionRunStats) -> None:
+        """Upsert `records` and log the run, in one transaction."""
+        rows = [
+            (
+                r.login,
+                r.output.current_stage,
+                r.output.suggested_stage,
+                int(r.output.is_candidate),
+                r.output.confidence,
+                json.dumps([asdict(e) for e in r.output.evidence], ensure_ascii=False),
+                r.output.recommendation,
+                r.merged_prs,
+                r.reviews,
+                r.recent_activity_score,
+                json.dumps(list(r.areas)),
+                r.narrative,
+                r.stage_changed_at,
+                r.updated_at,
+                r.narrated_stage,
+            )
+            for r in records
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO promotion_status({_COLUMNS}) VALUES ({', '.join('?' * 15)})", rows
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO promotion_run VALUES (?, ?, ?, ?, ?, ?)",
+                    tuple(asdict(stats).values()),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+
+def run_promotion_batch(
+    contributors: Sequence[Contributor],
+    store: PromotionStore,
+    *,
+    llm: LlmClient | None = None,
+    llm_limit: int = DEFAULT_LLM_LIMIT,
+    now: datetime | None = None,
+) -> PromotionRunStats:
+    """Evaluate every contributor, ask the LLM about stage changes only, and materialise the results.
+
+    On the very first run (empty store) nobody counts as changed, so it only
+    records a baseline; afterwards a contributor seen for the first time counts
+    as changed. The LLM writes at most `llm_limit` narratives per run, for the
+    pending records whose stage changed longest ago.
+    """
+    started = time.perf_counter()
+    run_at = (now or datetime.now(timezone.utc)).isoformat()
+    previous = store.records()
+    first_run = not previous
+
+    merged = [c.merged_prs for c in contributors]
+    current = infer_stages(merged)
+    suggested = suggest_next_stages(current, merged)
+
+    records: list[PromotionRecord] = []
+    changed = 0
+    for contributor, cur, sug in zip(contributors, current, suggested):
+        prev = previous.get(contributor.login)
+        if prev is None:
+            stage_changed = not first_run
+        else:
+            stage_changed = (prev.output.current_stage, prev.output.suggested_stage) != (cur, sug)
+
+        output = promotion_output(contributor, cur, sug)
+        narrative = "heuristic"
+        narrated_stage = prev.narrated_stage if prev is not None else None
+        if prev is not None and prev.narrative == "llm" and narrated_stage == _stage_key(output):
+            # Same stage as when the LLM wrote it: keep that narrative.
+            output = replace(
+                output,
+                confidence=prev.output.confidence,
+                evidence=prev.output.evidence,
+                recommendation=prev.output.recommendation,
+            )
+            narrative = "llm"
+        changed += stage_changed
+        records.append(
+            PromotionRecord(
+                login=contributor.login,
+                output=output,
+                merged_prs=contributor.merged_prs,
+                reviews=contributor.reviews,
+                recent_activity_score=contributor.recent_activity_score,
+                areas=contributor.areas,
+                narrative=narrative,
+                stage_changed_at=run_at if stage_changed else (prev.stage_changed_at if prev else None),
+                updated_at=run_at,
+                narrated_stage=narrated_stage,
+            )
+        )
+
+    llm_calls = llm_errors = 0
+    if llm is not None:
+        # Pending rather than changed-this-run: changes past the cap or with a failed call are retried later.
+        pending = sorted(
+            (i for i, r in enumerate(records) if r.narrative_pending),
+            key=lambda i: records[i].stage_changed_at or "",
+        )
+        for i in pending[:llm_limit]:
+            llm_calls += 1
+            try:
+                narrative_output = evaluate_promotion_llm(llm, contributors[i])
+            except Exception:
+                llm_errors += 1
+                continue
+            # Stages stay the heuristic's; the LLM contributes the narrative.
+            output = replace(
+                records[i].output,
+                confidence=narrative_output.confidence,
+                evidence=narrative_output.evidence,
+                recommendation=narrative_output.recommendation,
+            )
+            records[i] = replace(records[i], output=output, narrative="llm", narrated_stage=_stage_key(output))
+
+    stats = PromotionRunStats(
+        run_at=run_at,
+        contributors=len(records),
+        stage_changes=changed,
+        llm_calls=llm_calls,
+        llm_errors=llm_errors,
+        elapsed_s=round(time.perf_counter() - started, 3),
+    )
+    store.write(records, stats)
+    return stats
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import json
+from collections.abc import AsyncIterator
 
-from devrel.llm.client import JsonSchema, LlmClient
+from devrel.llm.client import AsyncLlmClient, JsonSchema, JsonStreamEvent, LlmClient
 from devrel.llm.model_selector import LlmTask
-from devrel.search.rag_client import RAGClient
+from devrel.search.context_builder import build_references
+from devrel.search.rag_client import AsyncRAGClient, RAGClient
 
 from .types import (
     Issue,
@@ -47,13 +49,9 @@ def draft_response(issue: Issue, analysis: IssueAnalysisOutput) -> ResponseOutpu
     )
 
 
-def draft_response_llm(
-    llm: LlmClient,
-    *,
-    issue: Issue,
-    analysis: IssueAnalysisOutput,
-    references: list[str] | None = None,
-) -> ResponseOutput:
+def _response_request(
+    issue: Issue, analysis: IssueAnalysisOutput, references: list[str] | None
+) -> tuple[JsonSchema, str, str]:
     schema = JsonSchema(
         name="response_output",
         schema={
@@ -90,6 +88,17 @@ def draft_response_llm(
         "references": references or [],
     }
     user = f"Input:\n{json.dumps(payload, ensure_ascii=False)}"
+    return schema, system, user
+
+
+def draft_response_llm(
+    llm: LlmClient,
+    *,
+    issue: Issue,
+    analysis: IssueAnalysisOutput,
+    references: list[str] | None = None,
+) -> ResponseOutput:
+    schema, system, user = _response_request(issue, analysis, references)
     data = llm.generate_json(
         task=LlmTask.RESPONSE,
         system=system,
@@ -100,6 +109,59 @@ def draft_response_llm(
     return response_output_from_dict(data)
 
 
+async def draft_response_llm_async(
+    llm: AsyncLlmClient,
+    *,
+    issue: Issue,
+    analysis: IssueAnalysisOutput,
+    references: list[str] | None = None,
+) -> ResponseOutput:
+    schema, system, user = _response_request(issue, analysis, references)
+    data = await llm.generate_json(
+        task=LlmTask.RESPONSE,
+        system=system,
+        user=user,
+        json_schema=schema,
+        max_output_tokens=1200,
+    )
+    return response_output_from_dict(data)
+
+
+async def draft_response_llm_stream(
+    llm: AsyncLlmClient,
+    *,
+    issue: Issue,
+    analysis: IssueAnalysisOutput,
+    references: list[str] | None = None,
+) -> AsyncIterator[JsonStreamEvent | ResponseOutput]:
+    """Streaming `draft_response_llm_async`.
+
+    Yields `delta`/`reset` events for `response_text` while the model writes it,
+    then the validated `ResponseOutput` last.
+    """
+    schema, system, user = _response_request(issue, analysis, references)
+    async for event in llm.stream_json(
+        task=LlmTask.RESPONSE,
+        system=system,
+        user=user,
+        json_schema=schema,
+        text_field="response_text",
+        max_output_tokens=1200,
+    ):
+        if event.type == "done":
+            yield response_output_from_dict(event.data)
+        else:
+            yield event
+
+
+def rag_search_query(issue: Issue, analysis: IssueAnalysisOutput) -> str:
+    """Search query used for KB lookups: issue title plus the top analysis keywords."""
+    query_parts = [issue.title]
+    if analysis.keywords:
+        query_parts.extend(analysis.keywords[:3])
+    return " ".join(query_parts)
+
+
 def draft_response_with_rag(
     llm: LlmClient,
     rag: RAGClient,
@@ -114,21 +176,17 @@ def draft_response_with_rag(
     This function:
     1. Builds a search query from issue title and keywords
     2. Searches the KB using hybrid search (keyword + vector)
-    3. Formats results as references
+    3. Packs the most query-relevant sentences into a token-budgeted context
     4. Passes to LLM for response generation
     """
-    query_parts = [issue.title]
-    if analysis.keywords:
-        query_parts.extend(analysis.keywords[:3])
-    search_query = " ".join(query_parts)
-
+    query = rag_search_query(issue, analysis)
     kb_docs = rag.search_hybrid(
-        search_query,
+        query,
         limit=search_limit,
         repo_filter=repo_filter,
     )
 
-    references = rag.format_references(kb_docs)
+    references = build_references(query, kb_docs, task=LlmTask.RESPONSE)
 
     return draft_response_llm(
         llm,
@@ -136,3 +194,28 @@ def draft_response_with_rag(
         analysis=analysis,
         references=references,
     )
+
+
+async def draft_response_with_rag_async(
+    llm: AsyncLlmClient,
+    rag: AsyncRAGClient,
+    *,
+    issue: Issue,
+    analysis: IssueAnalysisOutput,
+    search_limit: int = 5,
+    repo_filter: str | None = None,
+) -> ResponseOutput:
+    """Async `draft_response_with_rag`: awaits the KB search and the LLM call."""
+    query = rag_search_query(issue, analysis)
+    kb_docs = await rag.search_hybrid(
+        query,
+        limit=search_limit,
+        repo_filter=repo_filter,
+    )
+
+    return await draft_response_llm_async(
+        llm,
+        issue=issue,
+        analysis=analysis,
+        references=build_references(query, kb_docs, task=LlmTask.RESPONSE),
+    )
@@ -0,0 +1,73 @@
+"""Triage many issues in one go (backfills, `/api/agents/analyze/batch`)."""
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+from devrel.llm.batch import BatchRequest, OpenAIBatchRunner, run_batch
+from devrel.llm.client import AsyncLlmClient
+from devrel.llm.model_selector import LlmTask
+
+from .assignment import analyze_issue, issue_analysis_request
+from .types import Issue, issue_analysis_from_dict, issue_analysis_to_dict
+
+
+async def analyze_issues_stream(
+    issues: Sequence[Issue],
+    *,
+    llm: AsyncLlmClient | None = None,
+    mode: str = "concurrent",
+    concurrency: int = 8,
+    max_retries: int = 2,
+    backoff_s: float = 0.5,
+    batch_runner: OpenAIBatchRunner | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield one JSON-ready line per issue as its analysis finishes.
+
+    Each line has `number`, `status` ("ok" or "error"), `attempts` and either
+    `analysis` or `error`. Without `llm` the heuristic `analyze_issue` is used.
+    """
+    if llm is None:
+        for issue in issues:
+            yield {
+                "number": issue.number,
+                "status": "ok",
+                "attempts": 1,
+                "transport": "heuristic",
+                "analysis": issue_analysis_to_dict(analyze_issue(issue)),
+            }
+        return
+
+    requests: list[BatchRequest] = []
+    numbers: dict[str, int] = {}
+    for i, issue in enumerate(issues):
+        schema, system, user = issue_analysis_request(issue)
+        custom_id = f"{i}:{issue.number}"
+        numbers[custom_id] = issue.number
+        requests.append(
+            BatchRequest(custom_id=custom_id, task=LlmTask.ISSUE_TRIAGE, system=system, user=user, json_schema=schema)
+        )
+
+    async for result in run_batch(
+        llm,
+        requests,
+        mode=mode,
+        concurrency=concurrency,
+        max_retries=max_retries,
+        backoff_s=backoff_s,
+        batch_runner=batch_runner,
+    ):
+        line: dict[str, Any] = {
+            "number": numbers[result.custom_id],
+            "status": result.status,
+            "attempts": result.attempts,
+            "transport": result.transport,
+        }
+        if result.status == "ok" and result.data is not None:
+            try:
+                line["analysis"] = issue_analysis_to_dict(issue_analysis_from_dict(result.data))
+            except (KeyError, ValueError) as e:
+                line.update(status="error", error=f"invalid analysis: {type(e).__name__}: {e}")
+        else:
+            line["error"] = result.error
+        yield line
@@ -0,0 +1,358 @@
+"""Offline triage tier between the keyword heuristic and the LLM.
+
+`TriageClassifier` predicts `issue_type`, `priority` and `suggested_action` with
+TF-IDF features (title and body word unigrams/bigrams) and one multinomial
+logistic-regression head per field. It is pure Python: training takes seconds
+on a few thousand issues and a prediction is a sparse dot product (well under
+a millisecond on CPU).
+
+`analyze_issue_tiered` uses the classifier when every head is at least
+`threshold` confident and defers to the LLM otherwise. Keywords, skills and
+summary always come from the heuristic analyzer.
+
+Models are trained with `scripts/train_triage_classifier.py` from labelled
+history (`repo_work_item` labels, or LLM triage output) and stored as JSON.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import math
+import random
+import re
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .assignment import analyze_issue, analyze_issue_llm, analyze_issue_llm_async
+from .types import Issue, IssueAnalysisOutput, IssueType, Priority, ResponseStrategy
+
+if TYPE_CHECKING:
+    from devrel.llm.client import AsyncLlmClient, LlmClient
+
+HEADS: dict[str, type] = {
+    "issue_type": IssueType,
+    "priority": Priority,
+    "suggested_action": ResponseStrategy,
+}
+DEFAULT_THRESHOLD = 0.7
+MODEL_VERSION = 1
+
+_WORD = re.compile(r"[a-z0-9_]+(?:[.\-][a-z0-9_]+)*")
+
+# GitHub label -> field value, for deriving training targets from labelled history.
+LABEL_TARGETS: dict[str, dict[str, str]] = {
+    "issue_type": {
+        "bug": "bug",
+        "crash": "bug",
+        "regression": "bug",
+        "enhancement": "feature",
+        "feature": "feature",
+        "feature request": "feature",
+        "question": "question",
+        "documentation": "documentation",
+        "docs": "documentation",
+    },
+    "priority": {
+        "critical": "critical",
+        "p0": "critical",
+        "priority: critical": "critical",
+        "p1": "high",
+        "priority: high": "high",
+        "p2": "medium",
+        "priority: medium": "medium",
+        "p3": "low",
+        "priority: low": "low",
+    },
+    "suggested_action": {
+        "needs more info": "request_info",
+        "needs-more-info": "request_info",
+        "needs repro": "request_info",
+        "needs-repro": "request_info",
+        "waiting for response": "request_info",
+        "duplicate": "link_docs",
+        "documentation": "link_docs",
+        "question": "direct_answer",
+    },
+}
+
+
+@dataclass(frozen=True, slots=True)
+class TriageExample:
+    issue: Issue
+    targets: dict[str, str]  # subset of HEADS; a head trains only on examples that have its field
+
+
+def example_from_labels(issue: Issue) -> TriageExample:
+    """Targets implied by the issue's GitHub labels (fields without a matching label are left out)."""
+    labels = [label.lower().strip() for label in issue.labels]
+    targets: dict[str, str] = {}
+    for head, mapping in LABEL_TARGETS.items():
+        for label in labels:
+            if label in mapping:
+                targets[head] = mapping[label]
+                break
+    return TriageExample(issue=issue, targets=targets)
+
+
+def issue_features(issue: Issue, *, max_body_chars: int = 4000) -> list[str]:
+    """Token features; labels are left out so the model also works on unlabelled issues."""
+    title = _WORD.findall(issue.title.lower())
+    body = _WORD.findall(issue.body[:max_body_chars].lower())
+    feats = [f"t:{w}" for w in title]
+    feats += [f"t:{a} {b}" for a, b in zip(title, title[1:])]
+    feats += body
+    feats += [f"{a} {b}" for a, b in zip(body, body[1:])]
+    feats.append("body:empty" if not body else f"body:len{min(4, len(body).bit_length() // 3)}")
+    if "```" in issue.body or "traceback" in issue.body.lower():
+        feats.append("body:trace")
+    if issue.title.rstrip().endswith("?"):
+        feats.append("t:?")
+    return feats
+
+
+def _tfidf(feats: Iterable[str], idf: dict[str, float]) -> dict[str, float]:
+    counts: dict[str, int] = {}
+    for f in feats:
+        if f in idf:
+            counts[f] = counts.get(f, 0) + 1
+    vec = {f: (1.0 + math.log(c)) * idf[f] for f, c in counts.items()}
+    norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+    return {f: v / norm for f, v in vec.items()}
+
+
+def _softmax(scores: list[float]) -> list[float]:
+    top = max(scores)
+    exps = [math.exp(s - top) for s in scores]
+    total = sum(exps)
+    return [e / total for e in exps]
+
+
+@dataclass(slots=True)
+class _Head:
+    classes: list[str]
+    weights: dict[str, list[float]] = field(default_factory=dict)
+    bias: list[float] = field(default_factory=list)
+
+    def proba(self, x: dict[str, float]) -> list[float]:
+        scores = list(self.bias)
+        for f, v in x.items():
+            w = self.weights.get(f)
+            if w is not None:
+                for k, wk in enumerate(w):
+                    scores[k] += wk * v
+        return _softmax(scores)
+
+    def fit(self, xs: list[dict[str, float]], ys: list[str], *, epochs: int, lr: float, l2: float, seed: int) -> None:
+        index = {c: k for k, c in enumerate(self.classes)}
+        n_classes = len(self.classes)
+        self.bias = [0.0] * n_classes
+        order = list(range(len(xs)))
+        rng = random.Random(seed)
+        for epoch in range(epochs):
+            rng.shuffle(order)
+            step = lr / (1.0 + epoch)
+            for i in order:
+                x, target = xs[i], index[ys[i]]
+                p = self.proba(x)
+                p[target] -= 1.0  # gradient of cross-entropy w.r.t. the scores
+                for k in range(n_classes):
+                    self.bias[k] -= step * p[k]
+                for f, v in x.items():
+                    w = self.weights.setdefault(f, [0.0] * n_classes)
+                    for k in range(n_classes):
+                        w[k] -= step * (p[k] * v + l2 * w[k])
+
+
+@dataclass(frozen=True, slots=True)
+class TriagePrediction:
+    labels: dict[str, str]
+    confidence: dict[str, float]
+
+    @property
+    def min_confidence(self) -> float:
+        return min(self.confidence.values()) if self.confidence else 0.0
+
+
+class TriageClassifier:
+    def __init__(self, idf: dict[str, float], heads: dict[str, _Head]) -> None:
+        self.idf = idf
+        self.heads = heads
+
+    @classmethod
+    def train(
+        cls,
+        examples: Sequence[TriageExample],
+        *,
+        min_df: int = 2,
+        max_features: int = 50_000,
+        epochs: int = 12,
+        lr: float = 0.5,
+        l2: float = 1e-4,
+        seed: int = 13,
+    ) -> TriageClassifier:
+        docs = [issue_features(e.issue) for e in examples]
+        df: dict[str, int] = {}
+        for feats in docs:
+            for f in set(feats):
+                df[f] = df.get(f, 0) + 1
+        kept = sorted((f for f, n in df.items() if n >= min_df), key=lambda f: (-df[f], f))[:max_features]
+        n_docs = len(docs)
+        idf = {f: math.log((1 + n_docs) / (1 + df[f])) + 1.0 for f in kept}
+        xs = [_tfidf(feats, idf) for feats in docs]
+
+        heads: dict[str, _Head] = {}
+        for name in HEADS:
+            rows = [(x, e.targets[name]) for x, e in zip(xs, examples) if name in e.targets]
+            classes = sorted({y for _, y in rows})
+            if len(classes) < 2:
+                continue  # nothing to learn; analyze_issue_tiered falls back to the heuristic for this field
+            head = _Head(classes=classes)
+            head.fit([x for x, _ in rows], [y for _, y in rows], epochs=epochs, lr=lr, l2=l2, seed=seed)
+            heads[name] = head
+        return cls(idf, heads)
+
+    def predict(self, issue: Issue) -> TriagePrediction:
+        x = _tfidf(issue_features(issue), self.idf)
+        labels: dict[str, str] = {}
+        confidence: dict[str, float] = {}
+        for name, head in self.heads.items():
+            p = head.proba(x)
+            best = max(range(len(p)), key=p.__getitem__)
+            labels[name] = head.classes[best]
+            confidence[name] = p[best]
+        return TriagePrediction(labels=labels, confidence=confidence)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": MODEL_VERSION,
+            "idf": self.idf,
+            "heads": {
+                name: {"classes": h.classes, "bias": h.bias, "weights": {f: w for f, w in h.weights.items() if any(w)}}
+                for name, h in self.heads.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TriageClassifier:
+        if data.get("version") != MODEL_VERSION:
+            raise ValueError(f"Unsupported triage model version: {data.get('version')}")
+        heads = {
+            name: _Head(classes=list(h["classes"]), weights=dict(h["weights"]), bias=list(h["bias"]))
+            for name, h in data["heads"].items()
+        }
+        return cls(dict(data["idf"]), heads)
+
+    def save(self, path: str | Path) -> None:
+        raw = json.dumps(self.to_dict(), separators=(",", ":")).encode("utf-8")
+        Path(path).write_bytes(gzip.compress(raw) if str(path).endswith(".gz") else raw)
+
+    @classmethod
+    def load(cls, path: str | Path) -> TriageClassifier:
+        raw = Path(path).read_bytes()
+        if str(path).endswith(".gz"):
+            raw = gzip.decompress(raw)
+        return cls.from_dict(json.loads(raw))
+
+
+@dataclass(frozen=True, slots=True)
+class TieredAnalysis:
+    analysis: IssueAnalysisOutput
+    tier: str  # classifier | llm | heuristic
+    confidence: float
+
+
+def _merge(heuristic: IssueAnalysisOutput, prediction: TriagePrediction) -> IssueAnalysisOutput:
+    labels = prediction.labels
+    analysis = replace(
+        heuristic,
+        issue_type=IssueType(labels["issue_type"]) if "issue_type" in labels else heuristic.issue_type,
+        priority=Priority(labels["priority"]) if "priority" in labels else heuristic.priority,
+        suggested_action=(
+            ResponseStrategy(labels["suggested_action"]) if "suggested_action" in labels else heuristic.suggested_action
+        ),
+    )
+    if analysis.suggested_action == ResponseStrategy.REQUEST_INFO:
+        analysis = replace(analysis, needs_more_info=True)
+    return analysis
+
+
+def _classify(classifier: TriageClassifier | None, issue: Issue) -> tuple[IssueAnalysisOutput, float]:
+    heuristic = analyze_issue(issue)
+    if classifier is None or not classifier.heads:
+        return heuristic, 0.0
+    prediction = classifier.predict(issue)
+    return _merge(heuristic, prediction), prediction.min_confidence
+
+
+def analyze_issue_tiered(
+    issue: Issue,
+    *,
+    classifier: TriageClassifier | None,
+    llm: LlmClient | None = None,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> TieredAnalysis:
+    """Classifier when confident, else the LLM (if given), else the classifier/heuristic result."""
+    analysis, confidence = _classify(classifier, issue)
+    if confidence >= threshold:
+        return TieredAnalysis(analysis, "classifier", confidence)
+    if llm is not None:
+        return TieredAnalysis(analyze_issue_llm(llm, issue), "llm", confidence)
+    return TieredAnalysis(analysis, "classifier" if confidence else "heuristic", confidence)
+
+
+async def analyze_issue_tiered_async(
+    issue: Issue,
+    *,
+    classifier: TriageClassifier | None,
+    llm: AsyncLlmClient | None = None,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> TieredAnalysis:
+    analysis, confidence = _classify(classifier, issue)
+    if confidence >= threshold:
+        return TieredAnalysis(analysis, "classifier", confidence)
+    if llm is not None:
+        return TieredAnalysis(await analyze_issue_llm_async(llm, issue), "llm", confidence)
+    return TieredAnalysis(analysis, "classifier" if confidence else "heuristic", confidence)
+
+
+def evaluate(
+    classifier: TriageClassifier,
+    examples: Sequence[TriageExample],
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> dict[str, Any]:
+    """Per-head accuracy, accuracy/coverage of the confident subset, and prediction latency."""
+    latencies: list[float] = []
+    per_head: dict[str, list[int]] = {name: [0, 0] for name in classifier.heads}  # [correct, total]
+    confident: list[bool] = []
+    for example in examples:
+        started = time.perf_counter()
+        prediction = classifier.predict(example.issue)
+        latencies.append((time.perf_counter() - started) * 1000.0)
+        correct = True
+        for name, target in example.targets.items():
+            if name not in per_head:
+                continue
+            hit = prediction.labels[name] == target
+            per_head[name][0] += hit
+            per_head[name][1] += 1
+            correct = correct and hit
+        if prediction.min_confidence >= threshold:
+            confident.append(correct)
+
+    latencies.sort()
+
+    def pct(q: float) -> float:
+        return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))], 4) if latencies else 0.0
+
+    return {
+        "examples": len(examples),
+        "accuracy": {name: round(c / t, 4) if t else None for name, (c, t) in per_head.items()},
+        "threshold": threshold,
+        "coverage": round(len(confident) / len(examples), 4) if examples else 0.0,
+        "confident_accuracy": round(sum(confident) / len(confident), 4) if confident else None,
+        "latency_ms": {"p50": pct(0.5), "p95": pct(0.95), "max": pct(1.0)},
+    }
@@ -205,6 +205,18 @@ def issue_analysis_from_dict(data: dict[str, object]) -> IssueAnalysisOutput:
     )
 
 
+def issue_analysis_to_dict(analysis: IssueAnalysisOutput) -> dict[str, object]:
+    return {
+        "issue_type": analysis.issue_type.value,
+        "priority": analysis.priority.value,
+        "required_skills": list(analysis.required_skills),
+        "keywords": list(analysis.keywords),
+        "summary": analysis.summary,
+        "needs_more_info": analysis.needs_more_info,
+        "suggested_action": analysis.suggested_action.value,
+    }
+
+
 def assignment_output_from_dict(data: dict[str, object]) -> AssignmentOutput:
     reasons_raw = data.get("reasons", []) or []
     reasons: list[AssignmentReason] = []
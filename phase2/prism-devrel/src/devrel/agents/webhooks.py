@@ -0,0 +1,475 @@
+"""GitHub webhooks → durable job queue → agent pipeline workers.
+
+`POST /webhooks/github` only verifies the `X-Hub-Signature-256` HMAC, filters
+the events worth triaging (`issues.opened`, `issue_comment.created` on issues)
+and inserts the payload into `WebhookQueue`, a SQLite table keyed by the
+`X-GitHub-Delivery` id so redeliveries are deduplicated. The ACK therefore costs
+one small write, however slow the LLM is.
+
+`WebhookWorkerPool` runs the pipeline for queued jobs with a fixed number of
+concurrent workers. A worker claims a job inside `BEGIN IMMEDIATE` and holds it
+under a lease (`locked_until`), which is SQLite's equivalent of Postgres
+`FOR UPDATE SKIP LOCKED`: several worker processes can share one queue file,
+and a job whose worker died is claimed again once its lease expires. Failed
+jobs are retried with exponential backoff; after `max_attempts` (failures or
+expired leases) they stay in the table with status `dead` (the dead-letter
+store) until `retry` requeues them. `complete` and `fail` only apply while the
+caller still holds the lease, so a worker that overran it cannot overwrite the
+outcome of the worker that reclaimed the job. The pool runs every queue call in
+a thread (`asyncio.to_thread`) to keep SQLite off the event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+from devrel import CACHE_DIR
+
+from .contributor_index import is_bot_account
+from .pipeline import build_issue_pipeline, run_dag
+from .types import Contributor, Issue, issue_analysis_to_dict
+
+if TYPE_CHECKING:
+    from devrel.llm.client import AsyncLlmClient
+    from devrel.search.rag_client import AsyncRAGClient
+
+    from .contributor_index import ContributorIndex
+    from .ownership import OwnershipTrie
+
+DEFAULT_WEBHOOK_QUEUE_PATH = str(CACHE_DIR / "webhook_jobs.sqlite")
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_ATTEMPTS = 3
+
+# (X-GitHub-Event, payload action) pairs that trigger triage.
+TRIAGE_EVENTS = frozenset({("issues", "opened"), ("issue_comment", "created")})
+JOB_STATUSES = ("queued", "running", "done", "dead")
+
+WebhookHandler = Callable[["WebhookJob"], Awaitable[dict[str, Any]]]
+
+
+def sign_payload(secret: str, body: bytes) -> str:
+    """`X-Hub-Signature-256` value GitHub sends for `body`."""
+    return "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(secret: str, body: bytes, signature: str | None) -> bool:
+    """Constant-time check of an `X-Hub-Signature-256` header."""
+    if not secret or not signature or not signature.startswith("sha256="):
+        return False
+    return hmac.compare_digest(sign_payload(secret, body), signature)
+
+
+def triage_target(event: str, payload: Mapping[str, Any]) -> tuple[str, int] | None:
+    """(repo, issue number) when this delivery should be triaged, else None.
+
+    Comments on pull requests (which GitHub also reports as `issue_comment`)
+    and anything a bot did are ignored, so the agents' own replies do not
+    trigger another run.
+    """
+    if (event, payload.get("action")) not in TRIAGE_EVENTS:
+        return None
+    issue = payload.get("issue") or {}
+    if "number" not in issue or issue.get("pull_request"):
+        return None
+    actor = (payload.get("comment") or issue).get("user") or {}
+    if is_bot_account(str(actor.get("login", ""))) or actor.get("type") == "Bot":
+        return None
+    repo = str((payload.get("repository") or {}).get("full_name", ""))
+    return repo, int(issue["number"])
+
+
+def issue_from_webhook(payload: Mapping[str, Any]) -> Issue:
+    """The `Issue` to triage; for a comment event, the new comment is appended to the body."""
+    issue = payload["issue"]
+    body = str(issue.get("body") or "")
+    comment = payload.get("comment")
+    if comment:
+        login = (comment.get("user") or {}).get("login", "")
+        body = f"{body}\n\n---\n@{login}: {comment.get('body') or ''}".strip()
+    return Issue(
+        number=int(issue["number"]),
+        title=str(issue.get("title") or ""),
+        body=body,
+        labels=tuple(label["name"] for label in issue.get("labels", ()) if label.get("name")),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class WebhookJob:
+    id: int
+    delivery_id: str
+    event: str
+    action: str
+    repo: str
+    issue_number: int
+    payload: dict[str, Any]
+    status: str  # queued | running | done | dead
+    attempts: int
+    last_error: str
+    result: dict[str, Any] | None
+    created_at: float
+    updated_at: float
+    worker: str | None = None  # holder of the current (or last) lease
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-ready summary (without the raw payload)."""
+        out = asdict(self)
+        del out["payload"]
+        return out
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS webhook_job (
+  id integer PRIMARY KEY AUTOINCREMENT,
+  delivery_id text NOT NULL UNIQUE,
+  event text NOT NULL,
+  action text NOT NULL,
+  repo text NOT NULL,
+  issue_number integer NOT NULL,
+  payload text NOT NULL,
+  status text NOT NULL,
+  attempts integer NOT NULL DEFAULT 0,
+  available_at real NOT NULL,
+  locked_until real,
+  worker text,
+  last_error text NOT NULL DEFAULT '',
+  result text,
+  created_at real NOT NULL,
+  updated_at real NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_webhook_job_ready ON webhook_job (status, available_at, id);
+"""
+
+_COLUMNS = (
+    "id, delivery_id, event, action, repo, issue_number, payload, status, attempts, last_error, result, "
+    "created_at, updated_at, worker"
+)
+
+
+def _job_from_row(row: Sequence[Any]) -> WebhookJob:
+    return WebhookJob(
+        id=int(row[0]),
+        delivery_id=row[1],
+        event=row[2],
+        action=row[3],
+        repo=row[4],
+        issue_number=int(row[5]),
+        payload=json.loads(row[6]),
+        status=row[7],
+        attempts=int(row[8]),
+        last_error=row[9],
+        result=json.loads(row[10]) if row[10] else None,
+        created_at=float(row[11]),
+        updated_at=float(row[12]),
+        worker=row[13],
+    )
+
+
+class WebhookQueue:
+    """Durable job queue in one SQLite table; `dead` rows are the dead-letter store."""
+
+    def __init__(self, path: str = DEFAULT_WEBHOOK_QUEUE_PATH, *, clock: Callable[[], float] = time.time) -> None:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SQLITE_SCHEMA)
+        self._lock = threading.Lock()
+        self._clock = clock
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _transaction(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                out = fn(self._conn)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return out
+
+    def enqueue(
+        self,
+        delivery_id: str,
+        event: str,
+        action: str,
+        repo: str,
+        issue_number: int,
+        payload: Mapping[str, Any],
+    ) -> tuple[int, bool]:
+        """(job id, created); a delivery id seen before returns the existing job and False."""
+        now = self._clock()
+        row = (delivery_id, event, action, repo, issue_number, json.dumps(payload, ensure_ascii=False), now, now, now)
+
+        def insert(conn: sqlite3.Connection) -> tuple[int, bool]:
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO webhook_job"
+                "(delivery_id, event, action, repo, issue_number, payload, status, available_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, 'queued', ?, ?, ?)",
+                row,
+            )
+            if cur.rowcount:
+                return int(cur.lastrowid), True
+            (job_id,) = conn.execute("SELECT id FROM webhook_job WHERE delivery_id = ?", (delivery_id,)).fetchone()
+            return int(job_id), False
+
+        return self._transaction(insert)
+
+    def claim(
+        self, worker: str, *, lease_s: float = 300.0, max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    ) -> WebhookJob | None:
+        """Take the oldest ready job (or one whose lease expired) and lease it to `worker`.
+
+        An expired lease counts as a failed attempt: a job that already used
+        `max_attempts` is dead-lettered instead of being run again, so a payload
+        that kills its worker cannot loop forever.
+        """
+        now = self._clock()
+
+        def take(conn: sqlite3.Connection) -> WebhookJob | None:
+            conn.execute(
+                "UPDATE webhook_job SET status = 'dead', locked_until = NULL, "
+                "last_error = 'lease expired after ' || attempts || ' attempt(s)', updated_at = ? "
+                "WHERE status = 'running' AND locked_until < ? AND attempts >= ?",
+                (now, now, max_attempts),
+            )
+            row = conn.execute(
+                "SELECT id FROM webhook_job "
+                "WHERE (status = 'queued' AND available_at <= ?) OR (status = 'running' AND locked_until < ?) "
+                "ORDER BY available_at, id LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE webhook_job SET status = 'running', attempts = attempts + 1, locked_until = ?, worker = ?, "
+                "updated_at = ? WHERE id = ?",
+                (now + lease_s, worker, now, row[0]),
+            )
+            return _job_from_row(conn.execute(f"SELECT {_COLUMNS} FROM webhook_job WHERE id = ?", row).fetchone())
+
+        return self._transaction(take)
+
+    def complete(self, job_id: int, result: Mapping[str, Any], *, worker: str) -> bool:
+        """Store the result; False (and no change) when `worker` no longer holds the job's lease."""
+        cur = self._transaction(
+            lambda conn: conn.execute(
+                "UPDATE webhook_job SET status = 'done', result = ?, locked_until = NULL, last_error = '', "
+                "updated_at = ? WHERE id = ? AND status = 'running' AND worker = ?",
+                (json.dumps(result, ensure_ascii=False), self._clock(), job_id, worker),
+            )
+        )
+        return bool(cur.rowcount)
+
+    def fail(
+        self,
+        job_id: int,
+        error: str,
+        *,
+        worker: str,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_s: float = 5.0,
+    ) -> str | None:
+        """Record a failed attempt: requeue with exponential backoff, or dead-letter it.
+
+        Returns the new status, or None (and no change) when `worker` no longer holds the job's lease.
+        """
+        now = self._clock()
+
+        def record(conn: sqlite3.Connection) -> str | None:
+            row = conn.execute(
+                "SELECT attempts FROM webhook_job WHERE id = ? AND status = 'running' AND worker = ?", (job_id, worker)
+            ).fetchone()
+            if row is None:
+                return None
+            (attempts,) = row
+            status = "dead" if attempts >= max_attempts else "queued"
+            conn.execute(
+                "UPDATE webhook_job SET status = ?, available_at = ?, locked_until = NULL, last_error = ?, "
+                "updated_at = ? WHERE id = ?",
+                (status, now + backoff_s * 2 ** (attempts - 1), error[:2000], now, job_id),
+            )
+            return status
+
+        return self._transaction(record)
+
+    def retry(self, job_id: int) -> bool:
+        """Move a dead-lettered job back to the queue with a fresh attempt budget."""
+        now = self._clock()
+        cur = self._transaction(
+            lambda conn: conn.execute(
+                "UPDATE webhook_job SET status = 'queued', attempts = 0, available_at = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'dead'",
+                (now, now, job_id),
+            )
+        )
+        return bool(cur.rowcount)
+
+    def get(self, job_id: int) -> WebhookJob | None:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_COLUMNS} FROM webhook_job WHERE id = ?", (job_id,)).fetchone()
+        return _job_from_row(row) if row else None
+
+    def jobs(self, *, status: str | None = None, limit: int = 100) -> list[WebhookJob]:
+        """Most recently updated jobs first, optionally only one status (`dead` for the dead letters)."""
+        clause, params = (" WHERE status = ?", [status]) if status else ("", [])
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM webhook_job{clause} ORDER BY updated_at DESC, id DESC LIMIT ?",
+                [*params, limit],
+            ).fetchall()
+        return [_job_from_row(row) for row in rows]
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, count(*) FROM webhook_job GROUP BY status").fetchall()
+        return {status: 0 for status in JOB_STATUSES} | {status: int(n) for status, n in rows}
+
+
+class WebhookWorkerPool:
+    """`workers` concurrent consumers of a `WebhookQueue`; more workers (or processes) = more throughput."""
+
+    def __init__(
+        self,
+        queue: WebhookQueue,
+        handler: WebhookHandler,
+        *,
+        workers: int = DEFAULT_WORKERS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_s: float = 5.0,
+        job_timeout_s: float = 120.0,
+        lease_s: float = 300.0,
+        poll_interval_s: float = 1.0,
+        name: str = "",
+    ) -> None:
+        self.queue = queue
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.max_attempts = max_attempts
+        self.backoff_s = backoff_s
+        self.job_timeout_s = job_timeout_s
+        self.lease_s = max(lease_s, job_timeout_s)
+        self.poll_interval_s = poll_interval_s
+        self.name = name or f"pid{os.getpid()}"
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def notify(self) -> None:
+        """Wake idle workers now instead of at their next poll (call after `enqueue`)."""
+        self._wakeup.set()
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._run(f"{self.name}-{i}", until_idle=False)) for i in range(self.workers)
+            ]
+
+    async def stop(self) -> None:
+        """Cancel the workers; a job interrupted mid-run is claimed again when its lease expires."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def drain(self) -> None:
+        """Process jobs until none is ready (jobs backing off for later are left queued)."""
+        await asyncio.gather(*(self._run(f"{self.name}-{i}", until_idle=True) for i in range(self.workers)))
+
+    async def process(self, job: WebhookJob) -> str:
+        """Run one claimed job and record the outcome; returns the job's new status ("lost" if its lease was)."""
+        worker = job.worker or ""
+        try:
+            result = await asyncio.wait_for(self.handler(job), timeout=self.job_timeout_s)
+        except asyncio.TimeoutError:
+            error = f"timed out after {self.job_timeout_s}s"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        else:
+            done = await asyncio.to_thread(self.queue.complete, job.id, result, worker=worker)
+            return "done" if done else "lost"
+        status = await asyncio.to_thread(
+            self.queue.fail, job.id, error, worker=worker, max_attempts=self.max_attempts, backoff_s=self.backoff_s
+        )
+        return status or "lost"
+
+    async def _run(self, worker: str, *, until_idle: bool) -> None:
+        while True:
+            job = await asyncio.to_thread(
+                self.queue.claim, worker, lease_s=self.lease_s, max_attempts=self.max_attempts
+            )
+            if job is not None:
+                await self.process(job)
+                continue
+            if until_idle:
+                return
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval_s)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+def triage_handler(
+    *,
+    llm: AsyncLlmClient | None = None,
+    rag: AsyncRAGClient | None = None,
+    contributors: Sequence[Contributor] = (),
+    contributor_index: ContributorIndex | None = None,
+    ownership: OwnershipTrie | None = None,
+    timeouts: Mapping[str, float] | None = None,
+) -> WebhookHandler:
+    """Handler running the issue pipeline (`build_issue_pipeline`) for a webhook job.
+
+    Triage failing or timing out fails the job so it is retried; failures of
+    other nodes are recorded in the result like `/api/agents/run` does.
+    """
+
+    async def handle(job: WebhookJob) -> dict[str, Any]:
+        if contributor_index is not None and not contributors:
+            await asyncio.to_thread(contributor_index.refresh)
+        outcome = await run_dag(
+            build_issue_pipeline(
+                issue_from_webhook(job.payload),
+                llm=llm,
+                rag=rag,
+                contributors=contributors,
+                contributor_index=contributor_index,
+                ownership=ownership,
+                timeouts=timeouts,
+            )
+        )
+        triage = outcome["triage"]
+        if triage.status != "ok":
+            raise RuntimeError(f"triage {triage.status}: {triage.error}")
+
+        result: dict[str, Any] = {
+            "analysis": issue_analysis_to_dict(triage.value),
+            "nodes": {name: {"status": r.status, "error": r.error} for name, r in outcome.items()},
+        }
+        response = outcome.get("response")
+        if response is not None and response.status == "ok":
+            result["response"] = {
+                "strategy": response.value.strategy.value,
+                "response_text": response.value.response_text,
+                "confidence": response.value.confidence,
+                "references": list(response.value.references),
+                "follow_up_needed": response.value.follow_up_needed,
+            }
+        assignment = outcome.get("assignment")
+        if assignment is not None and assignment.status == "ok":
+            result["assignment"] = asdict(assignment.value)
+        return result
+
+    return handle
@@ -1,20 +1,60 @@
 """FastAPI server exposing RAG-enhanced DevRel agents."""
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import os
+import time
 from contextlib import asynccontextmanager
+from dataclasses import asdict
 from typing import Any
 
 import httpx
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
-from devrel.agents.assignment import analyze_issue, analyze_issue_llm
-from devrel.agents.response import draft_response, draft_response_llm, draft_response_with_rag
-from devrel.agents.types import Issue, IssueType, Priority, ResponseStrategy
-from devrel.llm.client import LlmClient
-from devrel.search.rag_client import RAGClient
+from devrel.agents.assignment import analyze_issue, analyze_issue_llm_async
+from devrel.agents.pipeline import build_issue_pipeline, run_dag
+from devrel.agents.response import (
+    draft_response,
+    draft_response_llm_async,
+    draft_response_llm_stream,
+    draft_response_with_rag_async,
+    rag_search_query,
+)
+from devrel.agents.contributor_index import ContributorIndex, is_bot_account
+from devrel.agents.ownership import OwnershipTrie
+from devrel.agents.promotion_batch import PromotionStore
+from devrel.agents.triage_batch import analyze_issues_stream
+from devrel.agents.triage_classifier import DEFAULT_THRESHOLD, TriageClassifier, analyze_issue_tiered_async
+from devrel.agents.types import (
+    Contributor,
+    Issue,
+    IssueType,
+    Priority,
+    ResponseOutput,
+    ResponseStrategy,
+    issue_analysis_to_dict,
+)
+from devrel.agents.webhooks import (
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_WEBHOOK_QUEUE_PATH,
+    DEFAULT_WORKERS,
+    WebhookQueue,
+    WebhookWorkerPool,
+    triage_handler,
+    triage_target,
+    verify_signature,
+)
+from devrel.llm.cache import build_llm_cache_from_env
+from devrel.llm.client import AsyncLlmClient
+from devrel.llm.router import AsyncRoutedLlmClient, ModelRouter
+from devrel.llm.telemetry import LlmTelemetry
+from devrel.search.context_builder import build_references
+from devrel.search.rag_client import AsyncRAGClient
 
 GITHUB_REPO = os.getenv("GITHUB_REPO", "GSN-OMG/Prism")
 
@@ -39,11 +79,29 @@ class SearchInput(BaseModel):
     search_type: str = "hybrid"
 
 
+class ContributorInput(BaseModel):
+    login: str
+    areas: list[str] = []
+    recent_activity_score: float = 0.0
+    merged_prs: int = 0
+    reviews: int = 0
+
+
+class BatchAnalyzeInput(BaseModel):
+    issues: list[IssueInput]
+    use_llm: bool = True
+    mode: str = "concurrent"  # only concurrent; the OpenAI Batch API path is scripts/analyze_batch.py --mode batch
+    concurrency: int = 8
+    max_retries: int = 2
+
+
 class AgentRunInput(BaseModel):
     issue: IssueInput
     agent: str
     use_llm: bool = False
     use_rag: bool = True
+    contributors: list[ContributorInput] = []
+    timeouts: dict[str, float] = {}
 
 
 class KBDocumentResponse(BaseModel):
@@ -75,26 +133,103 @@ class ResponseAgentResponse(BaseModel):
     follow_up_needed: bool
 
 
-_rag_client: RAGClient | None = None
-_llm_client: LlmClient | None = None
+# Async clients: handlers await LLM and DB I/O instead of blocking the event loop (and the SSE streams).
+_rag_client: AsyncRAGClient | None = None
+_llm_client: AsyncLlmClient | AsyncRoutedLlmClient | None = None
+_llm_telemetry = LlmTelemetry()
+_triage_classifier: TriageClassifier | None = None
+_contributor_index: ContributorIndex | None = None
+_ownership: OwnershipTrie | None = None
+_promotion_store: PromotionStore | None = None
+_webhook_queue: WebhookQueue | None = None
+_webhook_pool: WebhookWorkerPool | None = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global _rag_client, _llm_client
+    global _rag_client, _llm_client, _triage_classifier, _contributor_index, _ownership, _promotion_store
+    global _webhook_queue, _webhook_pool
     try:
-        _rag_client = RAGClient()
+        _rag_client = AsyncRAGClient()
+        await _rag_client.open()
     except Exception as e:
         print(f"Warning: RAG client not available: {e}")
         _rag_client = None
 
     if os.getenv("OPENAI_API_KEY"):
         try:
-            _llm_client = LlmClient()
+            _llm_client = AsyncLlmClient(cache=build_llm_cache_from_env(), telemetry=_llm_telemetry)
+            if os.getenv("LLM_ROUTER", "0") in ("1", "true", "TRUE", "yes", "YES"):
+                _llm_client = AsyncRoutedLlmClient(_llm_client, ModelRouter.from_env(telemetry=_llm_telemetry))
         except Exception as e:
             print(f"Warning: LLM client not available: {e}")
             _llm_client = None
-    yield
+    if os.getenv("TRIAGE_CLASSIFIER_PATH"):
+        try:
+            _triage_classifier = TriageClassifier.load(os.environ["TRIAGE_CLASSIFIER_PATH"])
+        except Exception as e:
+            print(f"Warning: triage classifier not available: {e}")
+            _triage_classifier = None
+    if os.getenv("CONTRIBUTOR_ACTIVITY_PATH"):
+        try:
+            _contributor_index = ContributorIndex.from_activity_csv(
+                os.environ["CONTRIBUTOR_ACTIVITY_PATH"],
+                repo=os.getenv("CONTRIBUTOR_REPO") or None,
+                exclude=is_bot_account,
+            )
+        except Exception as e:
+            print(f"Warning: contributor index not available: {e}")
+            _contributor_index = None
+    if os.getenv("CODE_OWNERSHIP_PATH"):
+        try:
+            path = os.environ["CODE_OWNERSHIP_PATH"]
+            if path.endswith(".csv"):
+                _ownership = OwnershipTrie.from_csv(path, repo=os.getenv("CONTRIBUTOR_REPO") or None)
+            else:
+                _ownership = OwnershipTrie.load(path)
+        except Exception as e:
+            print(f"Warning: code ownership index not available: {e}")
+            _ownership = None
+    if os.getenv("PROMOTION_DB_PATH"):
+        try:
+            _promotion_store = PromotionStore(os.environ["PROMOTION_DB_PATH"])
+        except Exception as e:
+            print(f"Warning: promotion store not available: {e}")
+            _promotion_store = None
+    if os.getenv("GITHUB_WEBHOOK_SECRET"):
+        try:
+            _webhook_queue = WebhookQueue(os.getenv("WEBHOOK_QUEUE_PATH", DEFAULT_WEBHOOK_QUEUE_PATH))
+            # WEBHOOK_WORKERS=0: this process only enqueues; scripts/run_webhook_worker.py consumes.
+            workers = int(os.getenv("WEBHOOK_WORKERS", str(DEFAULT_WORKERS)))
+            if workers > 0:
+                _webhook_pool = WebhookWorkerPool(
+                    _webhook_queue,
+                    triage_handler(
+                        llm=_llm_client,
+                        rag=_rag_client,
+                        contributor_index=_contributor_index,
+                        ownership=_ownership,
+                    ),
+                    workers=workers,
+                    max_attempts=int(os.getenv("WEBHOOK_MAX_ATTEMPTS", str(DEFAULT_MAX_ATTEMPTS))),
+                )
+                _webhook_pool.start()
+        except Exception as e:
+            print(f"Warning: webhook queue not available: {e}")
+            _webhook_queue = _webhook_pool = None
+    try:
+        yield
+    finally:
+        if _webhook_pool is not None:
+            await _webhook_pool.stop()
+        if _webhook_queue is not None:
+            _webhook_queue.close()
+        if _rag_client is not None:
+            await _rag_client.close()
+        if _llm_client is not None:
+            await _llm_client.close()
+        if _promotion_store is not None:
+            _promotion_store.close()
 
 
 app = FastAPI(
@@ -119,10 +254,19 @@ async def health():
         "status": "ok",
         "rag_available": _rag_client is not None,
         "llm_available": _llm_client is not None,
+        "llm_cache": _llm_client.cache.stats.to_dict() if _llm_client and _llm_client.cache else None,
+        "llm_usage": _llm_client.usage.to_dict() if _llm_client else None,
         "github_token_set": bool(os.getenv("GITHUB_TOKEN")),
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics for LLM calls: latency, tokens, retries, fallbacks and estimated cost per task."""
+    telemetry = _llm_client.telemetry if _llm_client is not None else _llm_telemetry
+    return PlainTextResponse(telemetry.metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/api/github/issues")
 async def create_github_issue(input: IssueCreateInput):
     """Create a new GitHub issue in the target repository."""
@@ -172,15 +316,15 @@ async def search_kb(input: SearchInput):
         raise HTTPException(status_code=503, detail="RAG client not available")
 
     if input.search_type == "keyword":
-        docs = _rag_client.search_keyword(
+        docs = await _rag_client.search_keyword(
             input.query, limit=input.limit, repo_filter=input.repo_filter
         )
     elif input.search_type == "vector":
-        docs = _rag_client.search_vector(
+        docs = await _rag_client.search_vector(
             input.query, limit=input.limit, repo_filter=input.repo_filter
         )
     else:
-        docs = _rag_client.search_hybrid(
+        docs = await _rag_client.search_hybrid(
             input.query, limit=input.limit, repo_filter=input.repo_filter
         )
 
@@ -208,8 +352,17 @@ async def analyze_issue_endpoint(input: IssueInput, use_llm: bool = False):
         labels=tuple(input.labels),
     )
 
-    if use_llm and _llm_client:
-        analysis = analyze_issue_llm(_llm_client, issue)
+    if _triage_classifier is not None:
+        # Classifier answers when confident; otherwise defer to the LLM (if requested).
+        tiered = await analyze_issue_tiered_async(
+            issue,
+            classifier=_triage_classifier,
+            llm=_llm_client if use_llm else None,
+            threshold=float(os.getenv("TRIAGE_CLASSIFIER_THRESHOLD", str(DEFAULT_THRESHOLD))),
+        )
+        analysis = tiered.analysis
+    elif use_llm and _llm_client:
+        analysis = await analyze_issue_llm_async(_llm_client, issue)
     else:
         analysis = analyze_issue(issue)
 
@@ -224,6 +377,39 @@ async def analyze_issue_endpoint(input: IssueInput, use_llm: bool = False):
     )
 
 
+@app.post("/api/agents/analyze/batch")
+async def analyze_issue_batch_endpoint(input: BatchAnalyzeInput):
+    """Triage many issues; streams one NDJSON line per issue as each finishes.
+
+    LLM calls run with bounded concurrency. Failed items are retried up to
+    `max_retries` times and report their `attempts`. The OpenAI Batch API can
+    take up to its 24h completion window, far longer than any client or proxy
+    keeps a request open, so it is only offered by `scripts/analyze_batch.py`.
+    """
+    if input.mode == "batch":
+        raise HTTPException(
+            status_code=422,
+            detail="mode 'batch' (OpenAI Batch API) can take hours; run scripts/analyze_batch.py --mode batch instead",
+        )
+    if input.mode != "concurrent":
+        raise HTTPException(status_code=422, detail="mode must be 'concurrent'")
+    issues = [
+        Issue(number=i.number, title=i.title, body=i.body, labels=tuple(i.labels)) for i in input.issues
+    ]
+
+    async def lines():
+        async for line in analyze_issues_stream(
+            issues,
+            llm=_llm_client if input.use_llm else None,
+            mode=input.mode,
+            concurrency=max(1, min(input.concurrency, 64)),
+            max_retries=max(0, input.max_retries),
+        ):
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @app.post("/api/agents/response", response_model=ResponseAgentResponse)
 async def response_agent_endpoint(
     input: IssueInput,
@@ -238,19 +424,19 @@ async def response_agent_endpoint(
     )
 
     if use_llm and _llm_client:
-        analysis = analyze_issue_llm(_llm_client, issue)
+        analysis = await analyze_issue_llm_async(_llm_client, issue)
     else:
         analysis = analyze_issue(issue)
 
     if use_rag and use_llm and _rag_client and _llm_client:
-        response = draft_response_with_rag(
+        response = await draft_response_with_rag_async(
             _llm_client,
             _rag_client,
             issue=issue,
             analysis=analysis,
         )
     elif use_llm and _llm_client:
-        response = draft_response_llm(
+        response = await draft_response_llm_async(
             _llm_client,
             issue=issue,
             analysis=analysis,
@@ -267,39 +453,132 @@ async def response_agent_endpoint(
     )
 
 
+def _sse(payload: dict[str, Any]) -> str:
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+def _response_payload(response: Any) -> dict[str, Any]:
+    return {
+        "strategy": response.strategy.value,
+        "response_text": response.response_text,
+        "confidence": response.confidence,
+        "references": list(response.references),
+        "follow_up_needed": response.follow_up_needed,
+    }
+
+
+async def _stream_response_events(issue: Issue, *, use_rag: bool):
+    """SSE events: analysis, then delta/reset chunks of response_text, then complete (or error)."""
+    try:
+        if _llm_client:
+            analysis = await analyze_issue_llm_async(_llm_client, issue)
+        else:
+            analysis = analyze_issue(issue)
+        yield _sse({"type": "analysis", "analysis": issue_analysis_to_dict(analysis)})
+
+        if not _llm_client:
+            response = draft_response(issue, analysis)
+            yield _sse({"type": "delta", "text": response.response_text})
+            yield _sse({"type": "complete", "response": _response_payload(response)})
+            return
+
+        references = None
+        if use_rag and _rag_client:
+            query = rag_search_query(issue, analysis)
+            references = build_references(query, await _rag_client.search_hybrid(query, limit=5))
+
+        async for event in draft_response_llm_stream(
+            _llm_client, issue=issue, analysis=analysis, references=references
+        ):
+            if isinstance(event, ResponseOutput):
+                yield _sse({"type": "complete", "response": _response_payload(event)})
+            else:
+                yield _sse({"type": event.type, "text": event.text})
+    except Exception as e:
+        yield _sse({"type": "error", "detail": f"{type(e).__name__}: {e}"})
+
+
+@app.post("/api/agents/response/stream")
+async def response_agent_stream_endpoint(input: IssueInput, use_rag: bool = True):
+    """Stream the drafted response over SSE so the UI can render text as it is generated."""
+    issue = Issue(
+        number=input.number,
+        title=input.title,
+        body=input.body,
+        labels=tuple(input.labels),
+    )
+    return StreamingResponse(
+        _stream_response_events(issue, use_rag=use_rag),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 @app.post("/api/agents/run")
 async def run_agent_pipeline(input: AgentRunInput):
-    """Run the full agent pipeline for an issue."""
+    """Run the full agent pipeline for an issue as a concurrent DAG.
+
+    Nodes that fail or time out are reported under `pipeline` and their
+    dependents are skipped; every other result is still returned.
+    """
     issue = Issue(
         number=input.issue.number,
         title=input.issue.title,
         body=input.issue.body,
         labels=tuple(input.issue.labels),
     )
+    contributors = [
+        Contributor(
+            login=c.login,
+            areas=tuple(c.areas),
+            recent_activity_score=c.recent_activity_score,
+            merged_prs=c.merged_prs,
+            reviews=c.reviews,
+        )
+        for c in input.contributors
+    ]
+    if not contributors and _contributor_index is not None:
+        # Picks up rows appended to the activity CSV since the last call; file I/O, so off the event loop.
+        await asyncio.to_thread(_contributor_index.refresh)
+
+    started = time.perf_counter()
+    outcome = await run_dag(
+        build_issue_pipeline(
+            issue,
+            llm=_llm_client if input.use_llm else None,
+            rag=_rag_client if input.use_rag else None,
+            contributors=contributors,
+            contributor_index=_contributor_index,
+            ownership=_ownership,
+            timeouts=input.timeouts,
+        )
+    )
+    elapsed_ms = round((time.perf_counter() - started) * 1000.0, 1)
 
-    results: dict[str, Any] = {}
+    def value(name: str) -> Any:
+        result = outcome.get(name)
+        return result.value if result is not None and result.status == "ok" else None
 
-    if input.use_llm and _llm_client:
-        analysis = analyze_issue_llm(_llm_client, issue)
-    else:
-        analysis = analyze_issue(issue)
+    results: dict[str, Any] = {}
 
-    results["analysis"] = {
-        "issue_type": analysis.issue_type.value,
-        "priority": analysis.priority.value,
-        "required_skills": list(analysis.required_skills),
-        "keywords": list(analysis.keywords),
-        "summary": analysis.summary,
-        "needs_more_info": analysis.needs_more_info,
-        "suggested_action": analysis.suggested_action.value,
-    }
+    analysis = value("triage")
+    if analysis is not None:
+        results["analysis"] = {
+            "issue_type": analysis.issue_type.value,
+            "priority": analysis.priority.value,
+            "required_skills": list(analysis.required_skills),
+            "keywords": list(analysis.keywords),
+            "summary": analysis.summary,
+            "needs_more_info": analysis.needs_more_info,
+            "suggested_action": analysis.suggested_action.value,
+        }
 
-    kb_references: list[str] = []
-    if input.use_rag and _rag_client:
-        query_parts = [issue.title] + list(analysis.keywords[:3])
-        search_query = " ".join(query_parts)
-        kb_docs = _rag_client.search_hybrid(search_query, limit=5)
-        kb_references = _rag_client.format_references(kb_docs)
+    kb_docs = value("rag")
+    if kb_docs is not None:
         results["rag_results"] = [
             {
                 "kb_id": d.kb_id,
@@ -313,27 +592,114 @@ async def run_agent_pipeline(input: AgentRunInput):
             for d in kb_docs
         ]
 
-    if input.use_llm and _llm_client:
-        response = draft_response_llm(
-            _llm_client,
-            issue=issue,
-            analysis=analysis,
-            references=kb_references,
-        )
-    else:
-        response = draft_response(issue, analysis)
+    response = value("response")
+    if response is not None:
+        results["response"] = {
+            "strategy": response.strategy.value,
+            "response_text": response.response_text,
+            "confidence": response.confidence,
+            "references": list(response.references),
+            "follow_up_needed": response.follow_up_needed,
+        }
 
-    results["response"] = {
-        "strategy": response.strategy.value,
-        "response_text": response.response_text,
-        "confidence": response.confidence,
-        "references": list(response.references),
-        "follow_up_needed": response.follow_up_needed,
+    assignment = value("assignment")
+    if assignment is not None:
+        results["assignment"] = asdict(assignment)
+
+    if "doc_gap" in outcome:
+        doc_gap = value("doc_gap")
+        results["doc_gap"] = asdict(doc_gap) if doc_gap is not None else None
+
+    promotion = value("promotion")
+    if promotion is not None:
+        results["promotion"] = {login: asdict(p) for login, p in promotion.items()}
+
+    results["pipeline"] = {
+        "elapsed_ms": elapsed_ms,
+        "nodes": {
+            name: {
+                "status": r.status,
+                "error": r.error,
+                "started_ms": r.started_ms,
+                "duration_ms": r.duration_ms,
+            }
+            for name, r in outcome.items()
+        },
     }
-
     return results
 
 
+@app.get("/api/promotions")
+def list_promotions(candidates_only: bool = False, stage: str | None = None, limit: int = 100, offset: int = 0):
+    """Materialised promotion results from the last `scripts/run_promotion_batch.py` run; nothing is evaluated here."""
+    if _promotion_store is None:
+        raise HTTPException(status_code=503, detail="PROMOTION_DB_PATH not configured")
+    total, records = _promotion_store.query(
+        candidates_only=candidates_only,
+        stage=stage,
+        limit=min(max(limit, 1), 1000),
+        offset=max(offset, 0),
+    )
+    last_run = _promotion_store.last_run()
+    return {
+        "as_of": last_run.run_at if last_run else None,
+        "total": total,
+        "items": [r.to_dict() for r in records],
+    }
+
+
+@app.post("/webhooks/github", status_code=202)
+async def github_webhook(request: Request):
+    """Verify and enqueue a GitHub delivery; triage runs later on the worker pool, so this only ACKs."""
+    if _webhook_queue is None:
+        raise HTTPException(status_code=503, detail="GITHUB_WEBHOOK_SECRET not configured")
+    body = await request.body()
+    if not verify_signature(os.getenv("GITHUB_WEBHOOK_SECRET", ""), body, request.headers.get("X-Hub-Signature-256")):
+        raise HTTPException(status_code=401, detail="invalid signature")
+    event = request.headers.get("X-GitHub-Event", "")
+    if event == "ping":
+        return {"status": "pong"}
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="payload is not JSON")
+    target = triage_target(event, payload)
+    if target is None:
+        return {"status": "ignored", "event": event, "action": payload.get("action")}
+
+    repo, number = target
+    delivery_id = request.headers.get("X-GitHub-Delivery") or hashlib.sha256(body).hexdigest()
+    job_id, created = await asyncio.to_thread(
+        _webhook_queue.enqueue, delivery_id, event, payload["action"], repo, number, payload
+    )
+    if _webhook_pool is not None:
+        _webhook_pool.notify()
+    return {"status": "queued" if created else "duplicate", "job_id": job_id}
+
+
+@app.get("/api/webhooks/jobs")
+def list_webhook_jobs(status: str | None = None, limit: int = 50):
+    """Queue depth per status and the latest jobs (`status=dead` lists the dead letters)."""
+    if _webhook_queue is None:
+        raise HTTPException(status_code=503, detail="GITHUB_WEBHOOK_SECRET not configured")
+    return {
+        "counts": _webhook_queue.counts(),
+        "items": [job.to_dict() for job in _webhook_queue.jobs(status=status, limit=min(max(limit, 1), 500))],
+    }
+
+
+@app.post("/api/webhooks/jobs/{job_id}/retry")
+def retry_webhook_job(job_id: int):
+    """Requeue a dead-lettered job."""
+    if _webhook_queue is None:
+        raise HTTPException(status_code=503, detail="GITHUB_WEBHOOK_SECRET not configured")
+    if not _webhook_queue.retry(job_id):
+        raise HTTPException(status_code=404, detail=f"no dead-lettered job {job_id}")
+    if _webhook_pool is not None:
+        _webhook_pool.notify()
+    return {"status": "queued", "job_id": job_id}
+
+
 # =============================================================================
 # Phase 3: Retrospective Court API with Real LLM Integration
 # =============================================================================
@@ -0,0 +1,533 @@
+"""Response cache in front of `LlmClient.generate_json`.
+
+Two tiers:
+
+1. Exact: a SHA-256 of (task, model, system, user, schema, temperature).
+2. Semantic (optional): when an embedder is configured, an exact miss falls
+   back to the closest cached entry with the same task/model/system/schema/
+   temperature whose user-message embedding has cosine similarity at or above
+   `semantic_threshold`.
+
+Backends: in-process LRU (`MemoryCacheBackend`), SQLite (`SqliteCacheBackend`)
+and Postgres (`PostgresCacheBackend`, pgvector for the semantic tier). All of
+them honour a TTL and evict least-recently-used entries beyond `max_entries`.
+SQLite has no vector index, so its semantic tier only compares against the
+`semantic_scan` most recently used entries of the scope (with numpy when it is
+installed); use the Postgres backend for a semantic tier over the whole cache.
+"""
+from __future__ import annotations
+
+import array
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any, Protocol
+
+from devrel import CACHE_DIR
+
+Embedder = Callable[[str], list[float]]
+
+
+@dataclass(slots=True)
+class CacheRequest:
+    """Cache identity of one `generate_json` call."""
+
+    key: str  # exact-match key
+    scope: str  # everything but the user message; semantic matches never cross scopes
+    user: str
+    embedding: list[float] | None = None
+
+
+@dataclass(slots=True)
+class CacheStats:
+    exact_hits: int = 0
+    semantic_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0
+
+    def to_dict(self) -> dict[str, float]:
+        return {**asdict(self), "hit_rate": round(self.hit_rate, 4)}
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str, *, now: float) -> dict[str, Any] | None: ...
+
+    def nearest(
+        self, scope: str, embedding: list[float], *, threshold: float, now: float
+    ) -> dict[str, Any] | None: ...
+
+    def set(
+        self,
+        request: CacheRequest,
+        value: dict[str, Any],
+        *,
+        expires_at: float | None,
+        now: float,
+    ) -> int:
+        """Store `value` and return how many entries were evicted to stay within bounds."""
+        ...
+
+    def clear(self) -> None: ...
+
+    def __len__(self) -> int: ...
+
+
+def _digest(obj: object) -> str:
+    payload = json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _normalize(vec: list[float]) -> list[float]:
+    norm = math.sqrt(sum(v * v for v in vec))
+    return [v / norm for v in vec] if norm else list(vec)
+
+
+def _dot(a: list[float], b: list[float]) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+def _best_blob(blobs: list[bytes], embedding: list[float]) -> tuple[int, float] | None:
+    """(index, similarity) of the float32 blob closest to `embedding`; blobs of another size are ignored."""
+    size = 4 * len(embedding)
+    candidates = [i for i, blob in enumerate(blobs) if len(blob) == size]
+    if not candidates:
+        return None
+    try:
+        import numpy as np
+    except ImportError:
+        sims = [_dot(array.array("f", blobs[i]).tolist(), embedding) for i in candidates]
+    else:
+        matrix = np.frombuffer(b"".join(blobs[i] for i in candidates), dtype=np.float32).reshape(len(candidates), -1)
+        sims = (matrix @ np.asarray(embedding, dtype=np.float32)).tolist()
+    best = max(range(len(candidates)), key=sims.__getitem__)
+    return candidates[best], float(sims[best])
+
+
+@dataclass(slots=True)
+class _MemoryEntry:
+    scope: str
+    value: dict[str, Any]
+    expires_at: float | None
+    embedding: list[float] | None = None
+
+
+class MemoryCacheBackend:
+    """Thread-safe in-process LRU."""
+
+    def __init__(self, *, max_entries: int = 1024) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, _MemoryEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, *, now: float) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at is not None and entry.expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def nearest(
+        self, scope: str, embedding: list[float], *, threshold: float, now: float
+    ) -> dict[str, Any] | None:
+        best_key: str | None = None
+        best_sim = threshold
+        with self._lock:
+            for key, entry in self._entries.items():
+                if entry.scope != scope or entry.embedding is None:
+                    continue
+                if entry.expires_at is not None and entry.expires_at <= now:
+                    continue
+                sim = _dot(entry.embedding, embedding)
+                if sim >= best_sim:
+                    best_key, best_sim = key, sim
+            if best_key is None:
+                return None
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key].value
+
+    def set(
+        self,
+        request: CacheRequest,
+        value: dict[str, Any],
+        *,
+        expires_at: float | None,
+        now: float,
+    ) -> int:
+        with self._lock:
+            self._entries[request.key] = _MemoryEntry(
+                scope=request.scope, value=value, expires_at=expires_at, embedding=request.embedding
+            )
+            self._entries.move_to_end(request.key)
+            evicted = 0
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+  key TEXT PRIMARY KEY,
+  scope TEXT NOT NULL,
+  value TEXT NOT NULL,
+  embedding BLOB,
+  expires_at REAL,
+  last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_scope ON llm_cache (scope);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_scope_access ON llm_cache (scope, last_access);
+"""
+
+DEFAULT_SEMANTIC_SCAN = 512
+
+
+class SqliteCacheBackend:
+    """Single-file cache shared by processes on one host; embeddings are stored as float32 blobs."""
+
+    def __init__(self, path: str, *, max_entries: int = 10_000, semantic_scan: int = DEFAULT_SEMANTIC_SCAN) -> None:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._max_entries = max_entries
+        self._semantic_scan = semantic_scan
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SQLITE_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def get(self, key: str, *, now: float) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= now:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            return json.loads(row[0])
+
+    def nearest(
+        self, scope: str, embedding: list[float], *, threshold: float, now: float
+    ) -> dict[str, Any] | None:
+        with self._lock:
+            # Bounded to the most recently used entries: every row is compared, so the scan is the cost of a miss.
+            rows = self._conn.execute(
+                "SELECT key, embedding FROM llm_cache "
+                "WHERE scope = ? AND embedding IS NOT NULL AND (expires_at IS NULL OR expires_at > ?) "
+                "ORDER BY last_access DESC LIMIT ?",
+                (scope, now, self._semantic_scan),
+            ).fetchall()
+            match = _best_blob([row[1] for row in rows], embedding)
+            if match is None or match[1] < threshold:
+                return None
+            key = rows[match[0]][0]
+            (value,) = self._conn.execute("SELECT value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            return json.loads(value)
+
+    def set(
+        self,
+        request: CacheRequest,
+        value: dict[str, Any],
+        *,
+        expires_at: float | None,
+        now: float,
+    ) -> int:
+        blob = array.array("f", request.embedding).tobytes() if request.embedding is not None else None
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache(key, scope, value, embedding, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (request.key, request.scope, json.dumps(value, ensure_ascii=False), blob, expires_at, now),
+                )
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+                )
+                (count,) = self._conn.execute("SELECT count(*) FROM llm_cache").fetchone()
+                evicted = max(0, count - self._max_entries)
+                if evicted:
+                    self._conn.execute(
+                        "DELETE FROM llm_cache WHERE key IN "
+                        "(SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                        (evicted,),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT count(*) FROM llm_cache").fetchone()
+            return int(count)
+
+
+_POSTGRES_SCHEMA = """
+CREATE EXTENSION IF NOT EXISTS vector;
+CREATE TABLE IF NOT EXISTS llm_cache (
+  key text PRIMARY KEY,
+  scope text NOT NULL,
+  value jsonb NOT NULL,
+  embedding vector,
+  expires_at double precision,
+  last_access double precision NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_scope ON llm_cache (scope);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access);
+"""
+
+
+def postgres_conninfo_from_env() -> str:
+    """libpq conninfo from the `POSTGRES_*` env vars (the phase1 database by default)."""
+    conninfo = (
+        f"host={os.getenv('POSTGRES_HOST', 'localhost')} "
+        f"port={os.getenv('POSTGRES_PORT', '5432')} "
+        f"dbname={os.getenv('POSTGRES_DB', 'prism_phase1')} "
+        f"user={os.getenv('POSTGRES_USER', os.getenv('USER', 'postgres'))}"
+    )
+    password = os.getenv("POSTGRES_PASSWORD", "")
+    if password:
+        conninfo += f" password={password}"
+    return conninfo
+
+
+def _vector_literal(embedding: list[float]) -> str:
+    return "[" + ",".join(f"{v:.8f}" for v in embedding) + "]"
+
+
+class PostgresCacheBackend:
+    """Cache table shared by every API worker; the semantic tier uses pgvector's cosine distance."""
+
+    def __init__(self, conninfo: str | None = None, *, max_entries: int = 100_000) -> None:
+        import psycopg
+
+        self._max_entries = max_entries
+        self._conn = psycopg.connect(conninfo or postgres_conninfo_from_env(), autocommit=True)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(_POSTGRES_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def get(self, key: str, *, now: float) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "UPDATE llm_cache SET last_access = %s "
+                "WHERE key = %s AND (expires_at IS NULL OR expires_at > %s) RETURNING value",
+                (now, key, now),
+            ).fetchone()
+        return row[0] if row else None
+
+    def nearest(
+        self, scope: str, embedding: list[float], *, threshold: float, now: float
+    ) -> dict[str, Any] | None:
+        vec = _vector_literal(embedding)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT key, value, 1 - (embedding <=> %s::vector) AS similarity FROM llm_cache "
+                "WHERE scope = %s AND embedding IS NOT NULL AND (expires_at IS NULL OR expires_at > %s) "
+                "ORDER BY embedding <=> %s::vector LIMIT 1",
+                (vec, scope, now, vec),
+            ).fetchone()
+            if row is None or float(row[2]) < threshold:
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_access = %s WHERE key = %s", (now, row[0]))
+        return row[1]
+
+    def set(
+        self,
+        request: CacheRequest,
+        value: dict[str, Any],
+        *,
+        expires_at: float | None,
+        now: float,
+    ) -> int:
+        vec = _vector_literal(request.embedding) if request.embedding is not None else None
+        with self._lock, self._conn.transaction():
+            self._conn.execute(
+                "INSERT INTO llm_cache(key, scope, value, embedding, expires_at, last_access) "
+                "VALUES (%s, %s, %s::jsonb, %s::vector, %s, %s) "
+                "ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, embedding = EXCLUDED.embedding, "
+                "expires_at = EXCLUDED.expires_at, last_access = EXCLUDED.last_access",
+                (request.key, request.scope, json.dumps(value, ensure_ascii=False), vec, expires_at, now),
+            )
+            self._conn.execute("DELETE FROM llm_cache WHERE expires_at IS NOT NULL AND expires_at <= %s", (now,))
+            (count,) = self._conn.execute("SELECT count(*) FROM llm_cache").fetchone()
+            evicted = max(0, int(count) - self._max_entries)
+            if evicted:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN "
+                    "(SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT %s)",
+                    (evicted,),
+                )
+        return evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT count(*) FROM llm_cache").fetchone()
+        return int(count)
+
+
+@dataclass(slots=True)
+class LlmCache:
+    """Exact + optional semantic cache for JSON LLM responses.
+
+    Args:
+        backend: Where entries live (defaults to an in-process LRU).
+        ttl_s: Entry lifetime in seconds; `None` keeps entries until evicted.
+        embedder: Maps a user message to an embedding. Enables the semantic tier.
+        semantic_threshold: Minimum cosine similarity for a semantic hit.
+        clock: Time source (injectable for tests).
+    """
+
+    backend: CacheBackend = field(default_factory=MemoryCacheBackend)
+    ttl_s: float | None = 24 * 3600.0
+    embedder: Embedder | None = None
+    semantic_threshold: float = 0.97
+    clock: Callable[[], float] = time.time
+    stats: CacheStats = field(default_factory=CacheStats)
+
+    def request(
+        self,
+        *,
+        task: str,
+        model: str,
+        system: str,
+        user: str,
+        schema: dict[str, object] | None,
+        temperature: float | None,
+    ) -> CacheRequest:
+        scope = _digest({"task": task, "model": model, "system": system, "schema": schema, "temperature": temperature})
+        return CacheRequest(key=_digest({"scope": scope, "user": user}), scope=scope, user=user)
+
+    def get(self, request: CacheRequest) -> dict[str, Any] | None:
+        """Return a cached value (exact tier first, then semantic) or `None`.
+
+        On a semantic miss the computed embedding is kept on `request` so `put` can reuse it.
+        Backend errors count as misses; the cache never fails a call.
+        """
+        now = self.clock()
+        try:
+            value = self.backend.get(request.key, now=now)
+            if value is not None:
+                self.stats.exact_hits += 1
+                return value
+            if self.embedder is not None:
+                if request.embedding is None:
+                    request.embedding = _normalize(list(self.embedder(request.user)))
+                value = self.backend.nearest(
+                    request.scope, request.embedding, threshold=self.semantic_threshold, now=now
+                )
+                if value is not None:
+                    self.stats.semantic_hits += 1
+                    return value
+        except Exception:
+            self.stats.errors += 1
+        self.stats.misses += 1
+        return None
+
+    def put(self, request: CacheRequest, value: dict[str, Any]) -> None:
+        now = self.clock()
+        expires_at = now + self.ttl_s if self.ttl_s is not None else None
+        try:
+            if self.embedder is not None and request.embedding is None:
+                request.embedding = _normalize(list(self.embedder(request.user)))
+            self.stats.evictions += self.backend.set(request, value, expires_at=expires_at, now=now)
+            self.stats.stores += 1
+        except Exception:
+            self.stats.errors += 1
+
+
+def openai_embedder(*, api_key: str | None = None, model: str = "text-embedding-3-small") -> Embedder:
+    """Embed user messages with the OpenAI embeddings API (sync client; async callers run the cache in a thread)."""
+    from openai import OpenAI
+
+    client = OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
+
+    def embed(text: str) -> list[float]:
+        return list(client.embeddings.create(model=model, input=text).data[0].embedding)
+
+    return embed
+
+
+def build_llm_cache_from_env() -> LlmCache | None:
+    """Build the cache configured by `LLM_CACHE_*` env vars, or `None` when `LLM_CACHE_BACKEND` is unset/off.
+
+    - `LLM_CACHE_BACKEND`: `memory`, `sqlite` or `postgres`
+    - `LLM_CACHE_PATH`: SQLite file (default `prism-devrel/.cache/llm_cache.sqlite`)
+    - `LLM_CACHE_TTL_S`: entry lifetime in seconds (default 86400; `0` disables expiry)
+    - `LLM_CACHE_MAX_ENTRIES`: size bound before LRU eviction
+    - `LLM_CACHE_SEMANTIC_THRESHOLD`: enables the semantic tier (e.g. `0.97`)
+    - `LLM_CACHE_SEMANTIC_SCAN`: SQLite only, recent entries per scope a semantic lookup compares (default 512)
+    - `LLM_CACHE_EMBEDDING_MODEL`: embedding model for the semantic tier
+    """
+    kind = os.getenv("LLM_CACHE_BACKEND", "").strip().lower()
+    if kind in ("", "off", "none", "0"):
+        return None
+
+    max_entries = os.getenv("LLM_CACHE_MAX_ENTRIES")
+    backend: CacheBackend
+    if kind == "memory":
+        backend = MemoryCacheBackend(max_entries=int(max_entries or 1024))
+    elif kind == "sqlite":
+        backend = SqliteCacheBackend(
+            os.getenv("LLM_CACHE_PATH") or str(CACHE_DIR / "llm_cache.sqlite"),
+            max_entries=int(max_entries or 10_000),
+            semantic_scan=int(os.getenv("LLM_CACHE_SEMANTIC_SCAN", str(DEFAULT_SEMANTIC_SCAN))),
+        )
+    elif kind == "postgres":
+        backend = PostgresCacheBackend(max_entries=int(max_entries or 100_000))
+    else:
+        raise ValueError(f"Unknown LLM_CACHE_BACKEND: {kind}")
+
+    ttl = float(os.getenv("LLM_CACHE_TTL_S", "86400"))
+    threshold = os.getenv("LLM_CACHE_SEMANTIC_THRESHOLD")
+    embedder = None
+    if threshold:
+        embedder = openai_embedder(model=os.getenv("LLM_CACHE_EMBEDDING_MODEL", "text-embedding-3-small"))
+    return LlmCache(
+        backend=backend,
+        ttl_s=ttl if ttl > 0 else None,
+        embedder=embedder,
+        semantic_threshold=float(threshold) if threshold else 0.97,
+    )
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import copy
+import hashlib
 import json
 import os
-from dataclasses import dataclass
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass, field
+from types import SimpleNamespace
 from typing import Any
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
+from .cache import CacheRequest, LlmCache
+from .json_stream import JsonFieldStreamer
 from .model_selector import LlmTask, model_for
+from .singleflight import AsyncSingleFlight, SingleFlight
+from .telemetry import CallTracker, LlmTelemetry
+from .usage import UsageStats
 
 
 @dataclass(frozen=True, slots=True)
@@ -18,8 +28,198 @@ class JsonSchema:
     description: str | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class JsonStreamEvent:
+    """Event from `AsyncLlmClient.stream_json`.
+
+    `delta`: new characters of the streamed text field. `reset`: the streamed text
+    is being replaced (the stream failed validation and the call was retried without
+    streaming). `done`: the final, validated JSON object in `data`.
+    """
+
+    type: str
+    text: str = ""
+    data: dict[str, Any] = field(default_factory=dict)
+
+
+FALLBACK_SYSTEM_SUFFIX = (
+    "\n\nReturn a single JSON object only. Ensure all strings use valid JSON escaping (e.g. \\n)."
+)
+
+
+def _required_keys(json_schema: JsonSchema) -> set[str]:
+    schema_obj = json_schema.schema or {}
+    if isinstance(schema_obj, dict):
+        required_list = schema_obj.get("required", [])
+        if isinstance(required_list, list):
+            return {str(x) for x in required_list}
+    return set()
+
+
+def _json_schema_format(json_schema: JsonSchema) -> dict[str, object]:
+    fmt: dict[str, object] = {
+        "type": "json_schema",
+        "name": json_schema.name,
+        "schema": json_schema.schema,
+        "strict": json_schema.strict,
+    }
+    if json_schema.description:
+        fmt["description"] = json_schema.description
+    return fmt
+
+
+def _prompt_cache_key(task: LlmTask, system_prompt: str, context: Sequence[str], text_format: dict[str, object]) -> str:
+    """Routing hint for OpenAI's prompt cache: requests sharing a static prefix share a key."""
+    prefix = json.dumps([system_prompt, list(context), text_format], ensure_ascii=False, sort_keys=True)
+    return f"devrel-{task.value}-{hashlib.sha256(prefix.encode('utf-8')).hexdigest()[:16]}"
+
+
+def _request_kwargs(
+    *,
+    task: LlmTask,
+    system_prompt: str,
+    user: str,
+    text_format: dict[str, object],
+    max_output_tokens: int,
+    temperature: float | None,
+    context: Sequence[str] = (),
+    model: str | None = None,
+) -> dict[str, object]:
+    """Responses API arguments with the static parts of the prompt first.
+
+    Messages are ordered system instructions, then the `context` blocks (schemas,
+    examples, repo/team data that is shared across requests), then the per-request
+    `user` message, so consecutive calls share a byte-identical prefix that
+    OpenAI's prompt cache can reuse.
+    """
+    kwargs: dict[str, object] = {
+        "model": model or model_for(task),
+        "input": [
+            {"role": "system", "content": system_prompt},
+            *({"role": "developer", "content": block} for block in context),
+            {"role": "user", "content": user},
+        ],
+        "max_output_tokens": max_output_tokens,
+        "text": {"format": text_format},
+        "prompt_cache_key": _prompt_cache_key(task, system_prompt, context, text_format),
+    }
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+    return kwargs
+
+
+def _truncated_by_max_tokens(resp: Any) -> bool:
+    status = getattr(resp, "status", None)
+    incomplete = getattr(resp, "incomplete_details", None)
+    reason = None
+    if isinstance(incomplete, dict):
+        reason = incomplete.get("reason")
+    elif incomplete is not None:
+        reason = getattr(incomplete, "reason", None)
+    return status == "incomplete" and reason == "max_output_tokens"
+
+
+def _output_text(resp: Any) -> str:
+    text = getattr(resp, "output_text", "") or ""
+    if text:
+        return text
+    output = getattr(resp, "output", None) or []
+    collected: list[str] = []
+    for item in output:
+        contents = item.get("content") if isinstance(item, dict) else getattr(item, "content", None)
+        for content in contents or []:
+            if isinstance(content, dict):
+                ctype = content.get("type")
+                ctext = content.get("text")
+            else:
+                ctype = getattr(content, "type", None)
+                ctext = getattr(content, "text", None)
+            if ctype == "output_text" and ctext:
+                collected.append(str(ctext))
+    return "\n".join(collected).strip()
+
+
+def _parse_json_output(resp: Any, required: set[str]) -> dict[str, Any]:
+    text = _output_text(resp)
+    if not text:
+        raise ValueError("OpenAI response had no output_text")
+
+    data = json.loads(text)
+    if required and isinstance(data, dict):
+        missing = required - set(data.keys())
+        if missing:
+            raise ValueError(f"JSON missing required keys: {sorted(missing)}")
+    return data
+
+
+def _cache_request(
+    cache: LlmCache,
+    *,
+    task: LlmTask,
+    system: str,
+    user: str,
+    json_schema: JsonSchema,
+    temperature: float | None,
+    context: Sequence[str] = (),
+    model: str | None = None,
+) -> CacheRequest:
+    return cache.request(
+        task=task.value,
+        model=model or model_for(task),
+        system="\n\n".join([system, *context]),
+        user=user,
+        schema=_json_schema_format(json_schema),
+        temperature=temperature,
+    )
+
+
+def _flight_key(
+    *,
+    task: LlmTask,
+    system: str,
+    user: str,
+    json_schema: JsonSchema,
+    temperature: float | None,
+    max_output_tokens: int,
+    context: Sequence[str] = (),
+    model: str | None = None,
+) -> str:
+    payload = json.dumps(
+        [
+            task.value,
+            model or model_for(task),
+            system,
+            list(context),
+            user,
+            _json_schema_format(json_schema),
+            temperature,
+            max_output_tokens,
+        ],
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 class LlmClient:
-    def __init__(self, *, api_key: str | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        api_key: str | None = None,
+        client: OpenAI | None = None,
+        cache: LlmCache | None = None,
+        coalesce: bool = True,
+        telemetry: LlmTelemetry | None = None,
+    ) -> None:
+        self.cache = cache
+        self.usage = UsageStats()
+        self.telemetry = telemetry or LlmTelemetry()
+        # Identical calls issued while one is in flight share its result instead of calling OpenAI again.
+        self._flight = SingleFlight() if coalesce else None
+        if client is not None:
+            self._client = client
+            return
         api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY is not set")
@@ -34,88 +234,364 @@ class LlmClient:
         json_schema: JsonSchema,
         temperature: float | None = None,
         max_output_tokens: int = 600,
+        context: Sequence[str] = (),
+        model: str | None = None,
+    ) -> dict[str, Any]:
+        """Call the model and return its JSON output, validated against the schema's required keys.
+
+        `context` holds prompt blocks shared across requests (e.g. the contributor
+        roster); they are sent between `system` and `user` to keep the prompt prefix cacheable.
+        `model` overrides `model_for(task)` for this call (see `devrel.llm.router`).
+        """
+        kwargs: dict[str, Any] = dict(
+            task=task,
+            system=system,
+            user=user,
+            json_schema=json_schema,
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            context=tuple(context),
+            model=model,
+        )
+        if self._flight is None:
+            return self._generate_json_cached(**kwargs)
+        data = self._flight.do(_flight_key(**kwargs), lambda: self._generate_json_cached(**kwargs))
+        return copy.deepcopy(data)
+
+    def _generate_json_cached(
+        self,
+        *,
+        task: LlmTask,
+        system: str,
+        user: str,
+        json_schema: JsonSchema,
+        temperature: float | None,
+        max_output_tokens: int,
+        context: tuple[str, ...],
+        model: str | None,
     ) -> dict[str, Any]:
-        required = set()
-        schema_obj = json_schema.schema or {}
-        if isinstance(schema_obj, dict):
-            required_list = schema_obj.get("required", [])
-            if isinstance(required_list, list):
-                required = {str(x) for x in required_list}
-
-        def call_openai(*, text_format: dict[str, object], system_prompt: str) -> dict[str, Any]:
+        cache_request = None
+        if self.cache is not None:
+            cache_request = _cache_request(
+                self.cache,
+                task=task,
+                system=system,
+                user=user,
+                json_schema=json_schema,
+                temperature=temperature,
+                context=context,
+                model=model,
+            )
+            cached = self.cache.get(cache_request)
+            if cached is not None:
+                return copy.deepcopy(cached)
+
+        data = self._generate_json_uncached(
+            task=task,
+            system=system,
+            user=user,
+            json_schema=json_schema,
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            context=context,
+            model=model,
+        )
+        if cache_request is not None:
+            self.cache.put(cache_request, copy.deepcopy(data))
+        return data
+
+    def _generate_json_uncached(
+        self,
+        *,
+        task: LlmTask,
+        system: str,
+        user: str,
+        json_schema: JsonSchema,
+        temperature: float | None,
+        max_output_tokens: int,
+        context: tuple[str, ...],
+        model: str | None,
+    ) -> dict[str, Any]:
+        required = _required_keys(json_schema)
+        model = model or model_for(task)
+
+        def call_openai(
+            tracker: CallTracker, *, text_format: dict[str, object], system_prompt: str
+        ) -> dict[str, Any]:
             local_max_tokens = max_output_tokens
             for attempt in range(2):
-                kwargs: dict[str, object] = {
-                    "model": model_for(task),
-                    "input": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user},
-                    ],
-                    "max_output_tokens": local_max_tokens,
-                    "text": {"format": text_format},
-                }
-                if temperature is not None:
-                    kwargs["temperature"] = temperature
-
-                resp = self._client.responses.create(**kwargs)
-
-                status = getattr(resp, "status", None)
-                incomplete = getattr(resp, "incomplete_details", None)
-                reason = None
-                if isinstance(incomplete, dict):
-                    reason = incomplete.get("reason")
-                elif incomplete is not None:
-                    reason = getattr(incomplete, "reason", None)
-
-                if status == "incomplete" and reason == "max_output_tokens" and attempt == 0:
+                resp = self._client.responses.create(
+                    **_request_kwargs(
+                        task=task,
+                        system_prompt=system_prompt,
+                        user=user,
+                        text_format=text_format,
+                        max_output_tokens=local_max_tokens,
+                        temperature=temperature,
+                        context=context,
+                        model=model,
+                    )
+                )
+                self.usage.record(task.value, resp)
+                tracker.response(resp)
+                if _truncated_by_max_tokens(resp) and attempt == 0:
+                    tracker.retry("max_output_tokens")
                     local_max_tokens = int(local_max_tokens * 2)
                     continue
+                break
+            return _parse_json_output(resp, required)
+
+        with self.telemetry.track(task.value, model) as tracker:
+            try:
+                return call_openai(tracker, text_format=_json_schema_format(json_schema), system_prompt=system)
+            except (json.JSONDecodeError, ValueError):
+                # Fallback for models that don't reliably escape newlines in JSON schema mode.
+                # Still validates required keys (best-effort) after parsing.
+                tracker.retry("invalid_json")
+                tracker.use_fallback("json_object")
+                return call_openai(
+                    tracker, text_format={"type": "json_object"}, system_prompt=system + FALLBACK_SYSTEM_SUFFIX
+                )
+
+
+class AsyncLlmClient:
+    """Same contract as `LlmClient`, but awaits `AsyncOpenAI` so callers never block the event loop.
+
+    Cache lookups (which may embed the prompt or hit SQLite/Postgres) run in a worker thread.
+    """
 
+    def __init__(
+        self,
+        *,
+        api_key: str | None = None,
+        client: AsyncOpenAI | None = None,
+        cache: LlmCache | None = None,
+        coalesce: bool = True,
+        telemetry: LlmTelemetry | None = None,
+    ) -> None:
+        self.cache = cache
+        self.usage = UsageStats()
+        self.telemetry = telemetry or LlmTelemetry()
+        self._flight = AsyncSingleFlight() if coalesce else None
+        if client is not None:
+            self._client = client
+            return
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY is not set")
+        self._client = AsyncOpenAI(api_key=api_key)
+
+    async def generate_json(
+        self,
+        *,
+        task: LlmTask,
+        system: str,
+        user: str,
+        json_schema: JsonSchema,
+        temperature: float | None = None,
+        max_output_tokens: int = 600,
+        context: Sequence[str] = (),
+        model: str | None = None,
+    ) -> dict[str, Any]:
+        kwargs: dict[str, Any] = dict(
+            task=task,
+            system=system,
+            user=user,
+            json_schema=json_schema,
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            context=tuple(context),
+            model=model,
+        )
+        if self._flight is None:
+            return await self._generate_json_cached(**kwargs)
+        data = await self._flight.do(_flight_key(**kwargs), lambda: self._generate_json_cached(**kwargs))
+        return copy.deepcopy(data)
+
+    async def _generate_json_cached(
+        self,
+        *,
+        task: LlmTask,
+        system: str,
+        user: str,
+        json_schema: JsonSchema,
+        temperature: float | None,
+        max_output_tokens: int,
+        context: tuple[str, ...],
+        model: str | None,
+    ) -> dict[str, Any]:
+        cache_request = None
+        if self.cache is not None:
+            cache_request = _cache_request(
+                self.cache,
+                task=task,
+                system=system,
+                user=user,
+                json_schema=json_schema,
+                temperature=temperature,
+                context=context,
+                model=model,
+            )
+            cached = await asyncio.to_thread(self.cache.get, cache_request)
+            if cached is not None:
+                return copy.deepcopy(cached)
+
+        data = await self._generate_json_uncached(
+            task=task,
+            system=system,
+            user=user,
+            json_schema=json_schema,
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            context=context,
+            model=model,
+        )
+        if cache_request is not None:
+            await asyncio.to_thread(self.cache.put, cache_request, copy.deepcopy(data))
+        return data
+
+    async def _generate_json_uncached(
+        self,
+        *,
+        task: LlmTask,
+        system: str,
+        user: str,
+        json_schema: JsonSchema,
+        temperature: float | None,
+        max_output_tokens: int,
+        context: tuple[str, ...],
+        model: str | None,
+    ) -> dict[str, Any]:
+        required = _required_keys(json_schema)
+        model = model or model_for(task)
+
+        async def call_openai(
+            tracker: CallTracker, *, text_format: dict[str, object], system_prompt: str
+        ) -> dict[str, Any]:
+            local_max_tokens = max_output_tokens
+            for attempt in range(2):
+                resp = await self._client.responses.create(
+                    **_request_kwargs(
+                        task=task,
+                        system_prompt=system_prompt,
+                        user=user,
+                        text_format=text_format,
+                        max_output_tokens=local_max_tokens,
+                        temperature=temperature,
+                        context=context,
+                        model=model,
+                    )
+                )
+                self.usage.record(task.value, resp)
+                tracker.response(resp)
+                if _truncated_by_max_tokens(resp) and attempt == 0:
+                    tracker.retry("max_output_tokens")
+                    local_max_tokens = int(local_max_tokens * 2)
+                    continue
                 break
+            return _parse_json_output(resp, required)
+
+        with self.telemetry.track(task.value, model) as tracker:
+            try:
+                return await call_openai(tracker, text_format=_json_schema_format(json_schema), system_prompt=system)
+            except (json.JSONDecodeError, ValueError):
+                tracker.retry("invalid_json")
+                tracker.use_fallback("json_object")
+                return await call_openai(
+                    tracker, text_format={"type": "json_object"}, system_prompt=system + FALLBACK_SYSTEM_SUFFIX
+                )
+
+    async def close(self) -> None:
+        close = getattr(self._client, "close", None)
+        if close is not None:
+            await close()
 
-            text = getattr(resp, "output_text", "") or ""
-            if not text:
-                output = getattr(resp, "output", None) or []
-                collected: list[str] = []
-                for item in output:
-                    contents = item.get("content") if isinstance(item, dict) else getattr(item, "content", None)
-                    for content in contents or []:
-                        if isinstance(content, dict):
-                            ctype = content.get("type")
-                            ctext = content.get("text")
-                        else:
-                            ctype = getattr(content, "type", None)
-                            ctext = getattr(content, "text", None)
-                        if ctype == "output_text" and ctext:
-                            collected.append(str(ctext))
-                text = "\n".join(collected).strip()
-
-            if not text:
-                raise ValueError("OpenAI response had no output_text")
-
-            data = json.loads(text)
-            if required and isinstance(data, dict):
-                missing = required - set(data.keys())
-                if missing:
-                    raise ValueError(f"JSON missing required keys: {sorted(missing)}")
-            return data
-
-        json_schema_format: dict[str, object] = {
-            "type": "json_schema",
-            "name": json_schema.name,
-            "schema": json_schema.schema,
-            "strict": json_schema.strict,
-        }
-        if json_schema.description:
-            json_schema_format["description"] = json_schema.description
-
-        try:
-            return call_openai(text_format=json_schema_format, system_prompt=system)
-        except (json.JSONDecodeError, ValueError):
-            # Fallback for models that don't reliably escape newlines in JSON schema mode.
-            # Still validates required keys (best-effort) after parsing.
-            fallback_system = (
-                system
-                + "\n\nReturn a single JSON object only. Ensure all strings use valid JSON escaping (e.g. \\n)."
+    async def stream_json(
+        self,
+        *,
+        task: LlmTask,
+        system: str,
+        user: str,
+        json_schema: JsonSchema,
+        text_field: str,
+        temperature: float | None = None,
+        max_output_tokens: int = 600,
+        context: Sequence[str] = (),
+        model: str | None = None,
+    ) -> AsyncIterator[JsonStreamEvent]:
+        """Stream a structured output, surfacing the string field `text_field` as it is generated.
+
+        The final object is validated like `generate_json` (required keys). If the
+        streamed output is truncated or invalid, a `reset` event is sent and the
+        call falls back to the non-streaming `generate_json` path.
+        """
+        kwargs: dict[str, Any] = dict(
+            task=task,
+            system=system,
+            user=user,
+            json_schema=json_schema,
+            temperature=temperature,
+            context=tuple(context),
+            model=model,
+        )
+        cache_request = None
+        if self.cache is not None:
+            cache_request = _cache_request(self.cache, **kwargs)
+            cached = await asyncio.to_thread(self.cache.get, cache_request)
+            if cached is not None:
+                yield JsonStreamEvent(type="delta", text=str(cached.get(text_field, "")))
+                yield JsonStreamEvent(type="done", data=copy.deepcopy(cached))
+                return
+
+        streamer = JsonFieldStreamer(text_field)
+        chunks: list[str] = []
+        final: Any = None
+        data: dict[str, Any] | None = None
+        with self.telemetry.track(task.value, model or model_for(task), streamed=True) as tracker:
+            stream = await self._client.responses.create(
+                stream=True,
+                **_request_kwargs(
+                    task=task,
+                    system_prompt=system,
+                    user=user,
+                    text_format=_json_schema_format(json_schema),
+                    max_output_tokens=max_output_tokens,
+                    temperature=temperature,
+                    context=context,
+                    model=model,
+                ),
             )
-            return call_openai(text_format={"type": "json_object"}, system_prompt=fallback_system)
+            async for event in stream:
+                etype = getattr(event, "type", "")
+                if etype == "response.output_text.delta":
+                    delta = str(getattr(event, "delta", "") or "")
+                    chunks.append(delta)
+                    text = streamer.feed(delta)
+                    if text:
+                        yield JsonStreamEvent(type="delta", text=text)
+                elif etype in ("response.completed", "response.incomplete"):
+                    final = getattr(event, "response", None)
+                    self.usage.record(task.value, final)
+                elif etype in ("response.failed", "error"):
+                    raise RuntimeError(f"OpenAI stream failed: {getattr(event, 'error', None) or etype}")
+            tracker.response(final)
+
+            truncated = final is not None and _truncated_by_max_tokens(final)
+            try:
+                if truncated:
+                    raise ValueError("streamed output truncated by max_output_tokens")
+                data = _parse_json_output(SimpleNamespace(output_text="".join(chunks)), _required_keys(json_schema))
+            except (json.JSONDecodeError, ValueError):
+                tracker.retry("max_output_tokens" if truncated else "invalid_json")
+                tracker.use_fallback("non_streaming")
+
+        if data is None:
+            yield JsonStreamEvent(type="reset")
+            data = await self.generate_json(max_output_tokens=max_output_tokens * 2, **kwargs)
+            yield JsonStreamEvent(type="delta", text=str(data.get(text_field, "")))
+            yield JsonStreamEvent(type="done", data=data)
+            return
+
+        if cache_request is not None:
+            await asyncio.to_thread(self.cache.put, cache_request, copy.deepcopy(data))
+        yield JsonStreamEvent(type="done", data=data)
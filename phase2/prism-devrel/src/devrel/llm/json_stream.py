@@ -0,0 +1,88 @@
+"""Incremental extraction of one string field from a JSON object being streamed.
+
+Structured outputs arrive as JSON text deltas (`{"strategy": "...", "response_text": "Hel`),
+so the user-facing text cannot be shown by `json.loads` until the whole object is done.
+`JsonFieldStreamer` scans the deltas and returns the decoded characters of a top-level
+string field as soon as they arrive, handling escapes split across chunks.
+"""
+from __future__ import annotations
+
+_SIMPLE_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class JsonFieldStreamer:
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self.text = ""  # everything emitted so far
+        self._depth = 0
+        self._expect_key = False
+        self._in_string = False
+        self._string_is_key = False
+        self._capturing = False
+        self._escape = False
+        self._unicode: str | None = None
+        self._high_surrogate: int | None = None
+        self._key_chars: list[str] = []
+        self._last_key: str | None = None
+
+    def feed(self, chunk: str) -> str:
+        """Consume a JSON text delta; return newly decoded characters of the field (may be empty)."""
+        out: list[str] = []
+        for ch in chunk:
+            if self._in_string:
+                self._string_char(ch, out)
+            elif ch == '"':
+                self._in_string = True
+                self._string_is_key = self._depth == 1 and self._expect_key
+                self._capturing = not self._string_is_key and self._depth == 1 and self._last_key == self.field
+                self._key_chars = []
+            elif ch in "{[":
+                self._depth += 1
+                self._expect_key = ch == "{" and self._depth == 1
+            elif ch in "}]":
+                self._depth -= 1
+            elif self._depth == 1 and ch == ":":
+                self._expect_key = False
+            elif self._depth == 1 and ch == ",":
+                self._expect_key = True
+        emitted = "".join(out)
+        self.text += emitted
+        return emitted
+
+    def _emit(self, text: str, out: list[str]) -> None:
+        if self._string_is_key:
+            self._key_chars.append(text)
+        elif self._capturing:
+            out.append(text)
+
+    def _string_char(self, ch: str, out: list[str]) -> None:
+        if self._unicode is not None:
+            self._unicode += ch
+            if len(self._unicode) < 4:
+                return
+            code = int(self._unicode, 16)
+            self._unicode = None
+            if 0xD800 <= code <= 0xDBFF:
+                self._high_surrogate = code
+                return
+            if 0xDC00 <= code <= 0xDFFF and self._high_surrogate is not None:
+                code = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+            self._high_surrogate = None
+            self._emit(chr(code), out)
+            return
+        if self._escape:
+            self._escape = False
+            if ch == "u":
+                self._unicode = ""
+            else:
+                self._emit(_SIMPLE_ESCAPES.get(ch, ch), out)
+            return
+        if ch == "\\":
+            self._escape = True
+        elif ch == '"':
+            self._in_string = False
+            if self._string_is_key:
+                self._last_key = "".join(self._key_chars)
+            self._capturing = False
+        else:
+            self._emit(ch, out)
@@ -0,0 +1,309 @@
+"""Per-request model routing with escalation.
+
+`model_selector.model_for` maps every task to one fixed model. `ModelRouter`
+scores each request's complexity from the prompt (size, number of candidate
+contributors, whether RAG references are attached, plus a per-task base) and
+starts on the cheapest rung of a model ladder expected to handle it. If a
+latency SLO is set, it steps down while the expected latency of the pick (from
+recent telemetry, else `DEFAULT_EXPECTED_LATENCY_MS`) exceeds the SLO.
+
+A call is escalated to the next rung only when the output fails validation
+(`generate_json` raised after its own retry/fallback) or reports a `confidence`
+below the floor. Every attempt is recorded as a `RouteDecision`, kept in
+`ModelRouter.decisions` and logged as JSON on `devrel.llm.router`.
+
+`RoutedLlmClient` / `AsyncRoutedLlmClient` wrap the regular clients with the same
+`generate_json` signature, so the agents can use them unchanged.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import time
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+from .model_selector import LlmTask
+
+if TYPE_CHECKING:
+    from .client import AsyncLlmClient, JsonSchema, LlmClient
+    from .telemetry import LlmTelemetry
+
+logger = logging.getLogger("devrel.llm.router")
+
+DEFAULT_LADDER: tuple[str, ...] = ("gpt-4.1-mini", "gpt-5-mini", "gpt-5")
+# Complexity at or above threshold i starts on ladder[i + 1].
+DEFAULT_THRESHOLDS: tuple[float, ...] = (0.35, 0.65)
+DEFAULT_EXPECTED_LATENCY_MS: dict[str, float] = {
+    "gpt-4.1-nano": 1000.0,
+    "gpt-4.1-mini": 1500.0,
+    "gpt-4.1": 3000.0,
+    "gpt-5-nano": 4000.0,
+    "gpt-5-mini": 6000.0,
+    "gpt-5": 15000.0,
+}
+# Tasks whose outputs need more judgement start further up the ladder.
+TASK_BASE_COMPLEXITY: dict[LlmTask, float] = {
+    LlmTask.ISSUE_TRIAGE: 0.0,
+    LlmTask.JUDGE: 0.0,
+    LlmTask.ASSIGNMENT: 0.1,
+    LlmTask.RESPONSE: 0.15,
+    LlmTask.DOCS: 0.2,
+    LlmTask.PROMOTION: 0.3,
+}
+MIN_LATENCY_SAMPLES = 5
+
+
+@dataclass(frozen=True, slots=True)
+class RequestFeatures:
+    task: LlmTask
+    prompt_tokens: int
+    contributors: int = 0
+    references: int = 0
+
+
+def _json_after_header(text: str) -> Any:
+    # Agent prompts are "<Header>:\n<json>".
+    _, _, rest = text.partition("\n")
+    try:
+        return json.loads(rest)
+    except ValueError:
+        return None
+
+
+def features_from_prompt(task: LlmTask, user: str, context: Sequence[str] = ()) -> RequestFeatures:
+    contributors = 0
+    for block in context:
+        parsed = _json_after_header(block)
+        if isinstance(parsed, list):
+            contributors += len(parsed)
+    payload = _json_after_header(user)
+    references = len(payload.get("references") or []) if isinstance(payload, dict) else 0
+    return RequestFeatures(
+        task=task,
+        prompt_tokens=math.ceil((len(user) + sum(len(b) for b in context)) / 4),
+        contributors=contributors,
+        references=references,
+    )
+
+
+def complexity_score(features: RequestFeatures) -> float:
+    """0..1; larger prompts, larger candidate lists and RAG context push requests up the ladder."""
+    score = TASK_BASE_COMPLEXITY.get(features.task, 0.0)
+    score += 0.5 * min(1.0, features.prompt_tokens / 2000)
+    score += 0.2 * min(1.0, features.contributors / 20)
+    score += 0.15 if features.references else 0.0
+    return round(min(1.0, score), 4)
+
+
+@dataclass(frozen=True, slots=True)
+class RouteDecision:
+    task: str
+    model: str
+    complexity: float
+    attempt: int
+    reason: str  # complexity | slo | escalate:invalid_output | escalate:low_confidence
+    outcome: str  # ok | invalid_output | low_confidence
+    latency_ms: float
+
+
+class Route:
+    """Routing state of one request; see `RoutedLlmClient.generate_json`."""
+
+    def __init__(self, router: ModelRouter, task: LlmTask, complexity: float, tier: int, reason: str) -> None:
+        self.router = router
+        self.task = task
+        self.complexity = complexity
+        self.tier = tier
+        self.reason = reason
+        self.attempt = 1
+
+    @property
+    def model(self) -> str:
+        return self.router.ladder[self.tier]
+
+    def advance(self, outcome: str, started: float) -> bool:
+        """Record the attempt; return True when the request should be retried one rung up."""
+        self.router.record(
+            RouteDecision(
+                task=self.task.value,
+                model=self.model,
+                complexity=self.complexity,
+                attempt=self.attempt,
+                reason=self.reason,
+                outcome=outcome,
+                latency_ms=round((time.perf_counter() - started) * 1000.0, 1),
+            )
+        )
+        if outcome == "ok" or self.attempt > self.router.max_escalations or self.tier + 1 >= len(self.router.ladder):
+            return False
+        self.tier += 1
+        self.attempt += 1
+        self.reason = f"escalate:{outcome}"
+        return True
+
+
+class ModelRouter:
+    def __init__(
+        self,
+        *,
+        ladder: Sequence[str] = DEFAULT_LADDER,
+        thresholds: Sequence[float] = DEFAULT_THRESHOLDS,
+        slo_ms: float | None = None,
+        confidence_floor: float = 0.5,
+        max_escalations: int = 1,
+        telemetry: LlmTelemetry | None = None,
+        history: int = 500,
+    ) -> None:
+        if not ladder:
+            raise ValueError("ladder must name at least one model")
+        self.ladder = tuple(ladder)
+        self.thresholds = tuple(sorted(thresholds))
+        self.slo_ms = slo_ms
+        self.confidence_floor = confidence_floor
+        self.max_escalations = max_escalations
+        self.telemetry = telemetry
+        self.decisions: deque[RouteDecision] = deque(maxlen=history)
+
+    @classmethod
+    def from_env(cls, *, telemetry: LlmTelemetry | None = None, history: int = 500) -> ModelRouter:
+        """`LLM_ROUTER_LADDER` (comma-separated, cheapest first), `LLM_ROUTER_SLO_MS`, `LLM_ROUTER_CONFIDENCE_FLOOR`."""
+        ladder = [m.strip() for m in os.getenv("LLM_ROUTER_LADDER", "").split(",") if m.strip()]
+        slo = os.getenv("LLM_ROUTER_SLO_MS", "").strip()
+        return cls(
+            ladder=ladder or DEFAULT_LADDER,
+            slo_ms=float(slo) if slo else None,
+            confidence_floor=float(os.getenv("LLM_ROUTER_CONFIDENCE_FLOOR", "0.5")),
+            telemetry=telemetry,
+            history=history,
+        )
+
+    def expected_latency_ms(self, model: str) -> float:
+        if self.telemetry is not None:
+            samples = [r.latency_ms for r in list(self.telemetry.recent) if r.model == model and r.status == "ok"]
+            if len(samples) >= MIN_LATENCY_SAMPLES:
+                return sum(samples) / len(samples)
+        return DEFAULT_EXPECTED_LATENCY_MS.get(model, math.inf)
+
+    def start(self, task: LlmTask, user: str, context: Sequence[str] = ()) -> Route:
+        complexity = complexity_score(features_from_prompt(task, user, context))
+        tier = min(sum(1 for t in self.thresholds if complexity >= t), len(self.ladder) - 1)
+        reason = "complexity"
+        if self.slo_ms is not None:
+            while tier > 0 and self.expected_latency_ms(self.ladder[tier]) > self.slo_ms:
+                tier -= 1
+                reason = "slo"
+        return Route(self, task, complexity, tier, reason)
+
+    def assess(self, data: dict[str, Any]) -> str:
+        confidence = data.get("confidence") if isinstance(data, dict) else None
+        if isinstance(confidence, (int, float)) and confidence < self.confidence_floor:
+            return "low_confidence"
+        return "ok"
+
+    def record(self, decision: RouteDecision) -> None:
+        self.decisions.append(decision)
+        logger.info(json.dumps({"event": "llm_route", **asdict(decision)}))
+
+
+class RoutedLlmClient:
+    """`LlmClient` whose `generate_json` picks the model per request via `ModelRouter`.
+
+    Other attributes (`cache`, `usage`, `telemetry`, ...) are those of the wrapped client.
+    """
+
+    def __init__(self, llm: LlmClient, router: ModelRouter | None = None) -> None:
+        self._llm = llm
+        self.router = router or ModelRouter.from_env()
+        if self.router.telemetry is None:
+            self.router.telemetry = getattr(llm, "telemetry", None)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._llm, name)
+
+    def generate_json(
+        self,
+        *,
+        task: LlmTask,
+        system: str,
+        user: str,
+        json_schema: JsonSchema,
+        temperature: float | None = None,
+        max_output_tokens: int = 600,
+        context: Sequence[str] = (),
+        model: str | None = None,
+    ) -> dict[str, Any]:
+        kwargs: dict[str, Any] = dict(
+            task=task,
+            system=system,
+            user=user,
+            json_schema=json_schema,
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            context=context,
+        )
+        if model is not None:
+            return self._llm.generate_json(model=model, **kwargs)
+        route = self.router.start(task, user, context)
+        while True:
+            started = time.perf_counter()
+            try:
+                data = self._llm.generate_json(model=route.model, **kwargs)
+            except (json.JSONDecodeError, ValueError):
+                if route.advance("invalid_output", started):
+                    continue
+                raise
+            if not route.advance(self.router.assess(data), started):
+                return data
+
+
+class AsyncRoutedLlmClient:
+    """Async counterpart of `RoutedLlmClient`; `stream_json` keeps the fixed per-task model."""
+
+    def __init__(self, llm: AsyncLlmClient, router: ModelRouter | None = None) -> None:
+        self._llm = llm
+        self.router = router or ModelRouter.from_env()
+        if self.router.telemetry is None:
+            self.router.telemetry = getattr(llm, "telemetry", None)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._llm, name)
+
+    async def generate_json(
+        self,
+        *,
+        task: LlmTask,
+        system: str,
+        user: str,
+        json_schema: JsonSchema,
+        temperature: float | None = None,
+        max_output_tokens: int = 600,
+        context: Sequence[str] = (),
+        model: str | None = None,
+    ) -> dict[str, Any]:
+        kwargs: dict[str, Any] = dict(
+            task=task,
+            system=system,
+            user=user,
+            json_schema=json_schema,
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            context=context,
+        )
+        if model is not None:
+            return await self._llm.generate_json(model=model, **kwargs)
+        route = self.router.start(task, user, context)
+        while True:
+            started = time.perf_counter()
+            try:
+                data = await self._llm.generate_json(model=route.model, **kwargs)
+            except (json.JSONDecodeError, ValueError):
+                if route.advance("invalid_output", started):
+                    continue
+                raise
+            if not route.advance(self.router.assess(data), started):
+                return data
@@ -0,0 +1,354 @@
+"""Per-call telemetry for LLM requests: latency, tokens, retries, fallbacks and cost.
+
+Every upstream `generate_json` / `stream_json` call produces one `LlmCallRecord`
+(all attempts of the call, including the doubled-`max_output_tokens` retry and
+the `json_object` fallback, count as one call). Records are
+
+- aggregated into Prometheus metrics (`LlmMetrics.render()` serves `/metrics`),
+- exported as OpenTelemetry spans when `opentelemetry-api` is installed
+  (a no-op unless an SDK/exporter is configured),
+- logged as JSON on the `devrel.llm.telemetry` logger at DEBUG level, and
+- kept in a bounded `recent` buffer for ad-hoc inspection.
+
+Cost is estimated from `DEFAULT_PRICES` (USD per 1M tokens: input, cached input,
+output); override or extend it with `LLM_PRICES`, a JSON object such as
+`{"gpt-5": [1.25, 0.125, 10.0]}`.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from .usage import response_usage
+
+logger = logging.getLogger("devrel.llm.telemetry")
+
+# USD per 1M tokens: (input, cached input, output).
+DEFAULT_PRICES: dict[str, tuple[float, float, float]] = {
+    "gpt-5": (1.25, 0.125, 10.0),
+    "gpt-5-mini": (0.25, 0.025, 2.0),
+    "gpt-5-nano": (0.05, 0.005, 0.4),
+    "gpt-4.1": (2.0, 0.5, 8.0),
+    "gpt-4.1-mini": (0.4, 0.1, 1.6),
+    "gpt-4.1-nano": (0.1, 0.025, 0.4),
+    "gpt-4o": (2.5, 1.25, 10.0),
+    "gpt-4o-mini": (0.15, 0.075, 0.6),
+}
+
+LATENCY_BUCKETS_S = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+
+def prices_from_env() -> dict[str, tuple[float, float, float]]:
+    prices = dict(DEFAULT_PRICES)
+    raw = os.getenv("LLM_PRICES", "").strip()
+    if raw:
+        for model, rates in json.loads(raw).items():
+            prices[str(model)] = (float(rates[0]), float(rates[1]), float(rates[2]))
+    return prices
+
+
+def estimate_cost(
+    model: str,
+    *,
+    input_tokens: int,
+    cached_tokens: int,
+    output_tokens: int,
+    prices: dict[str, tuple[float, float, float]] | None = None,
+) -> float | None:
+    """USD cost of one call, or None when the model is not in the price table.
+
+    Dated snapshots (`gpt-4.1-mini-2025-04-14`) use the price of their longest matching prefix.
+    """
+    table = prices if prices is not None else DEFAULT_PRICES
+    rates = table.get(model)
+    if rates is None:
+        matches = [name for name in table if model.startswith(f"{name}-")]
+        if not matches:
+            return None
+        rates = table[max(matches, key=len)]
+    input_rate, cached_rate, output_rate = rates
+    uncached = max(0, input_tokens - cached_tokens)
+    return (uncached * input_rate + cached_tokens * cached_rate + output_tokens * output_rate) / 1_000_000
+
+
+@dataclass(frozen=True, slots=True)
+class LlmCallRecord:
+    task: str
+    model: str
+    status: str  # ok | error | cancelled
+    latency_ms: float
+    attempts: int
+    input_tokens: int
+    cached_tokens: int
+    output_tokens: int
+    cost_usd: float | None
+    retry_reasons: tuple[str, ...] = ()  # max_output_tokens | invalid_json
+    fallback: str = ""  # "" | json_object | non_streaming
+    streamed: bool = False
+    error: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "retry_reasons": list(self.retry_reasons)}
+
+
+@dataclass(slots=True)
+class CallTracker:
+    """Collects what happens during one logical call; see `LlmTelemetry.track`."""
+
+    task: str
+    model: str
+    streamed: bool = False
+    attempts: int = 0
+    input_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+    retry_reasons: list[str] = field(default_factory=list)
+    fallback: str = ""
+
+    def response(self, resp: Any) -> None:
+        """Count one upstream response (an attempt) and its token usage."""
+        self.attempts += 1
+        usage = response_usage(resp)
+        if usage is not None:
+            self.input_tokens += usage.input_tokens
+            self.cached_tokens += usage.cached_input_tokens
+            self.output_tokens += usage.output_tokens
+
+    def retry(self, reason: str) -> None:
+        self.retry_reasons.append(reason)
+
+    def use_fallback(self, mode: str) -> None:
+        self.fallback = mode
+
+
+class LlmMetrics:
+    """Counters and a latency histogram per task/model, rendered in the Prometheus text format."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS_S) -> None:
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._calls: dict[tuple[str, str, str], int] = {}
+        self._tokens: dict[tuple[str, str, str], int] = {}
+        self._cost: dict[tuple[str, str], float] = {}
+        self._retries: dict[tuple[str, str], int] = {}
+        self._fallbacks: dict[tuple[str, str], int] = {}
+        self._latency_buckets: dict[tuple[str, str], list[int]] = {}
+        self._latency_sum: dict[tuple[str, str], float] = {}
+        self._latency_count: dict[tuple[str, str], int] = {}
+
+    def observe(self, record: LlmCallRecord) -> None:
+        key = (record.task, record.model)
+        seconds = record.latency_ms / 1000.0
+        with self._lock:
+            _inc(self._calls, (*key, record.status))
+            _inc(self._tokens, (*key, "input"), record.input_tokens)
+            _inc(self._tokens, (*key, "cached_input"), record.cached_tokens)
+            _inc(self._tokens, (*key, "output"), record.output_tokens)
+            if record.cost_usd is not None:
+                _inc(self._cost, key, record.cost_usd)
+            for reason in record.retry_reasons:
+                _inc(self._retries, (record.task, reason))
+            if record.fallback:
+                _inc(self._fallbacks, (record.task, record.fallback))
+            counts = self._latency_buckets.setdefault(key, [0] * len(self.buckets))
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    counts[i] += 1
+            _inc(self._latency_sum, key, seconds)
+            _inc(self._latency_count, key)
+
+    def totals(self) -> dict[str, Any]:
+        """Calls, errors, latency and cost over every observed call (unlike `LlmTelemetry.recent`, unbounded)."""
+        with self._lock:
+            calls = sum(self._calls.values())
+            errors = sum(n for (_, _, status), n in self._calls.items() if status != "ok")
+            latency_ms = sum(self._latency_sum.values()) * 1000.0
+            cost = sum(self._cost.values())
+            models = sorted({model for _, model, _ in self._calls})
+        return {
+            "calls": calls,
+            "errors": errors,
+            "latency_ms": round(latency_ms, 1),
+            "avg_latency_ms": round(latency_ms / calls, 1) if calls else 0.0,
+            "cost_usd": round(cost, 6),
+            "models": models,
+        }
+
+    def render(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            families = (
+                ("devrel_llm_calls_total", "LLM calls by task, model and outcome.", self._calls, ("task", "model", "status")),
+                ("devrel_llm_tokens_total", "Tokens by task, model and kind.", self._tokens, ("task", "model", "kind")),
+                ("devrel_llm_cost_usd_total", "Estimated spend in USD.", self._cost, ("task", "model")),
+                ("devrel_llm_retries_total", "Retried attempts by reason.", self._retries, ("task", "reason")),
+                (
+                    "devrel_llm_fallbacks_total",
+                    "LLM calls that used a fallback path, by mode (json_object, non_streaming).",
+                    self._fallbacks,
+                    ("task", "mode"),
+                ),
+            )
+            for family, help_text, values, label_names in families:
+                _counter_family(lines, family, help_text, values, label_names)
+            name = "devrel_llm_call_duration_seconds"
+            lines.append(f"# HELP {name} End-to-end latency of one LLM call, retries included.")
+            lines.append(f"# TYPE {name} histogram")
+            for key in sorted(self._latency_count):
+                labels = {"task": key[0], "model": key[1]}
+                for bound, count in zip(self.buckets, self._latency_buckets[key]):
+                    lines.append(f"{name}_bucket{_labels({**labels, 'le': _number(bound)})} {count}")
+                lines.append(f"{name}_bucket{_labels({**labels, 'le': '+Inf'})} {self._latency_count[key]}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(self._latency_sum[key])}")
+                lines.append(f"{name}_count{_labels(labels)} {self._latency_count[key]}")
+        return "\n".join(lines) + "\n"
+
+
+def _inc(counter: dict[Any, Any], key: Any, amount: float = 1) -> None:
+    counter[key] = counter.get(key, 0) + amount
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict[str, str]) -> str:
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _counter_family(
+    lines: list[str],
+    name: str,
+    help_text: str,
+    values: dict[tuple[str, ...], float],
+    label_names: tuple[str, ...],
+) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} counter")
+    for key in sorted(values):
+        lines.append(f"{name}{_labels(dict(zip(label_names, key)))} {_number(values[key])}")
+
+
+def _default_tracer() -> Any:
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        return None
+    return trace.get_tracer("devrel.llm")
+
+
+class LlmTelemetry:
+    def __init__(
+        self,
+        *,
+        prices: dict[str, tuple[float, float, float]] | None = None,
+        tracer: Any = None,
+        history: int = 500,
+    ) -> None:
+        self.prices = prices if prices is not None else prices_from_env()
+        self.metrics = LlmMetrics()
+        self.recent: deque[LlmCallRecord] = deque(maxlen=history)
+        self._tracer = tracer if tracer is not None else _default_tracer()
+
+    @contextmanager
+    def track(self, task: str, model: str, *, streamed: bool = False) -> Iterator[CallTracker]:
+        """Time one logical call; the record is emitted when the block exits (also on errors)."""
+        tracker = CallTracker(task=task, model=model, streamed=streamed)
+        # Not `start_as_current_span`: the block may span `yield`s of an async generator.
+        span = None
+        if self._tracer is not None:
+            span = self._tracer.start_span(
+                f"llm {task}",
+                attributes={"gen_ai.system": "openai", "gen_ai.request.model": model, "devrel.llm.task": task},
+            )
+        started = time.perf_counter()
+        status, error = "ok", ""
+        try:
+            yield tracker
+        except (GeneratorExit, KeyboardInterrupt, asyncio.CancelledError):
+            status = "cancelled"
+            raise
+        except Exception as e:
+            status, error = "error", f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record = LlmCallRecord(
+                task=task,
+                model=model,
+                status=status,
+                latency_ms=round((time.perf_counter() - started) * 1000.0, 1),
+                attempts=tracker.attempts,
+                input_tokens=tracker.input_tokens,
+                cached_tokens=tracker.cached_tokens,
+                output_tokens=tracker.output_tokens,
+                cost_usd=estimate_cost(
+                    model,
+                    input_tokens=tracker.input_tokens,
+                    cached_tokens=tracker.cached_tokens,
+                    output_tokens=tracker.output_tokens,
+                    prices=self.prices,
+                ),
+                retry_reasons=tuple(tracker.retry_reasons),
+                fallback=tracker.fallback,
+                streamed=streamed,
+                error=error,
+            )
+            self.record(record)
+            if span is not None:
+                _finish_span(span, record)
+
+    def record(self, record: LlmCallRecord) -> None:
+        self.metrics.observe(record)
+        self.recent.append(record)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(json.dumps({"event": "llm_call", **record.to_dict()}, ensure_ascii=False))
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Per-task totals over `recent`, slowest/most expensive task first."""
+        totals: dict[str, dict[str, float]] = {}
+        for r in list(self.recent):
+            t = totals.setdefault(r.task, {"calls": 0, "errors": 0, "latency_ms": 0.0, "cost_usd": 0.0})
+            t["calls"] += 1
+            t["errors"] += r.status != "ok"
+            t["latency_ms"] += r.latency_ms
+            t["cost_usd"] += r.cost_usd or 0.0
+        for t in totals.values():
+            t["avg_latency_ms"] = round(t["latency_ms"] / t["calls"], 1)
+            t["cost_usd"] = round(t["cost_usd"], 6)
+        return dict(sorted(totals.items(), key=lambda kv: (-kv[1]["latency_ms"], -kv[1]["cost_usd"])))
+
+
+def _finish_span(span: Any, record: LlmCallRecord) -> None:
+    span.set_attribute("gen_ai.usage.input_tokens", record.input_tokens)
+    span.set_attribute("gen_ai.usage.output_tokens", record.output_tokens)
+    span.set_attribute("devrel.llm.cached_tokens", record.cached_tokens)
+    span.set_attribute("devrel.llm.attempts", record.attempts)
+    span.set_attribute("devrel.llm.status", record.status)
+    span.set_attribute("devrel.llm.streamed", record.streamed)
+    if record.cost_usd is not None:
+        span.set_attribute("devrel.llm.cost_usd", record.cost_usd)
+    if record.retry_reasons:
+        span.set_attribute("devrel.llm.retry_reasons", list(record.retry_reasons))
+    if record.fallback:
+        span.set_attribute("devrel.llm.fallback", record.fallback)
+    if record.error:
+        try:
+            from opentelemetry.trace import Status, StatusCode
+
+            span.set_status(Status(StatusCode.ERROR, record.error))
+        except ImportError:
+            pass
+    span.end()
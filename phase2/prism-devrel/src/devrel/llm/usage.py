@@ -0,0 +1,76 @@
+"""Token usage reported by the Responses API, including prompt-cache hits.
+
+OpenAI caches prompt prefixes automatically (prompts of 1024+ tokens, matched in
+128-token increments) and reports the reused part as
+`usage.input_tokens_details.cached_tokens`. `UsageStats` adds those numbers up per
+task so the prefix cache hit rate of each agent prompt can be measured.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+
+@dataclass(slots=True)
+class TokenUsage:
+    calls: int = 0
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def cached_ratio(self) -> float:
+        return self.cached_input_tokens / self.input_tokens if self.input_tokens else 0.0
+
+    def add(self, other: TokenUsage) -> None:
+        self.calls += other.calls
+        self.input_tokens += other.input_tokens
+        self.cached_input_tokens += other.cached_input_tokens
+        self.output_tokens += other.output_tokens
+
+    def to_dict(self) -> dict[str, float]:
+        return {**asdict(self), "cached_ratio": round(self.cached_ratio, 4)}
+
+
+def _field(obj: Any, name: str) -> Any:
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def response_usage(resp: Any) -> TokenUsage | None:
+    """`TokenUsage` of one response (object or dict form); None when the response has no usage."""
+    usage = _field(resp, "usage")
+    if usage is None:
+        return None
+    details = _field(usage, "input_tokens_details")
+    return TokenUsage(
+        calls=1,
+        input_tokens=int(_field(usage, "input_tokens") or 0),
+        cached_input_tokens=int(_field(details, "cached_tokens") or 0) if details is not None else 0,
+        output_tokens=int(_field(usage, "output_tokens") or 0),
+    )
+
+
+@dataclass(slots=True)
+class UsageStats:
+    total: TokenUsage = field(default_factory=TokenUsage)
+    by_task: dict[str, TokenUsage] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, task: str, resp: Any) -> TokenUsage | None:
+        usage = response_usage(resp)
+        if usage is None:
+            return None
+        with self._lock:
+            self.total.add(usage)
+            self.by_task.setdefault(task, TokenUsage()).add(usage)
+        return usage
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                **self.total.to_dict(),
+                "by_task": {task: u.to_dict() for task, u in sorted(self.by_task.items())},
+            }
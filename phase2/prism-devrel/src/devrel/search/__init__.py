@@ -1,5 +1,5 @@
 """Search module for external API integrations."""
-from .rag_client import KBDocument, RAGClient
+from .rag_client import AsyncRAGClient, KBDocument, RAGClient
 from .tavily_client import TavilyClient, TavilySearchResult
 
-__all__ = ["TavilyClient", "TavilySearchResult", "RAGClient", "KBDocument"]
+__all__ = ["TavilyClient", "TavilySearchResult", "RAGClient", "AsyncRAGClient", "KBDocument"]
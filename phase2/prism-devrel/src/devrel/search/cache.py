@@ -0,0 +1,212 @@
+"""Caches for the external search clients.
+
+`SearchCache` is a TTL + LRU cache of `TavilyClient` responses keyed by the
+normalised query (case and whitespace folded) and the search params, so
+repeated doc-gap runs over the same topic skip the search round trip.
+
+`DocsTreeCache` backs `GitHubClient`'s docs crawl. A repository's file listing
+is stored per (repo, tree SHA): a tree SHA names immutable content, so entries
+never go stale and need no TTL. The only thing that changes is which tree a
+repository's default branch points at; that (branch, tree SHA) lookup is
+memoised in-process for `ref_ttl_s` seconds, so a warm crawl of a repository
+costs no GitHub requests inside that window and one small request after it.
+
+Listings live in memory and, when `path` is set (`GITHUB_DOCS_CACHE_PATH`), in a
+SQLite file shared by processes on one host so they survive restarts.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from functools import lru_cache
+from typing import Any
+
+DEFAULT_REF_TTL_S = 300.0
+DEFAULT_SEARCH_TTL_S = 3600.0
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class SearchCache:
+    """Thread-safe in-process TTL + LRU cache of search responses."""
+
+    def __init__(
+        self,
+        *,
+        ttl_s: float = DEFAULT_SEARCH_TTL_S,
+        max_entries: int = 512,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_s = ttl_s
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(query: str, params: Mapping[str, Any]) -> str:
+        payload = json.dumps(
+            {"query": normalize_query(query), **params}, sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_s, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS github_doc_trees (
+  repo text NOT NULL,
+  tree_sha text NOT NULL,
+  value text NOT NULL,
+  stored_at real NOT NULL,
+  PRIMARY KEY (repo, tree_sha)
+);
+CREATE INDEX IF NOT EXISTS idx_github_doc_trees_stored_at ON github_doc_trees (stored_at);
+"""
+
+
+class DocsTreeCache:
+    """Doc-file listings keyed by (repo, tree SHA), plus a short-lived repo -> (branch, tree SHA) memo."""
+
+    def __init__(
+        self,
+        path: str | None = None,
+        *,
+        ref_ttl_s: float = DEFAULT_REF_TTL_S,
+        max_entries: int = 1_000,
+    ) -> None:
+        self.ref_ttl_s = ref_ttl_s
+        self._max_entries = max_entries
+        self._trees: dict[tuple[str, str], list[Any]] = {}
+        self._heads: dict[str, tuple[str, str, float]] = {}  # repo -> (branch, tree_sha, expires_at)
+        self._branches: dict[str, str] = {}  # default branches outlive the head memo
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        if path:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SQLITE_SCHEMA)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def head(self, repo: str, *, now: float | None = None) -> tuple[str, str] | None:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._heads.get(repo)
+            if entry is None or entry[2] <= now:
+                return None
+            return entry[0], entry[1]
+
+    def put_head(self, repo: str, branch: str, tree_sha: str, *, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._heads[repo] = (branch, tree_sha, now + self.ref_ttl_s)
+            self._branches[repo] = branch
+
+    def default_branch(self, repo: str) -> str | None:
+        with self._lock:
+            return self._branches.get(repo)
+
+    def get_tree(self, repo: str, tree_sha: str) -> list[Any] | None:
+        with self._lock:
+            value = self._trees.get((repo, tree_sha))
+            if value is not None or self._conn is None:
+                return value
+            row = self._conn.execute(
+                "SELECT value FROM github_doc_trees WHERE repo = ? AND tree_sha = ?", (repo, tree_sha)
+            ).fetchone()
+            if row is None:
+                return None
+            value = json.loads(row[0])
+            self._trees[(repo, tree_sha)] = value
+            return value
+
+    def put_tree(self, repo: str, tree_sha: str, value: list[Any]) -> None:
+        with self._lock:
+            self._trees[(repo, tree_sha)] = value
+            while len(self._trees) > self._max_entries:
+                del self._trees[next(iter(self._trees))]
+            if self._conn is None:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO github_doc_trees(repo, tree_sha, value, stored_at) VALUES (?, ?, ?, ?)",
+                (repo, tree_sha, json.dumps(value, separators=(",", ":")), time.time()),
+            )
+            self._conn.execute(
+                "DELETE FROM github_doc_trees WHERE rowid IN "
+                "(SELECT rowid FROM github_doc_trees ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self._max_entries,),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._conn is None:
+                return len(self._trees)
+            (count,) = self._conn.execute("SELECT count(*) FROM github_doc_trees").fetchone()
+            return int(count)
+
+
+@lru_cache(maxsize=1)
+def default_docs_tree_cache() -> DocsTreeCache:
+    """Process-wide cache configured by env vars, shared by every `GitHubClient` that is not given one.
+
+    - `GITHUB_DOCS_CACHE_PATH`: SQLite file shared across processes (default unset: in memory only)
+    - `GITHUB_DOCS_REF_TTL_S`: seconds a repo's branch head is trusted before it is re-checked (default 300)
+    """
+    path = os.getenv("GITHUB_DOCS_CACHE_PATH", "").strip()
+    if path.lower() in ("", "off", "none", "0"):
+        path = ""
+    return DocsTreeCache(path or None, ref_ttl_s=float(os.getenv("GITHUB_DOCS_REF_TTL_S", str(DEFAULT_REF_TTL_S))))
+
+
+@lru_cache(maxsize=1)
+def default_search_cache() -> SearchCache | None:
+    """Process-wide search cache shared by every `TavilyClient` that is not given one; `None` when disabled.
+
+    - `TAVILY_CACHE_TTL_S`: response lifetime in seconds (default 3600; `0` disables caching)
+    - `TAVILY_CACHE_MAX_ENTRIES`: size bound before LRU eviction (default 512)
+    """
+    ttl = float(os.getenv("TAVILY_CACHE_TTL_S", str(DEFAULT_SEARCH_TTL_S)))
+    if ttl <= 0:
+        return None
+    return SearchCache(ttl_s=ttl, max_entries=int(os.getenv("TAVILY_CACHE_MAX_ENTRIES", "512")))
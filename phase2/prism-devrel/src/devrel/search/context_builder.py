@@ -0,0 +1,210 @@
+"""Token-budgeted RAG context assembly.
+
+`build_context` turns ranked KB documents into reference strings for a prompt:
+
+- counts tokens with the target model's tokenizer (`tiktoken`, the `tokens`
+  extra; without it a ~4 chars/token estimate),
+- drops near-duplicate chunks (word-shingle Jaccard similarity),
+- keeps the sentences of each chunk that best match the query (IDF-weighted
+  term overlap) in their original order, instead of a hard character prefix,
+- packs chunks in rank order until the per-task token budget is spent.
+"""
+from __future__ import annotations
+
+import math
+import os
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from devrel.llm.model_selector import LlmTask, model_for
+
+from .rag_client import KBDocument
+
+# Context tokens allowed per task; override with CONTEXT_BUDGET_<TASK> (e.g. CONTEXT_BUDGET_RESPONSE=2000).
+DEFAULT_CONTEXT_BUDGETS: dict[LlmTask, int] = {
+    LlmTask.ISSUE_TRIAGE: 600,
+    LlmTask.ASSIGNMENT: 800,
+    LlmTask.RESPONSE: 1500,
+    LlmTask.DOCS: 2000,
+    LlmTask.PROMOTION: 600,
+    LlmTask.JUDGE: 1000,
+}
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n{2,}|\n(?=\s*(?:[-*]|\d+\.)\s)")
+_WORD = re.compile(r"[0-9A-Za-z_]+|[^\x00-\x7F]+")
+
+
+def context_budget_for(task: LlmTask) -> int:
+    return int(os.getenv(f"CONTEXT_BUDGET_{task.value.upper()}", DEFAULT_CONTEXT_BUDGETS[task]))
+
+
+@lru_cache(maxsize=16)
+def _encoding(model: str) -> Any:
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str, model: str | None = None) -> int:
+    """Token count of `text` for `model` (estimated when tiktoken is not installed)."""
+    if not text:
+        return 0
+    enc = _encoding(model or model_for(LlmTask.RESPONSE))
+    if enc is None:
+        return math.ceil(len(text) / 4)
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def split_sentences(text: str) -> list[str]:
+    return [s.strip() for s in _SENTENCE_SPLIT.split(text or "") if s and s.strip()]
+
+
+def _terms(text: str) -> list[str]:
+    return [w.lower() for w in _WORD.findall(text)]
+
+
+def _shingles(text: str, size: int = 3) -> set[tuple[str, ...]]:
+    words = _terms(text)
+    if len(words) < size:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def _jaccard(a: set[tuple[str, ...]], b: set[tuple[str, ...]]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass(frozen=True, slots=True)
+class ContextPack:
+    references: tuple[str, ...]
+    tokens: int
+    budget: int
+    used_docs: int
+    dropped_duplicates: int
+    dropped_over_budget: int
+
+
+def _header(doc: KBDocument) -> str:
+    return f"[{doc.item_type.upper()} #{doc.item_number}] {doc.section}: "
+
+
+def _select_sentences(
+    sentences: list[str],
+    scores: list[float],
+    *,
+    max_tokens: int,
+    model: str | None,
+) -> str:
+    """Keep the best-scoring sentences that fit in `max_tokens`, in document order."""
+    order = sorted(range(len(sentences)), key=lambda i: (-scores[i], i))
+    chosen: list[int] = []
+    used = 0
+    for i in order:
+        cost = count_tokens(sentences[i], model) + 1
+        if used + cost > max_tokens:
+            continue
+        chosen.append(i)
+        used += cost
+    if not chosen and sentences:
+        # Not even the best sentence fits: cut it to the budget rather than returning nothing.
+        best = sentences[order[0]]
+        return best[: max(0, max_tokens) * 4].rstrip() + " …"
+    chosen.sort()
+    parts: list[str] = []
+    for prev, i in zip([None, *chosen], chosen):
+        if prev is not None and i != prev + 1:
+            parts.append("…")
+        parts.append(sentences[i])
+    return " ".join(parts)
+
+
+def build_context(
+    query: str,
+    docs: Sequence[KBDocument],
+    *,
+    task: LlmTask = LlmTask.RESPONSE,
+    budget_tokens: int | None = None,
+    per_doc_tokens: int | None = None,
+    dedup_threshold: float = 0.8,
+    model: str | None = None,
+) -> ContextPack:
+    """Pack `docs` (best first) into reference strings under the task's token budget.
+
+    Args:
+        query: Text the references should answer (used for sentence selection).
+        docs: Retrieved KB documents, in rank order.
+        task: Selects the default budget and tokenizer model.
+        budget_tokens: Total tokens for all references (default: `context_budget_for(task)`).
+        per_doc_tokens: Cap per reference (default: budget / 3, so at least three docs fit).
+        dedup_threshold: Word-shingle Jaccard similarity above which a chunk counts as a duplicate.
+        model: Tokenizer model (default: `model_for(task)`).
+    """
+    model = model or model_for(task)
+    budget = budget_tokens if budget_tokens is not None else context_budget_for(task)
+    per_doc = per_doc_tokens if per_doc_tokens is not None else max(64, budget // 3)
+
+    doc_sentences = [split_sentences(d.text) for d in docs]
+    n_sentences = sum(len(s) for s in doc_sentences) or 1
+    df: dict[str, int] = {}
+    for sentences in doc_sentences:
+        for sentence in sentences:
+            for term in set(_terms(sentence)):
+                df[term] = df.get(term, 0) + 1
+    query_terms = set(_terms(query))
+
+    def score(sentence: str) -> float:
+        terms = set(_terms(sentence))
+        return sum(math.log(1.0 + n_sentences / df.get(t, 1)) for t in query_terms & terms)
+
+    references: list[str] = []
+    kept_shingles: list[set[tuple[str, ...]]] = []
+    used = 0
+    dropped_duplicates = 0
+    dropped_over_budget = 0
+    for doc, sentences in zip(docs, doc_sentences):
+        shingles = _shingles(doc.text)
+        if any(_jaccard(shingles, seen) >= dedup_threshold for seen in kept_shingles):
+            dropped_duplicates += 1
+            continue
+
+        header = _header(doc)
+        source = f"\nSource: {doc.source_ref}" if doc.source_ref else ""
+        overhead = count_tokens(header + source, model)
+        room = min(per_doc, budget - used) - overhead
+        if room <= 8 or not sentences:
+            dropped_over_budget += 1
+            continue
+
+        body = _select_sentences(sentences, [score(s) for s in sentences], max_tokens=room, model=model)
+        reference = header + body + source
+        cost = count_tokens(reference, model)
+        if used + cost > budget:
+            dropped_over_budget += 1
+            continue
+        references.append(reference)
+        kept_shingles.append(shingles)
+        used += cost
+
+    return ContextPack(
+        references=tuple(references),
+        tokens=used,
+        budget=budget,
+        used_docs=len(references),
+        dropped_duplicates=dropped_duplicates,
+        dropped_over_budget=dropped_over_budget,
+    )
+
+
+def build_references(query: str, docs: Sequence[KBDocument], *, task: LlmTask = LlmTask.RESPONSE) -> list[str]:
+    """`build_context(...).references` as a list, for the agents' `references` argument."""
+    return list(build_context(query, docs, task=task).references)
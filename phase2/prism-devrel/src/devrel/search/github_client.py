@@ -2,9 +2,19 @@
 from __future__ import annotations
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from typing import Any
+from urllib.parse import quote
 
 import requests
+import requests.adapters
+
+from .cache import DocsTreeCache, default_docs_tree_cache
+
+DOC_EXTENSIONS = (".md", ".rst", ".txt")
+DEFAULT_DOCS_PATHS = ("docs", "doc", "documentation", "guide", "guides")
+ROOT_DOC_KEYWORDS = ("readme", "contributing", "changelog", "guide", "doc", "tutorial")
 
 
 @dataclass(frozen=True)
@@ -42,22 +52,62 @@ class DocsComparison:
 
 
 class GitHubClient:
-    """Client for GitHub API to analyze repository documentation."""
+    """Client for GitHub API to analyze repository documentation.
+
+    A repository's docs are read from one recursive Git Trees API call
+    (`GET /repos/{repo}/git/trees/{sha}?recursive=1`) instead of a contents
+    request per directory, and the resulting doc-file listing is cached by
+    tree SHA in a `DocsTreeCache` (by default the process-wide
+    `default_docs_tree_cache()`). Several repositories are crawled concurrently
+    with `get_docs_structures`.
+    """
 
     BASE_URL = "https://api.github.com"
+    HTML_URL = "https://github.com"
+    RAW_URL = "https://raw.githubusercontent.com"
 
-    def __init__(self, token: str | None = None):
+    def __init__(
+        self,
+        token: str | None = None,
+        *,
+        base_url: str | None = None,
+        cache: DocsTreeCache | None = None,
+        session: requests.Session | None = None,
+        max_workers: int = 4,
+    ):
         self._token = token or os.getenv("GITHUB_TOKEN")
+        self._base_url = (base_url or self.BASE_URL).rstrip("/")
+        self._cache = cache if cache is not None else default_docs_tree_cache()
+        self._max_workers = max(1, max_workers)
         self._headers = {
             "Accept": "application/vnd.github.v3+json",
         }
         if self._token:
             self._headers["Authorization"] = f"token {self._token}"
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=self._max_workers)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self._session = session
+
+    def _get_json(self, path: str, params: dict[str, Any] | None = None) -> Any | None:
+        """GET `path` on the API; `None` on 404 or any request error."""
+        try:
+            response = self._session.get(
+                f"{self._base_url}{path}", headers=self._headers, params=params, timeout=10
+            )
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return response.json()
+        except (requests.RequestException, ValueError):
+            return None
 
     def get_docs_structure(
         self,
         repo: str,
-        docs_paths: tuple[str, ...] = ("docs", "doc", "documentation", "guide", "guides"),
+        docs_paths: tuple[str, ...] = DEFAULT_DOCS_PATHS,
     ) -> RepoDocsStructure | None:
         """Get documentation structure of a repository.
 
@@ -65,133 +115,162 @@ class GitHubClient:
             repo: Repository in "owner/repo" format
             docs_paths: Possible documentation directory names to check
         """
+        listing = self._doc_blobs(repo)
+        if listing is None:
+            return None
+        branch, blobs = listing
         for docs_path in docs_paths:
-            structure = self._fetch_directory(repo, docs_path)
+            structure = self._structure_from_blobs(repo, branch, blobs, docs_path)
             if structure:
                 return structure
 
         # Try root-level markdown files
-        return self._fetch_root_docs(repo)
+        return self._root_docs(repo, branch, blobs)
 
-    def _fetch_directory(self, repo: str, path: str) -> RepoDocsStructure | None:
-        """Fetch contents of a directory."""
-        url = f"{self.BASE_URL}/repos/{repo}/contents/{path}"
-        try:
-            response = requests.get(url, headers=self._headers, timeout=10)
-            if response.status_code == 404:
+    def get_docs_structures(
+        self,
+        repos: list[str] | tuple[str, ...],
+        docs_paths: tuple[str, ...] = DEFAULT_DOCS_PATHS,
+    ) -> dict[str, RepoDocsStructure | None]:
+        """`get_docs_structure` for several repositories, fetched concurrently; keyed in input order."""
+        unique = list(dict.fromkeys(repos))
+        if len(unique) <= 1:
+            return {repo: self.get_docs_structure(repo, docs_paths) for repo in unique}
+        with ThreadPoolExecutor(max_workers=min(self._max_workers, len(unique))) as pool:
+            structures = pool.map(lambda repo: self.get_docs_structure(repo, docs_paths), unique)
+            return dict(zip(unique, structures))
+
+    def _head(self, repo: str) -> tuple[str, str] | None:
+        """(default branch, tree SHA of its head commit), memoised for the cache's ref TTL."""
+        head = self._cache.head(repo)
+        if head is not None:
+            return head
+        branch = self._cache.default_branch(repo)
+        if branch is None:
+            info = self._get_json(f"/repos/{repo}")
+            if not isinstance(info, dict) or not info.get("default_branch"):
                 return None
-            response.raise_for_status()
-            contents = response.json()
-        except requests.RequestException:
+            branch = str(info["default_branch"])
+        data = self._get_json(f"/repos/{repo}/branches/{quote(branch, safe='')}")
+        try:
+            tree_sha = str(data["commit"]["commit"]["tree"]["sha"])
+        except (KeyError, TypeError):
             return None
+        self._cache.put_head(repo, branch, tree_sha)
+        return branch, tree_sha
 
-        if not isinstance(contents, list):
+    def _doc_blobs(self, repo: str) -> tuple[str, list[list[Any]]] | None:
+        """(branch, sorted `[path, size]` of every doc-extension file in the repository)."""
+        head = self._head(repo)
+        if head is None:
             return None
+        branch, tree_sha = head
+        blobs = self._cache.get_tree(repo, tree_sha)
+        if blobs is not None:
+            return branch, blobs
 
+        data = self._get_json(f"/repos/{repo}/git/trees/{tree_sha}", params={"recursive": "1"})
+        if not isinstance(data, dict):
+            return None
+        entries = data.get("tree") or []
+        complete = True
+        if data.get("truncated"):
+            subtrees = self._docs_subtrees(repo, tree_sha)
+            if subtrees is None:
+                return None
+            entries, complete = subtrees
+        blobs = sorted(
+            [e["path"], int(e.get("size") or 0)]
+            for e in entries
+            if e.get("type") == "blob" and str(e.get("path", "")).lower().endswith(DOC_EXTENSIONS)
+        )
+        # The cache is keyed by an immutable tree SHA, so a partial listing stored there would never be retried.
+        if complete:
+            self._cache.put_tree(repo, tree_sha, blobs)
+        return branch, blobs
+
+    def _docs_subtrees(self, repo: str, tree_sha: str) -> tuple[list[dict[str, Any]], bool] | None:
+        """Entries for a repository too large for one recursive listing: root files plus each docs directory.
+
+        The flag is False when a docs directory could not be fetched or was itself truncated.
+        """
+        root = self._get_json(f"/repos/{repo}/git/trees/{tree_sha}")
+        if not isinstance(root, dict):
+            return None
+        entries: list[dict[str, Any]] = []
+        complete = not root.get("truncated")
+        for item in root.get("tree") or []:
+            if item.get("type") == "blob":
+                entries.append(item)
+            elif item.get("type") == "tree" and item.get("path") in DEFAULT_DOCS_PATHS:
+                sub = self._get_json(f"/repos/{repo}/git/trees/{item['sha']}", params={"recursive": "1"})
+                if not isinstance(sub, dict) or sub.get("truncated"):
+                    complete = False
+                for child in (sub or {}).get("tree") or []:
+                    entries.append({**child, "path": f"{item['path']}/{child['path']}"})
+        return entries, complete
+
+    def _doc_file(self, repo: str, branch: str, path: str, size: int) -> DocFile:
+        ref_path = f"{quote(branch, safe='')}/{quote(path)}"
+        return DocFile(
+            path=path,
+            name=path.rsplit("/", 1)[-1],
+            size=size,
+            url=f"{self.HTML_URL}/{repo}/blob/{ref_path}",
+            download_url=f"{self.RAW_URL}/{repo}/{ref_path}",
+        )
+
+    def _structure_from_blobs(
+        self, repo: str, branch: str, blobs: list[list[Any]], docs_path: str
+    ) -> RepoDocsStructure | None:
+        """Docs under `docs_path` at any depth; `None` when it holds no doc files."""
+        prefix = f"{docs_path}/"
         files = []
-        directories = []
+        directories: dict[str, None] = {}
         topics = set()
 
-        for item in contents:
-            if item["type"] == "file" and item["name"].endswith((".md", ".rst", ".txt")):
-                files.append(
-                    DocFile(
-                        path=item["path"],
-                        name=item["name"],
-                        size=item.get("size", 0),
-                        url=item["html_url"],
-                        download_url=item.get("download_url"),
-                    )
-                )
-                # Extract topic from filename
-                topic = self._extract_topic(item["name"])
-                if topic:
-                    topics.add(topic)
-            elif item["type"] == "dir":
-                directories.append(item["path"])
+        for path, size in blobs:
+            if not path.startswith(prefix) or not path.endswith(DOC_EXTENSIONS):
+                continue
+            doc = self._doc_file(repo, branch, path, size)
+            files.append(doc)
+            # Extract topic from filename
+            topic = self._extract_topic(doc.name)
+            if topic:
+                topics.add(topic)
+            relative = path[len(prefix):]
+            if "/" in relative:
+                subdir = relative.split("/", 1)[0]
+                directories[f"{prefix}{subdir}"] = None
                 # Directory name is also a topic
-                topics.add(item["name"].lower())
+                topics.add(subdir.lower())
 
-        # Recursively fetch subdirectories (max depth 2)
-        for subdir in directories[:5]:  # Limit to prevent too many API calls
-            sub_contents = self._fetch_subdirectory(repo, subdir)
-            files.extend(sub_contents["files"])
-            topics.update(sub_contents["topics"])
+        if not files:
+            return None
 
         return RepoDocsStructure(
             repo=repo,
-            docs_path=path,
+            docs_path=docs_path,
             files=tuple(files),
             directories=tuple(directories),
             total_files=len(files),
             topics=tuple(sorted(topics)),
         )
 
-    def _fetch_subdirectory(self, repo: str, path: str) -> dict:
-        """Fetch contents of a subdirectory."""
-        url = f"{self.BASE_URL}/repos/{repo}/contents/{path}"
-        result = {"files": [], "topics": set()}
-
-        try:
-            response = requests.get(url, headers=self._headers, timeout=10)
-            if response.status_code != 200:
-                return result
-            contents = response.json()
-        except requests.RequestException:
-            return result
-
-        if not isinstance(contents, list):
-            return result
-
-        for item in contents:
-            if item["type"] == "file" and item["name"].endswith((".md", ".rst", ".txt")):
-                result["files"].append(
-                    DocFile(
-                        path=item["path"],
-                        name=item["name"],
-                        size=item.get("size", 0),
-                        url=item["html_url"],
-                        download_url=item.get("download_url"),
-                    )
-                )
-                topic = self._extract_topic(item["name"])
-                if topic:
-                    result["topics"].add(topic)
-
-        return result
-
-    def _fetch_root_docs(self, repo: str) -> RepoDocsStructure | None:
-        """Fetch root-level documentation files."""
-        url = f"{self.BASE_URL}/repos/{repo}/contents"
-        try:
-            response = requests.get(url, headers=self._headers, timeout=10)
-            response.raise_for_status()
-            contents = response.json()
-        except requests.RequestException:
-            return None
-
+    def _root_docs(self, repo: str, branch: str, blobs: list[list[Any]]) -> RepoDocsStructure | None:
+        """Root-level documentation files."""
         files = []
         topics = set()
 
-        for item in contents:
-            if item["type"] == "file" and item["name"].lower().endswith(".md"):
-                name_lower = item["name"].lower()
-                if any(
-                    kw in name_lower
-                    for kw in ("readme", "contributing", "changelog", "guide", "doc", "tutorial")
-                ):
-                    files.append(
-                        DocFile(
-                            path=item["path"],
-                            name=item["name"],
-                            size=item.get("size", 0),
-                            url=item["html_url"],
-                            download_url=item.get("download_url"),
-                        )
-                    )
-                    topic = self._extract_topic(item["name"])
-                    if topic:
-                        topics.add(topic)
+        for path, size in blobs:
+            name_lower = path.lower()
+            if "/" in path or not name_lower.endswith(".md"):
+                continue
+            if any(kw in name_lower for kw in ROOT_DOC_KEYWORDS):
+                files.append(self._doc_file(repo, branch, path, size))
+                topic = self._extract_topic(path)
+                if topic:
+                    topics.add(topic)
 
         if not files:
             return None
@@ -231,77 +310,9 @@ class GitHubClient:
             target_repo: Repository to analyze (e.g., "openai/openai-agents-python")
             reference_repo: Reference repository with good docs
         """
-        target_docs = self.get_docs_structure(target_repo)
-        ref_docs = self.get_docs_structure(reference_repo)
-
-        if not ref_docs:
-            return DocsComparison(
-                target_repo=target_repo,
-                reference_repo=reference_repo,
-                target_docs=target_docs,
-                reference_docs=None,
-                missing_topics=(),
-                missing_paths=(),
-                coverage_ratio=1.0 if target_docs else 0.0,
-                suggestions=("Reference repository has no documentation to compare.",),
-            )
-
-        if not target_docs:
-            return DocsComparison(
-                target_repo=target_repo,
-                reference_repo=reference_repo,
-                target_docs=None,
-                reference_docs=ref_docs,
-                missing_topics=ref_docs.topics,
-                missing_paths=tuple(f.path for f in ref_docs.files),
-                coverage_ratio=0.0,
-                suggestions=(
-                    f"Target repository has no docs/ directory.",
-                    f"Reference repository has {ref_docs.total_files} documentation files.",
-                    f"Consider adding docs for: {', '.join(ref_docs.topics[:5])}",
-                ),
-            )
-
-        # Compare topics
-        target_topics = set(target_docs.topics)
-        ref_topics = set(ref_docs.topics)
-        missing_topics = tuple(sorted(ref_topics - target_topics))
-
-        # Compare paths (normalized)
-        target_names = {f.name.lower() for f in target_docs.files}
-        ref_names = {f.name.lower() for f in ref_docs.files}
-        missing_names = ref_names - target_names
-        missing_paths = tuple(
-            f.path for f in ref_docs.files if f.name.lower() in missing_names
-        )
-
-        # Calculate coverage
-        if ref_topics:
-            coverage = len(target_topics & ref_topics) / len(ref_topics)
-        else:
-            coverage = 1.0
-
-        # Generate suggestions
-        suggestions = []
-        if missing_topics:
-            suggestions.append(f"Missing topics: {', '.join(missing_topics[:5])}")
-        if missing_paths:
-            suggestions.append(f"Consider adding: {', '.join(missing_paths[:3])}")
-        if coverage < 0.5:
-            suggestions.append(
-                f"Documentation coverage is low ({coverage:.0%}). "
-                f"Reference repo has {ref_docs.total_files} docs, target has {target_docs.total_files}."
-            )
-
-        return DocsComparison(
-            target_repo=target_repo,
-            reference_repo=reference_repo,
-            target_docs=target_docs,
-            reference_docs=ref_docs,
-            missing_topics=missing_topics,
-            missing_paths=missing_paths,
-            coverage_ratio=coverage,
-            suggestions=tuple(suggestions) if suggestions else ("Documentation structure is comparable.",),
+        structures = self.get_docs_structures([target_repo, reference_repo])
+        return compare_structures(
+            target_repo, reference_repo, structures.get(target_repo), structures.get(reference_repo)
         )
 
     def search_similar_repos(self, topic: str, language: str = "python") -> list[str]:
@@ -312,7 +323,7 @@ class GitHubClient:
             language: Programming language
         """
         query = f"{topic} documentation language:{language} stars:>100"
-        url = f"{self.BASE_URL}/search/repositories"
+        url = f"{self._base_url}/search/repositories"
         params = {
             "q": query,
             "sort": "stars",
@@ -321,7 +332,7 @@ class GitHubClient:
         }
 
         try:
-            response = requests.get(url, headers=self._headers, params=params, timeout=10)
+            response = self._session.get(url, headers=self._headers, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
         except requests.RequestException:
@@ -332,3 +343,81 @@ class GitHubClient:
             repos.append(item["full_name"])
 
         return repos
+
+
+def compare_structures(
+    target_repo: str,
+    reference_repo: str,
+    target_docs: RepoDocsStructure | None,
+    ref_docs: RepoDocsStructure | None,
+) -> DocsComparison:
+    """Compare two already-fetched docs structures (see `GitHubClient.get_docs_structures`)."""
+    if not ref_docs:
+        return DocsComparison(
+            target_repo=target_repo,
+            reference_repo=reference_repo,
+            target_docs=target_docs,
+            reference_docs=None,
+            missing_topics=(),
+            missing_paths=(),
+            coverage_ratio=1.0 if target_docs else 0.0,
+            suggestions=("Reference repository has no documentation to compare.",),
+        )
+
+    if not target_docs:
+        return DocsComparison(
+            target_repo=target_repo,
+            reference_repo=reference_repo,
+            target_docs=None,
+            reference_docs=ref_docs,
+            missing_topics=ref_docs.topics,
+            missing_paths=tuple(f.path for f in ref_docs.files),
+            coverage_ratio=0.0,
+            suggestions=(
+                f"Target repository has no docs/ directory.",
+                f"Reference repository has {ref_docs.total_files} documentation files.",
+                f"Consider adding docs for: {', '.join(ref_docs.topics[:5])}",
+            ),
+        )
+
+    # Compare topics
+    target_topics = set(target_docs.topics)
+    ref_topics = set(ref_docs.topics)
+    missing_topics = tuple(sorted(ref_topics - target_topics))
+
+    # Compare paths (normalized)
+    target_names = {f.name.lower() for f in target_docs.files}
+    ref_names = {f.name.lower() for f in ref_docs.files}
+    missing_names = ref_names - target_names
+    missing_paths = tuple(
+        f.path for f in ref_docs.files if f.name.lower() in missing_names
+    )
+
+    # Calculate coverage
+    if ref_topics:
+        coverage = len(target_topics & ref_topics) / len(ref_topics)
+    else:
+        coverage = 1.0
+
+    # Generate suggestions
+    suggestions = []
+    if missing_topics:
+        suggestions.append(f"Missing topics: {', '.join(missing_topics[:5])}")
+    if missing_paths:
+        suggestions.append(f"Consider adding: {', '.join(missing_paths[:3])}")
+    if coverage < 0.5:
+        suggestions.append(
+            f"Documentation coverage is low ({coverage:.0%}). "
+            f"Reference repo has {ref_docs.total_files} docs, target has {target_docs.total_files}."
+        )
+
+    return DocsComparison(
+        target_repo=target_repo,
+        reference_repo=reference_repo,
+        target_docs=target_docs,
+        reference_docs=ref_docs,
+        missing_topics=missing_topics,
+        missing_paths=missing_paths,
+        coverage_ratio=coverage,
+        suggestions=tuple(suggestions) if suggestions else ("Documentation structure is comparable.",),
+    )
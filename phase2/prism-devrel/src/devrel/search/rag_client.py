@@ -1,12 +1,15 @@
 """RAG client for pgvector-based knowledge base search."""
 from __future__ import annotations
 
+import asyncio
 import os
 from dataclasses import dataclass
 from typing import Any
 
 import psycopg
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+
+from devrel.llm.singleflight import AsyncSingleFlight, SingleFlight
 
 
 @dataclass(frozen=True, slots=True)
@@ -23,7 +26,165 @@ class KBDocument:
     score: float | None = None
 
 
-class RAGClient:
+_KEYWORD_SQL = """
+    SELECT
+        d.kb_id, d.item_type, d.item_number, d.section,
+        d.source_ref, d.text, d.metadata,
+        ts_rank(d.text_tsv, plainto_tsquery('simple', %s)) AS score
+    FROM kb_document d
+    WHERE d.text_tsv @@ plainto_tsquery('simple', %s)
+"""
+
+_VECTOR_SQL = """
+    SELECT
+        d.kb_id, d.item_type, d.item_number, d.section,
+        d.source_ref, d.text, d.metadata,
+        (e.embedding <=> %s::vector) AS distance
+    FROM kb_embedding e
+    JOIN kb_document d ON d.kb_id = e.kb_id
+    WHERE e.model = %s
+"""
+
+
+def _keyword_query(query: str, *, limit: int, repo_filter: str | None) -> tuple[str, list[Any]]:
+    sql = _KEYWORD_SQL
+    params: list[Any] = [query, query]
+    if repo_filter:
+        sql += " AND d.repo_full_name = %s"
+        params.append(repo_filter)
+    sql += " ORDER BY score DESC LIMIT %s"
+    params.append(limit)
+    return sql, params
+
+
+def _vector_query(
+    embedding: list[float], *, model: str, limit: int, repo_filter: str | None
+) -> tuple[str, list[Any]]:
+    vector_literal = "[" + ",".join(f"{v:.8f}" for v in embedding) + "]"
+    sql = _VECTOR_SQL
+    params: list[Any] = [vector_literal, model]
+    if repo_filter:
+        sql += " AND d.repo_full_name = %s"
+        params.append(repo_filter)
+    sql += " ORDER BY distance ASC LIMIT %s"
+    params.append(limit)
+    return sql, params
+
+
+def _keyword_docs(rows: list[tuple[Any, ...]]) -> list[KBDocument]:
+    return [
+        KBDocument(
+            kb_id=row[0],
+            item_type=row[1],
+            item_number=row[2],
+            section=row[3],
+            source_ref=row[4],
+            text=row[5] or "",
+            metadata=row[6] or {},
+            score=float(row[7]) if row[7] else None,
+        )
+        for row in rows
+    ]
+
+
+def _vector_docs(rows: list[tuple[Any, ...]]) -> list[KBDocument]:
+    return [
+        KBDocument(
+            kb_id=row[0],
+            item_type=row[1],
+            item_number=row[2],
+            section=row[3],
+            source_ref=row[4],
+            text=row[5] or "",
+            metadata=row[6] or {},
+            score=1.0 - float(row[7]) if row[7] else None,
+        )
+        for row in rows
+    ]
+
+
+def _fuse_rrf(
+    keyword_results: list[KBDocument],
+    vector_results: list[KBDocument],
+    *,
+    limit: int,
+    keyword_weight: float,
+    vector_weight: float,
+) -> list[KBDocument]:
+    scores: dict[str, float] = {}
+    docs: dict[str, KBDocument] = {}
+    k = 60
+
+    for rank, doc in enumerate(keyword_results):
+        rrf = 1.0 / (k + rank + 1)
+        scores[doc.kb_id] = scores.get(doc.kb_id, 0) + keyword_weight * rrf
+        docs[doc.kb_id] = doc
+
+    for rank, doc in enumerate(vector_results):
+        rrf = 1.0 / (k + rank + 1)
+        scores[doc.kb_id] = scores.get(doc.kb_id, 0) + vector_weight * rrf
+        docs[doc.kb_id] = doc
+
+    sorted_ids = sorted(scores.keys(), key=lambda x: scores[x], reverse=True)[:limit]
+
+    return [
+        KBDocument(
+            kb_id=docs[kb_id].kb_id,
+            item_type=docs[kb_id].item_type,
+            item_number=docs[kb_id].item_number,
+            section=docs[kb_id].section,
+            source_ref=docs[kb_id].source_ref,
+            text=docs[kb_id].text,
+            metadata=docs[kb_id].metadata,
+            score=scores[kb_id],
+        )
+        for kb_id in sorted_ids
+    ]
+
+
+def format_references(docs: list[KBDocument]) -> list[str]:
+    """Format KB documents as reference strings for the response agent."""
+    refs = []
+    for doc in docs:
+        ref = f"[{doc.item_type.upper()} #{doc.item_number}] {doc.section}: {doc.text[:200]}..."
+        if doc.source_ref:
+            ref += f"\nSource: {doc.source_ref}"
+        refs.append(ref)
+    return refs
+
+
+class _RAGSettings:
+    def __init__(
+        self,
+        *,
+        db_host: str | None,
+        db_port: int | None,
+        db_name: str | None,
+        db_user: str | None,
+        db_password: str | None,
+        embedding_model: str,
+        embedding_dims: int,
+    ) -> None:
+        self._db_host = db_host or os.getenv("POSTGRES_HOST", "localhost")
+        self._db_port = db_port or int(os.getenv("POSTGRES_PORT", "5432"))
+        self._db_name = db_name or os.getenv("POSTGRES_DB", "prism_phase1")
+        self._db_user = db_user or os.getenv("POSTGRES_USER", os.getenv("USER", "postgres"))
+        self._db_password = db_password or os.getenv("POSTGRES_PASSWORD", "")
+        self._embedding_model = embedding_model
+        self._embedding_dims = embedding_dims
+
+    def _conninfo(self) -> str:
+        conninfo = f"host={self._db_host} port={self._db_port} dbname={self._db_name} user={self._db_user}"
+        if self._db_password:
+            conninfo += f" password={self._db_password}"
+        return conninfo
+
+    def format_references(self, docs: list[KBDocument]) -> list[str]:
+        """Format KB documents as reference strings for the response agent."""
+        return format_references(docs)
+
+
+class RAGClient(_RAGSettings):
     """Client for searching the phase1 pgvector knowledge base."""
 
     def __init__(
@@ -38,29 +199,31 @@ class RAGClient:
         embedding_model: str = "text-embedding-3-large",
         embedding_dims: int = 3072,
     ) -> None:
-        self._db_host = db_host or os.getenv("POSTGRES_HOST", "localhost")
-        self._db_port = db_port or int(os.getenv("POSTGRES_PORT", "5432"))
-        self._db_name = db_name or os.getenv("POSTGRES_DB", "prism_phase1")
-        self._db_user = db_user or os.getenv("POSTGRES_USER", os.getenv("USER", "postgres"))
-        self._db_password = db_password or os.getenv("POSTGRES_PASSWORD", "")
-        self._embedding_model = embedding_model
-        self._embedding_dims = embedding_dims
-
+        super().__init__(
+            db_host=db_host,
+            db_port=db_port,
+            db_name=db_name,
+            db_user=db_user,
+            db_password=db_password,
+            embedding_model=embedding_model,
+            embedding_dims=embedding_dims,
+        )
         api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         if api_key:
             self._openai = OpenAI(api_key=api_key)
         else:
             self._openai = None
+        self._embed_flight = SingleFlight()
 
     def _get_connection(self) -> psycopg.Connection[tuple[Any, ...]]:
-        conninfo = f"host={self._db_host} port={self._db_port} dbname={self._db_name} user={self._db_user}"
-        if self._db_password:
-            conninfo += f" password={self._db_password}"
-        return psycopg.connect(conninfo)
+        return psycopg.connect(self._conninfo())
 
     def _embed_query(self, query: str) -> list[float]:
         if not self._openai:
             raise ValueError("OpenAI API key not set - cannot generate embeddings")
+        return self._embed_flight.do(query, lambda: self._create_embedding(query))
+
+    def _create_embedding(self, query: str) -> list[float]:
         response = self._openai.embeddings.create(
             model=self._embedding_model,
             input=query,
@@ -68,6 +231,12 @@ class RAGClient:
         )
         return response.data[0].embedding
 
+    def _fetch(self, sql: str, params: list[Any]) -> list[tuple[Any, ...]]:
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, params)
+                return cur.fetchall()
+
     def search_keyword(
         self,
         query: str,
@@ -76,41 +245,8 @@ class RAGClient:
         repo_filter: str | None = None,
     ) -> list[KBDocument]:
         """Full-text search using PostgreSQL tsvector."""
-        sql = """
-            SELECT
-                d.kb_id, d.item_type, d.item_number, d.section,
-                d.source_ref, d.text, d.metadata,
-                ts_rank(d.text_tsv, plainto_tsquery('simple', %s)) AS score
-            FROM kb_document d
-            WHERE d.text_tsv @@ plainto_tsquery('simple', %s)
-        """
-        params: list[Any] = [query, query]
-
-        if repo_filter:
-            sql += " AND d.repo_full_name = %s"
-            params.append(repo_filter)
-
-        sql += " ORDER BY score DESC LIMIT %s"
-        params.append(limit)
-
-        with self._get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(sql, params)
-                rows = cur.fetchall()
-
-        return [
-            KBDocument(
-                kb_id=row[0],
-                item_type=row[1],
-                item_number=row[2],
-                section=row[3],
-                source_ref=row[4],
-                text=row[5][:500] if row[5] else "",
-                metadata=row[6] or {},
-                score=float(row[7]) if row[7] else None,
-            )
-            for row in rows
-        ]
+        sql, params = _keyword_query(query, limit=limit, repo_filter=repo_filter)
+        return _keyword_docs(self._fetch(sql, params))
 
     def search_vector(
         self,
@@ -121,44 +257,10 @@ class RAGClient:
     ) -> list[KBDocument]:
         """Semantic search using pgvector embeddings."""
         query_embedding = self._embed_query(query)
-        vector_literal = "[" + ",".join(f"{v:.8f}" for v in query_embedding) + "]"
-
-        sql = """
-            SELECT
-                d.kb_id, d.item_type, d.item_number, d.section,
-                d.source_ref, d.text, d.metadata,
-                (e.embedding <=> %s::vector) AS distance
-            FROM kb_embedding e
-            JOIN kb_document d ON d.kb_id = e.kb_id
-            WHERE e.model = %s
-        """
-        params: list[Any] = [vector_literal, self._embedding_model]
-
-        if repo_filter:
-            sql += " AND d.repo_full_name = %s"
-            params.append(repo_filter)
-
-        sql += " ORDER BY distance ASC LIMIT %s"
-        params.append(limit)
-
-        with self._get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(sql, params)
-                rows = cur.fetchall()
-
-        return [
-            KBDocument(
-                kb_id=row[0],
-                item_type=row[1],
-                item_number=row[2],
-                section=row[3],
-                source_ref=row[4],
-                text=row[5][:500] if row[5] else "",
-                metadata=row[6] or {},
-                score=1.0 - float(row[7]) if row[7] else None,
-            )
-            for row in rows
-        ]
+        sql, params = _vector_query(
+            query_embedding, model=self._embedding_model, limit=limit, repo_filter=repo_filter
+        )
+        return _vector_docs(self._fetch(sql, params))
 
     def search_hybrid(
         self,
@@ -172,43 +274,140 @@ class RAGClient:
         """Hybrid search combining keyword and vector search with RRF."""
         keyword_results = self.search_keyword(query, limit=limit * 2, repo_filter=repo_filter)
         vector_results = self.search_vector(query, limit=limit * 2, repo_filter=repo_filter)
+        return _fuse_rrf(
+            keyword_results,
+            vector_results,
+            limit=limit,
+            keyword_weight=keyword_weight,
+            vector_weight=vector_weight,
+        )
+
+
+class AsyncRAGClient(_RAGSettings):
+    """Async variant of `RAGClient` backed by a psycopg async connection pool and `AsyncOpenAI`.
+
+    The pool is opened lazily on first use (or explicitly via `open()`) and must be closed with `close()`.
+    Requires `psycopg_pool` (`pip install "psycopg[binary,pool]"`).
+    """
 
-        scores: dict[str, float] = {}
-        docs: dict[str, KBDocument] = {}
-        k = 60
-
-        for rank, doc in enumerate(keyword_results):
-            rrf = 1.0 / (k + rank + 1)
-            scores[doc.kb_id] = scores.get(doc.kb_id, 0) + keyword_weight * rrf
-            docs[doc.kb_id] = doc
-
-        for rank, doc in enumerate(vector_results):
-            rrf = 1.0 / (k + rank + 1)
-            scores[doc.kb_id] = scores.get(doc.kb_id, 0) + vector_weight * rrf
-            docs[doc.kb_id] = doc
-
-        sorted_ids = sorted(scores.keys(), key=lambda x: scores[x], reverse=True)[:limit]
-
-        return [
-            KBDocument(
-                kb_id=docs[kb_id].kb_id,
-                item_type=docs[kb_id].item_type,
-                item_number=docs[kb_id].item_number,
-                section=docs[kb_id].section,
-                source_ref=docs[kb_id].source_ref,
-                text=docs[kb_id].text,
-                metadata=docs[kb_id].metadata,
-                score=scores[kb_id],
+    def __init__(
+        self,
+        *,
+        db_host: str | None = None,
+        db_port: int | None = None,
+        db_name: str | None = None,
+        db_user: str | None = None,
+        db_password: str | None = None,
+        openai_api_key: str | None = None,
+        embedding_model: str = "text-embedding-3-large",
+        embedding_dims: int = 3072,
+        min_pool_size: int | None = None,
+        max_pool_size: int | None = None,
+    ) -> None:
+        super().__init__(
+            db_host=db_host,
+            db_port=db_port,
+            db_name=db_name,
+            db_user=db_user,
+            db_password=db_password,
+            embedding_model=embedding_model,
+            embedding_dims=embedding_dims,
+        )
+        api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
+        self._openai = AsyncOpenAI(api_key=api_key) if api_key else None
+        self._min_pool_size = min_pool_size or int(os.getenv("POSTGRES_POOL_MIN", "1"))
+        self._max_pool_size = max_pool_size or int(os.getenv("POSTGRES_POOL_MAX", "10"))
+        self._pool: Any = None
+        self._pool_lock = asyncio.Lock()
+        self._embed_flight = AsyncSingleFlight()
+
+    async def open(self) -> None:
+        if self._pool is not None:
+            return
+        async with self._pool_lock:
+            if self._pool is not None:
+                return
+            from psycopg_pool import AsyncConnectionPool
+
+            pool = AsyncConnectionPool(
+                self._conninfo(),
+                min_size=self._min_pool_size,
+                max_size=self._max_pool_size,
+                open=False,
             )
-            for kb_id in sorted_ids
-        ]
+            await pool.open()
+            self._pool = pool
 
-    def format_references(self, docs: list[KBDocument]) -> list[str]:
-        """Format KB documents as reference strings for the response agent."""
-        refs = []
-        for doc in docs:
-            ref = f"[{doc.item_type.upper()} #{doc.item_number}] {doc.section}: {doc.text[:200]}..."
-            if doc.source_ref:
-                ref += f"\nSource: {doc.source_ref}"
-            refs.append(ref)
-        return refs
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+        if self._openai is not None:
+            await self._openai.close()
+
+    async def _embed_query(self, query: str) -> list[float]:
+        if not self._openai:
+            raise ValueError("OpenAI API key not set - cannot generate embeddings")
+        return await self._embed_flight.do(query, lambda: self._create_embedding(query))
+
+    async def _create_embedding(self, query: str) -> list[float]:
+        response = await self._openai.embeddings.create(
+            model=self._embedding_model,
+            input=query,
+            dimensions=self._embedding_dims,
+        )
+        return response.data[0].embedding
+
+    async def _fetch(self, sql: str, params: list[Any]) -> list[tuple[Any, ...]]:
+        await self.open()
+        async with self._pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(sql, params)
+                return await cur.fetchall()
+
+    async def search_keyword(
+        self,
+        query: str,
+        *,
+        limit: int = 10,
+        repo_filter: str | None = None,
+    ) -> list[KBDocument]:
+        """Full-text search using PostgreSQL tsvector."""
+        sql, params = _keyword_query(query, limit=limit, repo_filter=repo_filter)
+        return _keyword_docs(await self._fetch(sql, params))
+
+    async def search_vector(
+        self,
+        query: str,
+        *,
+        limit: int = 10,
+        repo_filter: str | None = None,
+    ) -> list[KBDocument]:
+        """Semantic search using pgvector embeddings."""
+        query_embedding = await self._embed_query(query)
+        sql, params = _vector_query(
+            query_embedding, model=self._embedding_model, limit=limit, repo_filter=repo_filter
+        )
+        return _vector_docs(await self._fetch(sql, params))
+
+    async def search_hybrid(
+        self,
+        query: str,
+        *,
+        limit: int = 10,
+        keyword_weight: float = 0.3,
+        vector_weight: float = 0.7,
+        repo_filter: str | None = None,
+    ) -> list[KBDocument]:
+        """Hybrid search; the keyword query and the embedding + vector query run concurrently."""
+        keyword_results, vector_results = await asyncio.gather(
+            self.search_keyword(query, limit=limit * 2, repo_filter=repo_filter),
+            self.search_vector(query, limit=limit * 2, repo_filter=repo_filter),
+        )
+        return _fuse_rrf(
+            keyword_results,
+            vector_results,
+            limit=limit,
+            keyword_weight=keyword_weight,
+            vector_weight=vector_weight,
+        )
@@ -1,11 +1,30 @@
-"""Tavily API client for external search and insights."""
+"""Tavily API client for external search and insights.
+
+Requests go through one pooled `requests.Session` per process, and responses
+are cached by normalised query + params in a `SearchCache` (by default the
+process-wide `default_search_cache()`). The client is thread-safe, so callers
+run independent searches concurrently.
+"""
 from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
 import requests
+import requests.adapters
+
+from .cache import SearchCache, default_search_cache
+
+
+@lru_cache(maxsize=1)
+def _shared_session() -> requests.Session:
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=8)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
 
 @dataclass(frozen=True)
@@ -31,10 +50,20 @@ class TavilyClient:
 
     BASE_URL = "https://api.tavily.com"
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        *,
+        base_url: str | None = None,
+        cache: SearchCache | None = None,
+        session: requests.Session | None = None,
+    ):
         self._api_key = api_key or os.getenv("TAVILY_API_KEY")
         if not self._api_key:
             raise ValueError("TAVILY_API_KEY not set")
+        self._base_url = (base_url or self.BASE_URL).rstrip("/")
+        self._cache = cache if cache is not None else default_search_cache()
+        self._session = session or _shared_session()
 
     def search(
         self,
@@ -53,23 +82,26 @@ class TavilyClient:
             include_answer: Include AI-generated answer
             include_domains: Limit to specific domains (e.g., ["github.com"])
         """
-        payload: dict[str, Any] = {
-            "api_key": self._api_key,
-            "query": query,
+        params: dict[str, Any] = {
             "search_depth": search_depth,
             "max_results": max_results,
             "include_answer": include_answer,
         }
         if include_domains:
-            payload["include_domains"] = include_domains
-
-        response = requests.post(
-            f"{self.BASE_URL}/search",
-            json=payload,
-            timeout=30,
-        )
-        response.raise_for_status()
-        data = response.json()
+            params["include_domains"] = sorted(include_domains)
+
+        key = SearchCache.key(query, params) if self._cache is not None else ""
+        data = self._cache.get(key) if self._cache is not None else None
+        if data is None:
+            response = self._session.post(
+                f"{self._base_url}/search",
+                json={"api_key": self._api_key, "query": query, **params},
+                timeout=30,
+            )
+            response.raise_for_status()
+            data = response.json()
+            if self._cache is not None:
+                self._cache.put(key, data)
 
         results = []
         for r in data.get("results", []):
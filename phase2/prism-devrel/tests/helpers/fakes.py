@@ -0,0 +1,38 @@
+"""Test doubles shared across test modules."""
+from __future__ import annotations
+
+from typing import Any
+
+from devrel.llm.client import JsonSchema
+from devrel.llm.model_selector import LlmTask
+
+
+class FakeClock:
+    """Settable `clock` for TTL caches: returns `now` until the test moves it."""
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class DocGapLlm:
+    """`LlmClient` stand-in for doc-gap prompts: records each user prompt and returns one canned verdict."""
+
+    def __init__(self, *, priority: str = "high") -> None:
+        self.priority = priority
+        self.users: list[str] = []
+
+    def generate_json(self, *, task: LlmTask, system: str, user: str, json_schema: JsonSchema, **kwargs: Any) -> dict[str, Any]:
+        _ = (system, json_schema, kwargs)
+        assert task == LlmTask.DOCS
+        self.users.append(user)
+        return {
+            "has_gap": True,
+            "gap_topic": "Redis caching",
+            "affected_issues": [1],
+            "suggested_doc_path": "docs/caching.md",
+            "suggested_outline": ["Setup"],
+            "priority": self.priority,
+        }
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from types import SimpleNamespace
+from typing import Any
+
+
+class StubBatchOpenAI:
+    """In-process stand-in for the `AsyncOpenAI` files/batches/responses endpoints.
+
+    `respond(body)` plays the model: it receives a `/v1/responses` request body and
+    returns the JSON object the model would output, or raises to simulate a failed line.
+    The batch advances one status per `batches.retrieve` call and runs its lines when it
+    reaches `completed`.
+    """
+
+    def __init__(self, respond: Callable[[dict[str, Any]], dict[str, Any]]) -> None:
+        self._respond = respond
+        self._files: dict[str, str] = {}
+        self._batches: dict[str, SimpleNamespace] = {}
+        self.direct_calls = 0
+        self.retrieve_calls = 0
+        self.files = SimpleNamespace(create=self._files_create, content=self._files_content)
+        self.batches = SimpleNamespace(create=self._batches_create, retrieve=self._batches_retrieve)
+        self.responses = SimpleNamespace(create=self._responses_create)
+
+    async def _files_create(self, *, file: tuple[str, bytes], purpose: str) -> SimpleNamespace:
+        file_id = f"file-{len(self._files) + 1}"
+        self._files[file_id] = file[1].decode("utf-8")
+        return SimpleNamespace(id=file_id, purpose=purpose)
+
+    async def _files_content(self, file_id: str) -> SimpleNamespace:
+        return SimpleNamespace(text=self._files[file_id])
+
+    async def _batches_create(self, *, input_file_id: str, endpoint: str, completion_window: str) -> SimpleNamespace:
+        batch = SimpleNamespace(
+            id=f"batch-{len(self._batches) + 1}",
+            status="validating",
+            input_file_id=input_file_id,
+            endpoint=endpoint,
+            output_file_id=None,
+            error_file_id=None,
+        )
+        self._batches[batch.id] = batch
+        return batch
+
+    async def _batches_retrieve(self, batch_id: str) -> SimpleNamespace:
+        self.retrieve_calls += 1
+        batch = self._batches[batch_id]
+        if batch.status == "validating":
+            batch.status = "in_progress"
+        elif batch.status == "in_progress":
+            self._complete(batch)
+        return batch
+
+    def _complete(self, batch: SimpleNamespace) -> None:
+        ok_lines: list[str] = []
+        error_lines: list[str] = []
+        for raw in self._files[batch.input_file_id].splitlines():
+            line = json.loads(raw)
+            try:
+                output = self._respond(line["body"])
+            except Exception as e:
+                error_lines.append(
+                    json.dumps({"custom_id": line["custom_id"], "response": None, "error": {"message": str(e)}})
+                )
+                continue
+            body = {
+                "status": "completed",
+                "output": [{"type": "message", "content": [{"type": "output_text", "text": json.dumps(output)}]}],
+            }
+            ok_lines.append(
+                json.dumps({"custom_id": line["custom_id"], "response": {"status_code": 200, "body": body}, "error": None})
+            )
+        if ok_lines:
+            batch.output_file_id = f"file-{len(self._files) + 1}"
+            self._files[batch.output_file_id] = "\n".join(ok_lines) + "\n"
+        if error_lines:
+            batch.error_file_id = f"file-{len(self._files) + 1}"
+            self._files[batch.error_file_id] = "\n".join(error_lines) + "\n"
+        batch.status = "completed"
+
+    async def _responses_create(self, **kwargs: Any) -> SimpleNamespace:
+        self.direct_calls += 1
+        return SimpleNamespace(status="completed", incomplete_details=None, output_text=json.dumps(self._respond(kwargs)))
@@ -2,38 +2,17 @@
 from __future__ import annotations
 
 import csv
-from collections import defaultdict
+import os
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+from devrel.agents.activity_store import ActivityRecord, ActivityStore
+from devrel.agents.contributor_index import BOT_PATTERNS, is_bot_account  # noqa: F401
 from devrel.agents.types import Contributor
 
-# 봇 및 CI/CD 계정 패턴
-BOT_PATTERNS = (
-    "[bot]",
-    "github-actions",
-    "dependabot",
-    "renovate",
-    "copilot",
-    "chatgpt-codex-connector",
-    "codecov",
-    "stale",
-    "mergify",
-    "semantic-release",
-)
-
-
-def is_bot_account(login: str) -> bool:
-    """Check if the login is a bot or CI/CD account."""
-    login_lower = login.lower()
-    for pattern in BOT_PATTERNS:
-        if pattern in login_lower:
-            return True
-    return False
-
-
 def raw_data_dir() -> Path:
     return Path(__file__).resolve().parent.parent.parent / "raw_data"
 
@@ -52,63 +31,76 @@ class RepoUser:
     role: str
 
 
+@lru_cache(maxsize=8)
+def _read_csv(path: Path, mtime_ns: int) -> tuple[dict[str, str], ...]:
+    # Keyed on mtime so an updated file is re-read; otherwise every loader call shares one parse.
+    with path.open("r", encoding="utf-8") as f:
+        return tuple(csv.DictReader(f))
+
+
+def _csv_rows(name: str) -> tuple[dict[str, str], ...]:
+    path = raw_data_dir() / name
+    return _read_csv(path, path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=4)
+def _open_activity_store(path: Path, mtime_ns: int, cache_path: str | None) -> ActivityStore:
+    # cache_path (ACTIVITY_STORE_PATH) persists the columnar file between runs; otherwise it is built in memory.
+    return ActivityStore.from_csv(path, cache_path=cache_path)
+
+
+def activity_store() -> ActivityStore:
+    """Columnar store over repo_user_activity.csv (rebuilt when the CSV or ACTIVITY_STORE_PATH changes)."""
+    path = raw_data_dir() / "repo_user_activity.csv"
+    return _open_activity_store(path, path.stat().st_mtime_ns, os.getenv("ACTIVITY_STORE_PATH") or None)
+
+
 def load_repo_users(repo: str | None = None) -> list[RepoUser]:
     """Load repo_user.csv and return list of RepoUser."""
-    path = raw_data_dir() / "repo_user.csv"
-    users: list[RepoUser] = []
-    with path.open("r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if repo and row["repo_full_name"] != repo:
-                continue
-            users.append(RepoUser(user_id=row["user_id"], role=row["role"]))
-    return users
+    return [
+        RepoUser(user_id=row["user_id"], role=row["role"])
+        for row in _csv_rows("repo_user.csv")
+        if not repo or row["repo_full_name"] == repo
+    ]
 
 
 def load_user_activities(repo: str | None = None) -> list[UserActivity]:
     """Load repo_user_activity.csv and return list of UserActivity."""
-    path = raw_data_dir() / "repo_user_activity.csv"
     activities: list[UserActivity] = []
-    with path.open("r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if repo and row["repo_full_name"] != repo:
-                continue
-            occurred_at = datetime.fromisoformat(row["occurred_at"].replace("Z", "+00:00"))
-            activities.append(
-                UserActivity(
-                    user_id=row["user_id"],
-                    action=row["action"],
-                    reference=row["reference"],
-                    occurred_at=occurred_at,
-                )
+    for row in _csv_rows("repo_user_activity.csv"):
+        if repo and row["repo_full_name"] != repo:
+            continue
+        occurred_at = datetime.fromisoformat(row["occurred_at"].replace("Z", "+00:00"))
+        activities.append(
+            UserActivity(
+                user_id=row["user_id"],
+                action=row["action"],
+                reference=row["reference"],
+                occurred_at=occurred_at,
             )
+        )
     return activities
 
 
+def _as_one_contributor(activities: list[UserActivity], days: int = 30) -> Contributor | None:
+    # The activity store's derivation, applied to `activities` as if they were one contributor's.
+    store = ActivityStore.build(
+        ActivityRecord(repo="", login="", action=a.action, reference=a.reference, occurred_at=a.occurred_at)
+        for a in activities
+    )
+    return store.contributor("", recent_days=days)
+
+
 def infer_areas_from_activities(activities: list[UserActivity]) -> list[str]:
     """Infer contributor areas from their activity patterns."""
-    areas: set[str] = set()
-    for act in activities:
-        if act.action == "reviewed":
-            areas.add("code-review")
-        elif act.action == "pr_opened":
-            areas.add("development")
-        elif act.action == "issue_opened":
-            areas.add("issue-reporting")
-        elif act.action == "commented":
-            areas.add("community")
-    return sorted(areas)
+    contributor = _as_one_contributor(activities)
+    return list(contributor.areas) if contributor else []
 
 
 def compute_activity_score(activities: list[UserActivity], days: int = 30) -> float:
     """Compute recent activity score based on last N days."""
-    if not activities:
-        return 0.0
-    now = max(a.occurred_at for a in activities)
-    cutoff = now.timestamp() - (days * 86400)
-    recent = [a for a in activities if a.occurred_at.timestamp() >= cutoff]
-    return round(len(recent) / 10.0, 2)  # Normalize to reasonable range
+    contributor = _as_one_contributor(activities, days)
+    return contributor.recent_activity_score if contributor else 0.0
 
 
 def build_contributors_from_raw_data(
@@ -121,46 +113,12 @@ def build_contributors_from_raw_data(
         repo: Repository name to filter by (e.g., "openai/openai-agents-python")
         exclude_bots: If True, exclude bot and CI/CD accounts (default: True)
     """
-    users = load_repo_users(repo)
-    activities = load_user_activities(repo)
-
-    # Group activities by user
-    user_activities: dict[str, list[UserActivity]] = defaultdict(list)
-    for act in activities:
-        user_activities[act.user_id].append(act)
-
-    contributors: list[Contributor] = []
-    for user in users:
-        # Skip bots if exclude_bots is True
-        if exclude_bots and is_bot_account(user.user_id):
-            continue
-
-        user_acts = user_activities.get(user.user_id, [])
-        if not user_acts:
-            continue  # Skip users with no activity
-
-        # Count specific actions
-        pr_count = sum(1 for a in user_acts if a.action == "pr_opened")
-        review_count = sum(1 for a in user_acts if a.action == "reviewed")
-
-        # Get date range
-        dates = sorted(a.occurred_at for a in user_acts)
-        first_date = dates[0].strftime("%Y-%m-%d") if dates else None
-        last_date = dates[-1].strftime("%Y-%m-%d") if dates else None
-
-        contributors.append(
-            Contributor(
-                login=user.user_id,
-                areas=tuple(infer_areas_from_activities(user_acts)),
-                recent_activity_score=compute_activity_score(user_acts),
-                merged_prs=pr_count,
-                reviews=review_count,
-                first_contribution_date=first_date,
-                last_contribution_date=last_date,
-            )
-        )
-
-    return contributors
+    # Windowed counts come from the activity store's per-user index, not a scan per user.
+    return activity_store().contributors(
+        repo=repo,
+        logins=[user.user_id for user in load_repo_users(repo)],
+        exclude=is_bot_account if exclude_bots else None,
+    )
 
 
 def get_active_contributors(
@@ -0,0 +1,31 @@
+"""Synthetic contributor teams for ranking tests."""
+from __future__ import annotations
+
+import random
+from collections.abc import Sequence
+
+from devrel.agents.types import Contributor
+
+
+def random_team(
+    n: int,
+    *,
+    seed: int,
+    areas: Sequence[str],
+    activity: Sequence[float],
+    merged_prs: Sequence[int],
+    reviews: Sequence[int],
+    max_areas: int = 3,
+) -> list[Contributor]:
+    """`n` contributors `dev0..`, each field drawn from the given values (0..`max_areas` areas)."""
+    rng = random.Random(seed)
+    return [
+        Contributor(
+            login=f"dev{i}",
+            areas=tuple(rng.sample(list(areas), rng.randint(0, max_areas))),
+            recent_activity_score=rng.choice(activity),
+            merged_prs=rng.choice(merged_prs),
+            reviews=rng.choice(reviews),
+        )
+        for i in range(n)
+    ]
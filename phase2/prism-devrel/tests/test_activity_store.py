@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import csv
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from devrel.agents.activity_store import ActivityRecord, ActivityStore
+from devrel.agents.contributor_index import ContributorIndex, is_bot_account
+from tests.helpers.raw_data_loader import activity_store, load_user_activities, raw_data_dir
+
+T0 = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+
+def _records() -> list[ActivityRecord]:
+    rows = [
+        ("acme/api", "alice", "pr_opened", 0),
+        ("acme/api", "alice", "reviewed", 5),
+        ("acme/api", "alice", "pr_opened", 40),
+        ("acme/web", "alice", "commented", 70),
+        ("acme/api", "bob", "issue_opened", 3),
+        ("acme/web", "bob", "reviewed", 90),
+    ]
+    # Deliberately out of order: the store sorts by (repo, user, occurred_at).
+    return [
+        ActivityRecord(repo, login, action, f"https://github.com/{repo}/issues/{i}", T0 + timedelta(days=day))
+        for i, (repo, login, action, day) in reversed(list(enumerate(rows)))
+    ]
+
+
+def test_windowed_counts_are_range_scans() -> None:
+    store = ActivityStore.build(_records())
+    assert len(store) == 6 and store.repos() == ["acme/api", "acme/web"]
+    assert store.logins("acme/web") == ["alice", "bob"]
+    assert store.count("alice") == 4
+    assert store.count("alice", repo="acme/api", action="pr_opened") == 2
+    assert store.count("alice", since=T0 + timedelta(days=5), until=T0 + timedelta(days=70)) == 2
+    assert store.count("alice", action="merged") == 0 and store.count("nobody") == 0
+
+    alice = store.contributor("alice")
+    assert alice is not None
+    assert (alice.merged_prs, alice.reviews, alice.areas) == (2, 1, ("code-review", "community", "development"))
+    assert (alice.first_contribution_date, alice.last_contribution_date) == ("2025-03-01", "2025-05-10")
+    assert alice.recent_activity_score == 0.2  # days 40 and 70 fall within 30 days of the latest
+    assert [r.occurred_at for r in store.records(login="alice", repo="acme/api")] == [
+        T0,
+        T0 + timedelta(days=5),
+        T0 + timedelta(days=40),
+    ]
+
+
+def test_matches_contributor_index_on_raw_data(tmp_path: Path) -> None:
+    csv_path = raw_data_dir() / "repo_user_activity.csv"
+    cache = tmp_path / "activity.store"
+    store = ActivityStore.from_csv(csv_path, cache_path=cache)
+    index = ContributorIndex.from_activity_csv(csv_path, exclude=is_bot_account)
+    assert store.contributors(exclude=is_bot_account) == sorted(index.contributors(), key=lambda c: c.login)
+
+    # Reopened through mmap while the CSV is unchanged.
+    reopened = ActivityStore.from_csv(csv_path, cache_path=cache)
+    assert reopened.path == cache and reopened.source == store.source and len(reopened) == len(store)
+    reopened.close()
+    store.close()
+
+
+def test_cache_is_rebuilt_when_the_csv_changes(tmp_path: Path) -> None:
+    csv_path = tmp_path / "activity.csv"
+    header = "repo_full_name,user_id,action,reference,occurred_at\n"
+    csv_path.write_text(header + "acme/api,alice,pr_opened,https://x/1,2025-03-01T00:00:00Z\n", encoding="utf-8")
+    cache = tmp_path / "activity.store"
+    first = ActivityStore.from_csv(csv_path, cache_path=cache)
+    assert len(first) == 1
+    first.close()
+
+    with csv_path.open("a", encoding="utf-8") as f:
+        f.write("acme/api,bob,reviewed,https://x/2,2025-03-02T00:00:00Z\n")
+    store = ActivityStore.from_csv(csv_path, cache_path=cache)
+    assert len(store) == 2 and store.count("bob", action="reviewed") == 1
+
+
+def test_raw_data_loader_keeps_csv_order_and_honours_store_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    with (raw_data_dir() / "repo_user_activity.csv").open(encoding="utf-8") as f:
+        expected = [row["reference"] for row in csv.DictReader(f) if row["repo_full_name"] == "openai/openai-agents-python"]
+    assert [a.reference for a in load_user_activities("openai/openai-agents-python")] == expected
+
+    monkeypatch.delenv("ACTIVITY_STORE_PATH", raising=False)
+    assert activity_store().path is None
+    monkeypatch.setenv("ACTIVITY_STORE_PATH", str(tmp_path / "activity.store"))
+    assert activity_store().path == tmp_path / "activity.store"
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from devrel.agents.pipeline import PipelineNode, build_issue_pipeline, run_dag
+from devrel.agents.types import Contributor, Issue
+from devrel.llm.client import AsyncLlmClient
+from devrel.search.rag_client import KBDocument
+
+STEP_S = 0.2
+
+
+def _sleeper(value: object, seconds: float = STEP_S):
+    async def fn(_: object) -> object:
+        await asyncio.sleep(seconds)
+        return value
+
+    return fn
+
+
+def test_independent_nodes_overlap() -> None:
+    nodes = [
+        PipelineNode("a", _sleeper("a")),
+        PipelineNode("b", _sleeper("b")),
+        PipelineNode("c", _sleeper("c"), requires=("a", "b")),
+    ]
+    started = time.perf_counter()
+    results = asyncio.run(run_dag(nodes))
+    elapsed = time.perf_counter() - started
+
+    assert [r.status for r in results.values()] == ["ok", "ok", "ok"]
+    # Critical path is two steps; running the three steps serially would take three.
+    assert elapsed < 2.5 * STEP_S
+    assert results["c"].started_ms >= results["a"].duration_ms
+
+
+def test_timeout_skips_dependents_but_keeps_partial_results() -> None:
+    async def seen(inputs: dict[str, object]) -> list[str]:
+        return sorted(inputs)
+
+    nodes = [
+        PipelineNode("fast", _sleeper("fast", 0.0)),
+        PipelineNode("slow", _sleeper("slow", 5.0), timeout_s=0.05),
+        PipelineNode("needs_slow", seen, requires=("slow",)),
+        PipelineNode("tolerates_slow", seen, requires=("fast",), after=("slow",)),
+    ]
+    results = asyncio.run(run_dag(nodes))
+
+    assert results["fast"].value == "fast"
+    assert results["slow"].status == "timeout"
+    assert results["needs_slow"].status == "skipped"
+    assert results["tolerates_slow"].status == "ok"
+    assert results["tolerates_slow"].value == ["fast"]
+
+
+def test_errors_are_captured_per_node() -> None:
+    async def boom(_: object) -> None:
+        raise RuntimeError("db down")
+
+    results = asyncio.run(run_dag([PipelineNode("boom", boom), PipelineNode("ok", _sleeper(1, 0.0))]))
+    assert results["boom"].status == "error"
+    assert "db down" in results["boom"].error
+    assert results["ok"].value == 1
+
+
+def test_rejects_cycles_and_unknown_dependencies() -> None:
+    with pytest.raises(ValueError, match="cycle"):
+        asyncio.run(run_dag([PipelineNode("a", _sleeper(1), requires=("b",)), PipelineNode("b", _sleeper(2), requires=("a",))]))
+    with pytest.raises(ValueError, match="unknown"):
+        asyncio.run(run_dag([PipelineNode("a", _sleeper(1), after=("missing",))]))
+
+
+class SlowFakeResponses:
+    async def create(self, **kwargs: object) -> SimpleNamespace:
+        await asyncio.sleep(STEP_S)
+        if kwargs["text"]["format"].get("name") == "response_output":  # type: ignore[index]
+            payload: dict[str, object] = {
+                "strategy": "direct_answer",
+                "response_text": "Raise the timeout.",
+                "confidence": 0.7,
+                "references": [],
+                "follow_up_needed": False,
+            }
+        else:
+            payload = {
+                "issue_type": "bug",
+                "priority": "high",
+                "required_skills": ["python"],
+                "keywords": ["timeout"],
+                "summary": "Runner timeout",
+                "needs_more_info": False,
+                "suggested_action": "direct_answer",
+            }
+        return SimpleNamespace(status="completed", incomplete_details=None, output_text=json.dumps(payload))
+
+
+class SlowFakeRAG:
+    def __init__(self) -> None:
+        self.queries: list[str] = []
+
+    async def search_hybrid(self, query: str, *, limit: int = 5) -> list[KBDocument]:
+        self.queries.append(query)
+        await asyncio.sleep(STEP_S)
+        return [KBDocument("kb-1", "issue", 3, "body", "", "Raise runner.timeout to 60s.", {}, 0.9)]
+
+
+def test_issue_pipeline_runs_on_the_critical_path() -> None:
+    issue = Issue(number=7, title="Runner times out", body="Stack trace attached", labels=("bug",))
+    rag = SlowFakeRAG()
+    nodes = build_issue_pipeline(
+        issue,
+        llm=AsyncLlmClient(client=SimpleNamespace(responses=SlowFakeResponses())),
+        rag=rag,  # type: ignore[arg-type]
+        contributors=[Contributor(login="alice", areas=("python",), merged_prs=3)],
+    )
+    started = time.perf_counter()
+    results = asyncio.run(run_dag(nodes))
+    elapsed = time.perf_counter() - started
+
+    assert {name: r.status for name, r in results.items()} == {
+        "triage": "ok",
+        "rag": "ok",
+        "assignment": "ok",
+        "promotion": "ok",
+        "doc_gap": "ok",
+        "response": "ok",
+    }
+    assert rag.queries == ["Runner times out"]
+    assert results["assignment"].value.recommended_assignee == "alice"
+    # triage || rag, then response: two LLM-sized steps rather than three.
+    assert results["rag"].started_ms < STEP_S * 1000 / 2
+    assert elapsed < 2.5 * STEP_S
@@ -1,4 +1,12 @@
-from devrel.agents.assignment import analyze_issue, analyze_issue_llm, recommend_assignee, recommend_assignee_llm
+from collections.abc import Sequence
+
+from devrel.agents.assignment import (
+    analyze_issue,
+    analyze_issue_llm,
+    recommend_assignee,
+    recommend_assignee_llm,
+    shortlist_contributors,
+)
 from devrel.agents.docs import detect_doc_gaps, to_doc_gap_output
 from devrel.agents.promotion import evaluate_promotion, evaluate_promotion_llm
 from devrel.agents.response import draft_response, draft_response_llm
@@ -20,8 +28,9 @@ class FakeLlmClient:
         json_schema: JsonSchema,
         temperature: float = 0.2,
         max_output_tokens: int = 600,
+        context: Sequence[str] = (),
     ) -> dict[str, object]:
-        _ = (system, user, json_schema, temperature, max_output_tokens)
+        _ = (system, user, json_schema, temperature, max_output_tokens, context)
         return self._mapping[task.value]
 
 
@@ -177,3 +186,57 @@ def test_llm_paths_use_structured_outputs() -> None:
 
     promo = evaluate_promotion_llm(llm, contributors[0])
     assert promo.is_candidate is True
+
+
+def test_shortlist_of_the_whole_team_is_in_heuristic_order() -> None:
+    # scripts/report_assignment_shortlist.py ranks the LLM pick by its position in this list.
+    contributors = [Contributor(login=f"dev{i}", areas=("docs",) if i == 3 else (), reviews=i) for i in range(5)]
+    analysis = analyze_issue(Issue(number=7, title="Docs page is outdated", body="The docs section is wrong.", labels=()))
+    expected = recommend_assignee(analysis, contributors, limit=len(contributors))
+    order = [expected.recommended_assignee, *expected.alternative_assignees]
+
+    ranking = [c.login for c in shortlist_contributors(analysis, contributors, len(contributors))]
+    assert ranking == order and ranking[0] == "dev3"
+    assert [c.login for c in shortlist_contributors(analysis, contributors, 0)] == order
+
+
+def test_recommend_assignee_llm_sends_only_the_shortlist() -> None:
+    contributors = [Contributor(login=f"dev{i:02d}", areas=("docs",) if i < 3 else (), reviews=i) for i in range(30)]
+    issue = Issue(number=7, title="Docs page is outdated", body="The docs section is wrong.", labels=())
+    analysis = analyze_issue(issue)
+    seen: list[Sequence[str]] = []
+
+    class Recorder(FakeLlmClient):
+        def generate_json(self, **kwargs: object) -> dict[str, object]:  # type: ignore[override]
+            seen.append(kwargs["context"])  # type: ignore[arg-type]
+            return super().generate_json(**kwargs)  # type: ignore[arg-type]
+
+    def assignment(login: str) -> dict[str, object]:
+        return {
+            "recommended_assignee": login,
+            "confidence": 0.8,
+            "reasons": [],
+            "context_for_assignee": "",
+            "alternative_assignees": [],
+        }
+
+    out = recommend_assignee_llm(
+        Recorder({"assignment": assignment("dev02")}),  # type: ignore[arg-type]
+        issue=issue,
+        issue_analysis=analysis,
+        contributors=contributors,
+        top_k=5,
+    )
+    assert out.recommended_assignee == "dev02"
+    roster = seen[-1][0]
+    assert roster.count('"login"') == 5 and '"dev21"' in roster and '"dev29"' not in roster  # reviews cap at 20
+
+    # A pick outside the shortlist falls back to the heuristic over the whole team.
+    fallback = recommend_assignee_llm(
+        Recorder({"assignment": assignment("dev10")}),  # type: ignore[arg-type]
+        issue=issue,
+        issue_analysis=analysis,
+        contributors=contributors,
+        top_k=5,
+    )
+    assert fallback == recommend_assignee(analysis, contributors)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("fastapi")
+httpx = pytest.importorskip("httpx")
+
+from devrel.api import main  # noqa: E402
+from devrel.llm.client import AsyncLlmClient  # noqa: E402
+
+LLM_LATENCY_S = 0.2
+
+ANALYSIS = {
+    "issue_type": "bug",
+    "priority": "high",
+    "required_skills": ["python"],
+    "keywords": ["timeout"],
+    "summary": "Timeout in runner",
+    "needs_more_info": False,
+    "suggested_action": "direct_answer",
+}
+RESPONSE = {
+    "strategy": "direct_answer",
+    "response_text": "Try raising the timeout.",
+    "confidence": 0.7,
+    "references": [],
+    "follow_up_needed": False,
+}
+
+
+class SlowFakeResponses:
+    """Stands in for `AsyncOpenAI().responses`: every call takes LLM_LATENCY_S of awaited (non-blocking) time."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def create(self, **kwargs: object) -> SimpleNamespace:
+        self.calls += 1
+        await asyncio.sleep(LLM_LATENCY_S)
+        schema_name = kwargs["text"]["format"].get("name")  # type: ignore[index]
+        payload = RESPONSE if schema_name == "response_output" else ANALYSIS
+        return SimpleNamespace(status="completed", incomplete_details=None, output_text=json.dumps(payload))
+
+
+async def _fire(path: str, n: int) -> float:
+    transport = httpx.ASGITransport(app=main.app)
+    # Distinct issue numbers so single-flight coalescing does not merge the requests.
+    issues = [
+        {"number": i + 1, "title": "Runner times out", "body": "Stack trace attached", "labels": ["bug"]}
+        for i in range(n)
+    ]
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(client.post(path, json=issue) for issue in issues))
+        elapsed = time.perf_counter() - started
+    assert all(r.status_code == 200 for r in responses), [r.text for r in responses if r.status_code != 200]
+    return elapsed
+
+
+@pytest.fixture()
+def fake_llm(monkeypatch: pytest.MonkeyPatch) -> SlowFakeResponses:
+    responses = SlowFakeResponses()
+    monkeypatch.setattr(main, "_llm_client", AsyncLlmClient(client=SimpleNamespace(responses=responses)))
+    monkeypatch.setattr(main, "_rag_client", None)
+    return responses
+
+
+def test_concurrent_analyze_requests_overlap(fake_llm: SlowFakeResponses) -> None:
+    single = asyncio.run(_fire("/api/agents/analyze?use_llm=true", 1))
+    concurrent = asyncio.run(_fire("/api/agents/analyze?use_llm=true", 32))
+
+    assert fake_llm.calls == 33
+    # Serialized handlers would need 32 * LLM_LATENCY_S; overlapping ones stay close to one call.
+    assert concurrent < 32 * LLM_LATENCY_S / 4
+    throughput_single = 1 / single
+    throughput_concurrent = 32 / concurrent
+    assert throughput_concurrent > 8 * throughput_single
+
+
+def test_response_endpoint_chains_async_calls(fake_llm: SlowFakeResponses) -> None:
+    elapsed = asyncio.run(_fire("/api/agents/response?use_llm=true&use_rag=false", 16))
+    # Each request awaits analysis then response (2 sequential calls), all requests in parallel.
+    assert fake_llm.calls == 32
+    assert elapsed < 16 * 2 * LLM_LATENCY_S / 4
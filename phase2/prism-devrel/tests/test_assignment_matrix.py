@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from devrel.agents.assignment import analyze_issue, recommend_assignee  # noqa: E402
+from devrel.agents.assignment_matrix import ContributorMatrix  # noqa: E402
+from devrel.agents.types import Contributor, Issue  # noqa: E402
+from tests.helpers.teams import random_team  # noqa: E402
+
+AREAS = ["python", "cache", "redis", "docs", "tracing", "streaming", "api", "cli"]
+
+
+def _team(n: int, seed: int) -> list[Contributor]:
+    # Coarse values so many contributors tie and the tie order is exercised.
+    return random_team(
+        n, seed=seed, areas=AREAS, activity=(0.0, 0.5, 2.5), merged_prs=(0, 4, 12), reviews=(0, 5)
+    )
+
+
+def test_batch_ranking_matches_recommend_assignee() -> None:
+    team = _team(400, seed=3)
+    matrix = ContributorMatrix(team)
+    issues = [
+        Issue(1, "Redis cache timeout", "trace"),
+        Issue(2, "Docs for streaming", "docs"),
+        Issue(3, "Unrelated", "hello"),
+        Issue(4, "How do I call the API?", "question"),
+    ]
+    analyses = [analyze_issue(i) for i in issues]
+
+    for limit in (1, 3, 10):
+        expected = [recommend_assignee(a, team, limit=limit) for a in analyses]
+        assert matrix.recommend_batch(analyses, limit=limit, chunk=3) == expected
+
+
+def test_small_and_empty_teams() -> None:
+    analysis = analyze_issue(Issue(1, "Redis cache timeout", "trace"))
+    assert ContributorMatrix([]).recommend_batch([analysis]) == [recommend_assignee(analysis, [])]
+
+    solo = [Contributor(login="solo", areas=("python",))]
+    assert ContributorMatrix(solo).recommend_batch([analysis]) == [recommend_assignee(analysis, solo)]
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import pytest
+
+from devrel.llm.model_selector import LlmTask
+from devrel.search.context_builder import build_context, count_tokens, split_sentences
+from devrel.search.rag_client import KBDocument
+
+FILLER = " ".join(f"Unrelated paragraph {i} talks about release notes and changelog formatting." for i in range(40))
+
+
+def _doc(kb_id: str, number: int, text: str, score: float = 1.0) -> KBDocument:
+    return KBDocument(kb_id, "issue", number, "body", f"https://github.com/o/r/issues/{number}", text, {}, score)
+
+
+def test_selects_relevant_sentences_instead_of_a_prefix() -> None:
+    answer = "To fix the Redis timeout, raise redis.socket_timeout to 30 seconds in settings.py."
+    doc = _doc("a", 1, f"{FILLER} {answer} {FILLER}")
+    pack = build_context("redis timeout", [doc], budget_tokens=200)
+
+    assert len(pack.references) == 1
+    assert "socket_timeout" in pack.references[0]
+    assert pack.references[0].startswith("[ISSUE #1] body: ")
+    assert "Source: https://github.com/o/r/issues/1" in pack.references[0]
+    assert pack.tokens <= 200
+
+
+def test_respects_budget_and_rank_order() -> None:
+    docs = [_doc(str(i), i, f"Redis timeout workaround number {i}. " + FILLER) for i in range(10)]
+    pack = build_context("redis timeout workaround", docs, budget_tokens=150, per_doc_tokens=50)
+
+    assert pack.tokens <= 150
+    assert 0 < pack.used_docs < len(docs)
+    assert pack.dropped_over_budget == len(docs) - pack.used_docs - pack.dropped_duplicates
+    assert pack.references[0].startswith("[ISSUE #0]")
+    assert sum(count_tokens(r) for r in pack.references) == pack.tokens
+
+
+def test_drops_near_duplicate_chunks() -> None:
+    text = "Set LOG_LEVEL=debug to enable verbose logging. Logs are written to /var/log/app.log by default."
+    docs = [_doc("a", 1, text), _doc("b", 2, text + " Thanks!"), _doc("c", 3, "Use the --trace flag for tracing output.")]
+    pack = build_context("enable debug logging", docs, budget_tokens=500)
+
+    assert pack.dropped_duplicates == 1
+    assert [r.split("]")[0] for r in pack.references] == ["[ISSUE #1", "[ISSUE #3"]
+
+
+def test_task_budget_comes_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CONTEXT_BUDGET_RESPONSE", "123")
+    assert build_context("q", [], task=LlmTask.RESPONSE).budget == 123
+
+
+def test_split_sentences_handles_lists_and_paragraphs() -> None:
+    text = "First sentence. Second one!\n\nNew paragraph\n- item one\n- item two"
+    assert split_sentences(text) == ["First sentence.", "Second one!", "New paragraph", "- item one", "- item two"]
+
+
+def test_counts_with_model_tokenizer_when_available() -> None:
+    tiktoken = pytest.importorskip("tiktoken")
+    text = "Hybrid search combines keyword and vector results."
+    expected = len(tiktoken.get_encoding("o200k_base").encode(text))
+    assert count_tokens(text, "gpt-4.1-mini") == expected
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from devrel.agents.assignment import analyze_issue, recommend_assignee
+from devrel.agents.contributor_index import ContributorIndex, is_bot_account
+from devrel.agents.types import Contributor, Issue
+from tests.helpers.raw_data_loader import build_contributors_from_raw_data, raw_data_dir
+from tests.helpers.teams import random_team
+
+AREAS = ["python", "cache", "redis", "docs", "tracing", "streaming", "api", "cli", "testing", "infra"]
+REPO = "openai/openai-agents-python"
+
+
+def _team(n: int, seed: int) -> list[Contributor]:
+    return random_team(
+        n, seed=seed, areas=AREAS, activity=(0.0, 0.5, 1.0, 3.0), merged_prs=range(16), reviews=range(26)
+    )
+
+
+def test_index_ranking_matches_recommend_assignee() -> None:
+    team = _team(300, seed=7)
+    index = ContributorIndex(team)
+    for title, body in [
+        ("Redis cache timeout", "trace"),
+        ("Docs for streaming", "docs"),
+        ("Unrelated request", "hello"),
+    ]:
+        analysis = analyze_issue(Issue(1, title, body))
+        assert index.recommend(analysis) == recommend_assignee(analysis, team)
+        assert index.recommend(analysis, limit=5) == recommend_assignee(analysis, team, limit=5)
+
+
+def test_ranking_is_sub_millisecond_at_org_scale() -> None:
+    index = ContributorIndex(_team(5000, seed=1))
+    analysis = analyze_issue(Issue(1, "Tracing export is slow", "tracing"))
+    index.recommend(analysis)  # builds the base-score order once
+
+    started = time.perf_counter()
+    for _ in range(50):
+        index.rank(("tracing",), 3)
+    assert (time.perf_counter() - started) / 50 * 1000.0 < 1.0
+
+
+def test_activity_csv_refresh_is_incremental(tmp_path: Path) -> None:
+    path = tmp_path / "activity.csv"
+    path.write_text(
+        "repo_full_name,user_id,action,reference,occurred_at\n"
+        "o/r,alice,pr_opened,https://github.com/o/r/pull/1,2025-01-01T00:00:00Z\n"
+        "o/r,dependabot[bot],pr_opened,https://github.com/o/r/pull/2,2025-01-01T00:00:00Z\n",
+        encoding="utf-8",
+    )
+    index = ContributorIndex.from_activity_csv(path, exclude=is_bot_account)
+    assert [c.login for c in index.contributors()] == ["alice"]
+    assert index.refresh() == 0
+
+    with path.open("a", encoding="utf-8") as f:
+        f.write("o/r,bob,reviewed,https://github.com/o/r/pull/1,2025-01-02T00:00:00Z\n")
+        f.write("o/r,alice,reviewed,https://github.com/o/r/pull/3,2025-01-03T00:00:00Z\n")
+        f.write("o/r,carol,commented,https://github.com/o/r/iss")  # partial row, not consumed yet
+    assert index.refresh() == 2
+
+    alice = index.get("alice")
+    assert alice is not None
+    assert (alice.merged_prs, alice.reviews, alice.areas) == (1, 1, ("code-review", "development"))
+    assert alice.last_contribution_date == "2025-01-03"
+    assert "carol" not in index
+    assert index.rank(("code-review",), 2)[0][0].login == "alice"
+
+
+def test_refresh_keeps_index_when_source_is_missing(tmp_path: Path, caplog) -> None:
+    path = tmp_path / "activity.csv"
+    path.write_text(
+        "repo_full_name,user_id,action,reference,occurred_at\n"
+        "o/r,alice,pr_opened,https://github.com/o/r/pull/1,2025-01-01T00:00:00Z\n",
+        encoding="utf-8",
+    )
+    index = ContributorIndex.from_activity_csv(path)
+    path.unlink()
+
+    with caplog.at_level("WARNING", logger="devrel.agents.contributor_index"):
+        assert index.refresh() == 0
+    assert "missing" in caplog.text
+    assert [c.login for c in index.contributors()] == ["alice"]
+
+
+def test_activity_index_agrees_with_raw_data_loader() -> None:
+    index = ContributorIndex.from_activity_csv(raw_data_dir() / "repo_user_activity.csv", repo=REPO, exclude=is_bot_account)
+    for expected in build_contributors_from_raw_data(REPO)[:50]:
+        assert index.get(expected.login) == expected
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from devrel.agents.doc_clusters import (  # noqa: E402
+    ClusterItem,
+    cluster_doc_gaps,
+    issue_from_kb_text,
+    summarize_clusters_llm,
+)
+from devrel.agents.docs import to_doc_gap_output  # noqa: E402
+from devrel.agents.types import Issue  # noqa: E402
+from tests.helpers.fakes import DocGapLlm  # noqa: E402
+
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+TOPICS = {
+    "redis": ("Redis cache timeout", 40, 10),
+    "tracing": ("Tracing spans missing", 25, 400),
+    "streaming": ("Streaming events dropped", 60, 720),
+}
+
+
+def _corpus(seed: int = 3) -> tuple[list[ClusterItem], Any]:
+    rng = np.random.default_rng(seed)
+    items: list[ClusterItem] = []
+    vectors = []
+    number = 1
+    for title, count, age_days in TOPICS.values():
+        centre = rng.normal(size=512)
+        for _ in range(count):
+            items.append(ClusterItem(Issue(number, f"{title} #{number}", "details"), NOW - timedelta(days=age_days)))
+            vectors.append(centre + rng.normal(scale=0.3, size=512))
+            number += 1
+    return items, np.array(vectors)
+
+
+def test_planted_topics_are_recovered_and_ranked_by_recency() -> None:
+    items, vectors = _corpus()
+    clusters = cluster_doc_gaps(items, vectors, k=3, dims=128, half_life_days=90, now=NOW)
+
+    # "streaming" is the largest cluster but two years old; the recent redis cluster ranks first.
+    assert [c.size for c in clusters] == [40, 25, 60]
+    assert clusters[0].top_terms[:3] == ("cache", "redis", "timeout")  # equal scores: alphabetical
+    assert set(clusters[0].issue_numbers) == set(range(1, 41))
+    assert clusters[0].weight > clusters[1].weight > clusters[2].weight
+    assert len(clusters[0].representatives) == 5 and clusters[0].cohesion > 0.8
+
+    candidate = clusters[0].to_candidate()
+    assert candidate.topic == "cache redis timeout"
+    assert to_doc_gap_output(candidate).affected_issues == tuple(range(1, 41))
+
+
+def test_llm_sees_only_cluster_summaries_and_representatives() -> None:
+    items, vectors = _corpus()
+    clusters = cluster_doc_gaps(items, vectors, k=3, dims=128, representatives=3, now=NOW)
+    llm = DocGapLlm()
+    outputs: Sequence = summarize_clusters_llm(llm, clusters[:2])  # type: ignore[arg-type]
+
+    assert len(llm.users) == 2
+    assert all(user.count('"number"') == 3 for user in llm.users)
+    assert outputs[0].affected_issues == tuple(range(1, 41))
+
+
+def test_issue_from_kb_text() -> None:
+    text = "Issue #7\nTitle: Docs for Redis\n\nBody: How do I\nconfigure it?\n\nLabels: docs, redis"
+    assert issue_from_kb_text(7, text) == Issue(7, "Docs for Redis", "How do I\nconfigure it?", ("docs", "redis"))
+    assert issue_from_kb_text(8, "Issue #8\nTitle: Bare") == Issue(8, "Bare", "")
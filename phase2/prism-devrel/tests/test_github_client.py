@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any
+
+from devrel.search.cache import DocsTreeCache
+from devrel.search.github_client import GitHubClient, compare_structures
+
+TREES: dict[str, list[dict[str, Any]]] = {
+    "o/target": [
+        {"path": "README.md", "type": "blob", "size": 10},
+        {"path": "docs", "type": "tree"},
+        {"path": "docs/index.md", "type": "blob", "size": 5},
+        {"path": "docs/quickstart.md", "type": "blob", "size": 7},
+        {"path": "src/app.py", "type": "blob", "size": 99},
+    ],
+    "o/ref": [
+        {"path": "docs/quickstart.md", "type": "blob", "size": 7},
+        {"path": "docs/guides/caching.md", "type": "blob", "size": 3},
+        {"path": "docs/guides/deep/tracing.rst", "type": "blob", "size": 4},
+        {"path": "docs/img/logo.png", "type": "blob", "size": 400},
+    ],
+    "o/rootonly": [
+        {"path": "CONTRIBUTING.md", "type": "blob", "size": 1},
+        {"path": "setup.py", "type": "blob", "size": 1},
+    ],
+}
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, payload: Any = None) -> None:
+        self.status_code = status_code
+        self._payload = payload
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise AssertionError("unexpected error status")
+
+    def json(self) -> Any:
+        return self._payload
+
+
+class FakeSession:
+    """Serves /repos/{repo}, /branches/main and /git/trees/{sha} for `TREES`."""
+
+    def __init__(self) -> None:
+        self.paths: list[str] = []
+        self._lock = threading.Lock()
+
+    def get(self, url: str, *, headers: Any = None, params: Any = None, timeout: Any = None) -> FakeResponse:
+        path = url.removeprefix("https://api.github.com")
+        with self._lock:
+            self.paths.append(path)
+        parts = path.strip("/").split("/")
+        repo = f"{parts[1]}/{parts[2]}"
+        if repo not in TREES:
+            return FakeResponse(404)
+        if len(parts) == 3:
+            return FakeResponse(200, {"default_branch": "main"})
+        if parts[3] == "branches":
+            return FakeResponse(200, {"commit": {"commit": {"tree": {"sha": f"sha-{parts[2]}"}}}})
+        assert parts[3:5] == ["git", "trees"] and params == {"recursive": "1"}
+        return FakeResponse(200, {"sha": parts[5], "tree": TREES[repo], "truncated": False})
+
+
+def test_docs_structure_from_one_recursive_tree_listing() -> None:
+    session = FakeSession()
+    github = GitHubClient(token="t", cache=DocsTreeCache(), session=session)  # type: ignore[arg-type]
+
+    ref = github.get_docs_structure("o/ref")
+    assert ref is not None
+    assert [f.path for f in ref.files] == [
+        "docs/guides/caching.md",
+        "docs/guides/deep/tracing.rst",
+        "docs/quickstart.md",
+    ]
+    assert ref.directories == ("docs/guides",)
+    assert ref.topics == ("caching", "guides", "quickstart", "tracing")
+    assert ref.files[0].url == "https://github.com/o/ref/blob/main/docs/guides/caching.md"
+    assert session.paths == ["/repos/o/ref", "/repos/o/ref/branches/main", "/repos/o/ref/git/trees/sha-ref"]
+
+    root = github.get_docs_structure("o/rootonly")
+    assert root is not None and root.docs_path == "." and [f.name for f in root.files] == ["CONTRIBUTING.md"]
+    assert github.get_docs_structure("o/missing") is None
+
+
+def test_tree_listing_is_cached_by_sha_and_persisted(tmp_path: Path) -> None:
+    path = str(tmp_path / "github_docs.sqlite")
+    session = FakeSession()
+    github = GitHubClient(cache=DocsTreeCache(path), session=session)  # type: ignore[arg-type]
+    first = github.get_docs_structure("o/target")
+    assert len(session.paths) == 3
+
+    # Within the ref TTL a repeat crawl makes no requests at all.
+    assert github.get_docs_structure("o/target") == first
+    assert len(session.paths) == 3
+
+    # A new process (fresh cache object, same file) only re-checks the branch head.
+    session = FakeSession()
+    github = GitHubClient(cache=DocsTreeCache(path, ref_ttl_s=0), session=session)  # type: ignore[arg-type]
+    assert github.get_docs_structure("o/target") == first
+    assert session.paths == ["/repos/o/target", "/repos/o/target/branches/main"]
+
+
+def test_concurrent_crawl_feeds_comparison_without_refetching_target() -> None:
+    session = FakeSession()
+    github = GitHubClient(cache=DocsTreeCache(), session=session)  # type: ignore[arg-type]
+    structures = github.get_docs_structures(["o/target", "o/ref", "o/rootonly", "o/ref"])
+    assert list(structures) == ["o/target", "o/ref", "o/rootonly"]
+    assert sum(p.endswith("/git/trees/sha-target") for p in session.paths) == 1
+
+    comparison = compare_structures("o/target", "o/ref", structures["o/target"], structures["o/ref"])
+    assert comparison.missing_topics == ("caching", "guides", "tracing")
+    assert comparison.missing_paths == ("docs/guides/caching.md", "docs/guides/deep/tracing.rst")
+    assert comparison.coverage_ratio == 0.25
+    assert github.compare_docs("o/target", "o/ref") == comparison
+
+
+class TruncatedSession(FakeSession):
+    """A repository whose recursive listing is truncated; the docs subtree fails until `docs_ok` is set."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.docs_ok = False
+
+    def get(self, url: str, *, headers: Any = None, params: Any = None, timeout: Any = None) -> FakeResponse:
+        path = url.removeprefix("https://api.github.com")
+        if "/git/trees/" not in path:
+            return super().get(url, headers=headers, params=params, timeout=timeout)
+        with self._lock:
+            self.paths.append(path)
+        if path.endswith("/sha-docs"):
+            if not self.docs_ok:
+                return FakeResponse(404)
+            return FakeResponse(200, {"tree": [{"path": "index.md", "type": "blob", "size": 5}], "truncated": False})
+        if params == {"recursive": "1"}:
+            return FakeResponse(200, {"tree": [], "truncated": True})
+        return FakeResponse(
+            200,
+            {
+                "tree": [
+                    {"path": "README.md", "type": "blob", "size": 10},
+                    {"path": "docs", "type": "tree", "sha": "sha-docs"},
+                ],
+                "truncated": False,
+            },
+        )
+
+
+def test_partial_subtree_listing_is_not_cached() -> None:
+    session = TruncatedSession()
+    cache = DocsTreeCache()
+    github = GitHubClient(cache=cache, session=session)  # type: ignore[arg-type]
+
+    first = github.get_docs_structure("o/target")
+    assert first is not None and first.docs_path == "."  # docs/ failed, only the root README is known
+    assert cache.get_tree("o/target", "sha-target") is None
+
+    session.docs_ok = True
+    second = github.get_docs_structure("o/target")
+    assert second is not None and [f.path for f in second.files] == ["docs/index.md"]
+    assert cache.get_tree("o/target", "sha-target") == [["README.md", 10], ["docs/index.md", 5]]
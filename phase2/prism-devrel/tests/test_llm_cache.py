@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from devrel.llm.cache import LlmCache, MemoryCacheBackend, SqliteCacheBackend
+from devrel.llm.client import AsyncLlmClient, JsonSchema, LlmClient
+from devrel.llm.model_selector import LlmTask
+from tests.helpers.fakes import FakeClock
+
+SCHEMA = JsonSchema(
+    name="triage",
+    schema={
+        "type": "object",
+        "additionalProperties": False,
+        "properties": {"label": {"type": "string"}},
+        "required": ["label"],
+    },
+)
+
+
+class CountingResponses:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def create(self, **kwargs: object) -> SimpleNamespace:
+        self.calls += 1
+        return SimpleNamespace(status="completed", incomplete_details=None, output_text=json.dumps({"label": f"call-{self.calls}"}))
+
+
+class AsyncCountingResponses(CountingResponses):
+    async def create(self, **kwargs: object) -> SimpleNamespace:  # type: ignore[override]
+        return CountingResponses.create(self, **kwargs)
+
+
+def bag_of_words(text: str) -> list[float]:
+    vocab = ["redis", "timeout", "cache", "oauth", "login", "docs"]
+    words = text.lower().split()
+    return [float(words.count(w)) for w in vocab]
+
+
+def _client(cache: LlmCache) -> tuple[LlmClient, CountingResponses]:
+    responses = CountingResponses()
+    return LlmClient(client=SimpleNamespace(responses=responses), cache=cache), responses
+
+
+def _ask(client: LlmClient, user: str, *, task: LlmTask = LlmTask.ISSUE_TRIAGE) -> dict[str, object]:
+    return client.generate_json(task=task, system="Classify.", user=user, json_schema=SCHEMA)
+
+
+def test_exact_tier_serves_repeated_calls() -> None:
+    cache = LlmCache()
+    client, responses = _client(cache)
+
+    first = _ask(client, "redis timeout")
+    first["label"] = "mutated by caller"
+    assert _ask(client, "redis timeout") == {"label": "call-1"}
+    assert _ask(client, "redis timeout", task=LlmTask.DOCS) == {"label": "call-2"}
+    assert responses.calls == 2
+    assert cache.stats.exact_hits == 1
+    assert cache.stats.misses == 2
+
+
+def test_ttl_expires_entries() -> None:
+    clock = FakeClock(1000.0)
+    client, responses = _client(LlmCache(ttl_s=60, clock=clock))
+    _ask(client, "redis timeout")
+    clock.now += 59
+    _ask(client, "redis timeout")
+    clock.now += 2
+    _ask(client, "redis timeout")
+    assert responses.calls == 2
+
+
+def test_lru_evicts_least_recently_used() -> None:
+    cache = LlmCache(backend=MemoryCacheBackend(max_entries=2))
+    client, responses = _client(cache)
+    _ask(client, "a")
+    _ask(client, "b")
+    _ask(client, "a")  # refresh "a"; "b" is now the oldest
+    _ask(client, "c")
+    assert cache.stats.evictions == 1
+    _ask(client, "a")
+    _ask(client, "b")
+    assert responses.calls == 4
+
+
+def test_semantic_tier_matches_near_duplicates_within_scope() -> None:
+    cache = LlmCache(embedder=bag_of_words, semantic_threshold=0.9)
+    client, responses = _client(cache)
+
+    _ask(client, "redis cache timeout")
+    assert _ask(client, "Redis cache timeout again") == {"label": "call-1"}  # not an exact match
+    assert cache.stats.semantic_hits == 1
+    _ask(client, "oauth login")  # dissimilar
+    _ask(client, "redis cache timeout", task=LlmTask.DOCS)  # different scope
+    assert responses.calls == 3
+
+
+def test_sqlite_backend_persists_and_bounds_size(tmp_path: Path) -> None:
+    path = str(tmp_path / "llm_cache.sqlite")
+    clock = FakeClock(1000.0)
+    client, responses = _client(LlmCache(backend=SqliteCacheBackend(path, max_entries=2), embedder=bag_of_words, clock=clock))
+    for user in ("redis", "oauth", "docs"):
+        clock.now += 1
+        _ask(client, user)
+
+    reopened = LlmCache(backend=SqliteCacheBackend(path, max_entries=2), embedder=bag_of_words, clock=clock)
+    assert len(reopened.backend) == 2
+    client2, responses2 = _client(reopened)
+    assert _ask(client2, "docs") == {"label": "call-3"}
+    assert _ask(client2, "docs docs") == {"label": "call-3"}
+    _ask(client2, "redis")  # evicted
+    assert responses2.calls == 1
+    assert reopened.stats.to_dict()["semantic_hits"] == 1
+
+
+def test_sqlite_semantic_lookup_scans_only_recent_entries(tmp_path: Path) -> None:
+    clock = FakeClock(1000.0)
+    backend = SqliteCacheBackend(str(tmp_path / "llm_cache.sqlite"), semantic_scan=1)
+    cache = LlmCache(backend=backend, embedder=bag_of_words, semantic_threshold=0.9, clock=clock)
+    client, responses = _client(cache)
+
+    _ask(client, "redis cache timeout")
+    clock.now += 1
+    assert _ask(client, "Redis cache timeout again") == {"label": "call-1"}  # most recent entry: found
+    clock.now += 1
+    _ask(client, "oauth login")  # now the only entry scanned
+    clock.now += 1
+    assert _ask(client, "redis timeout cache please") == {"label": "call-3"}
+    assert (cache.stats.semantic_hits, responses.calls) == (1, 3)
+
+
+def test_async_client_uses_cache() -> None:
+    responses = AsyncCountingResponses()
+    client = AsyncLlmClient(client=SimpleNamespace(responses=responses), cache=LlmCache())
+
+    async def run() -> list[dict[str, object]]:
+        out = []
+        for _ in range(3):
+            out.append(await client.generate_json(task=LlmTask.ISSUE_TRIAGE, system="s", user="u", json_schema=SCHEMA))
+        return out
+
+    assert asyncio.run(run()) == [{"label": "call-1"}] * 3
+    assert responses.calls == 1
+
+
+def test_backend_errors_degrade_to_misses() -> None:
+    class BrokenBackend(MemoryCacheBackend):
+        def get(self, key: str, *, now: float) -> None:
+            raise OSError("disk gone")
+
+    cache = LlmCache(backend=BrokenBackend())
+    client, responses = _client(cache)
+    assert _ask(client, "x") == {"label": "call-1"}
+    assert cache.stats.errors == 1
+    assert responses.calls == 1
+
+
+@pytest.mark.parametrize("value", ["", "off"])
+def test_cache_is_off_by_default(monkeypatch: pytest.MonkeyPatch, value: str) -> None:
+    from devrel.llm.cache import build_llm_cache_from_env
+
+    monkeypatch.setenv("LLM_CACHE_BACKEND", value)
+    assert build_llm_cache_from_env() is None
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from devrel.llm.client import AsyncLlmClient, JsonSchema, LlmClient
+from devrel.llm.model_selector import LlmTask, model_for
+from devrel.llm.telemetry import LlmTelemetry, estimate_cost
+
+SCHEMA = JsonSchema(
+    name="answer",
+    schema={"type": "object", "properties": {"answer": {"type": "string"}}, "required": ["answer"]},
+)
+
+
+def _usage(input_tokens: int, cached: int, output: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        input_tokens=input_tokens,
+        output_tokens=output,
+        input_tokens_details=SimpleNamespace(cached_tokens=cached),
+    )
+
+
+class ScriptedResponses:
+    """Returns the scripted responses in order, one per `create` call."""
+
+    def __init__(self, *responses: SimpleNamespace) -> None:
+        self.responses = list(responses)
+        self.formats: list[str] = []
+
+    def create(self, **kwargs: Any) -> SimpleNamespace:
+        self.formats.append(kwargs["text"]["format"]["type"])
+        return self.responses.pop(0)
+
+
+def test_one_record_per_call_covers_retry_and_fallback() -> None:
+    truncated = SimpleNamespace(
+        status="incomplete", incomplete_details={"reason": "max_output_tokens"}, output_text="", usage=_usage(1000, 0, 600)
+    )
+    invalid = SimpleNamespace(status="completed", incomplete_details=None, output_text="{not json", usage=_usage(1000, 512, 50))
+    valid = SimpleNamespace(
+        status="completed", incomplete_details=None, output_text=json.dumps({"answer": "ok"}), usage=_usage(1100, 1024, 20)
+    )
+    responses = ScriptedResponses(truncated, invalid, valid)
+    llm = LlmClient(client=SimpleNamespace(responses=responses))
+
+    assert llm.generate_json(task=LlmTask.DOCS, system="s", user="u", json_schema=SCHEMA) == {"answer": "ok"}
+
+    (record,) = llm.telemetry.recent
+    assert responses.formats == ["json_schema", "json_schema", "json_object"]
+    assert (record.task, record.model, record.status, record.attempts) == ("docs", model_for(LlmTask.DOCS), "ok", 3)
+    assert record.retry_reasons == ("max_output_tokens", "invalid_json")
+    assert record.fallback == "json_object"
+    body = llm.telemetry.metrics.render()
+    assert "# HELP devrel_llm_fallbacks_total LLM calls that used a fallback path" in body
+    assert 'devrel_llm_fallbacks_total{task="docs",mode="json_object"} 1' in body
+    assert (record.input_tokens, record.cached_tokens, record.output_tokens) == (3100, 1536, 670)
+    assert record.cost_usd == pytest.approx(estimate_cost(record.model, input_tokens=3100, cached_tokens=1536, output_tokens=670))
+
+
+def test_errors_are_recorded_and_reraised() -> None:
+    class Failing:
+        def create(self, **kwargs: Any) -> None:
+            raise RuntimeError("rate limited")
+
+    llm = LlmClient(client=SimpleNamespace(responses=Failing()))
+    with pytest.raises(RuntimeError):
+        llm.generate_json(task=LlmTask.JUDGE, system="s", user="u", json_schema=SCHEMA)
+    (record,) = llm.telemetry.recent
+    assert record.status == "error" and "rate limited" in record.error
+    assert 'devrel_llm_calls_total{task="judge",model="' in llm.telemetry.metrics.render()
+
+
+def test_metric_totals_cover_calls_beyond_the_recent_history() -> None:
+    telemetry = LlmTelemetry(history=2)
+    for i in range(5):
+        with telemetry.track("triage", "gpt-5-mini") as tracker:
+            tracker.response(SimpleNamespace(usage=_usage(1_000_000, 0, 0)))
+    assert len(telemetry.recent) == 2
+    totals = telemetry.metrics.totals()
+    assert (totals["calls"], totals["errors"], totals["models"]) == (5, 0, ["gpt-5-mini"])
+    assert totals["cost_usd"] == pytest.approx(5 * telemetry.recent[0].cost_usd)
+
+
+def test_cost_table_matches_dated_snapshots_and_unknown_models() -> None:
+    assert estimate_cost("gpt-4.1-mini-2025-04-14", input_tokens=1_000_000, cached_tokens=0, output_tokens=0) == 0.4
+    assert estimate_cost("gpt-5", input_tokens=1_000_000, cached_tokens=1_000_000, output_tokens=0) == 0.125
+    assert estimate_cost("my-finetune", input_tokens=10, cached_tokens=0, output_tokens=10) is None
+
+
+def test_metrics_endpoint_exposes_latency_histogram_and_spend(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("fastapi")
+    httpx = pytest.importorskip("httpx")
+    from devrel.api import main
+
+    class Responses:
+        async def create(self, **kwargs: Any) -> SimpleNamespace:
+            return SimpleNamespace(
+                status="completed",
+                incomplete_details=None,
+                output_text=json.dumps({"answer": "ok"}),
+                usage=_usage(2000, 1024, 100),
+            )
+
+    llm = AsyncLlmClient(client=SimpleNamespace(responses=Responses()))
+    monkeypatch.setattr(main, "_llm_client", llm)
+
+    async def run() -> Any:
+        await llm.generate_json(task=LlmTask.RESPONSE, system="s", user="u", json_schema=SCHEMA)
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/metrics")
+
+    response = asyncio.run(run())
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    model = model_for(LlmTask.RESPONSE)
+    body = response.text
+    assert f'devrel_llm_calls_total{{task="response",model="{model}",status="ok"}} 1' in body
+    assert f'devrel_llm_tokens_total{{task="response",model="{model}",kind="cached_input"}} 1024' in body
+    assert f'devrel_llm_call_duration_seconds_count{{task="response",model="{model}"}} 1' in body
+    assert "devrel_llm_cost_usd_total" in body
+
+
+def test_spans_carry_usage_attributes() -> None:
+    class Span:
+        def __init__(self, name: str, attributes: dict[str, Any]) -> None:
+            self.name, self.attributes, self.ended = name, dict(attributes), False
+
+        def set_attribute(self, key: str, value: Any) -> None:
+            self.attributes[key] = value
+
+        def set_status(self, status: Any) -> None:
+            self.attributes["status"] = status
+
+        def end(self) -> None:
+            self.ended = True
+
+    class Tracer:
+        def __init__(self) -> None:
+            self.spans: list[Span] = []
+
+        def start_span(self, name: str, attributes: dict[str, Any]) -> Span:
+            self.spans.append(Span(name, attributes))
+            return self.spans[-1]
+
+    tracer = Tracer()
+    telemetry = LlmTelemetry(tracer=tracer)
+    with telemetry.track("triage", "gpt-4.1-mini") as tracker:
+        tracker.response(SimpleNamespace(usage=_usage(10, 0, 5)))
+
+    (span,) = tracer.spans
+    assert span.ended
+    assert span.attributes["gen_ai.request.model"] == "gpt-4.1-mini"
+    assert span.attributes["gen_ai.usage.output_tokens"] == 5
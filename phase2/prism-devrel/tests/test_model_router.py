@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from devrel.agents.assignment import analyze_issue_llm, recommend_assignee_llm
+from devrel.agents.response import draft_response_llm_async
+from devrel.agents.types import Contributor, Issue, issue_analysis_from_dict
+from devrel.llm.client import AsyncLlmClient, LlmClient
+from devrel.llm.model_selector import LlmTask
+from devrel.llm.router import AsyncRoutedLlmClient, ModelRouter, RoutedLlmClient, complexity_score, features_from_prompt
+from devrel.llm.telemetry import LlmCallRecord, LlmTelemetry
+
+LADDER = ("small", "medium", "large")
+ANALYSIS = {
+    "issue_type": "bug",
+    "priority": "high",
+    "required_skills": ["cache"],
+    "keywords": ["redis"],
+    "summary": "s",
+    "needs_more_info": False,
+    "suggested_action": "direct_answer",
+}
+
+
+class ModelAwareResponses:
+    """Answers per model: `outputs[model]` is the JSON text that model returns."""
+
+    def __init__(self, outputs: dict[str, str]) -> None:
+        self.outputs = outputs
+        self.models: list[str] = []
+
+    def create(self, **kwargs: Any) -> SimpleNamespace:
+        self.models.append(kwargs["model"])
+        return SimpleNamespace(status="completed", incomplete_details=None, output_text=self.outputs[kwargs["model"]])
+
+
+def _routed(outputs: dict[str, str], **router_kwargs: Any) -> tuple[RoutedLlmClient, ModelAwareResponses]:
+    responses = ModelAwareResponses(outputs)
+    llm = LlmClient(client=SimpleNamespace(responses=responses))
+    return RoutedLlmClient(llm, ModelRouter(ladder=LADDER, **router_kwargs)), responses
+
+
+def test_short_triage_stays_on_the_cheapest_model() -> None:
+    routed, responses = _routed({"small": json.dumps(ANALYSIS)})
+    analysis = analyze_issue_llm(routed, Issue(1, "Redis timeout", "trace"))  # type: ignore[arg-type]
+
+    assert analysis.priority.value == "high"
+    assert responses.models == ["small"]
+    (decision,) = routed.router.decisions
+    assert (decision.model, decision.reason, decision.outcome) == ("small", "complexity", "ok")
+
+
+def test_large_team_and_long_issue_start_higher() -> None:
+    team = [Contributor(login=f"dev{i}", areas=("python",)) for i in range(25)]
+    simple = features_from_prompt(LlmTask.ISSUE_TRIAGE, "Issue number: 1\nTitle: t")
+    assert complexity_score(simple) < 0.35
+
+    assignment = {
+        "recommended_assignee": "dev1",
+        "confidence": 0.9,
+        "reasons": [],
+        "context_for_assignee": "",
+        "alternative_assignees": [],
+    }
+    routed, responses = _routed({m: json.dumps(assignment) for m in LADDER})
+    issue = Issue(1, "Cache eviction storms", "x" * 6000)
+    recommend_assignee_llm(
+        routed,  # type: ignore[arg-type]
+        issue=issue,
+        issue_analysis=issue_analysis_from_dict(ANALYSIS),
+        contributors=team,
+    )
+    assert responses.models[-1] == "large"
+
+
+def test_invalid_output_escalates_one_rung() -> None:
+    routed, responses = _routed({"small": "not json", "medium": json.dumps(ANALYSIS)})
+    analyze_issue_llm(routed, Issue(1, "t", "b"))  # type: ignore[arg-type]
+
+    # small: json_schema attempt + json_object fallback, then escalate.
+    assert responses.models == ["small", "small", "medium"]
+    assert [(d.model, d.reason, d.outcome) for d in routed.router.decisions] == [
+        ("small", "complexity", "invalid_output"),
+        ("medium", "escalate:invalid_output", "ok"),
+    ]
+
+
+def test_invalid_output_on_the_last_rung_raises() -> None:
+    routed, _ = _routed({"small": "nope", "medium": "nope"}, max_escalations=1)
+    with pytest.raises(ValueError):
+        analyze_issue_llm(routed, Issue(1, "t", "b"))  # type: ignore[arg-type]
+    assert len(routed.router.decisions) == 2
+
+
+def test_low_confidence_escalates_async_and_slo_caps_the_pick() -> None:
+    def response(confidence: float) -> str:
+        return json.dumps(
+            {
+                "strategy": "direct_answer",
+                "response_text": "ok",
+                "confidence": confidence,
+                "references": [],
+                "follow_up_needed": False,
+            }
+        )
+
+    class AsyncResponses(ModelAwareResponses):
+        async def create(self, **kwargs: Any) -> SimpleNamespace:  # type: ignore[override]
+            return super().create(**kwargs)
+
+    responses = AsyncResponses({"small": response(0.2), "medium": response(0.9), "large": response(0.95)})
+    telemetry = LlmTelemetry()
+    for _ in range(5):
+        telemetry.record(LlmCallRecord("response", "large", "ok", 30000.0, 1, 0, 0, 0, None))
+    router = ModelRouter(ladder=LADDER, slo_ms=10000.0, telemetry=telemetry)
+    routed = AsyncRoutedLlmClient(AsyncLlmClient(client=SimpleNamespace(responses=responses)), router)
+
+    refs = [f"[ISSUE #{i}] body: " + "context " * 400 for i in range(3)]
+    issue = Issue(1, "Redis timeout", "trace " * 1500)
+    out = asyncio.run(
+        draft_response_llm_async(
+            routed,  # type: ignore[arg-type]
+            issue=issue,
+            analysis=issue_analysis_from_dict(ANALYSIS),
+            references=refs,
+        )
+    )
+
+    assert out.confidence == 0.9
+    assert responses.models == ["small", "medium"]  # "large" would have been picked, but breaks the SLO
+    assert [d.reason for d in router.decisions] == ["slo", "escalate:low_confidence"]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+from devrel.agents.assignment import analyze_issue, recommend_assignee
+from devrel.agents.contributor_index import ContributorIndex
+from devrel.agents.ownership import OwnershipTrie, mentioned_paths, ownership_scores
+from devrel.agents.types import Contributor, Issue
+
+REPO = "openai/openai-agents-python"
+
+
+def _row(user: str, role: str, path: str, when: str) -> dict[str, str]:
+    return {"repo_full_name": REPO, "user_id": f"@{user}", "role": role, "path": path, "occurred_at": when}
+
+
+ROWS = [
+    _row("alice", "author", "src/agents/tracing/processors.py", "2026-01-10T00:00:00Z"),
+    _row("alice", "author", "src/agents/tracing/spans.py", "2026-01-10T00:00:00Z"),
+    _row("bob", "reviewer", "src/agents/tracing/processors.py", "2026-01-10T00:00:00Z"),
+    _row("bob", "author", "src/agents/run.py", "2026-01-10T00:00:00Z"),
+    _row("carol", "author", "src/agents/run.py", "2025-01-10T00:00:00Z"),  # a year older: mostly decayed
+    _row("dave", "author", "docs/tracing.md", "2026-01-10T00:00:00Z"),
+]
+
+
+def test_trie_lookup_decay_and_round_trip(tmp_path: Path) -> None:
+    trie = OwnershipTrie.from_rows(ROWS, half_life_days=180)
+
+    tracing = trie.lookup("src/agents/tracing")
+    assert tracing == {"alice": 2.0, "bob": 0.5}
+    # Unknown leaf falls back to the deepest known prefix.
+    assert trie.lookup("src/agents/tracing/new_file.py") == tracing
+
+    run = trie.lookup("src/agents/run.py")
+    assert run["bob"] == 1.0 and run["carol"] < 0.3
+
+    path = tmp_path / "ownership.json.gz"
+    trie.save(path)
+    assert OwnershipTrie.load(path).lookup("src/agents/run.py") == {k: round(v, 4) for k, v in run.items()}
+
+
+def test_issue_mentions_resolve_partial_paths_and_modules() -> None:
+    trie = OwnershipTrie.from_rows(ROWS, now=datetime(2026, 1, 10, tzinfo=timezone.utc))
+    issue = Issue(1, "Spans dropped", "Traceback in agents/tracing/processors.py and agents.tracing.spans")
+
+    assert "agents/tracing/processors.py" in mentioned_paths(issue.body)
+    assert trie.resolve("agents/tracing/processors.py") == "src/agents/tracing/processors.py"
+    assert trie.resolve("run.py") == "src/agents/run.py"
+    assert ownership_scores(trie, issue) == {"alice": 1.0, "bob": 0.25}
+    assert ownership_scores(trie, Issue(2, "Unrelated", "nothing here")) == {}
+
+
+def test_ambiguous_file_names_resolve_to_nothing() -> None:
+    rows = [
+        *ROWS,
+        _row("erin", "author", "src/agents/voice/processors.py", "2026-01-10T00:00:00Z"),
+        _row("erin", "author", "examples/deep/nested/pkg/run_demo.py", "2026-01-10T00:00:00Z"),
+    ]
+    trie = OwnershipTrie.from_rows(rows)
+    assert trie.resolve("processors.py") is None  # tracing/ or voice/: no guess either way
+    assert trie.resolve("tracing/processors.py") == "src/agents/tracing/processors.py"
+    assert trie.resolve("agents/voice/processors") == "src/agents/voice/processors.py"  # `agents.voice.processors`
+    assert trie.resolve("run_demo.py") == "examples/deep/nested/pkg/run_demo.py"  # any depth, one lookup
+    assert trie.resolve("voice/new_file.py") == "src/agents/voice/new_file.py"
+    assert trie.resolve("missing.py") is None
+    assert OwnershipTrie.from_dict(trie.to_dict()).resolve("processors.py") is None
+
+
+def test_assignment_routes_to_code_owner() -> None:
+    team = [
+        Contributor(login="zed", areas=("development",), recent_activity_score=1.0, merged_prs=4),
+        Contributor(login="alice", areas=("development",), recent_activity_score=0.5),
+        Contributor(login="bob", areas=("code-review",), recent_activity_score=0.5),
+    ]
+    issue = Issue(1, "Spans dropped", "Bug in src/agents/tracing/processors.py")
+    analysis = analyze_issue(issue)
+    owners = ownership_scores(OwnershipTrie.from_rows(ROWS), issue)
+
+    assert recommend_assignee(analysis, team).recommended_assignee == "zed"
+    routed = recommend_assignee(analysis, team, ownership=owners)
+    assert routed.recommended_assignee == "alice"
+    assert routed.reasons[0].factor == "code_ownership"
+    assert ContributorIndex(team).recommend(analysis, ownership=owners) == routed
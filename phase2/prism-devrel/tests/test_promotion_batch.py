@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from devrel.agents.promotion import _infer_stage, _suggest_next_stage
+from devrel.agents.promotion_batch import (
+    PromotionStore,
+    contributors_from_csv,
+    infer_stages,
+    run_promotion_batch,
+    suggest_next_stages,
+)
+from devrel.agents.types import Contributor
+from devrel.llm.client import JsonSchema
+from devrel.llm.model_selector import LlmTask
+
+
+class CountingLlm:
+    def __init__(self) -> None:
+        self.logins: list[str] = []
+
+    def generate_json(self, *, task: LlmTask, system: str, user: str, json_schema: JsonSchema, **kwargs: Any) -> dict[str, Any]:
+        _ = (system, json_schema, kwargs)
+        assert task == LlmTask.PROMOTION
+        login = user.split('"login": "')[1].split('"')[0]
+        self.logins.append(login)
+        return {
+            "is_candidate": True,
+            "current_stage": "IGNORED",
+            "suggested_stage": "IGNORED",
+            "confidence": 0.9,
+            "evidence": [{"criterion": "merged_prs", "status": "met", "detail": f"{login} keeps shipping"}],
+            "recommendation": f"Celebrate @{login}.",
+        }
+
+
+def test_columnar_stages_match_scalar_rules() -> None:
+    merged = list(range(0, 45))
+    stages = infer_stages(merged)
+    assert stages == [_infer_stage(Contributor(login="x", merged_prs=m)) for m in merged]
+    assert suggest_next_stages(stages, merged) == [
+        _suggest_next_stage(s, Contributor(login="x", merged_prs=m)) for s, m in zip(stages, merged)
+    ]
+
+
+def test_only_stage_changes_reach_the_llm(tmp_path: Path) -> None:
+    store = PromotionStore(str(tmp_path / "promotions.sqlite"))
+    llm = CountingLlm()
+    team = [Contributor("alice", merged_prs=1), Contributor("bob", merged_prs=12), Contributor("carol")]
+
+    first = run_promotion_batch(team, store, llm=llm, now=datetime(2025, 1, 1, tzinfo=timezone.utc))  # type: ignore[arg-type]
+    assert (first.contributors, first.stage_changes, first.llm_calls) == (3, 0, 0)
+
+    team = [
+        Contributor("alice", merged_prs=2),
+        Contributor("bob", merged_prs=13),
+        Contributor("carol"),
+        Contributor("dave", merged_prs=3),
+    ]
+    second = run_promotion_batch(team, store, llm=llm, now=datetime(2025, 1, 2, tzinfo=timezone.utc))  # type: ignore[arg-type]
+    assert (second.stage_changes, second.llm_calls) == (2, 2)
+    assert sorted(llm.logins) == ["alice", "dave"]
+
+    alice = store.get("alice")
+    assert alice is not None
+    assert (alice.output.current_stage, alice.narrative) == ("REGULAR", "llm")
+    assert alice.output.recommendation == "Celebrate @alice."
+    assert alice.stage_changed_at == "2025-01-02T00:00:00+00:00"
+
+    # Unchanged stages: no LLM calls, and the earlier narrative is kept.
+    third = run_promotion_batch(team, store, llm=llm, llm_limit=1)  # type: ignore[arg-type]
+    assert (third.stage_changes, third.llm_calls) == (0, 0)
+    assert store.get("alice").narrative == "llm"  # type: ignore[union-attr]
+    total, page = store.query(stage="REGULAR")
+    assert total == 2 and [r.login for r in page] == ["dave", "alice"]  # same confidence: more merged PRs first
+
+
+def test_capped_and_failed_narratives_stay_pending(tmp_path: Path) -> None:
+    store = PromotionStore(str(tmp_path / "promotions.sqlite"))
+    run_promotion_batch([Contributor("alice"), Contributor("bob")], store)
+    team = [Contributor("alice", merged_prs=1), Contributor("bob", merged_prs=1)]
+
+    class FailingLlm(CountingLlm):
+        def generate_json(self, **kwargs: Any) -> dict[str, Any]:  # type: ignore[override]
+            raise RuntimeError("rate limited")
+
+    second = run_promotion_batch(team, store, llm=FailingLlm(), llm_limit=1)  # type: ignore[arg-type]
+    assert (second.stage_changes, second.llm_calls, second.llm_errors) == (2, 1, 1)
+    assert all(r.narrative_pending for r in store.records().values())
+
+    # Stages are unchanged now, but both narratives are still owed; the cap drains them over runs.
+    llm = CountingLlm()
+    third = run_promotion_batch(team, store, llm=llm, llm_limit=1)  # type: ignore[arg-type]
+    fourth = run_promotion_batch(team, store, llm=llm, llm_limit=1)  # type: ignore[arg-type]
+    assert (third.stage_changes, third.llm_calls, fourth.llm_calls) == (0, 1, 1)
+    assert sorted(llm.logins) == ["alice", "bob"]
+    assert not any(r.narrative_pending for r in store.records().values())
+    assert run_promotion_batch(team, store, llm=llm).llm_calls == 0
+
+
+def test_contributors_from_csv_use_the_activity_store(tmp_path: Path) -> None:
+    path = tmp_path / "activity.csv"
+    path.write_text(
+        "repo_full_name,user_id,action,reference,occurred_at\n"
+        "o/r,bob,reviewed,https://github.com/o/r/pull/1,2025-01-02T00:00:00Z\n"
+        "o/r,alice,pr_opened,https://github.com/o/r/pull/1,2025-01-01T00:00:00Z\n"
+        "o/other,alice,pr_opened,https://github.com/o/other/pull/2,2025-01-03T00:00:00Z\n"
+        "o/r,dependabot[bot],pr_opened,https://github.com/o/r/pull/3,2025-01-01T00:00:00Z\n",
+        encoding="utf-8",
+    )
+    team = contributors_from_csv(path, repo="o/r", exclude=lambda login: login.endswith("[bot]"))
+    assert [(c.login, c.merged_prs, c.reviews) for c in team] == [("alice", 1, 0), ("bob", 0, 1)]
+
+
+def test_promotions_endpoint_reads_the_store(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("fastapi")
+    httpx = pytest.importorskip("httpx")
+    from devrel.api import main
+
+    store = PromotionStore(str(tmp_path / "promotions.sqlite"))
+    run_promotion_batch([Contributor("alice", merged_prs=31), Contributor("bob", merged_prs=2)], store)
+    monkeypatch.setattr(main, "_promotion_store", store)
+
+    async def fetch() -> Any:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/api/promotions", params={"stage": "MAINTAINER"})
+
+    response = asyncio.run(fetch())
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 1 and body["as_of"] is not None
+    assert body["items"][0]["login"] == "alice" and body["items"][0]["narrative"] == "heuristic"
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any
+
+from devrel.agents.assignment import analyze_issue_llm_async, recommend_assignee_llm
+from devrel.agents.types import Contributor, Issue, IssueAnalysisOutput, IssueType, Priority, ResponseStrategy
+from devrel.llm.client import AsyncLlmClient, LlmClient
+from devrel.llm.usage import response_usage
+
+ASSIGNMENT = {
+    "recommended_assignee": "alice",
+    "confidence": 0.8,
+    "reasons": [],
+    "context_for_assignee": "",
+    "alternative_assignees": ["bob"],
+}
+ANALYSIS = {
+    "issue_type": "bug",
+    "priority": "high",
+    "required_skills": [],
+    "keywords": [],
+    "summary": "s",
+    "needs_more_info": False,
+    "suggested_action": "direct_answer",
+}
+
+
+class RecordingResponses:
+    def __init__(self, payload: dict[str, Any], usage: Any = None) -> None:
+        self.payload = payload
+        self.usage = usage
+        self.calls: list[dict[str, Any]] = []
+
+    def create(self, **kwargs: Any) -> SimpleNamespace:
+        self.calls.append(kwargs)
+        return SimpleNamespace(
+            status="completed",
+            incomplete_details=None,
+            output_text=json.dumps(self.payload),
+            usage=self.usage,
+        )
+
+
+def _analysis() -> IssueAnalysisOutput:
+    return IssueAnalysisOutput(
+        issue_type=IssueType.BUG,
+        priority=Priority.HIGH,
+        required_skills=("cache",),
+        keywords=("redis",),
+        summary="s",
+        needs_more_info=False,
+        suggested_action=ResponseStrategy.DIRECT_ANSWER,
+    )
+
+
+def test_assignment_prompts_share_a_static_prefix_and_end_with_the_issue() -> None:
+    responses = RecordingResponses(ASSIGNMENT)
+    llm = LlmClient(client=SimpleNamespace(responses=responses))
+    team = [
+        Contributor(login="bob", areas=("docs", "api"), merged_prs=1),
+        Contributor(login="alice", areas=("cache", "python"), merged_prs=9),
+    ]
+
+    recommend_assignee_llm(llm, issue=Issue(1, "Redis timeout", "trace"), issue_analysis=_analysis(), contributors=team)
+    recommend_assignee_llm(
+        llm,
+        issue=Issue(2, "Cache eviction", "steps"),
+        issue_analysis=_analysis(),
+        contributors=list(reversed(team)),
+    )
+
+    first, second = (call["input"] for call in responses.calls)
+    assert [m["role"] for m in first] == ["system", "developer", "user"]
+    assert json.dumps(first[:-1]) == json.dumps(second[:-1])  # byte-identical prefix despite reordered team
+    assert "alice" in first[1]["content"] and "alice" not in first[-1]["content"]
+    assert "Redis timeout" in first[-1]["content"] and "Cache eviction" in second[-1]["content"]
+    assert responses.calls[0]["prompt_cache_key"] == responses.calls[1]["prompt_cache_key"]
+    assert responses.calls[0]["prompt_cache_key"].startswith("devrel-assignment-")
+
+
+def test_cached_tokens_are_reported_per_task() -> None:
+    usage = SimpleNamespace(input_tokens=2048, output_tokens=40, input_tokens_details=SimpleNamespace(cached_tokens=1536))
+
+    class AsyncResponses(RecordingResponses):
+        async def create(self, **kwargs: Any) -> SimpleNamespace:  # type: ignore[override]
+            return super().create(**kwargs)
+
+    llm = AsyncLlmClient(client=SimpleNamespace(responses=AsyncResponses(ANALYSIS, usage)))
+
+    async def run() -> None:
+        await analyze_issue_llm_async(llm, Issue(1, "a", "b"))
+        await analyze_issue_llm_async(llm, Issue(2, "c", "d"))
+
+    asyncio.run(run())
+    stats = llm.usage.to_dict()
+    assert stats["calls"] == 2
+    assert stats["cached_input_tokens"] == 3072
+    assert stats["by_task"]["issue_triage"]["cached_ratio"] == 0.75
+
+
+def test_usage_parses_dict_responses_and_missing_details() -> None:
+    parsed = response_usage({"usage": {"input_tokens": 10, "output_tokens": 2, "input_tokens_details": {"cached_tokens": 0}}})
+    assert parsed is not None and (parsed.input_tokens, parsed.cached_input_tokens) == (10, 0)
+    assert response_usage(SimpleNamespace(usage=SimpleNamespace(input_tokens=5, output_tokens=1))).cached_input_tokens == 0  # type: ignore[union-attr]
+    assert response_usage(SimpleNamespace()) is None
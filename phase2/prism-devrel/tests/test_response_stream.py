@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from devrel.agents.response import draft_response_llm_stream
+from devrel.agents.types import Issue, IssueAnalysisOutput, IssueType, Priority, ResponseOutput, ResponseStrategy
+from devrel.llm.client import AsyncLlmClient
+from devrel.llm.json_stream import JsonFieldStreamer
+
+RESPONSE = {
+    "strategy": "direct_answer",
+    "response_text": 'Line one\nSay "hi" — café 🚀 \\ done',
+    "confidence": 0.8,
+    "references": ["[ISSUE #1] body: response_text is not this"],
+    "follow_up_needed": False,
+}
+ANALYSIS = {
+    "issue_type": "bug",
+    "priority": "high",
+    "required_skills": [],
+    "keywords": ["timeout"],
+    "summary": "s",
+    "needs_more_info": False,
+    "suggested_action": "direct_answer",
+}
+CHUNK_DELAY_S = 0.01
+
+
+def test_field_streamer_decodes_escapes_split_across_chunks() -> None:
+    raw = json.dumps({"nested": {"response_text": "inner"}, **RESPONSE})  # ensure_ascii=True: \\u escapes
+    streamer = JsonFieldStreamer("response_text")
+    pieces = [streamer.feed(ch) for ch in raw]
+
+    assert "".join(pieces) == RESPONSE["response_text"]
+    assert streamer.text == RESPONSE["response_text"]
+    assert sum(1 for p in pieces if p) > 10  # emitted incrementally, not at the end
+
+
+class StreamingResponses:
+    def __init__(self, output: str, *, status: str = "completed") -> None:
+        self.output = output
+        self.status = status
+        self.stream_calls = 0
+        self.plain_calls = 0
+
+    async def create(self, **kwargs: Any) -> Any:
+        name = kwargs["text"]["format"].get("name")
+        if not kwargs.get("stream"):
+            self.plain_calls += 1
+            payload = RESPONSE if name == "response_output" or kwargs["text"]["format"]["type"] == "json_object" else ANALYSIS
+            return SimpleNamespace(status="completed", incomplete_details=None, output_text=json.dumps(payload))
+        self.stream_calls += 1
+        return self._events()
+
+    async def _events(self) -> Any:
+        for i in range(0, len(self.output), 5):
+            await asyncio.sleep(CHUNK_DELAY_S)
+            yield SimpleNamespace(type="response.output_text.delta", delta=self.output[i : i + 5])
+        details = {"reason": "max_output_tokens"} if self.status == "incomplete" else None
+        yield SimpleNamespace(
+            type=f"response.{self.status}",
+            response=SimpleNamespace(status=self.status, incomplete_details=details),
+        )
+
+
+def _analysis() -> IssueAnalysisOutput:
+    return IssueAnalysisOutput(
+        issue_type=IssueType.BUG,
+        priority=Priority.HIGH,
+        required_skills=(),
+        keywords=("timeout",),
+        summary="s",
+        needs_more_info=False,
+        suggested_action=ResponseStrategy.DIRECT_ANSWER,
+    )
+
+
+async def _drain(llm: AsyncLlmClient) -> tuple[list[Any], float, float]:
+    started = time.perf_counter()
+    first_delta = None
+    items: list[Any] = []
+    async for item in draft_response_llm_stream(llm, issue=Issue(1, "t", "b"), analysis=_analysis()):
+        if first_delta is None and not isinstance(item, ResponseOutput) and item.type == "delta":
+            first_delta = time.perf_counter() - started
+        items.append(item)
+    return items, first_delta or 0.0, time.perf_counter() - started
+
+
+def test_stream_emits_text_before_the_output_is_complete() -> None:
+    responses = StreamingResponses(json.dumps(RESPONSE))
+    items, first_delta, total = asyncio.run(_drain(AsyncLlmClient(client=SimpleNamespace(responses=responses))))
+
+    final = items[-1]
+    assert isinstance(final, ResponseOutput)
+    assert final.response_text == RESPONSE["response_text"]
+    assert "".join(i.text for i in items[:-1]) == RESPONSE["response_text"]
+    assert first_delta < total / 2
+    assert (responses.stream_calls, responses.plain_calls) == (1, 0)
+
+
+def test_truncated_stream_resets_and_falls_back_to_validated_call() -> None:
+    truncated = json.dumps(RESPONSE)[:60]
+    responses = StreamingResponses(truncated, status="incomplete")
+    items, _, _ = asyncio.run(_drain(AsyncLlmClient(client=SimpleNamespace(responses=responses))))
+
+    kinds = [getattr(i, "type", "final") for i in items]
+    assert "reset" in kinds
+    after_reset = items[kinds.index("reset") + 1 :]
+    assert after_reset[0].text == RESPONSE["response_text"]
+    assert isinstance(items[-1], ResponseOutput)
+    assert responses.plain_calls == 1
+
+
+def test_sse_endpoint_streams_analysis_deltas_and_complete(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("fastapi")
+    httpx = pytest.importorskip("httpx")
+    from devrel.api import main
+
+    class Responses(StreamingResponses):
+        async def create(self, **kwargs: Any) -> Any:
+            if kwargs["text"]["format"].get("name") == "issue_analysis_output":
+                return SimpleNamespace(status="completed", incomplete_details=None, output_text=json.dumps(ANALYSIS))
+            return await super().create(**kwargs)
+
+    monkeypatch.setattr(main, "_llm_client", AsyncLlmClient(client=SimpleNamespace(responses=Responses(json.dumps(RESPONSE)))))
+    monkeypatch.setattr(main, "_rag_client", None)
+
+    async def post() -> Any:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(
+                "/api/agents/response/stream",
+                json={"number": 1, "title": "Runner times out", "body": "trace", "labels": ["bug"]},
+            )
+
+    response = asyncio.run(post())
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [json.loads(block[len("data: ") :]) for block in response.text.split("\n\n") if block]
+    assert events[0]["type"] == "analysis"
+    assert events[-1]["type"] == "complete"
+    assert "".join(e["text"] for e in events if e["type"] == "delta") == RESPONSE["response_text"]
+    assert events[-1]["response"]["response_text"] == RESPONSE["response_text"]
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from devrel.llm.client import AsyncLlmClient, JsonSchema, LlmClient
+from devrel.llm.model_selector import LlmTask
+from devrel.llm.singleflight import AsyncSingleFlight, SingleFlight
+from devrel.search.rag_client import AsyncRAGClient
+
+SCHEMA = JsonSchema(
+    name="triage",
+    schema={"type": "object", "properties": {"label": {"type": "string"}}, "required": ["label"]},
+)
+N = 100
+
+
+class SlowResponses:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def create(self, **kwargs: object) -> SimpleNamespace:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return SimpleNamespace(status="completed", incomplete_details=None, output_text=json.dumps({"label": "bug"}))
+
+
+class SlowEmbeddings:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def create(self, **kwargs: object) -> SimpleNamespace:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return SimpleNamespace(data=[SimpleNamespace(embedding=[0.1, 0.2, 0.3])])
+
+
+def test_concurrent_identical_llm_calls_share_one_upstream_call() -> None:
+    responses = SlowResponses()
+    client = AsyncLlmClient(client=SimpleNamespace(responses=responses))
+
+    async def run() -> list[dict[str, object]]:
+        return await asyncio.gather(
+            *(
+                client.generate_json(task=LlmTask.ISSUE_TRIAGE, system="s", user="same issue", json_schema=SCHEMA)
+                for _ in range(N)
+            )
+        )
+
+    results = asyncio.run(run())
+    assert responses.calls == 1
+    assert results == [{"label": "bug"}] * N
+    results[0]["label"] = "mutated"
+    assert results[1] == {"label": "bug"}
+
+    # Once the call has finished nothing is remembered: a later call goes upstream again.
+    asyncio.run(run())
+    assert responses.calls == 2
+
+
+def test_different_requests_are_not_coalesced() -> None:
+    responses = SlowResponses()
+    client = AsyncLlmClient(client=SimpleNamespace(responses=responses))
+
+    async def run() -> None:
+        await asyncio.gather(
+            *(
+                client.generate_json(task=LlmTask.ISSUE_TRIAGE, system="s", user=f"issue {i % 4}", json_schema=SCHEMA)
+                for i in range(N)
+            )
+        )
+
+    asyncio.run(run())
+    assert responses.calls == 4
+
+
+def test_concurrent_identical_embeddings_share_one_upstream_call() -> None:
+    embeddings = SlowEmbeddings()
+    rag = AsyncRAGClient(openai_api_key="test")
+    rag._openai = SimpleNamespace(embeddings=embeddings)  # type: ignore[assignment]
+
+    async def run() -> list[list[float]]:
+        return await asyncio.gather(*(rag._embed_query("redis timeout") for _ in range(N)))
+
+    assert asyncio.run(run()) == [[0.1, 0.2, 0.3]] * N
+    assert embeddings.calls == 1
+
+
+def test_sync_client_coalesces_across_threads() -> None:
+    calls = 0
+    gate = threading.Event()
+
+    class BlockingResponses:
+        def create(self, **kwargs: object) -> SimpleNamespace:
+            nonlocal calls
+            calls += 1
+            gate.wait(5)
+            return SimpleNamespace(status="completed", incomplete_details=None, output_text=json.dumps({"label": "bug"}))
+
+    client = LlmClient(client=SimpleNamespace(responses=BlockingResponses()))
+    with ThreadPoolExecutor(max_workers=N) as pool:
+        futures = [
+            pool.submit(client.generate_json, task=LlmTask.ISSUE_TRIAGE, system="s", user="u", json_schema=SCHEMA)
+            for _ in range(N)
+        ]
+        time.sleep(0.2)
+        gate.set()
+        results = [f.result() for f in futures]
+    assert calls == 1
+    assert results == [{"label": "bug"}] * N
+
+
+def test_errors_propagate_to_every_waiter() -> None:
+    flight = SingleFlight()
+    with pytest.raises(RuntimeError):
+        flight.do("k", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+
+    async_flight = AsyncSingleFlight()
+
+    async def boom() -> None:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def run() -> list[object]:
+        return await asyncio.gather(*(async_flight.do("k", boom) for _ in range(5)), return_exceptions=True)
+
+    outcomes = asyncio.run(run())
+    assert all(isinstance(o, RuntimeError) for o in outcomes)
+    assert async_flight.coalesced == 4
+
+
+def test_cancelled_waiter_does_not_cancel_shared_call() -> None:
+    flight = AsyncSingleFlight()
+    calls = 0
+
+    async def slow() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def run() -> str:
+        impatient = asyncio.create_task(flight.do("k", slow))
+        await asyncio.sleep(0)
+        patient = asyncio.create_task(flight.do("k", slow))
+        await asyncio.sleep(0.01)
+        impatient.cancel()
+        return await patient
+
+    assert asyncio.run(run()) == "done"
+    assert calls == 1
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+
+from devrel.agents.docs import detect_doc_gaps_with_tavily
+from devrel.agents.types import Issue
+from devrel.search import tavily_client
+from devrel.search.cache import SearchCache
+from devrel.search.tavily_client import TavilyClient
+from tests.helpers.fakes import DocGapLlm, FakeClock
+
+SEARCH_DELAY_S = 0.3
+
+
+class FakeTavily(ThreadingHTTPServer):
+    """POST /search on localhost; answers after `SEARCH_DELAY_S` and records each payload."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.payloads: list[dict[str, Any]] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakeTavily
+
+    def do_POST(self) -> None:  # noqa: N802
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.payloads.append(payload)
+        time.sleep(SEARCH_DELAY_S)
+        body = json.dumps(
+            {
+                "answer": f"answer to {payload['query']}",
+                "results": [
+                    {
+                        "title": "redis-py docs",
+                        "url": "https://github.com/redis/redis-py/blob/master/docs/caching.md",
+                        "content": "Client-side caching",
+                        "score": 0.9,
+                    }
+                ],
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def tavily_server() -> Iterator[FakeTavily]:
+    server = FakeTavily()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_search_cache_keys_on_normalized_query_and_params(tavily_server: FakeTavily) -> None:
+    clock = FakeClock()
+    cache = SearchCache(ttl_s=60, clock=clock)
+    tavily = TavilyClient(api_key="k", base_url=tavily_server.url, cache=cache)
+
+    first = tavily.search("Redis  caching docs", include_domains=["github.com", "docs.github.com"])
+    again = tavily.search("redis caching DOCS", include_domains=["docs.github.com", "github.com"])
+    assert len(tavily_server.payloads) == 1
+    assert again.results == first.results and again.related_repos == ("redis/redis-py",)
+    assert again.query == "redis caching DOCS"
+
+    tavily.search("redis caching docs", max_results=3)
+    assert len(tavily_server.payloads) == 2
+
+    clock.now = 61.0
+    tavily.search("redis caching docs", include_domains=["github.com", "docs.github.com"])
+    assert len(tavily_server.payloads) == 3
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_doc_gap_searches_run_concurrently_and_repeat_runs_hit_cache(
+    tavily_server: FakeTavily, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = SearchCache(ttl_s=60)
+    monkeypatch.setattr(tavily_client, "default_search_cache", lambda: cache)
+    monkeypatch.setattr(TavilyClient, "BASE_URL", tavily_server.url)
+    issues = [Issue(1, "How do I cache with Redis?", "No docs on caching.")]
+
+    started = time.perf_counter()
+    output = detect_doc_gaps_with_tavily(DocGapLlm(priority="medium"), issues, "o/r", tavily_api_key="k")  # type: ignore[arg-type]
+    assert time.perf_counter() - started < 2 * SEARCH_DELAY_S
+    assert len(tavily_server.payloads) == 2
+    assert output.similar_repos == ("redis/redis-py",)
+
+    started = time.perf_counter()
+    assert detect_doc_gaps_with_tavily(DocGapLlm(priority="medium"), issues, "o/r", tavily_api_key="k") == output  # type: ignore[arg-type]
+    assert time.perf_counter() - started < SEARCH_DELAY_S
+    assert len(tavily_server.payloads) == 2
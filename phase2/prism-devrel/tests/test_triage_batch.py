@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from devrel.agents.triage_batch import analyze_issues_stream
+from devrel.agents.types import Issue
+from devrel.llm.batch import OpenAIBatchRunner
+from devrel.llm.client import AsyncLlmClient
+from tests.helpers.openai_batch_stub import StubBatchOpenAI
+
+ISSUES = [Issue(number=n, title=f"Issue {n}", body="Something broke", labels=("bug",)) for n in range(1, 21)]
+
+
+def _analysis(number: int) -> dict[str, Any]:
+    return {
+        "issue_type": "bug",
+        "priority": "high" if number % 2 else "low",
+        "required_skills": ["python"],
+        "keywords": [f"k{number}"],
+        "summary": f"summary {number}",
+        "needs_more_info": False,
+        "suggested_action": "direct_answer",
+    }
+
+
+def _number(body: dict[str, Any]) -> int:
+    user = body["input"][1]["content"]  # type: ignore[index]
+    return int(re.search(r"Issue number: (\d+)", user).group(1))  # type: ignore[union-attr]
+
+
+async def _collect(stream: Any) -> list[dict[str, Any]]:
+    return [line async for line in stream]
+
+
+def test_concurrent_mode_bounds_in_flight_calls_and_retries() -> None:
+    seen: Counter[int] = Counter()
+    in_flight = 0
+    peak = 0
+
+    async def respond(**kwargs: Any) -> Any:
+        nonlocal in_flight, peak
+        number = _number(kwargs)
+        seen[number] += 1
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if number == 5 and seen[number] == 1:
+                raise ConnectionError("reset by peer")
+            if number == 7:
+                raise ConnectionError("always down")
+        finally:
+            in_flight -= 1
+        return SimpleNamespace(status="completed", incomplete_details=None, output_text=json.dumps(_analysis(number)))
+
+    llm = AsyncLlmClient(client=SimpleNamespace(responses=SimpleNamespace(create=respond)))
+    lines = asyncio.run(
+        _collect(analyze_issues_stream(ISSUES, llm=llm, concurrency=4, max_retries=2, backoff_s=0.0))
+    )
+    by_number = {line["number"]: line for line in lines}
+
+    assert len(lines) == len(ISSUES)
+    assert peak <= 4
+    assert by_number[1]["status"] == "ok"
+    assert by_number[1]["analysis"]["keywords"] == ["k1"]
+    assert (by_number[5]["status"], by_number[5]["attempts"]) == ("ok", 2)
+    assert (by_number[7]["status"], by_number[7]["attempts"]) == ("error", 3)
+    assert "always down" in by_number[7]["error"]
+
+
+def test_batch_mode_uses_batch_api_and_retries_failed_lines_directly() -> None:
+    batch_attempts: Counter[int] = Counter()
+
+    def respond(body: dict[str, Any]) -> dict[str, Any]:
+        number = _number(body)
+        batch_attempts[number] += 1
+        if number == 3 and batch_attempts[number] == 1:
+            raise RuntimeError("model overloaded")
+        return _analysis(number)
+
+    stub = StubBatchOpenAI(respond)
+    llm = AsyncLlmClient(client=stub)  # type: ignore[arg-type]
+    runner = OpenAIBatchRunner(llm, poll_interval_s=0.0)
+    lines = asyncio.run(_collect(analyze_issues_stream(ISSUES, llm=llm, mode="batch", batch_runner=runner)))
+    by_number = {line["number"]: line for line in lines}
+
+    assert len(lines) == len(ISSUES)
+    assert all(line["status"] == "ok" for line in lines)
+    assert stub.retrieve_calls == 2
+    assert stub.direct_calls == 1
+    assert (by_number[3]["transport"], by_number[3]["attempts"]) == ("concurrent", 2)
+    assert (by_number[4]["transport"], by_number[4]["attempts"]) == ("batch", 1)
+    assert by_number[4]["analysis"]["priority"] == "low"
+
+
+def test_batch_endpoint_streams_ndjson() -> None:
+    pytest.importorskip("fastapi")
+    httpx = pytest.importorskip("httpx")
+    from devrel.api import main
+
+    async def post() -> Any:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            payload = {
+                "issues": [{"number": i.number, "title": i.title, "body": i.body, "labels": list(i.labels)} for i in ISSUES[:3]],
+                "use_llm": False,
+            }
+            return await client.post("/api/agents/analyze/batch", json=payload)
+
+    response = asyncio.run(post())
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["number"] for line in lines] == [1, 2, 3]
+    assert all(line["status"] == "ok" and line["analysis"]["issue_type"] == "bug" for line in lines)
+
+
+def test_batch_endpoint_rejects_batch_api_mode() -> None:
+    pytest.importorskip("fastapi")
+    httpx = pytest.importorskip("httpx")
+    from devrel.api import main
+
+    async def post() -> Any:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            payload = {"issues": [{"number": 1, "title": "t", "body": "b"}], "mode": "batch"}
+            return await client.post("/api/agents/analyze/batch", json=payload)
+
+    response = asyncio.run(post())
+    assert response.status_code == 422
+    assert "scripts/analyze_batch.py" in response.json()["detail"]
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from devrel.agents.triage_classifier import (
+    TriageClassifier,
+    TriageExample,
+    analyze_issue_tiered,
+    evaluate,
+    example_from_labels,
+)
+from devrel.agents.types import Issue, IssueType, Priority, ResponseStrategy
+from devrel.llm.client import LlmClient
+
+TEMPLATES = {
+    ("bug", "high", "direct_answer"): (
+        ["Crash when {x} runs", "{x} raises exception", "Regression: {x} fails"],
+        "Traceback (most recent call last): {x} raises TypeError after upgrading. Steps to reproduce attached.",
+    ),
+    ("feature", "medium", "direct_answer"): (
+        ["Support {x} in the runner", "Add option for {x}", "Allow configuring {x}"],
+        "It would be great to add support for {x}. Proposal: a new option so users can enable it.",
+    ),
+    ("question", "low", "link_docs"): (
+        ["How do I use {x}?", "Is it possible to use {x}?", "What is the best way to set up {x}?"],
+        "I am trying to figure out how to use {x}. Any guidance or example would help, thanks.",
+    ),
+    ("bug", "medium", "request_info"): (
+        ["{x} does not work", "Problem with {x}", "{x} broken"],
+        "{x} is not working for me.",
+    ),
+}
+TOPICS = ["streaming", "handoffs", "tracing", "sessions", "guardrails", "tools", "realtime", "mcp", "voice"]
+
+
+def _examples(n: int, seed: int) -> list[TriageExample]:
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        (issue_type, priority, action), (titles, body) = rng.choice(list(TEMPLATES.items()))
+        topic = rng.choice(TOPICS)
+        issue = Issue(i, rng.choice(titles).format(x=topic), body.format(x=topic))
+        out.append(TriageExample(issue, {"issue_type": issue_type, "priority": priority, "suggested_action": action}))
+    return out
+
+
+def test_classifier_learns_templates_and_serves_fast(tmp_path: Path) -> None:
+    classifier = TriageClassifier.train(_examples(200, seed=1))
+    report = evaluate(classifier, _examples(80, seed=2), threshold=0.7)
+
+    assert all(acc >= 0.95 for acc in report["accuracy"].values())
+    assert report["coverage"] > 0.5 and report["confident_accuracy"] >= 0.95
+    assert report["latency_ms"]["p95"] < 5.0
+
+    path = tmp_path / "triage.json.gz"
+    classifier.save(path)
+    loaded = TriageClassifier.load(path)
+    issue = Issue(1, "Crash when tracing runs", "Traceback (most recent call last): TypeError")
+    assert loaded.predict(issue) == classifier.predict(issue)
+
+
+def test_tiered_analysis_defers_to_llm_only_below_threshold() -> None:
+    classifier = TriageClassifier.train(_examples(200, seed=1))
+    calls: list[Any] = []
+
+    class Responses:
+        def create(self, **kwargs: Any) -> SimpleNamespace:
+            calls.append(kwargs)
+            analysis = {
+                "issue_type": "documentation",
+                "priority": "low",
+                "required_skills": [],
+                "keywords": [],
+                "summary": "s",
+                "needs_more_info": False,
+                "suggested_action": "link_docs",
+            }
+            return SimpleNamespace(status="completed", incomplete_details=None, output_text=json.dumps(analysis))
+
+    llm = LlmClient(client=SimpleNamespace(responses=Responses()))
+
+    confident = analyze_issue_tiered(
+        Issue(1, "Add option for voice", "It would be great to add support for voice."), classifier=classifier, llm=llm
+    )
+    assert confident.tier == "classifier" and not calls
+    assert confident.analysis.issue_type == IssueType.FEATURE
+    assert confident.analysis.priority == Priority.MEDIUM
+    assert confident.analysis.summary == "Add option for voice"  # heuristic fields are kept
+
+    unsure = analyze_issue_tiered(
+        Issue(2, "Translations", "Localization of the dashboard."), classifier=classifier, llm=llm, threshold=0.99
+    )
+    assert unsure.tier == "llm" and len(calls) == 1
+    assert unsure.analysis.suggested_action == ResponseStrategy.LINK_DOCS
+
+
+def test_label_targets_and_untrained_heads_fall_back_to_heuristic() -> None:
+    example = example_from_labels(Issue(1, "t", "b", labels=("Bug", "P1", "needs-repro")))
+    assert example.targets == {"issue_type": "bug", "priority": "high", "suggested_action": "request_info"}
+
+    # Only issue_type is labelled, so the other fields come from analyze_issue.
+    examples = [TriageExample(e.issue, {"issue_type": e.targets["issue_type"]}) for e in _examples(60, seed=3)]
+    classifier = TriageClassifier.train(examples)
+    assert set(classifier.heads) == {"issue_type"}
+    result = analyze_issue_tiered(Issue(1, "Crash when mcp runs", "Traceback ..."), classifier=classifier)
+    assert result.tier == "classifier" and result.analysis.issue_type == IssueType.BUG
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from devrel.agents.webhooks import (
+    WebhookJob,
+    WebhookQueue,
+    WebhookWorkerPool,
+    issue_from_webhook,
+    sign_payload,
+    triage_handler,
+    triage_target,
+    verify_signature,
+)
+from tests.helpers.github_fixtures import load_json
+
+SECRET = "It's a Secret to Everybody"
+
+
+def test_signature_and_event_filter() -> None:
+    body = b"Hello, World!"
+    # Example from GitHub's "Validating webhook deliveries" docs.
+    signature = "sha256=757107ea0eb2509fc211221cce984b8a37570b6d7586c22c46f4379c8b043e17"
+    assert sign_payload(SECRET, body) == signature
+    assert verify_signature(SECRET, body, signature)
+    assert not verify_signature(SECRET, body + b"!", signature)
+    assert not verify_signature(SECRET, body, None) and not verify_signature("", body, signature)
+
+    opened = load_json("github/webhooks/issues_opened.json")
+    comment = load_json("github/webhooks/issue_comment_created.json")
+    assert triage_target("issues", opened) == ("openai/openai-agents-python", 1874)
+    assert triage_target("issue_comment", comment) == ("openai/openai-agents-python", 1874)
+    assert triage_target("issues", {**opened, "action": "labeled"}) is None
+    assert triage_target("issue_comment", {**comment, "issue": {**comment["issue"], "pull_request": {"url": "x"}}}) is None
+    bot = {**comment, "comment": {**comment["comment"], "user": {"login": "github-actions[bot]", "type": "Bot"}}}
+    assert triage_target("issue_comment", bot) is None
+
+    issue = issue_from_webhook(comment)
+    assert issue.labels == ("bug",) and issue.body.endswith("@sam-ops: Same here with MCP tools on 0.3.3; the traceback points at the streaming loop.")
+
+
+def test_workers_retry_then_dead_letter(tmp_path: Path) -> None:
+    queue = WebhookQueue(str(tmp_path / "jobs.sqlite"))
+    flaky, _ = queue.enqueue("d-1", "issues", "opened", "acme/api", 1, {"issue": {"number": 1}})
+    broken, _ = queue.enqueue("d-2", "issues", "opened", "acme/api", 2, {"issue": {"number": 2}})
+    assert queue.enqueue("d-1", "issues", "opened", "acme/api", 1, {}) == (flaky, False)
+
+    seen: list[int] = []
+
+    async def handler(job: WebhookJob) -> dict[str, Any]:
+        seen.append(job.id)
+        if job.id == broken or job.attempts == 1:
+            raise RuntimeError("LLM unavailable")
+        return {"ok": True}
+
+    pool = WebhookWorkerPool(queue, handler, workers=2, max_attempts=3, backoff_s=0.0)
+    asyncio.run(pool.drain())
+
+    done, dead = queue.get(flaky), queue.get(broken)
+    assert done is not None and (done.status, done.attempts, done.result) == ("done", 2, {"ok": True})
+    assert dead is not None and (dead.status, dead.attempts) == ("dead", 3)
+    assert dead.last_error == "RuntimeError: LLM unavailable"
+    assert sorted(seen) == [flaky, flaky, broken, broken, broken]
+    assert queue.counts() == {"queued": 0, "running": 0, "done": 1, "dead": 1}
+    assert [j.id for j in queue.jobs(status="dead")] == [broken]
+
+    assert queue.retry(broken) and not queue.retry(flaky)
+    assert queue.get(broken).status == "queued"  # type: ignore[union-attr]
+
+
+def test_expired_lease_is_claimed_again(tmp_path: Path) -> None:
+    now = [1000.0]
+    queue = WebhookQueue(str(tmp_path / "jobs.sqlite"), clock=lambda: now[0])
+    job_id, _ = queue.enqueue("d-1", "issues", "opened", "acme/api", 1, {})
+    assert queue.claim("worker-a", lease_s=60).id == job_id  # type: ignore[union-attr]
+    assert queue.claim("worker-b", lease_s=60) is None
+    now[0] += 61  # worker-a died without completing
+    again = queue.claim("worker-b", lease_s=60, max_attempts=2)
+    assert again is not None and again.id == job_id and again.attempts == 2
+
+    # worker-a only overran its lease: its late outcome must not clobber worker-b's run.
+    assert not queue.complete(job_id, {"stale": True}, worker="worker-a")
+    assert queue.fail(job_id, "late", worker="worker-a") is None
+    assert queue.get(job_id).status == "running"  # type: ignore[union-attr]
+
+    # worker-b dies too: with its attempts used up, the job is dead-lettered rather than run a third time.
+    now[0] += 61
+    assert queue.claim("worker-c", lease_s=60, max_attempts=2) is None
+    dead = queue.get(job_id)
+    assert dead is not None and (dead.status, dead.attempts, dead.worker) == ("dead", 2, "worker-b")
+    assert dead.last_error == "lease expired after 2 attempt(s)"
+
+
+def test_webhook_acks_then_workers_triage(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("fastapi")
+    httpx = pytest.importorskip("httpx")
+    from devrel.api import main
+
+    queue = WebhookQueue(str(tmp_path / "jobs.sqlite"))
+    monkeypatch.setenv("GITHUB_WEBHOOK_SECRET", SECRET)
+    monkeypatch.setattr(main, "_webhook_queue", queue)
+    monkeypatch.setattr(main, "_webhook_pool", None)
+
+    def delivery(event: str, name: str, delivery_id: str, *, secret: str = SECRET) -> dict[str, Any]:
+        body = json.dumps(load_json(f"github/webhooks/{name}.json")).encode("utf-8")
+        headers = {
+            "X-GitHub-Event": event,
+            "X-GitHub-Delivery": delivery_id,
+            "X-Hub-Signature-256": sign_payload(secret, body),
+            "Content-Type": "application/json",
+        }
+        return {"content": body, "headers": headers}
+
+    async def post_all() -> list[Any]:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return [
+                await client.post("/webhooks/github", **delivery("issues", "issues_opened", "a")),
+                await client.post("/webhooks/github", **delivery("issues", "issues_opened", "a")),
+                await client.post("/webhooks/github", **delivery("issue_comment", "issue_comment_created", "b")),
+                await client.post("/webhooks/github", **delivery("issues", "issues_opened", "c", secret="wrong")),
+                await client.post("/webhooks/github", **delivery("pull_request", "issues_opened", "d")),
+            ]
+
+    opened, redelivered, commented, forged, other = asyncio.run(post_all())
+    assert opened.status_code == 202 and opened.json()["status"] == "queued"
+    assert redelivered.json() == {"status": "duplicate", "job_id": opened.json()["job_id"]}
+    assert commented.json()["status"] == "queued"
+    assert forged.status_code == 401
+    assert other.json()["status"] == "ignored"
+    assert queue.counts()["queued"] == 2
+
+    asyncio.run(WebhookWorkerPool(queue, triage_handler(), workers=2).drain())
+    job = queue.get(opened.json()["job_id"])
+    assert job is not None and job.status == "done"
+    assert job.result["analysis"]["issue_type"] == "bug"  # type: ignore[index]
+    assert job.result["nodes"]["triage"]["status"] == "ok"  # type: ignore[index]